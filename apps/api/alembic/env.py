@@ -12,7 +12,7 @@ from alembic import context
 
 # Import models to ensure they're registered
 from app.models.base import Base
-from app.models import User, Subscription, Job, UsageEvent
+from app.models import User, Subscription, Job, UsageEvent, UsageRollupHourly, UsageRollupDaily
 
 # this is the Alembic Config object
 config = context.config
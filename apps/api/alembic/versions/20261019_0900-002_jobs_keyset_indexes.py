@@ -0,0 +1,51 @@
+"""Composite indexes for keyset pagination of jobs
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently so the jobs table stays writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_jobs_user_id_created_at_id',
+            'jobs',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_jobs_user_id_status_created_at',
+            'jobs',
+            ['user_id', 'status', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_jobs_user_id_status_created_at',
+            table_name='jobs',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_jobs_user_id_created_at_id',
+            table_name='jobs',
+            postgresql_concurrently=True,
+        )
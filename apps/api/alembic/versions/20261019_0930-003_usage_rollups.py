@@ -0,0 +1,84 @@
+"""Hourly and daily usage rollup tables
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_TABLES = [
+    ('usage_rollups_hourly', 'hour'),
+    ('usage_rollups_daily', 'day'),
+]
+
+
+def upgrade() -> None:
+    for table, unit in ROLLUP_TABLES:
+        op.create_table(
+            table,
+            sa.Column('bucket_start', sa.DateTime(), nullable=False),
+            sa.Column('event_type', sa.String(length=50), nullable=False),
+            sa.Column('model', sa.String(length=100), nullable=False, server_default=''),
+            sa.Column('plan', sa.String(length=20), nullable=False, server_default=''),
+            sa.Column('job_status', sa.String(length=20), nullable=False, server_default=''),
+            sa.Column('event_count', sa.Integer(), nullable=False, server_default=sa.text('0')),
+            sa.Column('tokens', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+            sa.Column('quantity', sa.BigInteger(), nullable=False, server_default=sa.text('0')),
+            sa.PrimaryKeyConstraint('bucket_start', 'event_type', 'model', 'plan', 'job_status'),
+        )
+
+        # Backfill usage history
+        op.execute(f"""
+            INSERT INTO {table} (bucket_start, event_type, model, plan, job_status, event_count, tokens, quantity)
+            SELECT
+                date_trunc('{unit}', e.created_at),
+                e.event_type,
+                COALESCE(e.event_metadata->>'model', ''),
+                COALESCE(LOWER(s.plan::text), ''),
+                '',
+                count(*),
+                COALESCE(sum(e.tokens), 0),
+                sum(CASE e.event_type
+                    WHEN 'chat_completion' THEN e.tokens
+                    WHEN 'image_generation' THEN COALESCE((e.event_metadata->>'image_count')::int, 1)
+                    WHEN 'video_generation' THEN COALESCE((e.event_metadata->>'duration')::int, 1)
+                    ELSE 1
+                END)
+            FROM usage_events e
+            LEFT JOIN subscriptions s ON s.user_id = e.user_id
+            GROUP BY 1, 2, 3, 4
+        """)
+
+        # Backfill finished jobs
+        op.execute(f"""
+            INSERT INTO {table} (bucket_start, event_type, model, plan, job_status, event_count, tokens, quantity)
+            SELECT
+                date_trunc('{unit}', COALESCE(j.completed_at, j.updated_at)),
+                'job:' || LOWER(j.type::text),
+                COALESCE(j.model_name, ''),
+                COALESCE(LOWER(s.plan::text), ''),
+                LOWER(j.status::text),
+                count(*),
+                COALESCE(sum(j.tokens_used), 0),
+                count(*)
+            FROM jobs j
+            LEFT JOIN subscriptions s ON s.user_id = j.user_id
+            WHERE j.status IN ('COMPLETED', 'FAILED', 'CANCELLED')
+            GROUP BY 1, 2, 3, 4, 5
+        """)
+
+
+def downgrade() -> None:
+    for table, _ in reversed(ROLLUP_TABLES):
+        op.drop_table(table)
@@ -0,0 +1,64 @@
+"""Trigram and prefix indexes for admin user search
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Build concurrently so sign-ups are not blocked during the migration
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_email_trgm',
+            'users',
+            ['email'],
+            postgresql_using='gin',
+            postgresql_ops={'email': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_name_trgm',
+            'users',
+            ['name'],
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_email_lower_prefix',
+            'users',
+            [sa.text('lower(email) text_pattern_ops')],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_name_lower_prefix',
+            'users',
+            [sa.text('lower(name) text_pattern_ops')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index in (
+            'ix_users_name_lower_prefix',
+            'ix_users_email_lower_prefix',
+            'ix_users_name_trgm',
+            'ix_users_email_trgm',
+        ):
+            op.drop_index(index, table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,123 @@
+"""Typed columns and time-range indexes for usage_events
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    # Nullable columns without defaults: metadata-only change, no table rewrite
+    op.add_column('usage_events', sa.Column('provider', sa.String(length=50), nullable=True))
+    op.add_column('usage_events', sa.Column('model', sa.String(length=100), nullable=True))
+    op.add_column('usage_events', sa.Column('prompt_tokens', sa.Integer(), nullable=True))
+    op.add_column('usage_events', sa.Column('completion_tokens', sa.Integer(), nullable=True))
+    op.add_column('usage_events', sa.Column('image_count', sa.Integer(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        # Backfill from the JSON blob in id-ordered batches, each committed on
+        # its own so row locks stay short on a large table
+        conn = op.get_bind()
+        last_id = ''
+        while True:
+            last_id = conn.execute(
+                sa.text("""
+                    WITH batch AS (
+                        SELECT id FROM usage_events
+                        WHERE id > :last_id
+                        ORDER BY id
+                        LIMIT :batch_size
+                    ), updated AS (
+                        UPDATE usage_events e SET
+                            provider = e.event_metadata->>'provider',
+                            model = e.event_metadata->>'model',
+                            prompt_tokens = (e.event_metadata->>'prompt_tokens')::int,
+                            completion_tokens = (e.event_metadata->>'completion_tokens')::int,
+                            image_count = (e.event_metadata->>'image_count')::int
+                        FROM batch
+                        WHERE e.id = batch.id AND e.event_metadata IS NOT NULL
+                    )
+                    SELECT max(id) FROM batch
+                """),
+                {'last_id': last_id, 'batch_size': BACKFILL_BATCH_SIZE},
+            ).scalar()
+            if last_id is None:
+                break
+
+        op.create_index(
+            'ix_usage_events_user_id_created_at',
+            'usage_events',
+            ['user_id', 'created_at'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_usage_events_event_type_created_at',
+            'usage_events',
+            ['event_type', 'created_at'],
+            postgresql_concurrently=True,
+        )
+
+        # Superseded by the composite indexes above (same leading column)
+        op.drop_index('ix_usage_events_user_id', table_name='usage_events', postgresql_concurrently=True)
+        op.drop_index('ix_usage_events_event_type', table_name='usage_events', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_usage_events_event_type',
+            'usage_events',
+            ['event_type'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_usage_events_user_id',
+            'usage_events',
+            ['user_id'],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_usage_events_event_type_created_at',
+            table_name='usage_events',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_usage_events_user_id_created_at',
+            table_name='usage_events',
+            postgresql_concurrently=True,
+        )
+
+    # Rows written after the upgrade keep these fields only in the columns
+    op.execute("""
+        UPDATE usage_events SET event_metadata = (
+            COALESCE(event_metadata::jsonb, '{}'::jsonb) || jsonb_strip_nulls(jsonb_build_object(
+                'provider', provider,
+                'model', model,
+                'prompt_tokens', prompt_tokens,
+                'completion_tokens', completion_tokens,
+                'image_count', image_count
+            ))
+        )::json
+        WHERE provider IS NOT NULL OR model IS NOT NULL OR prompt_tokens IS NOT NULL
+            OR completion_tokens IS NOT NULL OR image_count IS NOT NULL
+    """)
+
+    op.drop_column('usage_events', 'image_count')
+    op.drop_column('usage_events', 'completion_tokens')
+    op.drop_column('usage_events', 'prompt_tokens')
+    op.drop_column('usage_events', 'model')
+    op.drop_column('usage_events', 'provider')
@@ -0,0 +1,98 @@
+"""Monthly range partitioning of jobs and usage_events
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created ahead of the current month (the app keeps extending this)
+MONTHS_AHEAD = 3
+
+INDEXES = {
+    'jobs': [
+        ('ix_jobs_user_id', '(user_id)'),
+        ('ix_jobs_status', '(status)'),
+        ('ix_jobs_user_id_created_at_id', '(user_id, created_at DESC, id DESC)'),
+        ('ix_jobs_user_id_status_created_at', '(user_id, status, created_at)'),
+    ],
+    'usage_events': [
+        ('ix_usage_events_job_id', '(job_id)'),
+        ('ix_usage_events_user_id_created_at', '(user_id, created_at)'),
+        ('ix_usage_events_event_type_created_at', '(event_type, created_at)'),
+    ],
+}
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _month_start(at: datetime) -> datetime:
+    return at.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_constraints(table: str, primary_key: str) -> None:
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})')
+    op.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {table}_user_id_fkey '
+        f'FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE'
+    )
+    for name, columns in INDEXES[table]:
+        op.execute(f'CREATE INDEX {name} ON {table} {columns}')
+
+
+def upgrade() -> None:
+    # Rows are copied into the new partitioned tables, so both tables are
+    # rewritten once; run this in a maintenance window on large databases.
+    conn = op.get_bind()
+    current = _month_start(datetime.utcnow())
+
+    for table in INDEXES:
+        legacy = f'{table}_unpartitioned'
+        op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) '
+            f'PARTITION BY RANGE (created_at)'
+        )
+
+        oldest = conn.execute(sa.text(f'SELECT min(created_at) FROM {legacy}')).scalar()
+        month = _month_start(min(oldest, current) if oldest else current)
+        last = _add_months(current, MONTHS_AHEAD)
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+            )
+            month = _add_months(month, 1)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        op.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+        op.execute(f'DROP TABLE {legacy}')
+
+        # Unique constraints on a partitioned table must include the partition key
+        _add_constraints(table, 'id, created_at')
+
+
+def downgrade() -> None:
+    # Months already archived to S3 are not restored
+    for table in INDEXES:
+        partitioned = f'{table}_partitioned'
+        op.execute(f'ALTER TABLE {table} RENAME TO {partitioned}')
+        op.execute(f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)')
+        op.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+        op.execute(f'DROP TABLE {partitioned} CASCADE')
+        _add_constraints(table, 'id')
@@ -0,0 +1,41 @@
+"""Job dispatch tracking for the scheduler
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('dispatched_at', sa.DateTime(), nullable=True))
+    # Video jobs created before the scheduler were sent to SQS directly. Their
+    # dispatch lease runs from creation, so on the scheduler's first rounds
+    # pending ones no worker picked up are dispatched again and processing
+    # ones that stopped updating are failed (see JobScheduler.release_stale)
+    op.execute(
+        "UPDATE jobs SET dispatched_at = created_at "
+        "WHERE type = 'VIDEO' AND status IN ('PENDING', 'PROCESSING')"
+    )
+    op.create_index(
+        'ix_jobs_awaiting_dispatch',
+        'jobs',
+        ['type', 'created_at'],
+        postgresql_where=sa.text("status = 'PENDING' AND dispatched_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_awaiting_dispatch', table_name='jobs')
+    op.drop_column('jobs', 'dispatched_at')
@@ -0,0 +1,80 @@
+"""Webhook endpoints and delivery log
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'webhook_endpoints',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('url', sa.String(length=2048), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('secret', sa.String(length=100), nullable=False),
+        sa.Column('events', sa.JSON(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_webhook_endpoints_user_id', 'webhook_endpoints', ['user_id'])
+
+    op.create_table(
+        'webhook_deliveries',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('endpoint_id', sa.String(length=36), nullable=False),
+        sa.Column('job_id', sa.String(length=36), nullable=True),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('PENDING', 'SUCCEEDED', 'FAILED', name='deliverystatus'),
+            nullable=False,
+        ),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_status_code', sa.Integer(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('delivered_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['endpoint_id'], ['webhook_endpoints.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_webhook_deliveries_job_id', 'webhook_deliveries', ['job_id'])
+    op.create_index(
+        'ix_webhook_deliveries_endpoint_id_created_at',
+        'webhook_deliveries',
+        ['endpoint_id', sa.text('created_at DESC')],
+    )
+    op.create_index(
+        'ix_webhook_deliveries_due',
+        'webhook_deliveries',
+        ['next_attempt_at'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhook_deliveries_due', table_name='webhook_deliveries')
+    op.drop_index('ix_webhook_deliveries_endpoint_id_created_at', table_name='webhook_deliveries')
+    op.drop_index('ix_webhook_deliveries_job_id', table_name='webhook_deliveries')
+    op.drop_table('webhook_deliveries')
+    sa.Enum(name='deliverystatus').drop(op.get_bind(), checkfirst=True)
+    op.drop_index('ix_webhook_endpoints_user_id', table_name='webhook_endpoints')
+    op.drop_table('webhook_endpoints')
@@ -1,5 +1,7 @@
 """Authentication dependencies for FastAPI."""
 
+import os
+import hmac
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -125,3 +127,28 @@ def require_admin(user: User = Depends(get_current_user)) -> User:
     
     return user
 
+
+async def require_metrics_access(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """
+    Dependency guarding the Prometheus metrics endpoint.
+    
+    Scrapers present the ``METRICS_TOKEN`` shared secret as a bearer
+    token; admins may also use their own token.
+    
+    Args:
+        credentials: Bearer token credentials
+        db: Database session
+        
+    Raises:
+        HTTPException: If the token is neither the scrape token nor an admin's
+    """
+    scrape_token = os.getenv("METRICS_TOKEN")
+    if scrape_token and credentials and hmac.compare_digest(
+        credentials.credentials.encode(), scrape_token.encode()
+    ):
+        return
+    
+    require_admin(await get_current_user(credentials, db))
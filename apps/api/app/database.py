@@ -1,40 +1,153 @@
 """Database configuration and session management."""
 
 import os
-from typing import AsyncGenerator
+import time
+import asyncio
+from typing import AsyncGenerator, Dict, Optional
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
     async_sessionmaker,
 )
+from sqlalchemy import text
 from sqlalchemy.pool import NullPool
 from .models.base import Base
+from .utils.logging import logger
+from .utils.partitions import ensure_partitions
+from .utils.pool import POOL_PRE_PING, instrument_engine, pool_options
+
+
+def _async_url(url: str) -> str:
+    """Convert postgres:// and postgresql:// URLs to postgresql+asyncpg://."""
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    """
+    Create an async engine with the shared, instrumented pool settings.
+
+    Pool size, overflow, timeout, recycle and pre-ping come from the
+    DB_POOL_* environment variables (see utils/pool.py).
+    """
+    if os.getenv("TESTING"):
+        pool_kwargs = {"poolclass": NullPool, "pool_pre_ping": POOL_PRE_PING}
+    else:
+        pool_kwargs = pool_options(name)
+
+    created = create_async_engine(
+        url,
+        echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+        future=True,
+        **pool_kwargs,
+    )
+    instrument_engine(created, name)
+    return created
+
+
+def _session_factory(bind: AsyncEngine) -> async_sessionmaker:
+    """Create a session factory bound to an engine."""
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
 
 # Get database URL from environment
-DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://localhost/pulse")
+DATABASE_URL = _async_url(os.getenv("DATABASE_URL", "postgresql+asyncpg://localhost/pulse"))
+
+# Optional read replica for heavy, lag-tolerant reads (analytics, listings)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+# Replica reads fall back to the primary when lag exceeds this many seconds
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
 
-# Convert postgres:// to postgresql+asyncpg:// if needed
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
-elif DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+# How often replica lag is re-measured
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "5"))
 
 # Create async engine
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=os.getenv("SQL_ECHO", "false").lower() == "true",
-    poolclass=NullPool if os.getenv("TESTING") else None,
-    future=True,
-)
+engine = _create_engine(DATABASE_URL, "primary")
 
 # Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+AsyncSessionLocal = _session_factory(engine)
+
+read_engine: Optional[AsyncEngine] = (
+    _create_engine(_async_url(DATABASE_READ_URL), "replica") if DATABASE_READ_URL else None
 )
+ReadSessionLocal = _session_factory(read_engine) if read_engine else None
+
+# Zero when the replica has replayed everything it received; otherwise the
+# age of the last replayed transaction
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class ReplicaMonitor:
+    """Measure replica lag periodically and decide whether reads may use it."""
+
+    def __init__(
+        self,
+        replica: AsyncEngine,
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = REPLICA_LAG_CHECK_INTERVAL,
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            replica: Read replica engine
+            max_lag: Largest acceptable lag in seconds
+            check_interval: Seconds a lag measurement stays valid
+        """
+        self.replica = replica
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: Optional[float] = None
+        self.checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def refresh(self) -> None:
+        """Measure lag now; an unreachable replica counts as unusable."""
+        try:
+            async with self.replica.connect() as conn:
+                result = await asyncio.wait_for(
+                    conn.execute(text(REPLICA_LAG_QUERY)), timeout=self.check_interval
+                )
+                self.lag = float(result.scalar())
+        except Exception as e:
+            if self.lag is not None:
+                logger.warning("Read replica unavailable", extra={"error_message": str(e)})
+            self.lag = None
+        self.checked_at = time.monotonic()
+
+    async def is_usable(self) -> bool:
+        """
+        Whether reads should go to the replica right now.
+
+        Returns:
+            True if the replica is reachable and within ``max_lag``
+        """
+        if time.monotonic() - self.checked_at >= self.check_interval:
+            async with self._lock:
+                # Another request may have refreshed while we waited
+                if time.monotonic() - self.checked_at >= self.check_interval:
+                    await self.refresh()
+        return self.lag is not None and self.lag <= self.max_lag
+
+
+replica_monitor: Optional[ReplicaMonitor] = ReplicaMonitor(read_engine) if read_engine else None
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -55,13 +168,80 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_engine() -> AsyncEngine:
+    """
+    Engine for lag-tolerant reads.
+
+    Returns:
+        The read replica when configured and caught up, else the primary
+    """
+    if replica_monitor is not None and await replica_monitor.is_usable():
+        return read_engine
+    return engine
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only sessions that tolerate slight staleness.
+
+    Served by the read replica when one is configured and its lag is
+    within REPLICA_MAX_LAG_SECONDS; otherwise by the primary. Never
+    commits, so it must not be used for writes.
+
+    Yields:
+        AsyncSession: Database session
+    """
+    session_factory = AsyncSessionLocal
+    if await get_read_engine() is read_engine:
+        session_factory = ReadSessionLocal
+
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def pool_stats() -> Dict[str, dict]:
+    """
+    Connection pool usage per engine.
+
+    Returns:
+        Pool figures keyed by "primary" / "replica"
+    """
+    engines = {"primary": engine}
+    if read_engine is not None:
+        engines["replica"] = read_engine
+
+    stats = {}
+    for name, current in engines.items():
+        pool = current.pool
+        if not hasattr(pool, "checkedout"):
+            # NullPool (tests) keeps no connections
+            stats[name] = {"pool": type(pool).__name__}
+            continue
+        stats[name] = {
+            "pool": type(pool).__name__,
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+    return stats
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     async with engine.begin() as conn:
+        # Required by the trigram indexes on users
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        # jobs/usage_events are partitioned; inserts need a partition to land in
+        await ensure_partitions(conn)
 
 
 async def close_db() -> None:
     """Close database connections."""
     await engine.dispose()
-
+    if read_engine is not None:
+        await read_engine.dispose()
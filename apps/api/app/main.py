@@ -3,16 +3,19 @@ Pulse AI Studio - FastAPI Backend
 Main application entry point
 """
 import os
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 
-from .database import init_db, close_db
+from .database import AsyncSessionLocal, engine, init_db, close_db
 from .routers import api_router
+from .services.templates import get_template_registry
 from .middleware.rate_limit import RateLimitMiddleware
 from .middleware.security import SecurityHeadersMiddleware, RequestValidationMiddleware
+from .middleware.idempotency import REPLAYED_HEADER, run_idempotency_purger
 from .middleware.errors import (
     http_exception_handler,
     validation_exception_handler,
@@ -20,6 +23,17 @@ from .middleware.errors import (
     general_exception_handler,
 )
 from .utils.quota import QuotaError
+from .utils.archive import PartitionMaintainer
+from .utils.browser_pool import close_browser_pool, get_browser_pool
+from .utils.document_pool import close_document_pool, get_document_pool
+from .utils.job_events import get_job_event_hub
+from .utils.pool import POOL_DEBUG, run_leak_detector
+from .utils.scheduler import get_job_scheduler
+from .utils.spool import SpoolReplayer, get_spool
+from .utils.sqs_producer import close_sqs_producer
+from .utils.task_queue import MemoryTaskQueue, get_task_queue
+from .utils.usage_writer import replay_records
+from .utils.webhooks import WebhookDispatcher
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -36,9 +50,74 @@ async def lifespan(app: FastAPI):
     # Initialize database
     await init_db()
     
+    # Drain usage/job writes spooled during database outages
+    spool = get_spool()
+    replayer = SpoolReplayer(
+        spool,
+        replay_records,
+        interval=float(os.getenv("SPOOL_REPLAY_INTERVAL", "5")),
+    )
+    replay_task = asyncio.create_task(replayer.run())
+    
+    # Create upcoming partitions; archive and drop expired ones
+    maintainer = PartitionMaintainer(
+        engine,
+        interval=float(os.getenv("PARTITION_MAINTENANCE_INTERVAL", "3600")),
+    )
+    maintenance_task = asyncio.create_task(maintainer.run())
+    
+    # Listen for job status events and fan them out to SSE watchers
+    event_task = asyncio.create_task(get_job_event_hub().run())
+    
+    # Delete idempotency keys past their TTL
+    purge_task = asyncio.create_task(run_idempotency_purger())
+    
+    # Dispatch queued video jobs to SQS by plan lane and per-user fairness
+    scheduler_task = asyncio.create_task(get_job_scheduler().run())
+    
+    # Compile the CV and slide HTML templates
+    get_template_registry()
+    
+    # Launch the Chromium processes that render CV and slide PDFs
+    browser_task = asyncio.create_task(get_browser_pool().start())
+    
+    # Spawn the processes that build DOCX/PPTX files off the event loop
+    document_task = asyncio.create_task(get_document_pool().start())
+    
+    # Without SQS (TASK_QUEUE_URL), async jobs are queued in-process and
+    # run by a worker inside the API, which also delivers webhooks;
+    # otherwise `python -m worker` does both
+    task_queue = get_task_queue()
+    job_worker = None
+    if isinstance(task_queue, MemoryTaskQueue):
+        from worker import create_worker
+        job_worker = create_worker(task_queue, poll_wait=1)
+        worker_task = asyncio.create_task(job_worker.run())
+        webhook_task = asyncio.create_task(WebhookDispatcher(AsyncSessionLocal).run())
+    
+    # Log sessions holding a pooled connection too long (DB_POOL_DEBUG)
+    leak_task = asyncio.create_task(run_leak_detector()) if POOL_DEBUG else None
+    
     yield
     
     # Shutdown
+    if job_worker:
+        webhook_task.cancel()
+        job_worker.stop()
+        await worker_task
+    document_task.cancel()
+    browser_task.cancel()
+    scheduler_task.cancel()
+    event_task.cancel()
+    purge_task.cancel()
+    if leak_task:
+        leak_task.cancel()
+    maintenance_task.cancel()
+    replay_task.cancel()
+    await close_sqs_producer()
+    await close_browser_pool()
+    await close_document_pool()
+    await spool.close()
     await close_db()
 
 
@@ -82,7 +161,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
+    expose_headers=[
+        "X-RateLimit-Limit",
+        "X-RateLimit-Remaining",
+        "X-RateLimit-Reset",
+        "X-Next-Cursor",
+        REPLAYED_HEADER,
+    ],
 )
 
 # Trusted Host Middleware (for production)
@@ -0,0 +1,323 @@
+"""Idempotency-Key support for generation endpoints."""
+
+import os
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import Callable, Coroutine, Any, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from ..auth.jwt import verify_token
+from ..database import AsyncSessionLocal
+from ..models.idempotency import IdempotencyKey
+from ..utils.logging import logger
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# How long a successful response is replayed for
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+
+# How long a duplicate waits for the original request to finish
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "120"))
+
+# A claim this old without a response is assumed abandoned (crashed process)
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", "900"))
+
+# Seconds between checks while waiting for the original request
+POLL_INTERVAL = 0.5
+
+
+def request_fingerprint(method: str, path: str, body: bytes, query: str = "") -> str:
+    """
+    Hash identifying a request, to detect a key reused for another one.
+
+    Args:
+        method: HTTP method
+        path: Request path
+        body: Raw request body
+        query: Query string (parameter order does not matter)
+
+    Returns:
+        SHA-256 hex digest
+    """
+    query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    digest = hashlib.sha256(f"{method} {path}?{query}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def user_id_from_request(request: Request) -> Optional[str]:
+    """
+    User ID from the request's bearer token, if it is valid.
+
+    Keys are scoped per user. Requests without a valid token are left to
+    the endpoint's own authentication to reject.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        User ID, or None
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return verify_token(token).get("sub")
+    except HTTPException:
+        return None
+
+
+async def claim_key(user_id: str, key: str, request_hash: str) -> bool:
+    """
+    Claim a key for a new request.
+
+    Succeeds if the key is unused, expired, or held by an abandoned claim.
+
+    Args:
+        user_id: User ID
+        key: Idempotency key
+        request_hash: Request fingerprint
+
+    Returns:
+        True if this request owns the key
+    """
+    now = datetime.utcnow()
+    stmt = insert(IdempotencyKey).values(
+        user_id=user_id,
+        key=key,
+        request_hash=request_hash,
+        locked_at=now,
+        created_at=now,
+        expires_at=now + timedelta(seconds=IDEMPOTENCY_TTL),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+        set_={
+            "request_hash": stmt.excluded.request_hash,
+            "status_code": None,
+            "content_type": None,
+            "response_body": None,
+            "locked_at": stmt.excluded.locked_at,
+            "created_at": stmt.excluded.created_at,
+            "expires_at": stmt.excluded.expires_at,
+        },
+        where=or_(
+            IdempotencyKey.expires_at < now,
+            and_(
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.locked_at < now - timedelta(seconds=IDEMPOTENCY_LOCK_TIMEOUT),
+            ),
+        ),
+    ).returning(IdempotencyKey.key)
+
+    async with AsyncSessionLocal() as db:
+        claimed = (await db.execute(stmt)).first() is not None
+        await db.commit()
+    return claimed
+
+
+async def get_key(user_id: str, key: str) -> Optional[IdempotencyKey]:
+    """
+    Load a user's key.
+
+    Args:
+        user_id: User ID
+        key: Idempotency key
+
+    Returns:
+        Key record, or None if there is none
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+async def wait_for_response(user_id: str, key: str, request_hash: str) -> Optional[IdempotencyKey]:
+    """
+    Claim a key, or wait for the request holding it to finish.
+
+    Args:
+        user_id: User ID
+        key: Idempotency key
+        request_hash: Request fingerprint
+
+    Returns:
+        None if this request now owns the key, else the stored response
+
+    Raises:
+        HTTPException: If the key belongs to a different request, or the
+            original request is still running after the wait timeout
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + IDEMPOTENCY_WAIT_TIMEOUT
+
+    while True:
+        if await claim_key(user_id, key, request_hash):
+            return None
+
+        record = await get_key(user_id, key)
+        if record is None:
+            # Released in the meantime; try to claim it again
+            continue
+
+        if record.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{IDEMPOTENCY_HEADER} was already used for a different request",
+            )
+
+        if record.status_code is not None:
+            return record
+
+        if loop.time() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A request with this {IDEMPOTENCY_HEADER} is still being processed",
+            )
+
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def store_response(user_id: str, key: str, response: Response) -> None:
+    """
+    Store the response of the request that owns a key.
+
+    Args:
+        user_id: User ID
+        key: Idempotency key
+        response: Successful response
+    """
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(IdempotencyKey).
+            where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key).
+            values(
+                status_code=response.status_code,
+                content_type=response.headers.get("content-type"),
+                response_body=response.body.decode(),
+            )
+        )
+        await db.commit()
+
+
+async def release_key(user_id: str, key: str) -> None:
+    """
+    Drop an unfinished claim, so a retry runs the request again.
+
+    Args:
+        user_id: User ID
+        key: Idempotency key
+    """
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+            )
+        )
+        await db.commit()
+
+
+async def purge_expired_keys() -> int:
+    """
+    Delete keys past their TTL.
+
+    Returns:
+        Number of keys deleted
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.utcnow())
+        )
+        await db.commit()
+    return result.rowcount
+
+
+async def run_idempotency_purger(interval: float = 3600.0) -> None:
+    """Purge expired keys forever until cancelled."""
+    while True:
+        try:
+            purged = await purge_expired_keys()
+            if purged:
+                logger.info("Purged expired idempotency keys", extra={"count": purged})
+        except Exception as e:
+            logger.warning("Idempotency key purge failed", extra={"error_message": str(e)})
+        await asyncio.sleep(interval)
+
+
+class IdempotentRoute(APIRoute):
+    """
+    Route that honours an ``Idempotency-Key`` header on POST requests.
+
+    The first request with a key runs normally and its successful
+    response is stored for ``IDEMPOTENCY_TTL`` seconds. A duplicate that
+    arrives while it is still running waits for it; a later duplicate
+    gets the stored response back (with ``Idempotent-Replayed: true``)
+    without running the endpoint again. Failed requests release the key
+    so the client can retry. Streaming responses are not stored.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if key is None or request.method != "POST":
+                return await handler(request)
+
+            if not key or len(key) > MAX_KEY_LENGTH:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters",
+                )
+
+            user_id = user_id_from_request(request)
+            if user_id is None:
+                return await handler(request)
+
+            request_hash = request_fingerprint(
+                request.method, request.url.path, await request.body(), request.url.query
+            )
+            stored = await wait_for_response(user_id, key, request_hash)
+            if stored is not None:
+                return Response(
+                    content=stored.response_body,
+                    status_code=stored.status_code,
+                    media_type=stored.content_type,
+                    headers={REPLAYED_HEADER: "true"},
+                )
+
+            try:
+                response = await handler(request)
+            except Exception:
+                await release_key(user_id, key)
+                raise
+
+            if 200 <= response.status_code < 300 and hasattr(response, "body"):
+                try:
+                    await store_response(user_id, key, response)
+                except Exception as e:
+                    # The work is done; duplicates wait out the claim instead
+                    logger.warning(
+                        "Failed to store idempotent response",
+                        extra={"user_id": user_id, "error_message": str(e)},
+                    )
+            else:
+                await release_key(user_id, key)
+            return response
+
+        return route_handler
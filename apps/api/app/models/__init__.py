@@ -5,6 +5,20 @@ from .user import User
 from .subscription import Subscription
 from .usage import UsageEvent
 from .job import Job
+from .rollup import UsageRollupHourly, UsageRollupDaily
+from .idempotency import IdempotencyKey
+from .webhook import WebhookEndpoint, WebhookDelivery
 
-__all__ = ["Base", "User", "Subscription", "UsageEvent", "Job"]
+__all__ = [
+    "Base",
+    "User",
+    "Subscription",
+    "UsageEvent",
+    "Job",
+    "UsageRollupHourly",
+    "UsageRollupDaily",
+    "IdempotencyKey",
+    "WebhookEndpoint",
+    "WebhookDelivery",
+]
 
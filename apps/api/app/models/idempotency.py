@@ -0,0 +1,36 @@
+"""Stored responses for Idempotency-Key requests."""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    A client-supplied idempotency key and the response it produced.
+
+    The row is claimed (with no response yet) when the first request
+    starts; ``status_code`` is set once that request has succeeded.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # Hash of method, path and body, so a key cannot be reused for another request
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    status_code: Mapped[Optional[int]] = mapped_column(Integer)
+    content_type: Mapped[Optional[str]] = mapped_column(String(100))
+    response_body: Mapped[Optional[str]] = mapped_column(Text)
+
+    locked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey(user_id={self.user_id}, key={self.key}, status_code={self.status_code})>"
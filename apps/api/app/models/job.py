@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Text, DateTime, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Enum as SQLEnum, JSON, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from enum import Enum
 from .base import Base, TimestampMixin
@@ -28,12 +28,25 @@ class JobStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# Statuses a job never leaves
+TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED})
+
+
 class Job(Base, TimestampMixin):
     """Job model for tracking AI generation tasks."""
 
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Monthly range partitions; see app/utils/partitions.py
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Part of the table's primary key because partitioned tables require it;
+    # the ORM still identifies jobs by id alone (see __mapper_args__)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, primary_key=True
+    )
     user_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
@@ -49,8 +62,12 @@ class Job(Base, TimestampMixin):
     parameters: Mapped[Optional[dict]] = mapped_column(JSON)
     result_url: Mapped[Optional[str]] = mapped_column(String(500))
     error_message: Mapped[Optional[str]] = mapped_column(Text)
+    # Percentage reported by the worker processing the job
+    progress: Mapped[Optional[int]] = mapped_column(Integer)
     
     # Processing metadata
+    # When the scheduler handed the job to the queue (see utils/scheduler.py)
+    dispatched_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     
@@ -61,6 +78,21 @@ class Job(Base, TimestampMixin):
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="jobs")
 
+    __mapper_args__ = {"primary_key": [id]}
+
     def __repr__(self) -> str:
         return f"<Job(id={self.id}, type={self.type}, status={self.status})>"
 
+
+
+# Keyset pagination of a user's jobs, newest first (optionally by status)
+Index("ix_jobs_user_id_created_at_id", Job.user_id, Job.created_at.desc(), Job.id.desc())
+Index("ix_jobs_user_id_status_created_at", Job.user_id, Job.status, Job.created_at)
+
+# Jobs waiting for the scheduler to dispatch them
+Index(
+    "ix_jobs_awaiting_dispatch",
+    Job.type,
+    Job.created_at,
+    postgresql_where=text("status = 'PENDING' AND dispatched_at IS NULL"),
+)
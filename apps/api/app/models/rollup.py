@@ -0,0 +1,44 @@
+"""Pre-aggregated usage rollups for analytics."""
+
+from datetime import datetime
+from sqlalchemy import String, Integer, BigInteger, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+
+class RollupMixin:
+    """
+    Counters for one time bucket and dimension combination.
+
+    Dimensions that do not apply to a row are stored as an empty string so
+    they can be part of the primary key. Job outcomes are rolled up with
+    ``event_type`` set to ``job:<type>`` and ``job_status`` set.
+    """
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    model: Mapped[str] = mapped_column(String(100), primary_key=True, default="")
+    plan: Mapped[str] = mapped_column(String(20), primary_key=True, default="")
+    job_status: Mapped[str] = mapped_column(String(20), primary_key=True, default="")
+
+    event_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tokens: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    quantity: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+
+class UsageRollupHourly(RollupMixin, Base):
+    """Hourly usage rollup."""
+
+    __tablename__ = "usage_rollups_hourly"
+
+    def __repr__(self) -> str:
+        return f"<UsageRollupHourly(bucket={self.bucket_start}, type={self.event_type})>"
+
+
+class UsageRollupDaily(RollupMixin, Base):
+    """Daily usage rollup."""
+
+    __tablename__ = "usage_rollups_daily"
+
+    def __repr__(self) -> str:
+        return f"<UsageRollupDaily(bucket={self.bucket_start}, type={self.event_type})>"
@@ -1,7 +1,8 @@
 """Usage tracking model."""
 
+from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Integer, ForeignKey, JSON
+from sqlalchemy import String, Integer, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base, TimestampMixin
 from .job import JobType
@@ -11,23 +12,43 @@ class UsageEvent(Base, TimestampMixin):
     """Usage event model for detailed tracking."""
 
     __tablename__ = "usage_events"
+    __table_args__ = (
+        # Time-range queries per user and per event type
+        Index("ix_usage_events_user_id_created_at", "user_id", "created_at"),
+        Index("ix_usage_events_event_type_created_at", "event_type", "created_at"),
+        # Monthly range partitions; see app/utils/partitions.py
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    # Partition key, hence part of the table's primary key (ORM identity is id)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, primary_key=True
+    )
     user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     job_id: Mapped[Optional[str]] = mapped_column(String(36), index=True)
     
     # Event details
-    event_type: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
     tokens: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     
-    # Additional data
+    # Hot metadata promoted to typed columns for per-model/provider reports
+    provider: Mapped[Optional[str]] = mapped_column(String(50))
+    model: Mapped[Optional[str]] = mapped_column(String(100))
+    prompt_tokens: Mapped[Optional[int]] = mapped_column(Integer)
+    completion_tokens: Mapped[Optional[int]] = mapped_column(Integer)
+    image_count: Mapped[Optional[int]] = mapped_column(Integer)
+    
+    # Additional (long-tail) data
     event_metadata: Mapped[Optional[dict]] = mapped_column(JSON)
     
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="usage_events")
 
+    __mapper_args__ = {"primary_key": [id]}
+
     def __repr__(self) -> str:
         return f"<UsageEvent(id={self.id}, type={self.event_type}, tokens={self.tokens})>"
 
@@ -0,0 +1,86 @@
+"""Webhook endpoints and their delivery log."""
+
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import String, Text, Integer, Boolean, DateTime, ForeignKey, Enum as SQLEnum, JSON, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from enum import Enum
+from .base import Base, TimestampMixin
+
+
+class WebhookEvent(str, Enum):
+    """Events a webhook endpoint can subscribe to."""
+
+    JOB_COMPLETED = "job.completed"
+    JOB_FAILED = "job.failed"
+    JOB_CANCELLED = "job.cancelled"
+
+
+class DeliveryStatus(str, Enum):
+    """Webhook delivery state."""
+
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class WebhookEndpoint(Base, TimestampMixin):
+    """A URL a user wants job events posted to."""
+
+    __tablename__ = "webhook_endpoints"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(String(255))
+    # HMAC key for the X-Pulse-Signature header
+    secret: Mapped[str] = mapped_column(String(100), nullable=False)
+    # WebhookEvent values the endpoint receives
+    events: Mapped[List[str]] = mapped_column(JSON, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<WebhookEndpoint(id={self.id}, url={self.url}, is_active={self.is_active})>"
+
+
+class WebhookDelivery(Base):
+    """One event for one endpoint, with the outcome of its latest attempt."""
+
+    __tablename__ = "webhook_deliveries"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    endpoint_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("webhook_endpoints.id", ondelete="CASCADE"), nullable=False
+    )
+    # No foreign key: jobs is partitioned (see models/job.py)
+    job_id: Mapped[Optional[str]] = mapped_column(String(36), index=True)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Request body exactly as signed and sent
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+
+    status: Mapped[DeliveryStatus] = mapped_column(
+        SQLEnum(DeliveryStatus), default=DeliveryStatus.PENDING, nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    last_status_code: Mapped[Optional[int]] = mapped_column(Integer)
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    delivered_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+    def __repr__(self) -> str:
+        return f"<WebhookDelivery(id={self.id}, event_type={self.event_type}, status={self.status})>"
+
+
+# Delivery log of an endpoint, newest first
+Index("ix_webhook_deliveries_endpoint_id_created_at", WebhookDelivery.endpoint_id, WebhookDelivery.created_at.desc())
+
+# Deliveries due for an attempt
+Index(
+    "ix_webhook_deliveries_due",
+    WebhookDelivery.next_attempt_at,
+    postgresql_where=text("status = 'PENDING'"),
+)
@@ -12,6 +12,7 @@ from .cv import router as cv_router
 from .slides import router as slides_router
 from .stripe import router as stripe_router
 from .admin import router as admin_router
+from .webhooks import router as webhooks_router
 from .health import router as health_router
 
 # Create main API router
@@ -29,6 +30,7 @@ api_router.include_router(cv_router, prefix="/cv", tags=["cv"])
 api_router.include_router(slides_router, prefix="/slides", tags=["slides"])
 api_router.include_router(stripe_router, prefix="/stripe", tags=["stripe"])
 api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
+api_router.include_router(webhooks_router, prefix="/webhooks", tags=["webhooks"])
 
 __all__ = ["api_router"]
 
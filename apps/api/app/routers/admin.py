@@ -1,16 +1,17 @@
 """Admin routes."""
 
-from typing import Optional
+from typing import Literal, Optional
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from ..database import get_db
+from ..database import get_db, get_read_db, get_read_engine
 from ..models.user import User
 from ..models.subscription import Subscription
-from ..models.usage import UsageEvent
-from ..models.job import Job
+from ..models.job import Job, JobStatus
 from ..auth.dependencies import require_admin
 from ..schemas.admin import (
     UserListResponse,
@@ -19,7 +20,12 @@ from ..schemas.admin import (
     UserUpdateRequest,
     SubscriptionUpdateRequest,
 )
+from ..utils.archive import iter_archived_rows, list_archived_months
+from ..utils.export import EXPORT_MEDIA_TYPES, build_export_query, stream_export
+from ..utils.partitions import PARTITIONED_TABLES
 from ..utils.quota import get_usage_summary
+from ..utils.rollups import GRANULARITIES, bucket_start
+from ..utils.user_search import build_user_filter, count_users
 
 router = APIRouter()
 
@@ -30,7 +36,7 @@ async def list_users(
     per_page: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
     admin: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List all users (admin only).
@@ -38,7 +44,7 @@ async def list_users(
     Args:
         page: Page number
         per_page: Results per page
-        search: Search query (email or name)
+        search: Search query (email prefix, or substring of email or name)
         admin: Admin user
         db: Database session
         
@@ -47,16 +53,12 @@ async def list_users(
     """
     query = select(User)
     
-    # Apply search filter
-    if search:
-        query = query.where(
-            (User.email.ilike(f"%{search}%")) | (User.full_name.ilike(f"%{search}%"))
-        )
+    # Apply search filter (prefix or trigram index, see utils.user_search)
+    if search and search.strip():
+        query = query.where(build_user_filter(search))
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    result = await db.execute(count_query)
-    total = result.scalar()
+    # Get total count (capped / estimated for large result sets)
+    total, total_is_estimate = await count_users(db, query)
     
     # Apply pagination
     query = query.offset((page - 1) * per_page).limit(per_page)
@@ -76,6 +78,7 @@ async def list_users(
             for user in users
         ],
         total=total,
+        total_is_estimate=total_is_estimate,
         page=page,
         per_page=per_page,
     )
@@ -85,7 +88,7 @@ async def list_users(
 async def get_user_details(
     user_id: str,
     admin: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get user details (admin only).
@@ -216,7 +219,7 @@ async def list_subscriptions(
     status_filter: Optional[str] = None,
     plan_filter: Optional[str] = None,
     admin: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     List all subscriptions (admin only).
@@ -322,19 +325,42 @@ async def update_subscription(
 
 @router.get("/analytics", response_model=AnalyticsResponse)
 async def get_analytics(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: Literal["hour", "day"] = "day",
     admin: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get platform analytics (admin only).
     
+    Usage and job figures are read from the hourly/daily rollup tables,
+    so cost depends on the number of buckets in range, not on history size.
+    
     Args:
+        start: Range start (defaults to 30 days before end)
+        end: Range end (defaults to now)
+        granularity: Bucket size for the time series: hour or day
         admin: Admin user
         db: Database session
         
     Returns:
         Analytics data
     """
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'start' must be before 'end'",
+        )
+    
+    rollup = GRANULARITIES[granularity]
+    in_range = and_(
+        rollup.bucket_start >= bucket_start(start, granularity),
+        rollup.bucket_start < end,
+    )
+    
     # Total users
     result = await db.execute(select(func.count()).select_from(User))
     total_users = result.scalar()
@@ -357,23 +383,66 @@ async def get_analytics(
     plan_prices = {"starter": 9, "plus": 29, "pro": 99}
     total_revenue = sum(plan_prices.get(plan, 0) * count for plan, count in plan_counts.items())
     
+    is_job = rollup.event_type.startswith("job:")
+    
     # Usage stats
     result = await db.execute(
-        select(UsageEvent.event_type, func.count()).
-        group_by(UsageEvent.event_type)
+        select(rollup.event_type, func.sum(rollup.event_count)).
+        where(in_range, ~is_job).
+        group_by(rollup.event_type)
     )
-    usage_by_type = dict(result.all())
+    usage_by_type = {event_type: int(count) for event_type, count in result.all()}
+    
+    result = await db.execute(
+        select(rollup.model, func.sum(rollup.event_count), func.sum(rollup.tokens)).
+        where(in_range, ~is_job, rollup.model != "").
+        group_by(rollup.model)
+    )
+    usage_by_model = {
+        model: {"events": int(count), "tokens": int(tokens)}
+        for model, count, tokens in result.all()
+    }
+    
+    # Job stats: finished jobs from the rollups, in-flight jobs live
+    result = await db.execute(
+        select(rollup.event_type, rollup.job_status, func.sum(rollup.event_count)).
+        where(in_range, is_job).
+        group_by(rollup.event_type, rollup.job_status)
+    )
+    job_stats = {}
+    for event_type, job_status, count in result.all():
+        job_type = event_type.split(":", 1)[1]
+        job_stats.setdefault(job_type, {})[job_status] = int(count)
     
-    # Job stats
     result = await db.execute(
         select(Job.type, Job.status, func.count()).
+        where(Job.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])).
         group_by(Job.type, Job.status)
     )
-    job_stats = {}
     for job_type, job_status, count in result.all():
-        if job_type not in job_stats:
-            job_stats[job_type] = {}
-        job_stats[job_type][job_status] = count
+        job_stats.setdefault(job_type.value, {})[job_status.value] = count
+    
+    # Time series
+    result = await db.execute(
+        select(
+            rollup.bucket_start,
+            rollup.event_type,
+            func.sum(rollup.event_count),
+            func.sum(rollup.tokens),
+        ).
+        where(in_range).
+        group_by(rollup.bucket_start, rollup.event_type).
+        order_by(rollup.bucket_start)
+    )
+    series = [
+        {
+            "bucket_start": bucket.isoformat(),
+            "event_type": event_type,
+            "events": int(count),
+            "tokens": int(tokens),
+        }
+        for bucket, event_type, count, tokens in result.all()
+    ]
     
     return AnalyticsResponse(
         total_users=total_users,
@@ -381,8 +450,136 @@ async def get_analytics(
         total_revenue=total_revenue,
         usage_stats={
             "by_type": usage_by_type,
+            "by_model": usage_by_model,
             "by_plan": plan_counts,
             "jobs": job_stats,
         },
+        start=start,
+        end=end,
+        granularity=granularity,
+        series=series,
     )
 
+
+
+@router.get("/export")
+async def export_data(
+    dataset: Literal["usage", "jobs"] = "usage",
+    format: Literal["csv", "ndjson"] = "csv",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+    gzip: bool = False,
+    admin: User = Depends(require_admin),
+):
+    """
+    Stream usage events or jobs as CSV or NDJSON (admin only).
+    
+    Rows are streamed from a server-side cursor in a single response, so
+    a year of events exports with constant memory and no paging.
+    
+    Args:
+        dataset: "usage" or "jobs"
+        format: "csv" or "ndjson"
+        start: Only rows created at or after this time
+        end: Only rows created before this time
+        user_id: Only rows of this user
+        event_type: Usage event type (or job type for the jobs dataset)
+        gzip: Gzip the response body
+        admin: Admin user
+        
+    Returns:
+        Streaming export
+    """
+    if start and end and start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'start' must be before 'end'",
+        )
+    try:
+        query = build_export_query(dataset, start, end, user_id, event_type)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid event_type for jobs",
+        )
+    
+    filename = f"{dataset}-export.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(await get_read_engine(), query, format=format, compress=gzip),
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.get("/archive")
+async def list_archives(
+    admin: User = Depends(require_admin),
+):
+    """
+    List archived months per partitioned table (admin only).
+    
+    Args:
+        admin: Admin user
+        
+    Returns:
+        Archived months (``YYYY-MM``) keyed by table
+    """
+    return {
+        table: await asyncio.to_thread(list_archived_months, table)
+        for table in PARTITIONED_TABLES
+    }
+
+
+@router.get("/archive/{table}/{month}")
+async def read_archive(
+    table: str,
+    month: str,
+    user_id: Optional[str] = None,
+    admin: User = Depends(require_admin),
+):
+    """
+    Stream rows of an archived month as NDJSON (admin only).
+    
+    Months older than the retention window are no longer in the database;
+    this reads them back from the archive in S3.
+    
+    Args:
+        table: "jobs" or "usage_events"
+        month: Month as YYYY-MM
+        user_id: Only return rows of this user
+        admin: Admin user
+        
+    Returns:
+        NDJSON stream of archived rows
+    """
+    if table not in PARTITIONED_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown table",
+        )
+    try:
+        month_start = datetime.strptime(month, "%Y-%m")
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'month' must be YYYY-MM",
+        )
+    
+    rows = iter_archived_rows(table, month_start, user_id=user_id)
+    try:
+        # Pull the first row so a missing archive is a 404, not a broken stream
+        first = await anext(rows, b"")
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Month not archived",
+        )
+    
+    async def stream():
+        if first:
+            yield first
+        async for row in rows:
+            yield row
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
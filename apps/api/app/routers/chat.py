@@ -1,6 +1,7 @@
 """Chat completion routes."""
 
 import uuid
+from contextlib import aclosing
 from datetime import datetime
 from typing import AsyncIterator
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -8,14 +9,16 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from ..database import get_db
+from ..database import AsyncSessionLocal, get_db
 from ..models.user import User
 from ..models.subscription import Subscription
-from ..models.usage import UsageEvent
 from ..models.job import Job, JobType, JobStatus
 from ..auth.dependencies import require_auth
+from ..middleware.idempotency import IdempotentRoute
 from ..providers import get_provider, ProviderType
 from ..providers.types import ChatRequest, ChatResponse
+from ..utils.cancellation import CancelScope, JobCancelled
+from ..utils.usage_writer import record_usage_event, save_job_result
 from ..schemas.chat import (
     ChatCompletionRequest,
     ChatCompletionResponse,
@@ -24,7 +27,7 @@ from ..schemas.chat import (
     ModelInfo,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
 
 @router.get("/models", response_model=ModelsListResponse)
@@ -137,10 +140,14 @@ async def record_usage(
     prompt_tokens: int,
     completion_tokens: int,
     db: AsyncSession,
+    cancelled: bool = False,
 ):
     """
     Record usage event for chat completion.
     
+    Falls back to the local spool if the database is unreachable, so a
+    paid completion is never lost.
+    
     Args:
         user_id: User ID
         job_id: Job ID
@@ -149,32 +156,27 @@ async def record_usage(
         prompt_tokens: Input tokens
         completion_tokens: Output tokens
         db: Database session
+        cancelled: Whether the completion was cut short by a cancel
     """
-    usage_event = UsageEvent(
-        id=str(uuid.uuid4()),
+    event_metadata = {
+        "provider": provider,
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+    }
+    if cancelled:
+        event_metadata["cancelled"] = True
+    
+    await record_usage_event(
+        db,
         user_id=user_id,
         job_id=job_id,
         event_type="chat_completion",
         tokens=prompt_tokens + completion_tokens,
-        event_metadata={
-            "provider": provider,
-            "model": model,
-            "prompt_tokens": prompt_tokens,
-            "completion_tokens": completion_tokens,
-        },
-    )
-    
-    db.add(usage_event)
-    
-    # Update subscription token usage
-    result = await db.execute(
-        select(Subscription).where(Subscription.user_id == user_id)
+        event_metadata=event_metadata,
+        counter="tokens_used",
+        amount=prompt_tokens + completion_tokens,
     )
-    subscription = result.scalar_one_or_none()
-    if subscription:
-        subscription.tokens_used += prompt_tokens + completion_tokens
-    
-    await db.commit()
 
 
 @router.post("/complete", response_model=ChatCompletionResponse)
@@ -225,24 +227,48 @@ async def chat_complete(
             system=request.system,
         )
         
-        # Get completion
-        response = await provider.chat_completion(chat_request)
+        # Get completion (a cancel aborts the provider request)
+        response = None
+        cancelled = False
+        try:
+            async with CancelScope(job.id):
+                response = await provider.chat_completion(chat_request)
+        except JobCancelled:
+            cancelled = True
+            raise
+        finally:
+            # Record usage, also when cancelled: the prompt was already sent,
+            # so its tokens count (as in the streaming path)
+            if response is not None:
+                await record_usage(
+                    user_id=current_user.id,
+                    job_id=job.id,
+                    provider=response.provider,
+                    model=response.model,
+                    prompt_tokens=response.prompt_tokens,
+                    completion_tokens=response.completion_tokens,
+                    db=db,
+                )
+            elif cancelled:
+                prompt_text = " ".join([msg.content for msg in request.messages])
+                await record_usage(
+                    user_id=current_user.id,
+                    job_id=job.id,
+                    provider=request.provider,
+                    model=request.model,
+                    prompt_tokens=provider.count_tokens(prompt_text, request.model),
+                    completion_tokens=0,
+                    db=db,
+                    cancelled=True,
+                )
         
         # Update job
-        job.status = JobStatus.COMPLETED
-        job.completed_at = datetime.utcnow()
-        job.tokens_used = response.total_tokens
-        await db.commit()
-        
-        # Record usage
-        await record_usage(
-            user_id=current_user.id,
-            job_id=job.id,
-            provider=response.provider,
-            model=response.model,
-            prompt_tokens=response.prompt_tokens,
-            completion_tokens=response.completion_tokens,
-            db=db,
+        await save_job_result(
+            db,
+            job.id,
+            status=JobStatus.COMPLETED,
+            completed_at=datetime.utcnow(),
+            tokens_used=response.total_tokens,
         )
         
         return ChatCompletionResponse(
@@ -256,12 +282,21 @@ async def chat_complete(
             finish_reason=response.finish_reason,
         )
     
+    except JobCancelled:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job was cancelled",
+        )
+    
     except Exception as e:
         # Update job status
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        job.completed_at = datetime.utcnow()
-        await db.commit()
+        await save_job_result(
+            db,
+            job.id,
+            status=JobStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Chat completion failed: {str(e)}",
@@ -270,18 +305,19 @@ async def chat_complete(
 
 async def generate_stream(
     request: ChatCompletionRequest,
-    user: User,
+    user_id: str,
     job_id: str,
-    db: AsyncSession,
 ) -> AsyncIterator[str]:
     """
     Generate streaming chat response.
     
+    No database connection is held while tokens stream; the job result
+    and usage are written through a short-lived session at the end.
+    
     Args:
         request: Chat completion request
-        user: Current user
+        user_id: Current user's ID
         job_id: Job ID
-        db: Database session
         
     Yields:
         Server-Sent Events formatted chunks
@@ -300,56 +336,73 @@ async def generate_stream(
             system=request.system,
         )
         
-        # Stream response
+        # Stream response; a cancel stops it between chunks and closes the
+        # provider stream
         full_content = ""
-        async for chunk in provider.chat_completion_stream(chat_request):
-            full_content += chunk.content
-            
-            # Format as SSE
-            chunk_response = StreamChunkResponse(
-                job_id=job_id,
-                content=chunk.content,
-                finish_reason=chunk.finish_reason,
-            )
-            yield f"data: {chunk_response.model_dump_json()}\n\n"
+        cancelled = False
+        async with CancelScope(job_id, interrupt=False) as scope:
+            async with aclosing(provider.chat_completion_stream(chat_request)) as stream:
+                async for chunk in stream:
+                    if scope.cancelled:
+                        cancelled = True
+                        break
+                    full_content += chunk.content
+                    
+                    # Format as SSE
+                    chunk_response = StreamChunkResponse(
+                        job_id=job_id,
+                        content=chunk.content,
+                        finish_reason=chunk.finish_reason,
+                    )
+                    yield f"data: {chunk_response.model_dump_json()}\n\n"
         
-        # Count tokens for usage tracking
+        # Count tokens for usage tracking (only what was streamed, if cancelled)
         prompt_text = " ".join([msg.content for msg in request.messages])
         prompt_tokens = provider.count_tokens(prompt_text, request.model)
         completion_tokens = provider.count_tokens(full_content, request.model)
         
-        # Update job
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        if job:
-            job.status = JobStatus.COMPLETED
-            job.completed_at = datetime.utcnow()
-            job.tokens_used = prompt_tokens + completion_tokens
-            await db.commit()
+        async with AsyncSessionLocal() as db:
+            # Update job (a cancelled job keeps its status)
+            if cancelled:
+                await save_job_result(db, job_id, tokens_used=prompt_tokens + completion_tokens)
+            else:
+                await save_job_result(
+                    db,
+                    job_id,
+                    status=JobStatus.COMPLETED,
+                    completed_at=datetime.utcnow(),
+                    tokens_used=prompt_tokens + completion_tokens,
+                )
+            
+            # Record usage
+            await record_usage(
+                user_id=user_id,
+                job_id=job_id,
+                provider=request.provider,
+                model=request.model,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                db=db,
+                cancelled=cancelled,
+            )
         
-        # Record usage
-        await record_usage(
-            user_id=user.id,
-            job_id=job_id,
-            provider=request.provider,
-            model=request.model,
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-            db=db,
-        )
+        if cancelled:
+            chunk_response = StreamChunkResponse(job_id=job_id, content="", finish_reason="cancelled")
+            yield f"data: {chunk_response.model_dump_json()}\n\n"
         
         # Send final message
         yield "data: [DONE]\n\n"
     
     except Exception as e:
         # Update job status
-        result = await db.execute(select(Job).where(Job.id == job_id))
-        job = result.scalar_one_or_none()
-        if job:
-            job.status = JobStatus.FAILED
-            job.error_message = str(e)
-            job.completed_at = datetime.utcnow()
-            await db.commit()
+        async with AsyncSessionLocal() as db:
+            await save_job_result(
+                db,
+                job_id,
+                status=JobStatus.FAILED,
+                error_message=str(e),
+                completed_at=datetime.utcnow(),
+            )
         
         # Send error
         yield f"data: {{\"error\": \"{str(e)}\"}}\n\n"
@@ -389,8 +442,13 @@ async def chat_stream(
     db.add(job)
     await db.commit()
     
+    # Return the connection to the pool before streaming; the generator
+    # opens a short-lived session only to record the result
+    user_id = current_user.id
+    await db.close()
+    
     return StreamingResponse(
-        generate_stream(request, current_user, job.id, db),
+        generate_stream(request, user_id, job.id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
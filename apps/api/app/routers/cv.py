@@ -1,22 +1,36 @@
 """CV generation routes."""
 
 import uuid
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from ..database import get_db
 from ..models.user import User
 from ..models.subscription import Subscription
-from ..models.usage import UsageEvent
 from ..models.job import Job, JobType, JobStatus
 from ..auth.dependencies import require_auth
-from ..schemas.cv import CVRequest, CVResponse
-from ..services.cv_generator import CVGenerator
-from ..utils.s3 import get_s3_manager
+from ..middleware.idempotency import IdempotentRoute
+from ..schemas.cv import BulkCVRequest, BulkCVResponse, CVRequest, CVResponse
+from ..schemas.job import JobQueuedResponse
+from ..services.bulk_cv import (
+    BULK_CV_DELIVERIES,
+    BULK_CV_MAX_CVS,
+    BULK_CV_TASK,
+    run_bulk_cv_job,
+    stream_bulk_cv_job,
+)
+from ..services.generation import queue_job, run_cv_job
+from ..services.native_pdf import PDF_ENGINES
+from ..services.templates import get_template_registry
+from ..utils.browser_pool import BrowserPoolBusy
+from ..utils.cancellation import JobCancelled
+from ..utils.usage_writer import save_job_result
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
 
 async def check_cv_quota(user: User, db: AsyncSession) -> Subscription:
@@ -56,71 +70,66 @@ async def check_cv_quota(user: User, db: AsyncSession) -> Subscription:
     return subscription
 
 
-async def record_cv_usage(
-    user_id: str,
-    job_id: str,
-    format: str,
-    db: AsyncSession,
-):
+def validate_cv_request(cv_request: CVRequest) -> None:
     """
-    Record usage event for CV generation.
+    Check a CV request's format(s), PDF engine and template.
     
     Args:
-        user_id: User ID
-        job_id: Job ID
-        format: Export format (docx or pdf)
-        db: Database session
+        cv_request: CV data and format
+        
+    Raises:
+        HTTPException: If an option is not supported
     """
-    usage_event = UsageEvent(
-        id=str(uuid.uuid4()),
-        user_id=user_id,
-        job_id=job_id,
-        event_type="cv_export",
-        tokens=0,  # CVs don't use tokens
-        event_metadata={
-            "format": format,
-        },
-    )
-    
-    db.add(usage_event)
+    # Validate format(s); a list renders every format under one job
+    formats = cv_request.formats
+    if not formats or any(format not in ["docx", "pdf"] for format in formats):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Format must be 'docx' or 'pdf', or a list of them",
+        )
     
-    # Update subscription CV count
-    result = await db.execute(
-        select(Subscription).where(Subscription.user_id == user_id)
-    )
-    subscription = result.scalar_one_or_none()
-    if subscription:
-        subscription.cvs_generated += 1
+    if cv_request.pdf_engine and cv_request.pdf_engine not in PDF_ENGINES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"PDF engine must be one of: {', '.join(PDF_ENGINES)}",
+        )
     
-    await db.commit()
+    templates = get_template_registry().names("cv")
+    if cv_request.template and cv_request.template not in templates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Template must be one of: {', '.join(templates)}",
+        )
 
 
-@router.post("/generate", response_model=CVResponse)
+@router.post("/generate", response_model=Union[CVResponse, JobQueuedResponse])
 async def generate_cv(
     cv_request: CVRequest,
+    response: Response,
+    async_mode: bool = Query(False, alias="async", description="Queue the job and return immediately"),
     current_user: User = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
-) -> CVResponse:
+) -> Union[CVResponse, JobQueuedResponse]:
     """
-    Generate CV in DOCX or PDF format.
+    Generate CV in DOCX and/or PDF format.
+    
+    With ``async=true`` the job is queued for the job worker and its ID
+    returned straight away (202); follow it via the jobs endpoints.
     
     Args:
         cv_request: CV data and format
+        response: Outgoing response (for the 202 status)
+        async_mode: Queue the job instead of rendering in the request
         current_user: Current authenticated user
         db: Database session
         
     Returns:
-        Download URL and metadata
+        Download URL and metadata, or the queued job
     """
     # Check quota
     await check_cv_quota(current_user, db)
     
-    # Validate format
-    if cv_request.format not in ["docx", "pdf"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Format must be 'docx' or 'pdf'",
-        )
+    validate_cv_request(cv_request)
     
     # Create job
     job = Job(
@@ -129,77 +138,160 @@ async def generate_cv(
         type=JobType.CV,
         prompt=f"CV for {cv_request.personal_info.full_name}",
         parameters={"format": cv_request.format},
-        status=JobStatus.PROCESSING,
-        started_at=datetime.utcnow(),
+        status=JobStatus.PENDING if async_mode else JobStatus.PROCESSING,
+        started_at=None if async_mode else datetime.utcnow(),
     )
     db.add(job)
     await db.commit()
     
+    if async_mode:
+        await queue_job(db, job.id, current_user.id, JobType.CV, cv_request)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return JobQueuedResponse(job_id=job.id, message="CV generation job queued")
+    
     try:
-        # Generate CV
-        cv_generator = CVGenerator()
-        
-        if cv_request.format == "docx":
-            cv_bytes = await cv_generator.generate_docx(cv_request)
-            content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            extension = "docx"
-        else:  # pdf
-            cv_bytes = await cv_generator.generate_pdf(cv_request)
-            content_type = "application/pdf"
-            extension = "pdf"
-        
-        # Upload to S3
-        s3_manager = get_s3_manager()
-        s3_key = f"cvs/{current_user.id}/{job.id}/cv.{extension}"
-        
-        s3_manager.upload_file(
-            file_bytes=cv_bytes,
-            key=s3_key,
-            content_type=content_type,
-            metadata={
-                "user_id": current_user.id,
-                "job_id": job.id,
-                "name": cv_request.personal_info.full_name,
-            },
+        return await run_cv_job(db, job.id, current_user.id, cv_request)
+    
+    except JobCancelled:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job was cancelled",
         )
-        
-        # Generate presigned URL (valid for 7 days for CVs)
-        download_url = s3_manager.generate_presigned_url(s3_key, expiration=604800)
-        
-        # Update job
-        job.status = JobStatus.COMPLETED
-        job.completed_at = datetime.utcnow()
-        job.result_url = download_url
-        await db.commit()
-        
-        # Record usage
-        await record_cv_usage(
-            user_id=current_user.id,
-            job_id=job.id,
-            format=cv_request.format,
-            db=db,
+    
+    except BrowserPoolBusy as e:
+        await save_job_result(
+            db,
+            job.id,
+            status=JobStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
         )
         
-        # Calculate expiration
-        expires_at = (datetime.utcnow() + timedelta(days=7)).isoformat()
-        
-        return CVResponse(
-            job_id=job.id,
-            format=cv_request.format,
-            download_url=download_url,
-            s3_key=s3_key,
-            expires_at=expires_at,
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF rendering is at capacity, please retry shortly",
+            headers={"Retry-After": "5"},
         )
     
     except Exception as e:
         # Update job status
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        job.completed_at = datetime.utcnow()
-        await db.commit()
+        await save_job_result(
+            db,
+            job.id,
+            status=JobStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
+        )
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"CV generation failed: {str(e)}",
         )
 
+
+@router.post("/bulk", response_model=Union[BulkCVResponse, JobQueuedResponse])
+async def generate_cvs_bulk(
+    bulk_request: BulkCVRequest,
+    response: Response,
+    async_mode: bool = Query(False, alias="async", description="Queue the job and return immediately (s3 delivery)"),
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> Union[BulkCVResponse, JobQueuedResponse, StreamingResponse]:
+    """
+    Generate many CVs as one ZIP archive.
+    
+    CVs render in parallel, each in its own format(s). With ``stream``
+    delivery the archive is the response body, streamed as CVs finish;
+    with ``s3`` delivery it is uploaded and a download URL returned (or,
+    with ``async=true``, the job is queued). Either way the batch is one
+    job whose progress is reported through the jobs endpoints; the
+    streamed response carries its ID in ``X-Job-Id``.
+    
+    Args:
+        bulk_request: CVs and delivery
+        response: Outgoing response (for the 202 status)
+        async_mode: Queue the job instead of rendering in the request
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        Streamed ZIP archive, download URL and batch outcome, or the queued job
+    """
+    # Check quota
+    await check_cv_quota(current_user, db)
+    
+    if len(bulk_request.cvs) > BULK_CV_MAX_CVS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BULK_CV_MAX_CVS} CVs per request",
+        )
+    
+    if bulk_request.delivery not in BULK_CV_DELIVERIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Delivery must be one of: {', '.join(BULK_CV_DELIVERIES)}",
+        )
+    
+    if async_mode and bulk_request.delivery == "stream":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Queued bulk jobs must use 's3' delivery",
+        )
+    
+    for index, cv_request in enumerate(bulk_request.cvs):
+        try:
+            validate_cv_request(cv_request)
+        except HTTPException as e:
+            raise HTTPException(status_code=e.status_code, detail=f"cvs[{index}]: {e.detail}")
+    
+    # Create job
+    job = Job(
+        id=str(uuid.uuid4()),
+        user_id=current_user.id,
+        type=JobType.CV,
+        prompt=f"Bulk CVs ({len(bulk_request.cvs)})",
+        parameters={"bulk": True, "delivery": bulk_request.delivery, "cv_count": len(bulk_request.cvs)},
+        status=JobStatus.PENDING if async_mode else JobStatus.PROCESSING,
+        started_at=None if async_mode else datetime.utcnow(),
+    )
+    db.add(job)
+    await db.commit()
+    
+    if async_mode:
+        await queue_job(db, job.id, current_user.id, JobType.CV, bulk_request, task=BULK_CV_TASK)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return JobQueuedResponse(job_id=job.id, message="Bulk CV job queued")
+    
+    if bulk_request.delivery == "stream":
+        return StreamingResponse(
+            stream_bulk_cv_job(job.id, current_user.id, bulk_request),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": f'attachment; filename="cvs-{job.id}.zip"',
+                "X-Job-Id": job.id,
+            },
+        )
+    
+    try:
+        return await run_bulk_cv_job(db, job.id, current_user.id, bulk_request)
+    
+    except JobCancelled:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job was cancelled",
+        )
+    
+    except Exception as e:
+        # Update job status
+        await save_job_result(
+            db,
+            job.id,
+            status=JobStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
+        )
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk CV generation failed: {str(e)}",
+        )
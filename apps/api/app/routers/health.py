@@ -2,12 +2,14 @@
 
 import os
 from datetime import datetime
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..auth.dependencies import require_metrics_access
+from ..database import get_db, pool_stats, replica_monitor
 
 router = APIRouter()
 
@@ -101,22 +103,49 @@ async def database_health_check(db: AsyncSession = Depends(get_db)):
     """
     Database health check endpoint (legacy).
     
+    Also reports connection pool usage per engine and, when a read
+    replica is configured, its last measured lag.
+    
     Args:
         db: Database session
         
     Returns:
         Database health status
     """
+    replica = None
+    if replica_monitor is not None:
+        replica = {
+            "in_use": await replica_monitor.is_usable(),
+            "lag_seconds": replica_monitor.lag,
+        }
+    
     try:
         await db.execute(text("SELECT 1"))
         return {
             "status": "healthy",
             "database": "connected",
+            "pools": pool_stats(),
+            "replica": replica,
         }
     except Exception as e:
         return {
             "status": "unhealthy",
             "database": "disconnected",
             "error": str(e),
+            "pools": pool_stats(),
+            "replica": replica,
         }
 
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_access)])
+async def metrics():
+    """
+    Prometheus metrics (connection pool wait, in-use and hold times).
+    
+    Requires the ``METRICS_TOKEN`` scrape token or an admin's token.
+    
+    Returns:
+        Metrics in the Prometheus text format
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
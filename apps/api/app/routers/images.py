@@ -1,66 +1,29 @@
 """Image generation routes."""
 
 import uuid
-import os
 from datetime import datetime
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from ..database import get_db
 from ..models.user import User
 from ..models.subscription import Subscription
-from ..models.usage import UsageEvent
 from ..models.job import Job, JobType, JobStatus
 from ..auth.dependencies import require_auth
-from ..providers.google_imagen_provider import GoogleImagenProvider
-from ..providers.image_types import ImageRequest, GeneratedImage
+from ..middleware.idempotency import IdempotentRoute
 from ..schemas.image import (
     ImageGenerationRequest,
     ImageGenerationResponse,
-    GeneratedImageInfo,
     ImageModelsResponse,
 )
-from ..utils.s3 import get_s3_manager
+from ..schemas.job import JobQueuedResponse
+from ..services.generation import get_image_provider, queue_job, run_image_job
+from ..utils.cancellation import JobCancelled
+from ..utils.usage_writer import save_job_result
 
-router = APIRouter()
-
-
-def get_image_provider(provider: str) -> GoogleImagenProvider:
-    """
-    Get image generation provider.
-    
-    Args:
-        provider: Provider name
-        
-    Returns:
-        Image provider instance
-        
-    Raises:
-        HTTPException: If provider not supported or not configured
-    """
-    if provider == "google":
-        sa_json = os.getenv("GCP_VERTEX_SA_JSON")
-        project_id = os.getenv("GCP_VERTEX_PROJECT_ID")
-        location = os.getenv("GCP_VERTEX_LOCATION", "us-central1")
-        
-        if not sa_json or not project_id:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Google Vertex AI not configured",
-            )
-        
-        return GoogleImagenProvider(
-            service_account_json=sa_json,
-            project_id=project_id,
-            location=location,
-        )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported provider: {provider}",
-        )
+router = APIRouter(route_class=IdempotentRoute)
 
 
 async def check_image_quota(user: User, count: int, db: AsyncSession) -> Subscription:
@@ -101,51 +64,6 @@ async def check_image_quota(user: User, count: int, db: AsyncSession) -> Subscri
     return subscription
 
 
-async def record_image_usage(
-    user_id: str,
-    job_id: str,
-    provider: str,
-    model: str,
-    image_count: int,
-    db: AsyncSession,
-):
-    """
-    Record usage event for image generation.
-    
-    Args:
-        user_id: User ID
-        job_id: Job ID
-        provider: Provider name
-        model: Model name
-        image_count: Number of images generated
-        db: Database session
-    """
-    usage_event = UsageEvent(
-        id=str(uuid.uuid4()),
-        user_id=user_id,
-        job_id=job_id,
-        event_type="image_generation",
-        tokens=0,  # Images don't use tokens
-        event_metadata={
-            "provider": provider,
-            "model": model,
-            "image_count": image_count,
-        },
-    )
-    
-    db.add(usage_event)
-    
-    # Update subscription image count
-    result = await db.execute(
-        select(Subscription).where(Subscription.user_id == user_id)
-    )
-    subscription = result.scalar_one_or_none()
-    if subscription:
-        subscription.images_generated += image_count
-    
-    await db.commit()
-
-
 @router.get("/models", response_model=ImageModelsResponse)
 async def list_image_models():
     """
@@ -166,26 +84,39 @@ async def list_image_models():
     return ImageModelsResponse(models=models)
 
 
-@router.post("/generate", response_model=ImageGenerationResponse)
+@router.post(
+    "/generate",
+    response_model=Union[ImageGenerationResponse, JobQueuedResponse],
+)
 async def generate_images(
     request: ImageGenerationRequest,
+    response: Response,
+    async_mode: bool = Query(False, alias="async", description="Queue the job and return immediately"),
     current_user: User = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
-) -> ImageGenerationResponse:
+) -> Union[ImageGenerationResponse, JobQueuedResponse]:
     """
     Generate images from text prompt.
     
+    With ``async=true`` the job is queued for the job worker and its ID
+    returned straight away (202); follow it via the jobs endpoints.
+    
     Args:
         request: Image generation request
+        response: Outgoing response (for the 202 status)
+        async_mode: Queue the job instead of generating in the request
         current_user: Current authenticated user
         db: Database session
         
     Returns:
-        Generated images with URLs
+        Generated images with URLs, or the queued job
     """
     # Check quota
     await check_image_quota(current_user, request.count, db)
     
+    # Reject an unsupported or unconfigured provider before a job exists
+    get_image_provider(request.provider)
+    
     # Create job
     job = Job(
         id=str(uuid.uuid4()),
@@ -193,89 +124,37 @@ async def generate_images(
         type=JobType.IMAGE,
         prompt=request.prompt,
         parameters=request.model_dump(),
-        status=JobStatus.PROCESSING,
-        started_at=datetime.utcnow(),
+        status=JobStatus.PENDING if async_mode else JobStatus.PROCESSING,
+        started_at=None if async_mode else datetime.utcnow(),
     )
     db.add(job)
     await db.commit()
     
+    if async_mode:
+        await queue_job(db, job.id, current_user.id, JobType.IMAGE, request)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return JobQueuedResponse(job_id=job.id, message="Image generation job queued")
+    
     try:
-        # Get provider
-        provider = get_image_provider(request.provider)
-        
-        # Convert to provider request
-        image_request = ImageRequest(
-            prompt=request.prompt,
-            negative_prompt=request.negative_prompt,
-            count=request.count,
-            size=request.size,
-            seed=request.seed,
-            guidance_scale=request.guidance_scale,
-        )
-        
-        # Generate images
-        image_bytes_list = await provider.generate_images(image_request)
-        
-        if not image_bytes_list:
-            raise Exception("No images generated")
-        
-        # Upload to S3
-        s3_manager = get_s3_manager()
-        generated_images: List[GeneratedImageInfo] = []
-        
-        for i, image_bytes in enumerate(image_bytes_list):
-            s3_key, presigned_url = s3_manager.upload_image(
-                image_bytes=image_bytes,
-                user_id=current_user.id,
-                job_id=job.id,
-                image_index=i,
-                extension="png",
-            )
-            
-            generated_images.append(
-                GeneratedImageInfo(
-                    url=presigned_url,
-                    s3_key=s3_key,
-                    size=request.size.value,
-                    seed=request.seed + i if request.seed else None,
-                )
-            )
-        
-        # Update job
-        job.status = JobStatus.COMPLETED
-        job.completed_at = datetime.utcnow()
-        job.result_url = generated_images[0].url if generated_images else None
-        job.model_name = provider.get_model_name()
-        await db.commit()
-        
-        # Record usage
-        await record_image_usage(
-            user_id=current_user.id,
-            job_id=job.id,
-            provider=request.provider,
-            model=provider.get_model_name(),
-            image_count=len(generated_images),
-            db=db,
-        )
-        
-        return ImageGenerationResponse(
-            job_id=job.id,
-            images=generated_images,
-            provider=request.provider,
-            model=provider.get_model_name(),
-            prompt=request.prompt,
-            count=len(generated_images),
+        return await run_image_job(db, job.id, current_user.id, request)
+    
+    except JobCancelled:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job was cancelled",
         )
     
     except Exception as e:
         # Update job status
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        job.completed_at = datetime.utcnow()
-        await db.commit()
+        await save_job_result(
+            db,
+            job.id,
+            status=JobStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
+        )
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Image generation failed: {str(e)}",
         )
-
@@ -1,18 +1,104 @@
 """Job management routes."""
 
 import uuid
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, tuple_
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.user import User
-from ..models.job import Job, JobStatus
-from ..schemas.job import JobCreate, JobResponse, JobUpdate
+from ..models.job import TERMINAL_STATUSES, Job, JobStatus
+from ..schemas.job import JobCreate, JobResponse, JobStatusBatch, JobStatusSummary, JobUpdate
 from ..auth.dependencies import require_auth
+from ..middleware.idempotency import IdempotentRoute
+from ..utils.cancellation import cancel_running_job
+from ..utils.job_events import RESYNC, get_job_event_hub
+from ..utils.pagination import encode_cursor, decode_cursor
+from ..utils.usage_writer import save_job_result
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
+
+# Most jobs one batch status request may ask about
+MAX_STATUS_BATCH = 100
+
+# Longest a status long-poll may wait (seconds)
+MAX_STATUS_WAIT = 30
+
+# How often a long-poll re-reads while the job event listener is down
+STATUS_FALLBACK_POLL_INTERVAL = 2
+
+
+def parse_job_ids(ids: str) -> List[str]:
+    """
+    Parse a comma-separated list of job IDs.
+    
+    Args:
+        ids: Comma-separated job IDs
+        
+    Returns:
+        Unique job IDs in the order given
+        
+    Raises:
+        ValueError: If the list is empty or too long
+    """
+    job_ids = list(dict.fromkeys(job_id.strip() for job_id in ids.split(",") if job_id.strip()))
+    if not job_ids:
+        raise ValueError("No job IDs given")
+    if len(job_ids) > MAX_STATUS_BATCH:
+        raise ValueError(f"At most {MAX_STATUS_BATCH} job IDs per request")
+    return job_ids
+
+
+def should_wait_for_change(jobs: Sequence[JobStatusSummary], since: datetime) -> bool:
+    """
+    Whether a long-poll should keep waiting.
+    
+    It returns straight away once any job changed after ``since``, or
+    when none of the jobs can change any more.
+    
+    Args:
+        jobs: Current job statuses
+        since: Cursor of the client's last response
+        
+    Returns:
+        True if nothing newer than ``since`` is there to report yet
+    """
+    return (
+        any(job.status not in TERMINAL_STATUSES for job in jobs)
+        and all(job.updated_at <= since for job in jobs)
+    )
+
+
+async def fetch_job_statuses(
+    db: AsyncSession, user_id: str, job_ids: List[str]
+) -> List[JobStatusSummary]:
+    """
+    Read the status of a user's jobs in one query (by primary key).
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        job_ids: Job IDs
+        
+    Returns:
+        Statuses of the jobs that exist, in the order requested
+    """
+    result = await db.execute(
+        select(
+            Job.id,
+            Job.status,
+            Job.progress,
+            Job.result_url,
+            Job.error_message,
+            Job.updated_at,
+        ).where(Job.id.in_(job_ids), Job.user_id == user_id)
+    )
+    order = {job_id: i for i, job_id in enumerate(job_ids)}
+    jobs = [JobStatusSummary.model_validate(row) for row in result]
+    return sorted(jobs, key=lambda job: order[job.id])
 
 
 @router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
@@ -52,38 +138,141 @@ async def create_job(
 
 @router.get("", response_model=List[JobResponse])
 async def list_jobs(
+    response: Response,
     current_user: User = Depends(require_auth),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     status_filter: Optional[JobStatus] = Query(None, alias="status"),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="Cursor from a previous X-Next-Cursor header"),
 ) -> List[JobResponse]:
     """
-    List user's jobs with optional filtering.
+    List user's jobs with optional filtering, newest first.
+    
+    Pagination is keyset-based: pass the ``X-Next-Cursor`` response header
+    back as ``after`` to fetch the next page. ``offset`` is still accepted
+    for older clients but gets slower on deep pages.
     
     Args:
+        response: Outgoing response (for the cursor header)
         current_user: Current authenticated user
         db: Database session
         status_filter: Optional status filter
         limit: Maximum number of results
-        offset: Number of results to skip
+        offset: Number of results to skip (legacy)
+        after: Opaque cursor of the last job seen
         
     Returns:
         List of jobs
     """
-    query = select(Job).where(Job.user_id == current_user.id).order_by(desc(Job.created_at))
+    query = (
+        select(Job)
+        .where(Job.user_id == current_user.id)
+        .order_by(desc(Job.created_at), desc(Job.id))
+    )
     
     if status_filter:
         query = query.where(Job.status == status_filter)
     
-    query = query.limit(limit).offset(offset)
+    if after:
+        if offset:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use either 'after' or 'offset', not both",
+            )
+        try:
+            created_at, job_id = decode_cursor(after)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.where(tuple_(Job.created_at, Job.id) < tuple_(created_at, job_id))
+    elif offset:
+        query = query.offset(offset)
+    
+    query = query.limit(limit)
     
     result = await db.execute(query)
     jobs = result.scalars().all()
     
+    if len(jobs) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(jobs[-1].created_at, jobs[-1].id)
+    
     return [JobResponse.model_validate(job) for job in jobs]
 
 
+@router.get("/status", response_model=JobStatusBatch)
+async def get_job_statuses(
+    ids: str = Query(..., description=f"Comma-separated job IDs (at most {MAX_STATUS_BATCH})"),
+    wait: int = Query(0, ge=0, le=MAX_STATUS_WAIT, description="Seconds to wait for a change"),
+    since: Optional[datetime] = Query(None, description="Cursor from a previous response"),
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> JobStatusBatch:
+    """
+    Get the status of several jobs at once.
+    
+    With ``wait``, this is a long-poll: it returns as soon as any of the
+    jobs changes after ``since`` (or after the request, if omitted), or
+    when ``wait`` seconds pass. Dashboards pass each response's
+    ``cursor`` back as ``since``. Reads go to the primary, since the
+    change notifications that end a wait can run ahead of a replica.
+    
+    Args:
+        ids: Comma-separated job IDs
+        wait: Seconds to wait for a change (0 returns immediately)
+        since: Cursor from a previous response
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        Job statuses and the IDs that were not found
+    """
+    try:
+        job_ids = parse_job_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    user_id = current_user.id
+    if since is None:
+        since = datetime.utcnow()
+    elif since.tzinfo is not None:
+        # Timestamps are stored as naive UTC
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    hub = get_job_event_hub()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    
+    # Watch before reading so a change in between is not missed
+    async with hub.watch(*job_ids) as events:
+        jobs = await fetch_job_statuses(db, user_id, job_ids)
+        
+        while should_wait_for_change(jobs, since):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            
+            # Return the connection to the pool while waiting; the
+            # session checks out a new one for the next read
+            await db.close()
+            timeout = remaining if hub.connected else min(remaining, STATUS_FALLBACK_POLL_INTERVAL)
+            try:
+                event = await asyncio.wait_for(events.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if hub.connected:
+                    continue
+                event = RESYNC
+            
+            jobs = await fetch_job_statuses(db, user_id, job_ids)
+            if event is not RESYNC:
+                break
+    
+    found = {job.id for job in jobs}
+    return JobStatusBatch(
+        jobs=jobs,
+        missing=[job_id for job_id in job_ids if job_id not in found],
+        cursor=max([since] + [job.updated_at for job in jobs]),
+    )
+
+
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: str,
@@ -145,16 +334,81 @@ async def update_job(
             detail="Job not found",
         )
     
-    # Update job fields
-    if job_update.status is not None:
-        job.status = job_update.status
-    if job_update.result_url is not None:
-        job.result_url = job_update.result_url
-    if job_update.error_message is not None:
-        job.error_message = job_update.error_message
+    # Update job fields (terminal statuses also feed the analytics rollups)
+    fields = job_update.model_dump(exclude_none=True)
+    if await save_job_result(db, job.id, **fields):
+        await db.refresh(job)
+    else:
+        # Spooled until the database is back (the session let go of the
+        # job); answer with the values it will be given
+        for field, value in fields.items():
+            setattr(job, field, value)
     
-    await db.commit()
-    await db.refresh(job)
+    return JobResponse.model_validate(job)
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: str,
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> JobResponse:
+    """
+    Cancel a pending or running job.
+    
+    Marking the job cancelled is what stops it: queued jobs are skipped
+    when dequeued, workers stop at their next checkpoint, and in-process
+    work (e.g. a chat stream) is interrupted through the job event. Usage
+    is recorded for what was consumed before the job stopped. Cancelling
+    an already cancelled job returns it unchanged.
+    
+    Args:
+        job_id: Job ID
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        Cancelled job
+        
+    Raises:
+        HTTPException: If the job does not exist or already finished
+    """
+    result = await db.execute(
+        select(Job).where(Job.id == job_id, Job.user_id == current_user.id)
+    )
+    job = result.scalar_one_or_none()
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    
+    if job.status not in TERMINAL_STATUSES:
+        # Only applies while the job is unfinished, so a job completing at
+        # the same moment is not cancelled after the fact
+        cancelled_at = datetime.utcnow()
+        if await save_job_result(
+            db,
+            job.id,
+            status=JobStatus.CANCELLED,
+            completed_at=cancelled_at,
+        ):
+            await db.refresh(job)
+        else:
+            # Spooled until the database is back (the session let go of
+            # the job); answer with the values it will be given
+            job.status = JobStatus.CANCELLED
+            job.completed_at = cancelled_at
+    
+    if job.status != JobStatus.CANCELLED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job already {job.status.value}",
+        )
+    
+    # Other processes are told through the job event
+    cancel_running_job(job.id)
     
     return JobResponse.model_validate(job)
 
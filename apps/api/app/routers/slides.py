@@ -1,31 +1,33 @@
 """Slide generation routes."""
 
 import uuid
-import json
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from ..database import get_db
 from ..models.user import User
 from ..models.subscription import Subscription
-from ..models.usage import UsageEvent
 from ..models.job import Job, JobType, JobStatus
 from ..auth.dependencies import require_auth
+from ..middleware.idempotency import IdempotentRoute
 from ..schemas.slides import (
     SlideGenerationRequest,
     SlideGenerationResponse,
     OutlineGenerationRequest,
     OutlineGenerationResponse,
-    SlideContent,
 )
-from ..services.slide_generator import SlideGenerator
-from ..providers import get_provider, ProviderType
-from ..providers.types import ChatRequest, ChatMessage, ChatRole
-from ..utils.s3 import get_s3_manager
+from ..schemas.job import JobQueuedResponse
+from ..services.generation import generate_outline_with_ai, queue_job, run_slides_job
+from ..services.native_pdf import PDF_ENGINES
+from ..services.templates import get_template_registry
+from ..utils.browser_pool import BrowserPoolBusy
+from ..utils.cancellation import JobCancelled
+from ..utils.usage_writer import save_job_result
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
 
 async def check_slide_quota(user: User, db: AsyncSession) -> Subscription:
@@ -63,90 +65,6 @@ async def check_slide_quota(user: User, db: AsyncSession) -> Subscription:
     return subscription
 
 
-async def generate_outline_with_ai(
-    topic: str,
-    num_slides: int,
-    audience: str = None,
-    style: str = None,
-) -> list[SlideContent]:
-    """
-    Generate presentation outline using AI.
-    
-    Args:
-        topic: Presentation topic
-        num_slides: Number of slides to generate
-        audience: Target audience
-        style: Presentation style
-        
-    Returns:
-        List of slide contents
-    """
-    # Build prompt for AI
-    prompt = f"""Create a presentation outline for the following topic: "{topic}"
-
-Requirements:
-- Generate exactly {num_slides} slides (excluding title slide)
-- Each slide should have a clear title and 3-5 bullet points
-- Make it engaging and informative
-"""
-    
-    if audience:
-        prompt += f"- Target audience: {audience}\n"
-    
-    if style:
-        prompt += f"- Presentation style: {style}\n"
-    
-    prompt += """
-Format your response as JSON with this structure:
-{
-  "slides": [
-    {
-      "title": "Slide Title",
-      "content": ["Bullet point 1", "Bullet point 2", "Bullet point 3"]
-    }
-  ]
-}
-
-Respond ONLY with valid JSON, no additional text."""
-    
-    # Use OpenAI for outline generation (or fallback to Anthropic)
-    try:
-        provider = get_provider(ProviderType.OPENAI)
-        model = "gpt-3.5-turbo"
-    except:
-        provider = get_provider(ProviderType.ANTHROPIC)
-        model = "claude-3-haiku-20240307"
-    
-    # Get AI response
-    chat_request = ChatRequest(
-        messages=[ChatMessage(role=ChatRole.USER, content=prompt)],
-        model=model,
-        temperature=0.7,
-        max_tokens=2000,
-        stream=False,
-    )
-    
-    response = await provider.chat_completion(chat_request)
-    
-    # Parse JSON response
-    try:
-        # Extract JSON from response (might have markdown code blocks)
-        content = response.content.strip()
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
-        
-        data = json.loads(content)
-        slides = [SlideContent(**slide) for slide in data["slides"]]
-        return slides[:num_slides]  # Ensure we don't exceed requested number
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to parse AI response: {str(e)}",
-        )
-
-
 @router.post("/generate-outline", response_model=OutlineGenerationResponse)
 async def generate_outline(
     request: OutlineGenerationRequest,
@@ -175,58 +93,63 @@ async def generate_outline(
     )
 
 
-@router.post("/generate", response_model=SlideGenerationResponse)
+@router.post("/generate", response_model=Union[SlideGenerationResponse, JobQueuedResponse])
 async def generate_slides(
     slide_request: SlideGenerationRequest,
+    response: Response,
+    async_mode: bool = Query(False, alias="async", description="Queue the job and return immediately"),
     current_user: User = Depends(require_auth),
     db: AsyncSession = Depends(get_db),
-) -> SlideGenerationResponse:
+) -> Union[SlideGenerationResponse, JobQueuedResponse]:
     """
-    Generate presentation slides in PPTX or PDF format.
+    Generate presentation slides in PPTX and/or PDF format.
+    
+    With ``async=true`` the job (including any AI outline) is queued for
+    the job worker and its ID returned straight away (202); follow it via
+    the jobs endpoints.
     
     Args:
         slide_request: Slide generation request
+        response: Outgoing response (for the 202 status)
+        async_mode: Queue the job instead of rendering in the request
         current_user: Current authenticated user
         db: Database session
         
     Returns:
-        Download URL and metadata
+        Download URL and metadata, or the queued job
     """
     # Check quota
     await check_slide_quota(current_user, db)
     
-    # Validate format
-    if slide_request.format not in ["pptx", "pdf"]:
+    # Validate format(s); a list renders every format under one job
+    formats = slide_request.formats
+    if not formats or any(format not in ["pptx", "pdf"] for format in formats):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Format must be 'pptx' or 'pdf'",
+            detail="Format must be 'pptx' or 'pdf', or a list of them",
         )
     
-    # Determine slides to use
-    slides = []
-    title = ""
-    
-    if slide_request.auto_generate and slide_request.topic:
-        # Generate slides with AI
-        title = slide_request.topic
-        slides = await generate_outline_with_ai(
-            topic=slide_request.topic,
-            num_slides=slide_request.num_slides or 5,
+    if slide_request.pdf_engine and slide_request.pdf_engine not in PDF_ENGINES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"PDF engine must be one of: {', '.join(PDF_ENGINES)}",
         )
-    elif slide_request.outline:
-        # Use manual outline
-        title = slide_request.topic or "Presentation"
-        slides = slide_request.outline
-    else:
+    
+    templates = get_template_registry().names("slides")
+    if slide_request.template and slide_request.template not in templates:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Either provide 'topic' with 'auto_generate=true' or provide 'outline'",
+            detail=f"Template must be one of: {', '.join(templates)}",
         )
     
-    if not slides:
+    if slide_request.auto_generate and slide_request.topic:
+        slide_count = slide_request.num_slides or 5
+    elif slide_request.outline:
+        slide_count = len(slide_request.outline)
+    else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No slides to generate",
+            detail="Either provide 'topic' with 'auto_generate=true' or provide 'outline'",
         )
     
     # Create job
@@ -234,97 +157,54 @@ async def generate_slides(
         id=str(uuid.uuid4()),
         user_id=current_user.id,
         type=JobType.SLIDES,
-        prompt=f"Slides: {title}",
-        parameters={"format": slide_request.format, "slide_count": len(slides)},
-        status=JobStatus.PROCESSING,
-        started_at=datetime.utcnow(),
+        prompt=f"Slides: {slide_request.topic or 'Presentation'}",
+        parameters={"format": slide_request.format, "slide_count": slide_count},
+        status=JobStatus.PENDING if async_mode else JobStatus.PROCESSING,
+        started_at=None if async_mode else datetime.utcnow(),
     )
     db.add(job)
     await db.commit()
     
+    if async_mode:
+        await queue_job(db, job.id, current_user.id, JobType.SLIDES, slide_request)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return JobQueuedResponse(job_id=job.id, message="Slide generation job queued")
+    
     try:
-        # Generate slides
-        slide_generator = SlideGenerator()
-        
-        if slide_request.format == "pptx":
-            slide_bytes = await slide_generator.generate_pptx(title, slides, slide_request.template)
-            content_type = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
-            extension = "pptx"
-        else:  # pdf
-            slide_bytes = await slide_generator.generate_pdf(title, slides)
-            content_type = "application/pdf"
-            extension = "pdf"
-        
-        # Upload to S3
-        s3_manager = get_s3_manager()
-        s3_key = f"slides/{current_user.id}/{job.id}/presentation.{extension}"
-        
-        s3_manager.upload_file(
-            file_bytes=slide_bytes,
-            key=s3_key,
-            content_type=content_type,
-            metadata={
-                "user_id": current_user.id,
-                "job_id": job.id,
-                "title": title,
-                "slide_count": str(len(slides)),
-            },
-        )
-        
-        # Generate presigned URL (valid for 7 days)
-        download_url = s3_manager.generate_presigned_url(s3_key, expiration=604800)
-        
-        # Update job
-        job.status = JobStatus.COMPLETED
-        job.completed_at = datetime.utcnow()
-        job.result_url = download_url
-        await db.commit()
-        
-        # Record usage
-        usage_event = UsageEvent(
-            id=str(uuid.uuid4()),
-            user_id=current_user.id,
-            job_id=job.id,
-            event_type="slides_export",
-            tokens=0,
-            event_metadata={
-                "format": slide_request.format,
-                "slide_count": len(slides),
-            },
+        return await run_slides_job(db, job.id, current_user.id, slide_request)
+    
+    except JobCancelled:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job was cancelled",
         )
-        db.add(usage_event)
-        
-        # Update subscription
-        result = await db.execute(
-            select(Subscription).where(Subscription.user_id == current_user.id)
+    
+    except BrowserPoolBusy as e:
+        await save_job_result(
+            db,
+            job.id,
+            status=JobStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
         )
-        subscription = result.scalar_one_or_none()
-        if subscription:
-            subscription.slides_generated += 1
-        
-        await db.commit()
-        
-        # Calculate expiration
-        expires_at = (datetime.utcnow() + timedelta(days=7)).isoformat()
         
-        return SlideGenerationResponse(
-            job_id=job.id,
-            format=slide_request.format,
-            download_url=download_url,
-            s3_key=s3_key,
-            slide_count=len(slides),
-            expires_at=expires_at,
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF rendering is at capacity, please retry shortly",
+            headers={"Retry-After": "5"},
         )
     
     except Exception as e:
         # Update job status
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        job.completed_at = datetime.utcnow()
-        await db.commit()
+        await save_job_result(
+            db,
+            job.id,
+            status=JobStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
+        )
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Slide generation failed: {str(e)}",
         )
-
@@ -2,26 +2,40 @@
 
 import uuid
 from datetime import datetime
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import asyncio
 
-from ..database import get_db
+from ..database import AsyncSessionLocal, get_db
 from ..models.user import User
 from ..models.subscription import Subscription
 from ..models.job import Job, JobType, JobStatus
 from ..auth.dependencies import require_auth
+from ..middleware.idempotency import IdempotentRoute
 from ..schemas.video import (
     VideoGenerationRequest,
     VideoGenerationResponse,
     VideoJobStatus,
 )
-from ..utils.sqs import get_sqs_manager
+from ..utils.job_events import RESYNC, get_job_event_hub
+from ..utils.scheduler import get_job_scheduler
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
+
+# Longest a status stream stays open
+STATUS_STREAM_TIMEOUT = 600
+
+# Seconds between SSE keep-alive comments while no events arrive
+STATUS_KEEPALIVE_INTERVAL = 15
+
+TERMINAL_STATUS_VALUES = {
+    JobStatus.COMPLETED.value,
+    JobStatus.FAILED.value,
+    JobStatus.CANCELLED.value,
+}
 
 
 async def check_video_quota(
@@ -71,7 +85,7 @@ async def generate_video(
     db: AsyncSession = Depends(get_db),
 ) -> VideoGenerationResponse:
     """
-    Generate video from text prompt (async via SQS).
+    Generate video from text prompt (queued for the video workers).
     
     Args:
         request: Video generation request
@@ -100,39 +114,17 @@ async def generate_video(
     )
     db.add(job)
     await db.commit()
-    
-    try:
-        # Enqueue job to SQS
-        sqs_manager = get_sqs_manager()
-        message_id = sqs_manager.enqueue_video_job(
-            job_id=job.id,
-            user_id=current_user.id,
-            prompt=request.prompt,
-            provider=request.provider.value,
-            duration=request.duration,
-            style=request.style,
-            parameters={
-                "aspect_ratio": request.aspect_ratio,
-            },
-        )
-        
-        return VideoGenerationResponse(
-            job_id=job.id,
-            status="pending",
-            message="Video generation job queued successfully",
-            estimated_time=request.duration * 10,  # Rough estimate: 10x duration
-        )
-    
-    except Exception as e:
-        # Update job status
-        job.status = JobStatus.FAILED
-        job.error_message = str(e)
-        await db.commit()
-        
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to queue video generation: {str(e)}",
-        )
+
+    # The scheduler hands the job to SQS once its plan lane and the
+    # user's in-flight limit allow
+    get_job_scheduler().wake()
+
+    return VideoGenerationResponse(
+        job_id=job.id,
+        status="pending",
+        message="Video generation job queued successfully",
+        estimated_time=request.duration * 10,  # Rough estimate: 10x duration
+    )
 
 
 @router.get("/{job_id}/status", response_model=VideoJobStatus)
@@ -163,12 +155,22 @@ async def get_video_status(
             detail="Job not found",
         )
     
-    # Calculate progress (simple estimation)
-    progress = None
-    if job.status == JobStatus.PROCESSING:
-        progress = 50  # Mid-way through
-    elif job.status == JobStatus.COMPLETED:
-        progress = 100
+    return video_job_status(job)
+
+
+def video_job_status(job: Job) -> VideoJobStatus:
+    """
+    Build the status response for a video job.
+    
+    Args:
+        job: Job row
+        
+    Returns:
+        Job status with the progress reported by the worker
+    """
+    progress = job.progress
+    if progress is None:
+        progress = 100 if job.status == JobStatus.COMPLETED else 0
     
     return VideoJobStatus(
         job_id=job.id,
@@ -181,68 +183,90 @@ async def get_video_status(
     )
 
 
+async def load_video_job_status(job_id: str, user_id: str) -> Optional[VideoJobStatus]:
+    """
+    Read a job's current status through a short-lived session.
+    
+    Args:
+        job_id: Job ID
+        user_id: User ID
+        
+    Returns:
+        Job status, or None if the job does not exist for this user
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Job).where(Job.id == job_id, Job.user_id == user_id)
+        )
+        job = result.scalar_one_or_none()
+    return video_job_status(job) if job else None
+
+
 async def generate_status_stream(
     job_id: str,
     user_id: str,
-    db: AsyncSession,
 ) -> AsyncIterator[str]:
     """
     Generate Server-Sent Events stream for job status updates.
     
+    Updates are pushed by the job event hub as workers publish them, so
+    the stream does not poll the database. The job is read once at the
+    start and again only if the hub reports events may have been missed
+    (or, while its listener is down, at each keep-alive).
+    
     Args:
         job_id: Job ID
         user_id: User ID
-        db: Database session
         
     Yields:
         SSE formatted status updates
     """
-    max_attempts = 120  # 10 minutes max (5s intervals)
-    attempt = 0
+    hub = get_job_event_hub()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STATUS_STREAM_TIMEOUT
     
-    while attempt < max_attempts:
-        # Fetch job status
-        result = await db.execute(
-            select(Job).where(Job.id == job_id, Job.user_id == user_id)
-        )
-        job = result.scalar_one_or_none()
-        
-        if not job:
-            yield f"data: {{\"error\": \"Job not found\"}}\n\n"
-            break
-        
-        # Calculate progress
-        progress = 0
-        if job.status == JobStatus.PROCESSING:
-            progress = min(90, 10 + (attempt * 2))  # Progressive increase
-        elif job.status == JobStatus.COMPLETED:
-            progress = 100
+    # Watch before reading so a change in between is not missed
+    async with hub.watch(job_id) as events:
+        job_status = await load_video_job_status(job_id, user_id)
         
-        # Send status update
-        status_data = {
-            "job_id": job.id,
-            "status": job.status.value,
-            "progress": progress,
-            "video_url": job.result_url,
-            "error_message": job.error_message,
-        }
-        
-        yield f"data: {VideoJobStatus(**status_data, created_at=job.created_at.isoformat(), updated_at=job.updated_at.isoformat()).model_dump_json()}\n\n"
-        
-        # Check if job is complete
-        if job.status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]:
-            yield "data: [DONE]\n\n"
-            break
-        
-        # Wait before next poll
-        await asyncio.sleep(5)
-        attempt += 1
-        
-        # Refresh DB session
-        await db.refresh(job)
-    
-    if attempt >= max_attempts:
-        yield f"data: {{\"error\": \"Timeout waiting for job completion\"}}\n\n"
+        while True:
+            if job_status is None:
+                yield f"data: {{\"error\": \"Job not found\"}}\n\n"
+                return
+            
+            yield f"data: {job_status.model_dump_json()}\n\n"
+            
+            if job_status.status in TERMINAL_STATUS_VALUES:
+                yield "data: [DONE]\n\n"
+                return
+            
+            # Wait for the next event, sending keep-alives meanwhile
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    yield f"data: {{\"error\": \"Timeout waiting for job completion\"}}\n\n"
+                    return
+                try:
+                    event = await asyncio.wait_for(
+                        events.get(), timeout=min(STATUS_KEEPALIVE_INTERVAL, remaining)
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    if not hub.connected:
+                        event = RESYNC
+                        break
+                    yield ": keep-alive\n\n"
+            
+            if event is RESYNC:
+                job_status = await load_video_job_status(job_id, user_id)
+            else:
+                job_status = job_status.model_copy(update={
+                    "status": event["status"],
+                    "progress": event["progress"] if event["progress"] is not None else job_status.progress,
+                    "video_url": event["result_url"],
+                    "error_message": event["error_message"],
+                    "updated_at": event["updated_at"],
+                })
 
 
 @router.get("/{job_id}/stream")
@@ -274,8 +298,13 @@ async def stream_video_status(
             detail="Job not found",
         )
     
+    # Return the connection to the pool now; the stream reads through its
+    # own short-lived sessions and may outlive the request's dependencies
+    user_id = current_user.id
+    await db.close()
+    
     return StreamingResponse(
-        generate_status_stream(job_id, current_user.id, db),
+        generate_status_stream(job_id, user_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -0,0 +1,316 @@
+"""Webhook endpoint management routes."""
+
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc
+
+from ..database import get_db
+from ..models.user import User
+from ..models.webhook import DeliveryStatus, WebhookDelivery, WebhookEndpoint
+from ..schemas.webhook import (
+    WebhookDeliveryResponse,
+    WebhookEndpointCreate,
+    WebhookEndpointResponse,
+    WebhookEndpointSecret,
+    WebhookEndpointUpdate,
+)
+from ..auth.dependencies import require_auth
+from ..utils.webhooks import WebhookDestinationError, generate_secret, resolve_webhook_url
+
+router = APIRouter()
+
+# Most webhook endpoints one user may register
+MAX_ENDPOINTS_PER_USER = 10
+
+
+async def get_user_endpoint(db: AsyncSession, user_id: str, endpoint_id: str) -> WebhookEndpoint:
+    """
+    Load one of a user's webhook endpoints.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        endpoint_id: Endpoint ID
+
+    Returns:
+        Webhook endpoint
+
+    Raises:
+        HTTPException: If the endpoint does not exist
+    """
+    result = await db.execute(
+        select(WebhookEndpoint).where(
+            WebhookEndpoint.id == endpoint_id, WebhookEndpoint.user_id == user_id
+        )
+    )
+    endpoint = result.scalar_one_or_none()
+
+    if not endpoint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Webhook endpoint not found",
+        )
+
+    return endpoint
+
+
+async def check_endpoint_url(url: str) -> None:
+    """
+    Check that an endpoint URL resolves to public addresses only.
+
+    Args:
+        url: Endpoint URL
+
+    Raises:
+        HTTPException: If the URL is not one events may be sent to
+    """
+    try:
+        await resolve_webhook_url(url)
+    except WebhookDestinationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.post("", response_model=WebhookEndpointSecret, status_code=status.HTTP_201_CREATED)
+async def create_endpoint(
+    endpoint_data: WebhookEndpointCreate,
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> WebhookEndpointSecret:
+    """
+    Register a URL to receive job events.
+
+    Events are POSTed as JSON with an ``X-Pulse-Signature`` header
+    (``t=<unix time>,v1=<HMAC-SHA256 of "<t>.<body>">``) keyed with the
+    secret returned here; it is not shown again.
+
+    Args:
+        endpoint_data: Endpoint URL and events
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Created endpoint with its signing secret
+    """
+    count = await db.scalar(
+        select(func.count()).select_from(WebhookEndpoint).where(WebhookEndpoint.user_id == current_user.id)
+    )
+    if count >= MAX_ENDPOINTS_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_ENDPOINTS_PER_USER} webhook endpoints per user",
+        )
+    await check_endpoint_url(str(endpoint_data.url))
+
+    endpoint = WebhookEndpoint(
+        id=str(uuid.uuid4()),
+        user_id=current_user.id,
+        url=str(endpoint_data.url),
+        description=endpoint_data.description,
+        secret=generate_secret(),
+        events=[event.value for event in dict.fromkeys(endpoint_data.events)],
+        is_active=True,
+    )
+    db.add(endpoint)
+    await db.commit()
+    await db.refresh(endpoint)
+
+    return WebhookEndpointSecret.model_validate(endpoint)
+
+
+@router.get("", response_model=List[WebhookEndpointResponse])
+async def list_endpoints(
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> List[WebhookEndpointResponse]:
+    """
+    List the user's webhook endpoints.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Webhook endpoints
+    """
+    result = await db.execute(
+        select(WebhookEndpoint).
+        where(WebhookEndpoint.user_id == current_user.id).
+        order_by(WebhookEndpoint.created_at)
+    )
+    return [WebhookEndpointResponse.model_validate(endpoint) for endpoint in result.scalars()]
+
+
+@router.patch("/{endpoint_id}", response_model=WebhookEndpointResponse)
+async def update_endpoint(
+    endpoint_id: str,
+    endpoint_update: WebhookEndpointUpdate,
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> WebhookEndpointResponse:
+    """
+    Update a webhook endpoint (URL, events, or pausing it).
+
+    Deliveries queued while an endpoint is inactive are sent once it is
+    active again.
+
+    Args:
+        endpoint_id: Endpoint ID
+        endpoint_update: Fields to change
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Updated endpoint
+    """
+    endpoint = await get_user_endpoint(db, current_user.id, endpoint_id)
+
+    update_data = endpoint_update.model_dump(exclude_none=True)
+    if "url" in update_data:
+        update_data["url"] = str(endpoint_update.url)
+        await check_endpoint_url(update_data["url"])
+    if "events" in update_data:
+        update_data["events"] = [event.value for event in dict.fromkeys(endpoint_update.events)]
+    for field, value in update_data.items():
+        setattr(endpoint, field, value)
+
+    await db.commit()
+    await db.refresh(endpoint)
+
+    return WebhookEndpointResponse.model_validate(endpoint)
+
+
+@router.post("/{endpoint_id}/rotate-secret", response_model=WebhookEndpointSecret)
+async def rotate_endpoint_secret(
+    endpoint_id: str,
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> WebhookEndpointSecret:
+    """
+    Replace an endpoint's signing secret.
+
+    Args:
+        endpoint_id: Endpoint ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Endpoint with its new signing secret
+    """
+    endpoint = await get_user_endpoint(db, current_user.id, endpoint_id)
+    endpoint.secret = generate_secret()
+
+    await db.commit()
+    await db.refresh(endpoint)
+
+    return WebhookEndpointSecret.model_validate(endpoint)
+
+
+@router.delete("/{endpoint_id}")
+async def delete_endpoint(
+    endpoint_id: str,
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete a webhook endpoint and its delivery log.
+
+    Args:
+        endpoint_id: Endpoint ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Deletion confirmation
+    """
+    endpoint = await get_user_endpoint(db, current_user.id, endpoint_id)
+
+    await db.delete(endpoint)
+    await db.commit()
+
+    return {"message": "Webhook endpoint deleted successfully"}
+
+
+@router.get("/{endpoint_id}/deliveries", response_model=List[WebhookDeliveryResponse])
+async def list_deliveries(
+    endpoint_id: str,
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+    status_filter: Optional[DeliveryStatus] = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=100),
+) -> List[WebhookDeliveryResponse]:
+    """
+    List an endpoint's recent deliveries, newest first.
+
+    Args:
+        endpoint_id: Endpoint ID
+        current_user: Current authenticated user
+        db: Database session
+        status_filter: Optional delivery status filter
+        limit: Maximum number of results
+
+    Returns:
+        Deliveries with the outcome of their latest attempt
+    """
+    await get_user_endpoint(db, current_user.id, endpoint_id)
+
+    query = (
+        select(WebhookDelivery).
+        where(WebhookDelivery.endpoint_id == endpoint_id).
+        order_by(desc(WebhookDelivery.created_at)).
+        limit(limit)
+    )
+    if status_filter:
+        query = query.where(WebhookDelivery.status == status_filter)
+
+    result = await db.execute(query)
+    return [WebhookDeliveryResponse.model_validate(delivery) for delivery in result.scalars()]
+
+
+@router.post("/{endpoint_id}/deliveries/{delivery_id}/retry", response_model=WebhookDeliveryResponse)
+async def retry_delivery(
+    endpoint_id: str,
+    delivery_id: str,
+    current_user: User = Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+) -> WebhookDeliveryResponse:
+    """
+    Send a delivery again now (e.g. one that was given up on).
+
+    Args:
+        endpoint_id: Endpoint ID
+        delivery_id: Delivery ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Re-queued delivery
+    """
+    await get_user_endpoint(db, current_user.id, endpoint_id)
+
+    result = await db.execute(
+        select(WebhookDelivery).where(
+            WebhookDelivery.id == delivery_id, WebhookDelivery.endpoint_id == endpoint_id
+        )
+    )
+    delivery = result.scalar_one_or_none()
+
+    if not delivery:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Delivery not found",
+        )
+
+    delivery.status = DeliveryStatus.PENDING
+    delivery.attempts = 0
+    delivery.next_attempt_at = datetime.utcnow()
+
+    await db.commit()
+    await db.refresh(delivery)
+
+    return WebhookDeliveryResponse.model_validate(delivery)
@@ -10,6 +10,7 @@ class UserListResponse(BaseModel):
 
     users: List[dict]
     total: int
+    total_is_estimate: bool = False
     page: int
     per_page: int
 
@@ -30,6 +31,10 @@ class AnalyticsResponse(BaseModel):
     active_subscriptions: int
     total_revenue: float
     usage_stats: dict
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    granularity: Optional[str] = None
+    series: List[dict] = Field(default_factory=list)
 
 
 class UserUpdateRequest(BaseModel):
@@ -1,8 +1,10 @@
 """CV/Resume schemas."""
 
-from typing import Optional, List
+from typing import Optional, List, Union
 from pydantic import BaseModel, Field, EmailStr
 
+from .job import ExportFile
+
 
 class PersonalInfo(BaseModel):
     """Personal information section."""
@@ -55,16 +57,46 @@ class CVRequest(BaseModel):
     experience: List[Experience] = Field(default_factory=list)
     education: List[Education] = Field(default_factory=list)
     skills: List[Skill] = Field(default_factory=list)
-    format: str = Field("docx", description="Export format: docx or pdf")
+    format: Union[str, List[str]] = Field(
+        "docx", description="Export format: docx or pdf, or a list of formats rendered under one job"
+    )
     template: Optional[str] = Field("modern", description="Template style: modern, classic, minimal")
+    pdf_engine: Optional[str] = Field(None, description="PDF renderer: chromium or native (defaults to PDF_ENGINE)")
+
+    @property
+    def formats(self) -> List[str]:
+        """Requested formats, in order and without duplicates."""
+        formats = [self.format] if isinstance(self.format, str) else self.format
+        return list(dict.fromkeys(formats))
 
 
 class CVResponse(BaseModel):
     """CV generation response."""
 
     job_id: str
-    format: str
+    format: Union[str, List[str]]
     download_url: str
     s3_key: str
     expires_at: str
+    # Every requested format; the fields above describe the first
+    files: List[ExportFile] = Field(default_factory=list)
+
+
+
+class BulkCVRequest(BaseModel):
+    """Bulk CV generation request."""
+
+    cvs: List[CVRequest] = Field(..., min_length=1, description="CVs to render, each in its own format(s)")
+    delivery: str = Field("stream", description="ZIP delivery: stream (response body) or s3 (download URL)")
 
+
+class BulkCVResponse(BaseModel):
+    """Bulk CV generation response (S3 delivery)."""
+
+    job_id: str
+    cv_count: int
+    file_count: int
+    failed_count: int
+    download_url: str
+    s3_key: str
+    expires_at: str
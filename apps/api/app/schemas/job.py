@@ -1,8 +1,8 @@
 """Job schemas."""
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 from ..models.job import JobType, JobStatus
 
@@ -21,6 +21,7 @@ class JobUpdate(BaseModel):
     status: Optional[JobStatus] = None
     result_url: Optional[str] = None
     error_message: Optional[str] = None
+    progress: Optional[int] = Field(None, ge=0, le=100)
 
 
 class JobResponse(BaseModel):
@@ -34,6 +35,7 @@ class JobResponse(BaseModel):
     parameters: Optional[dict] = None
     result_url: Optional[str] = None
     error_message: Optional[str] = None
+    progress: Optional[int] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     model_name: Optional[str] = None
@@ -43,3 +45,42 @@ class JobResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+
+class JobStatusSummary(BaseModel):
+    """Schema for one job in a batch status response."""
+
+    id: str
+    status: JobStatus
+    progress: Optional[int] = None
+    result_url: Optional[str] = None
+    error_message: Optional[str] = None
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobStatusBatch(BaseModel):
+    """Schema for batch job status response."""
+
+    jobs: List[JobStatusSummary]
+    # Requested IDs that do not exist (or belong to another user)
+    missing: List[str] = []
+    # Pass back as ``since`` to long-poll for the next change
+    cursor: datetime
+
+
+class JobQueuedResponse(BaseModel):
+    """Schema for a job accepted for background processing."""
+
+    job_id: str
+    status: JobStatus = JobStatus.PENDING
+    message: str
+
+
+class ExportFile(BaseModel):
+    """One file of a CV or slide export."""
+
+    format: str
+    download_url: str
+    s3_key: str
@@ -1,8 +1,10 @@
 """Slide generation schemas."""
 
-from typing import Optional, List
+from typing import Optional, List, Union
 from pydantic import BaseModel, Field
 
+from .job import ExportFile
+
 
 class SlideContent(BaseModel):
     """Individual slide content."""
@@ -20,18 +22,29 @@ class SlideGenerationRequest(BaseModel):
     auto_generate: bool = Field(False, description="Use AI to generate slides from topic")
     num_slides: Optional[int] = Field(5, ge=3, le=20, description="Number of slides for auto-generation")
     template: Optional[str] = Field("modern", description="Template style: modern, classic, minimal")
-    format: str = Field("pptx", description="Export format: pptx or pdf")
+    format: Union[str, List[str]] = Field(
+        "pptx", description="Export format: pptx or pdf, or a list of formats rendered under one job"
+    )
+    pdf_engine: Optional[str] = Field(None, description="PDF renderer: chromium or native (defaults to PDF_ENGINE)")
+
+    @property
+    def formats(self) -> List[str]:
+        """Requested formats, in order and without duplicates."""
+        formats = [self.format] if isinstance(self.format, str) else self.format
+        return list(dict.fromkeys(formats))
 
 
 class SlideGenerationResponse(BaseModel):
     """Slide generation response."""
 
     job_id: str
-    format: str
+    format: Union[str, List[str]]
     download_url: str
     s3_key: str
     slide_count: int
     expires_at: str
+    # Every requested format; the fields above describe the first
+    files: List[ExportFile] = Field(default_factory=list)
 
 
 class OutlineGenerationRequest(BaseModel):
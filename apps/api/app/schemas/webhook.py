@@ -0,0 +1,73 @@
+"""Webhook schemas."""
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import AnyHttpUrl, BaseModel, ConfigDict, Field, field_validator
+
+from ..models.webhook import DeliveryStatus, WebhookEvent
+from ..utils.webhooks import check_webhook_url
+
+
+def _check_url(url: Optional[AnyHttpUrl]) -> Optional[AnyHttpUrl]:
+    """Refuse URLs events must not be sent to (see ``check_webhook_url``)."""
+    if url is not None:
+        check_webhook_url(str(url))
+    return url
+
+
+class WebhookEndpointCreate(BaseModel):
+    """Schema for registering a webhook endpoint."""
+
+    url: AnyHttpUrl
+    description: Optional[str] = Field(None, max_length=255)
+    events: List[WebhookEvent] = Field(default_factory=lambda: list(WebhookEvent), min_length=1)
+
+    check_url = field_validator("url")(_check_url)
+
+
+class WebhookEndpointUpdate(BaseModel):
+    """Schema for updating a webhook endpoint."""
+
+    url: Optional[AnyHttpUrl] = None
+    description: Optional[str] = Field(None, max_length=255)
+    events: Optional[List[WebhookEvent]] = Field(None, min_length=1)
+    is_active: Optional[bool] = None
+
+    check_url = field_validator("url")(_check_url)
+
+
+class WebhookEndpointResponse(BaseModel):
+    """Schema for webhook endpoint response."""
+
+    id: str
+    url: str
+    description: Optional[str] = None
+    events: List[WebhookEvent]
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class WebhookEndpointSecret(WebhookEndpointResponse):
+    """Endpoint with its signing secret (returned on creation and rotation only)."""
+
+    secret: str
+
+
+class WebhookDeliveryResponse(BaseModel):
+    """Schema for one entry of an endpoint's delivery log."""
+
+    id: str
+    job_id: Optional[str] = None
+    event_type: WebhookEvent
+    status: DeliveryStatus
+    attempts: int
+    last_status_code: Optional[int] = None
+    last_error: Optional[str] = None
+    next_attempt_at: datetime
+    created_at: datetime
+    delivered_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
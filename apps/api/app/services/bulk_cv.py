@@ -0,0 +1,357 @@
+"""Bulk CV Export - Many CVs rendered in parallel into one ZIP archive."""
+
+import os
+import re
+import json
+import asyncio
+import zipfile
+import tempfile
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import AsyncSessionLocal
+from ..models.job import JobStatus
+from ..schemas.cv import BulkCVRequest, BulkCVResponse, CVRequest
+from ..utils.cancellation import CancelScope, JobCancelled, check_cancelled
+from ..utils.logging import logger
+from ..utils.s3 import get_s3_manager
+from ..utils.usage_writer import record_usage_event, save_job_result
+from .generation import EXPORT_URL_EXPIRATION, render_cv
+
+# Worker handler of queued bulk jobs (the job itself is a CV job)
+BULK_CV_TASK = "cv_bulk"
+
+BULK_CV_DELIVERIES = ("stream", "s3")
+
+# CVs accepted in one bulk request
+BULK_CV_MAX_CVS = int(os.getenv("BULK_CV_MAX_CVS", "500"))
+
+# Documents of a batch rendering at once; bounds the finished documents
+# held in memory and keeps PDF renders within the browser pool's queue
+BULK_CV_CONCURRENCY = int(os.getenv("BULK_CV_CONCURRENCY", "8"))
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+class BulkCVStats:
+    """Outcome of a batch, filled in while its archive is written."""
+
+    def __init__(self):
+        self.total = 0
+        self.files = 0
+        self.failed = 0
+        # Indexes of the CVs with at least one rendered file
+        self.cvs: Set[int] = set()
+
+
+class _ZipSink:
+    """Write-only file for ZipFile, handing out what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def cv_filename(index: int, cv_request: CVRequest, format: str) -> str:
+    """
+    Name of a CV's file in the archive.
+
+    Args:
+        index: Position of the CV in the batch
+        cv_request: CV data
+        format: "docx" or "pdf"
+
+    Returns:
+        File name, e.g. ``0007-ada-lovelace.pdf``
+    """
+    slug = re.sub(r"[^a-z0-9]+", "-", cv_request.personal_info.full_name.lower()).strip("-")
+    return f"{index + 1:04d}-{slug or 'cv'}.{format}"
+
+
+async def _render_documents(
+    documents: List[Tuple[int, str, CVRequest, str]],
+    concurrency: int,
+) -> AsyncIterator[Tuple[int, str, Optional[bytes], Optional[str]]]:
+    """
+    Render documents with at most ``concurrency`` in flight, yielding them as they finish.
+
+    A document is only started once an earlier one has been handed on, so
+    a slow consumer (a slow download) holds back rendering rather than
+    letting finished documents pile up in memory.
+
+    Yields:
+        Tuples of (CV index, file name, document bytes or None, error or None)
+    """
+    pending = iter(documents)
+    running: Dict[asyncio.Task, Tuple[int, str]] = {}
+    try:
+        while True:
+            for index, filename, cv_request, format in islice(pending, concurrency - len(running)):
+                running[asyncio.create_task(render_cv(cv_request, format))] = (index, filename)
+            if not running:
+                return
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index, filename = running.pop(task)
+                content, error = None, None
+                try:
+                    content = task.result()
+                except Exception as e:
+                    logger.warning("Bulk CV render failed", extra={"file": filename, "error": str(e)})
+                    error = str(e) or type(e).__name__
+                yield index, filename, content, error
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+async def iter_cv_zip(
+    cv_requests: List[CVRequest],
+    stats: BulkCVStats,
+    on_progress: Optional[ProgressCallback] = None,
+    scope: Optional[CancelScope] = None,
+    concurrency: int = BULK_CV_CONCURRENCY,
+) -> AsyncIterator[bytes]:
+    """
+    Render CVs in parallel and stream them as a ZIP archive.
+
+    Each CV is rendered in each of its formats; DOCX files build in the
+    document pool and PDFs render in the browser pool (or a thread),
+    ``concurrency`` documents at a time. Files are stored uncompressed
+    (DOCX and PDF are compressed already) and written as they finish, so
+    memory use does not grow with the batch. CVs that fail to render are
+    listed in an ``errors.json`` entry instead.
+
+    Args:
+        cv_requests: CVs to render
+        stats: Filled in with the batch outcome
+        on_progress: Awaited with (documents done, documents total) after each document
+        scope: Cancel scope checked between documents
+        concurrency: Documents rendering at once
+
+    Yields:
+        Archive chunks
+
+    Raises:
+        JobCancelled: If the scope's job was cancelled
+    """
+    documents = [
+        (index, cv_filename(index, cv_request, format), cv_request, format)
+        for index, cv_request in enumerate(cv_requests)
+        for format in cv_request.formats
+    ]
+    stats.total = len(documents)
+    errors = []
+    sink = _ZipSink()
+
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        done = 0
+        async for index, filename, content, error in _render_documents(documents, concurrency):
+            if scope:
+                scope.check()
+            if error is None:
+                archive.writestr(filename, content)
+                stats.files += 1
+                stats.cvs.add(index)
+            else:
+                errors.append({"file": filename, "error": error})
+                stats.failed += 1
+
+            done += 1
+            if on_progress:
+                await on_progress(done, stats.total)
+
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+        if errors:
+            archive.writestr("errors.json", json.dumps(errors, indent=2))
+
+    yield sink.drain()
+
+
+def _progress_reporter(db: AsyncSession, job_id: str) -> ProgressCallback:
+    """Report a batch's progress on its job, once per percent."""
+    reported = [0]
+
+    async def report(done: int, total: int) -> None:
+        percent = done * 100 // total
+        # Completion sets 100
+        if reported[0] < percent < 100:
+            reported[0] = percent
+            await save_job_result(db, job_id, progress=percent)
+
+    return report
+
+
+async def _complete_job(
+    db: AsyncSession,
+    job_id: str,
+    user_id: str,
+    request: BulkCVRequest,
+    stats: BulkCVStats,
+    result_url: Optional[str] = None,
+) -> None:
+    """Complete a batch's job and record its usage."""
+    await save_job_result(
+        db,
+        job_id,
+        status=JobStatus.COMPLETED,
+        completed_at=datetime.utcnow(),
+        result_url=result_url,
+        parameters={
+            "bulk": True,
+            "delivery": request.delivery,
+            "cv_count": len(request.cvs),
+            "file_count": stats.files,
+            "failed_count": stats.failed,
+        },
+    )
+
+    await record_usage_event(
+        db,
+        user_id=user_id,
+        job_id=job_id,
+        event_type="cv_export",
+        tokens=0,  # CVs don't use tokens
+        event_metadata={
+            "bulk": True,
+            "delivery": request.delivery,
+            "file_count": stats.files,
+            "failed_count": stats.failed,
+        },
+        counter="cvs_generated",
+        amount=len(stats.cvs),
+    )
+
+
+async def _fail_job(job_id: str, error_message: str) -> None:
+    """Fail a batch's job from a fresh session."""
+    async with AsyncSessionLocal() as db:
+        await save_job_result(
+            db,
+            job_id,
+            status=JobStatus.FAILED,
+            error_message=error_message,
+            completed_at=datetime.utcnow(),
+        )
+
+
+async def stream_bulk_cv_job(job_id: str, user_id: str, request: BulkCVRequest) -> AsyncIterator[bytes]:
+    """
+    Stream a batch's ZIP archive as the response body, then complete its job.
+
+    Uses its own session, as the request's is closed before the response
+    streams. Progress is reported on the job while the archive streams.
+
+    Args:
+        job_id: Job ID
+        user_id: User ID
+        request: Bulk CV request
+
+    Yields:
+        Archive chunks
+    """
+    stats = BulkCVStats()
+    async with AsyncSessionLocal() as db:
+        try:
+            async with CancelScope(job_id, interrupt=False) as scope:
+                async for chunk in iter_cv_zip(
+                    request.cvs, stats, on_progress=_progress_reporter(db, job_id), scope=scope
+                ):
+                    yield chunk
+        except JobCancelled:
+            # The client is left with a truncated archive
+            logger.info("Bulk CV job cancelled while streaming", extra={"job_id": job_id})
+            return
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client disconnected; settle the job even if cancelled again
+            await asyncio.shield(_fail_job(job_id, "Download interrupted"))
+            raise
+        except Exception as e:
+            await _fail_job(job_id, str(e))
+            raise
+
+        if not stats.files:
+            await _fail_job(job_id, "No CV could be rendered")
+            return
+        await _complete_job(db, job_id, user_id, request, stats)
+
+
+async def run_bulk_cv_job(
+    db: AsyncSession,
+    job_id: str,
+    user_id: str,
+    request: BulkCVRequest,
+) -> BulkCVResponse:
+    """
+    Render a batch into a ZIP archive, upload it and complete its job.
+
+    The archive is spooled to a temporary file and uploaded with a
+    (multipart, for large archives) managed upload, so memory use does
+    not depend on batch size.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+        user_id: User ID
+        request: Bulk CV request
+
+    Returns:
+        Download URL and batch outcome
+
+    Raises:
+        ValueError: If no CV could be rendered
+    """
+    stats = BulkCVStats()
+    s3_manager = get_s3_manager()
+    s3_key = f"cvs/{user_id}/{job_id}/cvs.zip"
+
+    with tempfile.TemporaryFile() as archive:
+        async with CancelScope(job_id):
+            async for chunk in iter_cv_zip(request.cvs, stats, on_progress=_progress_reporter(db, job_id)):
+                archive.write(chunk)
+
+        await check_cancelled(db, job_id)
+        if not stats.files:
+            raise ValueError("No CV could be rendered")
+
+        # Upload to S3
+        archive.seek(0)
+        await asyncio.to_thread(
+            s3_manager.upload_fileobj,
+            archive,
+            s3_key,
+            "application/zip",
+            {"user_id": user_id, "job_id": job_id, "cv_count": str(len(request.cvs))},
+        )
+
+    download_url = s3_manager.generate_presigned_url(s3_key, expiration=EXPORT_URL_EXPIRATION)
+    await _complete_job(db, job_id, user_id, request, stats, result_url=download_url)
+
+    return BulkCVResponse(
+        job_id=job_id,
+        cv_count=len(request.cvs),
+        file_count=stats.files,
+        failed_count=stats.failed,
+        download_url=download_url,
+        s3_key=s3_key,
+        expires_at=(datetime.utcnow() + timedelta(seconds=EXPORT_URL_EXPIRATION)).isoformat(),
+    )
@@ -1,5 +1,6 @@
 """CV Generator Service - Creates DOCX and PDF resumes."""
 
+import asyncio
 import io
 import os
 from typing import Optional
@@ -7,9 +8,12 @@ from datetime import datetime
 from docx import Document
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from playwright.async_api import async_playwright
 
 from ..schemas.cv import CVRequest, PersonalInfo, Experience, Education, Skill
+from ..utils.browser_pool import get_browser_pool
+from ..utils.document_pool import get_document_pool
+from .native_pdf import get_native_pdf_renderer, resolve_pdf_engine
+from .templates import get_template_registry
 
 
 class CVGenerator:
@@ -22,7 +26,19 @@ class CVGenerator:
 
     async def generate_docx(self, cv_data: CVRequest) -> bytes:
         """
-        Generate CV in DOCX format.
+        Generate CV in DOCX format, in the document process pool.
+        
+        Args:
+            cv_data: CV data
+            
+        Returns:
+            DOCX file as bytes
+        """
+        return await get_document_pool().run(build_cv_docx, cv_data)
+
+    def build_docx(self, cv_data: CVRequest) -> bytes:
+        """
+        Build a CV in DOCX format (CPU-bound; see ``generate_docx``).
         
         Args:
             cv_data: CV data
@@ -214,197 +230,53 @@ class CVGenerator:
             skills_text = ", ".join(skill_group.skills)
             skill_para.add_run(skills_text)
 
-    async def generate_pdf(self, cv_data: CVRequest) -> bytes:
+    async def generate_pdf(self, cv_data: CVRequest, engine: Optional[str] = None) -> bytes:
         """
-        Generate CV in PDF format using Playwright.
+        Generate CV in PDF format using Playwright or the native renderer.
         
         Args:
             cv_data: CV data
+            engine: "chromium" or "native" (defaults to PDF_ENGINE; the native
+                engine draws the modern layout only)
             
         Returns:
             PDF file as bytes
         """
+        if resolve_pdf_engine(engine) == "native":
+            return await asyncio.to_thread(get_native_pdf_renderer().render_cv, cv_data)
+        
         # Generate HTML
         html_content = self._generate_html(cv_data)
         
-        # Convert HTML to PDF using Playwright
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            page = await browser.new_page()
-            await page.set_content(html_content)
-            pdf_bytes = await page.pdf(
-                format='A4',
-                margin={
+        # Convert HTML to PDF on a pooled browser
+        pdf_bytes = await get_browser_pool().render_pdf(
+            html_content,
+            pdf_options={
+                'format': 'A4',
+                'margin': {
                     'top': '0.5in',
                     'right': '0.75in',
                     'bottom': '0.5in',
                     'left': '0.75in',
-                }
-            )
-            await browser.close()
+                },
+            },
+        )
         
         return pdf_bytes
 
     def _generate_html(self, cv_data: CVRequest) -> str:
-        """Generate HTML for PDF conversion."""
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <style>
-        body {{
-            font-family: 'Calibri', 'Arial', sans-serif;
-            font-size: 11pt;
-            line-height: 1.6;
-            color: #333;
-        }}
-        h1 {{
-            color: #1f4e79;
-            font-size: 24pt;
-            text-align: center;
-            margin-bottom: 5px;
-        }}
-        h2 {{
-            color: #1f4e79;
-            font-size: 14pt;
-            border-bottom: 2px solid #1f4e79;
-            padding-bottom: 3px;
-            margin-top: 20px;
-            margin-bottom: 10px;
-        }}
-        .contact {{
-            text-align: center;
-            font-size: 10pt;
-            margin-bottom: 5px;
-        }}
-        .links {{
-            text-align: center;
-            font-size: 9pt;
-            color: #666;
-            margin-bottom: 20px;
-        }}
-        .job-title {{
-            font-weight: bold;
-            font-size: 12pt;
-        }}
-        .company {{
-            font-style: italic;
-        }}
-        .date {{
-            color: #666;
-        }}
-        ul {{
-            margin: 5px 0;
-            padding-left: 20px;
-        }}
-        li {{
-            margin-bottom: 3px;
-        }}
-        .section-item {{
-            margin-bottom: 15px;
-        }}
-    </style>
-</head>
-<body>
-"""
-        
-        # Personal Info
-        html += f"<h1>{cv_data.personal_info.full_name}</h1>\n"
-        
-        contact_parts = [cv_data.personal_info.email]
-        if cv_data.personal_info.phone:
-            contact_parts.append(cv_data.personal_info.phone)
-        if cv_data.personal_info.location:
-            contact_parts.append(cv_data.personal_info.location)
-        html += f"<div class='contact'>{' | '.join(contact_parts)}</div>\n"
-        
-        if cv_data.personal_info.website or cv_data.personal_info.linkedin or cv_data.personal_info.github:
-            link_parts = []
-            if cv_data.personal_info.website:
-                link_parts.append(cv_data.personal_info.website)
-            if cv_data.personal_info.linkedin:
-                link_parts.append(f"LinkedIn: {cv_data.personal_info.linkedin}")
-            if cv_data.personal_info.github:
-                link_parts.append(f"GitHub: {cv_data.personal_info.github}")
-            html += f"<div class='links'>{' | '.join(link_parts)}</div>\n"
-        
-        # Summary
-        if cv_data.summary:
-            html += "<h2>Professional Summary</h2>\n"
-            html += f"<p>{cv_data.summary}</p>\n"
-        
-        # Experience
-        if cv_data.experience:
-            html += "<h2>Experience</h2>\n"
-            for exp in cv_data.experience:
-                html += "<div class='section-item'>\n"
-                html += f"<div class='job-title'>{exp.job_title}</div>\n"
-                
-                company_line = f"<span class='company'>{exp.company}</span>"
-                if exp.location:
-                    company_line += f", {exp.location}"
-                
-                date_str = exp.start_date
-                if exp.end_date:
-                    date_str += f" - {exp.end_date}"
-                company_line += f" | <span class='date'>{date_str}</span>"
-                
-                html += f"<div>{company_line}</div>\n"
-                
-                if exp.description:
-                    html += f"<p>{exp.description}</p>\n"
-                
-                if exp.responsibilities:
-                    html += "<ul>\n"
-                    for resp in exp.responsibilities:
-                        html += f"<li>{resp}</li>\n"
-                    html += "</ul>\n"
-                
-                html += "</div>\n"
-        
-        # Education
-        if cv_data.education:
-            html += "<h2>Education</h2>\n"
-            for edu in cv_data.education:
-                html += "<div class='section-item'>\n"
-                html += f"<div class='job-title'>{edu.degree}</div>\n"
-                
-                inst_line = f"<span class='company'>{edu.institution}</span>"
-                if edu.location:
-                    inst_line += f", {edu.location}"
-                
-                if edu.start_date or edu.end_date:
-                    date_str = edu.start_date or ""
-                    if edu.end_date:
-                        date_str += f" - {edu.end_date}" if date_str else edu.end_date
-                    inst_line += f" | <span class='date'>{date_str}</span>"
-                
-                html += f"<div>{inst_line}</div>\n"
-                
-                if edu.gpa:
-                    html += f"<p>GPA: {edu.gpa}</p>\n"
-                
-                if edu.achievements:
-                    html += "<ul>\n"
-                    for achievement in edu.achievements:
-                        html += f"<li>{achievement}</li>\n"
-                    html += "</ul>\n"
-                
-                html += "</div>\n"
-        
-        # Skills
-        if cv_data.skills:
-            html += "<h2>Skills</h2>\n"
-            for skill_group in cv_data.skills:
-                if skill_group.category:
-                    html += f"<p><strong>{skill_group.category}:</strong> {', '.join(skill_group.skills)}</p>\n"
-                else:
-                    html += f"<p>{', '.join(skill_group.skills)}</p>\n"
-        
-        html += """
-</body>
-</html>
-"""
-        return html
+        """Generate HTML for PDF conversion, in the CV's template."""
+        return get_template_registry().render("cv", cv_data.template, cv=cv_data)
+
+
+def build_cv_docx(cv_data: CVRequest) -> bytes:
+    """
+    Build a CV in DOCX format; runs in a document pool process.
+
+    Args:
+        cv_data: CV data
 
+    Returns:
+        DOCX file as bytes
+    """
+    return CVGenerator().build_docx(cv_data)
@@ -0,0 +1,595 @@
+"""Generation work shared by the HTTP endpoints and the job worker."""
+
+import os
+import json
+import asyncio
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.job import JobStatus, JobType
+from ..providers import get_provider, ProviderType
+from ..providers.google_imagen_provider import GoogleImagenProvider
+from ..providers.image_types import ImageRequest
+from ..providers.types import ChatRequest, ChatMessage, ChatRole
+from ..schemas.cv import CVRequest, CVResponse
+from ..schemas.image import GeneratedImageInfo, ImageGenerationRequest, ImageGenerationResponse
+from ..schemas.job import ExportFile
+from ..schemas.slides import SlideContent, SlideGenerationRequest, SlideGenerationResponse
+from ..utils.cancellation import CancelScope, JobCancelled, check_cancelled
+from ..utils.s3 import get_s3_manager
+from ..utils.task_queue import enqueue_job_task
+from ..utils.usage_writer import record_usage_event, save_job_result
+from .cv_generator import CVGenerator
+from .render_cache import cv_render_digest, export_key, find_cached_export, slides_render_digest
+from .slide_generator import SlideGenerator
+
+# Presigned download URLs for exports are valid for 7 days
+EXPORT_URL_EXPIRATION = 604800
+
+EXPORT_CONTENT_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "pdf": "application/pdf",
+}
+
+
+async def queue_job(
+    db: AsyncSession,
+    job_id: str,
+    user_id: str,
+    job_type: JobType,
+    request: BaseModel,
+    task: Optional[str] = None,
+) -> None:
+    """
+    Hand a pending job to the job worker.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+        user_id: User ID
+        job_type: Job type (selects the worker handler)
+        request: Generation request the worker replays
+        task: Worker handler to run instead of the job type's
+
+    Raises:
+        HTTPException: If the job could not be queued (the job is failed)
+    """
+    try:
+        await enqueue_job_task(task or job_type.value, job_id, user_id, request.model_dump(mode="json"))
+    except Exception as e:
+        await save_job_result(
+            db,
+            job_id,
+            status=JobStatus.FAILED,
+            error_message=str(e),
+            completed_at=datetime.utcnow(),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to queue job: {str(e)}",
+        )
+
+
+def get_image_provider(provider: str) -> GoogleImagenProvider:
+    """
+    Get image generation provider.
+
+    Args:
+        provider: Provider name
+
+    Returns:
+        Image provider instance
+
+    Raises:
+        HTTPException: If provider not supported or not configured
+    """
+    if provider == "google":
+        sa_json = os.getenv("GCP_VERTEX_SA_JSON")
+        project_id = os.getenv("GCP_VERTEX_PROJECT_ID")
+        location = os.getenv("GCP_VERTEX_LOCATION", "us-central1")
+
+        if not sa_json or not project_id:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Google Vertex AI not configured",
+            )
+
+        return GoogleImagenProvider(
+            service_account_json=sa_json,
+            project_id=project_id,
+            location=location,
+        )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported provider: {provider}",
+        )
+
+
+async def generate_outline_with_ai(
+    topic: str,
+    num_slides: int,
+    audience: str = None,
+    style: str = None,
+) -> list[SlideContent]:
+    """
+    Generate presentation outline using AI.
+
+    Args:
+        topic: Presentation topic
+        num_slides: Number of slides to generate
+        audience: Target audience
+        style: Presentation style
+
+    Returns:
+        List of slide contents
+    """
+    # Build prompt for AI
+    prompt = f"""Create a presentation outline for the following topic: "{topic}"
+
+Requirements:
+- Generate exactly {num_slides} slides (excluding title slide)
+- Each slide should have a clear title and 3-5 bullet points
+- Make it engaging and informative
+"""
+
+    if audience:
+        prompt += f"- Target audience: {audience}\n"
+
+    if style:
+        prompt += f"- Presentation style: {style}\n"
+
+    prompt += """
+Format your response as JSON with this structure:
+{
+  "slides": [
+    {
+      "title": "Slide Title",
+      "content": ["Bullet point 1", "Bullet point 2", "Bullet point 3"]
+    }
+  ]
+}
+
+Respond ONLY with valid JSON, no additional text."""
+
+    # Use OpenAI for outline generation (or fallback to Anthropic)
+    try:
+        provider = get_provider(ProviderType.OPENAI)
+        model = "gpt-3.5-turbo"
+    except:
+        provider = get_provider(ProviderType.ANTHROPIC)
+        model = "claude-3-haiku-20240307"
+
+    # Get AI response
+    chat_request = ChatRequest(
+        messages=[ChatMessage(role=ChatRole.USER, content=prompt)],
+        model=model,
+        temperature=0.7,
+        max_tokens=2000,
+        stream=False,
+    )
+
+    response = await provider.chat_completion(chat_request)
+
+    # Parse JSON response
+    try:
+        # Extract JSON from response (might have markdown code blocks)
+        content = response.content.strip()
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
+
+        data = json.loads(content)
+        slides = [SlideContent(**slide) for slide in data["slides"]]
+        return slides[:num_slides]  # Ensure we don't exceed requested number
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to parse AI response: {str(e)}",
+        )
+
+
+async def resolve_slides(slide_request: SlideGenerationRequest) -> Tuple[str, List[SlideContent]]:
+    """
+    Title and slides of a presentation, generating the outline if asked to.
+
+    Args:
+        slide_request: Slide generation request
+
+    Returns:
+        Tuple of (title, slides)
+
+    Raises:
+        ValueError: If there are no slides to generate
+    """
+    if slide_request.auto_generate and slide_request.topic:
+        title = slide_request.topic
+        slides = await generate_outline_with_ai(
+            topic=slide_request.topic,
+            num_slides=slide_request.num_slides or 5,
+        )
+    else:
+        title = slide_request.topic or "Presentation"
+        slides = slide_request.outline or []
+
+    if not slides:
+        raise ValueError("No slides to generate")
+    return title, slides
+
+
+async def render_cv(cv_request: CVRequest, format: str) -> bytes:
+    """
+    Render a CV in one format.
+
+    Args:
+        cv_request: CV data
+        format: "docx" or "pdf"
+
+    Returns:
+        Document bytes
+    """
+    cv_generator = CVGenerator()
+    if format == "docx":
+        return await cv_generator.generate_docx(cv_request)
+    return await cv_generator.generate_pdf(cv_request, engine=cv_request.pdf_engine)
+
+
+async def export_files(
+    db: AsyncSession,
+    job_id: str,
+    user_id: str,
+    prefix: str,
+    name: str,
+    digests: Dict[str, str],
+    render: Callable[[str], Awaitable[bytes]],
+    metadata: Dict[str, str],
+) -> Tuple[List[ExportFile], bool]:
+    """
+    Render, upload and sign the files of one export, one per format.
+
+    Formats the user exported identically before are reused (see
+    services/render_cache.py). The others are rendered concurrently (DOCX
+    and PPTX build in the document pool while PDFs render in the browser
+    pool or a thread) and uploaded concurrently.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+        user_id: User ID
+        prefix: Export key prefix ("cvs" or "slides")
+        name: File name without extension
+        digests: Render digest of each requested format, in order
+        render: Renders the document in a format
+        metadata: S3 object metadata
+
+    Returns:
+        Tuple of (files in requested order, whether all were cached)
+
+    Raises:
+        JobCancelled: If the job was cancelled
+    """
+    s3_manager = get_s3_manager()
+    keys = {
+        format: export_key(prefix, user_id, job_id, digest, f"{name}.{format}")
+        for format, digest in digests.items()
+    }
+
+    hits = await asyncio.gather(
+        *(asyncio.to_thread(find_cached_export, s3_manager, key) for key in keys.values())
+    )
+    missing = [format for format, hit in zip(keys, hits, strict=True) if not hit]
+
+    async with CancelScope(job_id):
+        rendered = await asyncio.gather(*(render(format) for format in missing))
+
+    await check_cancelled(db, job_id)
+
+    # Upload to S3
+    await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                s3_manager.upload_file,
+                file_bytes=file_bytes,
+                key=keys[format],
+                content_type=EXPORT_CONTENT_TYPES[format],
+                metadata=metadata,
+            )
+            for format, file_bytes in zip(missing, rendered, strict=True)
+        )
+    )
+
+    files = [
+        ExportFile(
+            format=format,
+            download_url=s3_manager.generate_presigned_url(key, expiration=EXPORT_URL_EXPIRATION),
+            s3_key=key,
+        )
+        for format, key in keys.items()
+    ]
+    return files, not missing
+
+
+async def run_cv_job(
+    db: AsyncSession,
+    job_id: str,
+    user_id: str,
+    cv_request: CVRequest,
+) -> CVResponse:
+    """
+    Render a CV in each requested format, upload it and complete its job.
+
+    The job's result URL is the first format's; its parameters list every file.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+        user_id: User ID
+        cv_request: CV data and format(s)
+
+    Returns:
+        Download URLs and metadata
+    """
+    async def render(format: str) -> bytes:
+        return await render_cv(cv_request, format)
+
+    files, cached = await export_files(
+        db,
+        job_id,
+        user_id,
+        prefix="cvs",
+        name="cv",
+        digests={format: cv_render_digest(cv_request, format) for format in cv_request.formats},
+        render=render,
+        metadata={
+            "user_id": user_id,
+            "job_id": job_id,
+            "name": cv_request.personal_info.full_name,
+        },
+    )
+
+    # Update job
+    await save_job_result(
+        db,
+        job_id,
+        status=JobStatus.COMPLETED,
+        completed_at=datetime.utcnow(),
+        result_url=files[0].download_url,
+        parameters={"format": cv_request.format, "files": [file.model_dump() for file in files]},
+    )
+
+    # Record usage
+    await record_usage_event(
+        db,
+        user_id=user_id,
+        job_id=job_id,
+        event_type="cv_export",
+        tokens=0,  # CVs don't use tokens
+        event_metadata={
+            "format": cv_request.format,
+            "cached": cached,
+        },
+        counter="cvs_generated",
+        amount=1,
+    )
+
+    return CVResponse(
+        job_id=job_id,
+        format=cv_request.format,
+        download_url=files[0].download_url,
+        s3_key=files[0].s3_key,
+        expires_at=(datetime.utcnow() + timedelta(seconds=EXPORT_URL_EXPIRATION)).isoformat(),
+        files=files,
+    )
+
+
+async def run_slides_job(
+    db: AsyncSession,
+    job_id: str,
+    user_id: str,
+    slide_request: SlideGenerationRequest,
+) -> SlideGenerationResponse:
+    """
+    Render a presentation in each requested format, upload it and complete its job.
+
+    The outline is resolved (generated, if asked to) once for all formats.
+    The job's result URL is the first format's; its parameters list every file.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+        user_id: User ID
+        slide_request: Slide generation request
+
+    Returns:
+        Download URLs and metadata
+    """
+    slide_generator = SlideGenerator()
+
+    async with CancelScope(job_id):
+        title, slides = await resolve_slides(slide_request)
+
+    async def render(format: str) -> bytes:
+        if format == "pptx":
+            return await slide_generator.generate_pptx(title, slides, slide_request.template)
+        return await slide_generator.generate_pdf(
+            title, slides, template=slide_request.template, engine=slide_request.pdf_engine
+        )
+
+    files, cached = await export_files(
+        db,
+        job_id,
+        user_id,
+        prefix="slides",
+        name="presentation",
+        digests={
+            format: slides_render_digest(title, slides, slide_request.template, format, slide_request.pdf_engine)
+            for format in slide_request.formats
+        },
+        render=render,
+        metadata={
+            "user_id": user_id,
+            "job_id": job_id,
+            "title": title,
+            "slide_count": str(len(slides)),
+        },
+    )
+
+    # Update job
+    await save_job_result(
+        db,
+        job_id,
+        status=JobStatus.COMPLETED,
+        completed_at=datetime.utcnow(),
+        result_url=files[0].download_url,
+        parameters={
+            "format": slide_request.format,
+            "slide_count": len(slides),
+            "files": [file.model_dump() for file in files],
+        },
+    )
+
+    # Record usage
+    await record_usage_event(
+        db,
+        user_id=user_id,
+        job_id=job_id,
+        event_type="slides_export",
+        tokens=0,
+        event_metadata={
+            "format": slide_request.format,
+            "slide_count": len(slides),
+            "cached": cached,
+        },
+        counter="slides_generated",
+        amount=1,
+    )
+
+    return SlideGenerationResponse(
+        job_id=job_id,
+        format=slide_request.format,
+        download_url=files[0].download_url,
+        s3_key=files[0].s3_key,
+        slide_count=len(slides),
+        expires_at=(datetime.utcnow() + timedelta(seconds=EXPORT_URL_EXPIRATION)).isoformat(),
+        files=files,
+    )
+
+
+async def run_image_job(
+    db: AsyncSession,
+    job_id: str,
+    user_id: str,
+    request: ImageGenerationRequest,
+) -> ImageGenerationResponse:
+    """
+    Generate images, upload them and complete their job.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+        user_id: User ID
+        request: Image generation request
+
+    Returns:
+        Generated images with URLs
+    """
+    provider = get_image_provider(request.provider)
+
+    image_request = ImageRequest(
+        prompt=request.prompt,
+        negative_prompt=request.negative_prompt,
+        count=request.count,
+        size=request.size,
+        seed=request.seed,
+        guidance_scale=request.guidance_scale,
+    )
+
+    # Generate images (a cancel aborts the provider request)
+    async with CancelScope(job_id):
+        image_bytes_list = await provider.generate_images(image_request)
+
+    if not image_bytes_list:
+        raise Exception("No images generated")
+
+    try:
+        await check_cancelled(db, job_id)
+    except JobCancelled:
+        # Cancelled once the provider had already generated them: settle
+        # what was consumed, but skip the upload
+        await record_usage_event(
+            db,
+            user_id=user_id,
+            job_id=job_id,
+            event_type="image_generation",
+            event_metadata={
+                "provider": request.provider,
+                "model": provider.get_model_name(),
+                "image_count": len(image_bytes_list),
+                "cancelled": True,
+            },
+            counter="images_generated",
+            amount=len(image_bytes_list),
+        )
+        raise
+
+    # Upload to S3
+    s3_manager = get_s3_manager()
+    generated_images: List[GeneratedImageInfo] = []
+
+    for i, image_bytes in enumerate(image_bytes_list):
+        s3_key, presigned_url = s3_manager.upload_image(
+            image_bytes=image_bytes,
+            user_id=user_id,
+            job_id=job_id,
+            image_index=i,
+            extension="png",
+        )
+
+        generated_images.append(
+            GeneratedImageInfo(
+                url=presigned_url,
+                s3_key=s3_key,
+                size=request.size.value,
+                seed=request.seed + i if request.seed else None,
+            )
+        )
+
+    # Update job
+    await save_job_result(
+        db,
+        job_id,
+        status=JobStatus.COMPLETED,
+        completed_at=datetime.utcnow(),
+        result_url=generated_images[0].url if generated_images else None,
+        model_name=provider.get_model_name(),
+    )
+
+    # Record usage
+    await record_usage_event(
+        db,
+        user_id=user_id,
+        job_id=job_id,
+        event_type="image_generation",
+        tokens=0,  # Images don't use tokens
+        event_metadata={
+            "provider": request.provider,
+            "model": provider.get_model_name(),
+            "image_count": len(generated_images),
+        },
+        counter="images_generated",
+        amount=len(generated_images),
+    )
+
+    return ImageGenerationResponse(
+        job_id=job_id,
+        images=generated_images,
+        provider=request.provider,
+        model=provider.get_model_name(),
+        prompt=request.prompt,
+        count=len(generated_images),
+    )
@@ -0,0 +1,523 @@
+"""Native PDF Renderer - Draws CV and slide PDFs directly, without a browser."""
+
+import os
+import re
+import copy
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fpdf import FPDF
+from fpdf.fonts import SubsetMap, TTFFont
+from fontTools.ttLib import TTFont
+
+from ..schemas.cv import CVRequest
+from ..schemas.slides import SlideContent
+
+# PDF engines: "chromium" renders the HTML layouts on the browser pool,
+# "native" draws the same layouts with this module
+PDF_ENGINES = ("chromium", "native")
+DEFAULT_PDF_ENGINE = os.getenv("PDF_ENGINE", "chromium")
+
+# Where to look for TrueType fonts (embedded as subsets)
+PDF_FONT_DIRS = os.getenv(
+    "PDF_FONT_DIRS",
+    os.pathsep.join([
+        "/usr/share/fonts/truetype/liberation",
+        "/usr/share/fonts/truetype/dejavu",
+    ]),
+).split(os.pathsep)
+
+# Candidate families in order of preference, by style ("", "B", "I", "BI").
+# Liberation Sans is metric-compatible with Arial, the HTML layouts' fallback
+# (Calibri is not installed in the container), so line breaks match Chromium.
+FONT_FAMILIES: List[Tuple[str, Dict[str, str]]] = [
+    ("LiberationSans", {
+        "": "LiberationSans-Regular.ttf",
+        "B": "LiberationSans-Bold.ttf",
+        "I": "LiberationSans-Italic.ttf",
+        "BI": "LiberationSans-BoldItalic.ttf",
+    }),
+    ("DejaVuSans", {
+        "": "DejaVuSans.ttf",
+        "B": "DejaVuSans-Bold.ttf",
+        "I": "DejaVuSans-Oblique.ttf",
+        "BI": "DejaVuSans-BoldOblique.ttf",
+    }),
+]
+
+# CSS px in PDF points (Chromium prints at 96 px per inch)
+PX = 0.75
+
+Color = Tuple[int, int, int]
+TEXT = (51, 51, 51)        # #333
+MUTED = (102, 102, 102)    # #666
+ACCENT = (31, 78, 121)     # #1f4e79
+WHITE = (255, 255, 255)
+GRADIENT = ((102, 126, 234), (118, 75, 162))  # #667eea -> #764ba2
+
+# A run of text in one style: (text, style, size, color)
+Run = Tuple[str, str, float, Color]
+
+
+class FontSet:
+    """The TrueType files of one family, with the metrics layout needs."""
+
+    def __init__(self, family: str, files: Dict[str, str]):
+        """
+        Initialize font set.
+
+        Args:
+            family: Family name
+            files: Font file per style ("" and "B" at least)
+        """
+        self.family = family
+        self.files = dict(files)
+        # Missing slanted styles fall back to the upright ones
+        self.files.setdefault("I", self.files[""])
+        self.files.setdefault("BI", self.files["B"])
+        self.ascent, self.descent, self.line_gap = font_metrics(self.files[""])
+
+    @property
+    def normal_line_height(self) -> float:
+        """CSS ``line-height: normal`` as a multiple of the font size."""
+        return self.ascent + self.descent + self.line_gap
+
+    def style_for(self, style: str) -> str:
+        """The registered style drawing ``style`` (styles sharing a file share one)."""
+        for candidate in ("", "B", "I", "BI"):
+            if self.files[candidate] == self.files[style]:
+                return candidate
+        return style
+
+
+@lru_cache(maxsize=None)
+def font_metrics(path: str) -> Tuple[float, float, float]:
+    """Ascent, descent and line gap of a font, in em."""
+    font = TTFont(path, lazy=True)
+    hhea = font["hhea"]
+    units = font["head"].unitsPerEm
+    return hhea.ascent / units, abs(hhea.descent) / units, hhea.lineGap / units
+
+
+@lru_cache(maxsize=None)
+def find_font_set(font_dirs: Tuple[str, ...] = tuple(PDF_FONT_DIRS)) -> Optional[FontSet]:
+    """
+    Find the preferred installed font family.
+
+    Args:
+        font_dirs: Directories to search
+
+    Returns:
+        Font set, or None if no candidate family is installed
+    """
+    for family, styles in FONT_FAMILIES:
+        files = {}
+        for style, filename in styles.items():
+            for directory in font_dirs:
+                path = os.path.join(directory, filename)
+                if os.path.exists(path):
+                    files[style] = path
+                    break
+        if "" in files and "B" in files:
+            return FontSet(family, files)
+    return None
+
+
+@lru_cache(maxsize=None)
+def _parsed_font(path: str, style: str) -> TTFFont:
+    return TTFFont(FPDF(), path, "", style)
+
+
+def add_cached_font(pdf: FPDF, family: str, style: str, path: str) -> None:
+    """
+    Register a TrueType font like ``pdf.add_font``, parsing the file only once per process.
+
+    Parsing widths and the character map dominates the cost of a small
+    document, so documents share the parsed font and only get their own
+    glyph subset and ``TTFont`` (which output subsets in place).
+
+    Args:
+        pdf: Document
+        family: Family name
+        style: "", "B", "I" or "BI"
+        path: Font file
+    """
+    font = copy.copy(_parsed_font(path, style))
+    font.i = len(pdf.fonts) + 1
+    font.fontkey = f"{family.lower()}{style}"
+    font.ttfont = TTFont(path, recalcTimestamp=False, fontNumber=0, lazy=True)
+    font.missing_glyphs = []
+    reserved = "\x00 \r\n"
+    if pdf.str_alias_nb_pages:
+        reserved += "0123456789" + pdf.str_alias_nb_pages
+    font.subset = SubsetMap(font, [ord(char) for char in reserved])
+    pdf.fonts[font.fontkey] = font
+
+
+def resolve_pdf_engine(engine: Optional[str]) -> str:
+    """
+    The engine a PDF is rendered with.
+
+    Args:
+        engine: Engine requested for this document, if any
+
+    Returns:
+        Requested engine, or the PDF_ENGINE default
+    """
+    return engine or DEFAULT_PDF_ENGINE
+
+
+class _Document:
+    """An FPDF document with block layout: wrapped text, collapsing margins, page breaks."""
+
+    def __init__(self, fonts: Optional[FontSet], orientation: str, margins: Tuple[float, float, float, float]):
+        self.pdf = FPDF(orientation=orientation, unit="pt", format="A4")
+        self.pdf.set_auto_page_break(False)
+        self.pdf.set_margins(0, 0, 0)
+        self.fonts = fonts
+        if fonts:
+            self.family = fonts.family
+            self.ascent, self.descent = fonts.ascent, fonts.descent
+            self.normal_line_height = fonts.normal_line_height
+        else:
+            # Core Helvetica: no embedding, Latin-1 only
+            self.family = "helvetica"
+            self.ascent, self.descent = 0.718, 0.207
+            self.normal_line_height = 1.15
+
+        self.top, self.right, self.bottom, self.left = margins
+        self.width = self.pdf.w - self.left - self.right
+        self.y = self.top
+        # Margin waiting to collapse with the next block's top margin
+        self.pending_margin = 0.0
+
+    def text_of(self, text: str) -> str:
+        if self.fonts:
+            return text
+        return text.encode("latin-1", "replace").decode("latin-1")
+
+    def set_font(self, style: str, size: float) -> None:
+        if self.fonts:
+            # Fonts are embedded only if the document uses them
+            style = self.fonts.style_for(style)
+            if f"{self.family.lower()}{style}" not in self.pdf.fonts:
+                add_cached_font(self.pdf, self.family, style, self.fonts.files[style])
+        self.pdf.set_font(self.family, style, size)
+
+    def measure(self, text: str, style: str, size: float) -> float:
+        self.set_font(style, size)
+        return self.pdf.get_string_width(text)
+
+    def add_page(self) -> None:
+        self.pdf.add_page()
+        self.y = self.top
+        self.pending_margin = 0.0
+
+    def margin(self, amount: float) -> None:
+        """Add a block margin (adjacent margins collapse to the largest)."""
+        self.pending_margin = max(self.pending_margin, amount)
+
+    def start_block(self, margin_top: float) -> None:
+        self.margin(margin_top)
+        self.y += self.pending_margin
+        self.pending_margin = 0.0
+
+    def wrap(self, runs: Sequence[Run], width: float) -> List[List[Tuple[str, str, float, Color, float]]]:
+        """Break runs into lines of at most ``width``, at spaces (or anywhere in over-long words)."""
+        lines: List[List[Tuple[str, str, float, Color, float]]] = [[]]
+        line_width = 0.0
+        space: Optional[Tuple[str, str, float, Color, float]] = None
+
+        for text, style, size, color in runs:
+            for token in re.findall(r"\S+|\s+", self.text_of(text)):
+                if token.isspace():
+                    if lines[-1]:
+                        space = (" ", style, size, color, self.measure(" ", style, size))
+                    continue
+
+                token_width = self.measure(token, style, size)
+                extra = space[4] if space else 0.0
+                if lines[-1] and line_width + extra + token_width > width:
+                    lines.append([])
+                    line_width, space, extra = 0.0, None, 0.0
+
+                while token_width > width and len(token) > 1:
+                    # A word wider than the line: break it where it overflows
+                    cut = len(token) - 1
+                    while cut > 1 and self.measure(token[:cut], style, size) > width - line_width:
+                        cut -= 1
+                    head = token[:cut]
+                    lines[-1].append((head, style, size, color, self.measure(head, style, size)))
+                    lines.append([])
+                    line_width, space, extra = 0.0, None, 0.0
+                    token = token[cut:]
+                    token_width = self.measure(token, style, size)
+
+                if space:
+                    lines[-1].append(space)
+                    line_width += space[4]
+                    space = None
+                lines[-1].append((token, style, size, color, token_width))
+                line_width += token_width
+
+        return [line for line in lines if line] or [[]]
+
+    def paragraph(
+        self,
+        runs: Sequence[Run],
+        line_height: float,
+        margin_top: float = 0.0,
+        margin_bottom: float = 0.0,
+        align: str = "L",
+        indent: float = 0.0,
+        marker: Optional[Tuple[float, float, Color]] = None,
+    ) -> None:
+        """
+        Lay out a block of text, continuing on a new page when it runs out.
+
+        Args:
+            runs: Text runs
+            line_height: Line box height
+            margin_top: Block top margin
+            margin_bottom: Block bottom margin
+            align: "L" or "C"
+            indent: Left indent of the text
+            marker: List bullet as (center offset from the text, diameter, color)
+        """
+        self.start_block(margin_top)
+        size = max(run[2] for run in runs) if runs else 0.0
+        x0 = self.left + indent
+        width = self.width - indent
+
+        for number, line in enumerate(self.wrap(runs, width)):
+            if self.y + line_height > self.pdf.h - self.bottom:
+                self.add_page()
+            line_width = sum(part[4] for part in line)
+            x = x0 + (width - line_width) / 2 if align == "C" else x0
+            half_leading = (line_height - (self.ascent + self.descent) * size) / 2
+            baseline = self.y + half_leading + self.ascent * size
+
+            if marker and number == 0:
+                offset, diameter, color = marker
+                self.pdf.set_fill_color(*color)
+                center_y = baseline - 0.3 * size
+                self.pdf.ellipse(x0 - offset - diameter / 2, center_y - diameter / 2, diameter, diameter, style="F")
+
+            for text, style, part_size, color, part_width in line:
+                self.set_font(style, part_size)
+                self.pdf.set_text_color(*color)
+                self.pdf.text(x, baseline, text)
+                x += part_width
+            self.y += line_height
+
+        self.margin(margin_bottom)
+
+    def rule(self, thickness: float, color: Color) -> None:
+        """Draw a full-width border at the current position."""
+        self.pdf.set_fill_color(*color)
+        self.pdf.rect(self.left, self.y, self.width, thickness, style="F")
+        self.y += thickness
+
+    def output(self) -> bytes:
+        return bytes(self.pdf.output())
+
+
+class NativePDFRenderer:
+    """
+    Render CV and slide PDFs without a browser.
+
+    Draws the layouts of the "modern" CV and slide templates
+    (``app/templates``) directly with fpdf2,
+    using their CSS sizes, colors and spacing (converted to points), so
+    the output matches the Chromium render closely. Fonts are embedded as
+    subsets of the glyphs used. Rendering is CPU-bound and synchronous;
+    call it from a thread in async code.
+    """
+
+    def __init__(self, fonts: Optional[FontSet] = None):
+        """
+        Initialize renderer.
+
+        Args:
+            fonts: Font family to draw with (defaults to the best installed one)
+        """
+        self.fonts = fonts or find_font_set()
+
+    def render_cv(self, cv_data: CVRequest) -> bytes:
+        """
+        Render a CV.
+
+        Args:
+            cv_data: CV data
+
+        Returns:
+            PDF file as bytes
+        """
+        # Page margins as passed to page.pdf, plus the 8px body margin
+        doc = _Document(self.fonts, "portrait", (36, 54 + 8 * PX, 36, 54 + 8 * PX))
+        doc.add_page()
+        doc.margin(8 * PX)
+
+        def heading(text: str) -> None:
+            doc.paragraph([(text, "B", 14, ACCENT)], 14 * 1.6, margin_top=20 * PX)
+            doc.y += 3 * PX
+            doc.rule(2 * PX, ACCENT)
+            doc.margin(10 * PX)
+
+        def bullets(items: List[str]) -> None:
+            doc.margin(5 * PX)
+            for item in items:
+                doc.paragraph(
+                    [(item, "", 11, TEXT)], 11 * 1.6,
+                    margin_bottom=3 * PX, indent=20 * PX, marker=(7 * PX, 5 * PX, TEXT),
+                )
+            doc.margin(5 * PX)
+
+        def place_line(name: str, location: Optional[str], dates: Optional[str]) -> None:
+            runs: List[Run] = [(name, "I", 11, TEXT)]
+            if location:
+                runs.append((f", {location}", "", 11, TEXT))
+            if dates is not None:
+                runs.append((" | ", "", 11, TEXT))
+                runs.append((dates, "", 11, MUTED))
+            doc.paragraph(runs, 11 * 1.6)
+
+        info = cv_data.personal_info
+        doc.paragraph([(info.full_name, "B", 24, ACCENT)], 24 * 1.6, 0.67 * 24, 5 * PX, align="C")
+
+        contact_parts = [info.email]
+        if info.phone:
+            contact_parts.append(info.phone)
+        if info.location:
+            contact_parts.append(info.location)
+        doc.paragraph([(" | ".join(contact_parts), "", 10, TEXT)], 10 * 1.6, 0, 5 * PX, align="C")
+
+        link_parts = []
+        if info.website:
+            link_parts.append(info.website)
+        if info.linkedin:
+            link_parts.append(f"LinkedIn: {info.linkedin}")
+        if info.github:
+            link_parts.append(f"GitHub: {info.github}")
+        if link_parts:
+            doc.paragraph([(" | ".join(link_parts), "", 9, MUTED)], 9 * 1.6, 0, 20 * PX, align="C")
+
+        if cv_data.summary:
+            heading("Professional Summary")
+            doc.paragraph([(cv_data.summary, "", 11, TEXT)], 11 * 1.6, 11, 11)
+
+        if cv_data.experience:
+            heading("Experience")
+            for exp in cv_data.experience:
+                doc.paragraph([(exp.job_title, "B", 12, TEXT)], 12 * 1.6)
+                date_str = exp.start_date
+                if exp.end_date:
+                    date_str += f" - {exp.end_date}"
+                place_line(exp.company, exp.location, date_str)
+                if exp.description:
+                    doc.paragraph([(exp.description, "", 11, TEXT)], 11 * 1.6, 11, 11)
+                if exp.responsibilities:
+                    bullets(exp.responsibilities)
+                doc.margin(15 * PX)
+
+        if cv_data.education:
+            heading("Education")
+            for edu in cv_data.education:
+                doc.paragraph([(edu.degree, "B", 12, TEXT)], 12 * 1.6)
+                date_str = None
+                if edu.start_date or edu.end_date:
+                    date_str = edu.start_date or ""
+                    if edu.end_date:
+                        date_str += f" - {edu.end_date}" if date_str else edu.end_date
+                place_line(edu.institution, edu.location, date_str)
+                if edu.gpa:
+                    doc.paragraph([(f"GPA: {edu.gpa}", "", 11, TEXT)], 11 * 1.6, 11, 11)
+                if edu.achievements:
+                    bullets(edu.achievements)
+                doc.margin(15 * PX)
+
+        if cv_data.skills:
+            heading("Skills")
+            for skill_group in cv_data.skills:
+                runs: List[Run] = []
+                if skill_group.category:
+                    runs.append((f"{skill_group.category}:", "B", 11, TEXT))
+                    runs.append((" ", "", 11, TEXT))
+                runs.append((", ".join(skill_group.skills), "", 11, TEXT))
+                doc.paragraph(runs, 11 * 1.6, 11, 11)
+
+        return doc.output()
+
+    def render_slides(self, title: str, slides: List[SlideContent]) -> bytes:
+        """
+        Render a presentation, one landscape page per slide.
+
+        Args:
+            title: Presentation title
+            slides: List of slide contents
+
+        Returns:
+            PDF file as bytes
+        """
+        # Each slide fills its page, with 40px 60px padding
+        doc = _Document(self.fonts, "landscape", (40 * PX, 60 * PX, 40 * PX, 60 * PX))
+
+        # Title slide: centered on a 135deg gradient
+        doc.add_page()
+        self._draw_gradient(doc)
+        line_height = 48 * doc.normal_line_height
+        lines = len(doc.wrap([(title, "B", 48, WHITE)], doc.width))
+        doc.y = (doc.pdf.h - lines * line_height) / 2
+        doc.paragraph([(title, "B", 48, WHITE)], line_height, align="C")
+
+        for slide_content in slides:
+            doc.add_page()
+            doc.paragraph([(slide_content.title, "B", 32, ACCENT)], 32 * doc.normal_line_height)
+            doc.y += 10 * PX
+            doc.rule(3 * PX, ACCENT)
+            doc.margin(30 * PX)
+            for bullet in slide_content.content:
+                doc.paragraph(
+                    [(bullet, "", 18, TEXT)], 18 * doc.normal_line_height,
+                    margin_bottom=20 * PX, indent=30 * PX, marker=(25 * PX, 10 * PX, ACCENT),
+                )
+
+        return doc.output()
+
+    def _draw_gradient(self, doc: _Document, steps: int = 96) -> None:
+        """Fill the page with the title slide's linear-gradient(135deg, ...)."""
+        pdf = doc.pdf
+        width, height = pdf.w, pdf.h
+        # Color lines of a 135deg gradient are x + y = c, from the top-left
+        # corner (c = 0) to the bottom-right one (c = width + height)
+        span = width + height
+        (r0, g0, b0), (r1, g1, b1) = GRADIENT
+        for step in range(steps):
+            t = (step + 0.5) / steps
+            pdf.set_fill_color(
+                round(r0 + (r1 - r0) * t), round(g0 + (g1 - g0) * t), round(b0 + (b1 - b0) * t)
+            )
+            c0 = span * step / steps
+            # Bands overlap by a point so no hairline gaps show between them
+            c1 = span * (step + 1) / steps + 1
+            pdf.polygon(
+                [(c0, 0), (c1, 0), (c1 - height, height), (c0 - height, height)],
+                style="F",
+            )
+
+
+# Singleton instance
+_native_pdf_renderer: Optional[NativePDFRenderer] = None
+
+
+def get_native_pdf_renderer() -> NativePDFRenderer:
+    """
+    Get or create NativePDFRenderer singleton instance.
+
+    Returns:
+        NativePDFRenderer instance
+    """
+    global _native_pdf_renderer
+    if _native_pdf_renderer is None:
+        _native_pdf_renderer = NativePDFRenderer()
+    return _native_pdf_renderer
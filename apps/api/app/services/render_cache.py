@@ -0,0 +1,151 @@
+"""Render Cache - Content-addressed reuse of exported CVs and presentations."""
+
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from ..schemas.cv import CVRequest
+from ..schemas.slides import SlideContent
+from ..utils.logging import logger
+from ..utils.s3 import S3Manager
+from .native_pdf import resolve_pdf_engine
+from .templates import DEFAULT_TEMPLATE
+
+# Reuse an identical earlier export instead of rendering and uploading it again
+RENDER_CACHE_ENABLED = os.getenv("RENDER_CACHE_ENABLED", "true").lower() == "true"
+
+# Oldest export that is reused; exports expire from the bucket after 90 days,
+# and a reused one must outlive the 7-day download URL issued for it
+RENDER_CACHE_MAX_AGE_DAYS = int(os.getenv("RENDER_CACHE_MAX_AGE_DAYS", "80"))
+
+# Bump when generator output changes, so older exports stop matching
+RENDER_CACHE_VERSION = 1
+
+
+def render_digest(kind: str, payload: Dict[str, Any]) -> str:
+    """
+    Hash an export's content canonically.
+
+    Args:
+        kind: "cv" or "slides"
+        payload: JSON-serializable content, template and format
+
+    Returns:
+        Hex SHA-256 digest (equal payloads give equal digests regardless of key order)
+    """
+    canonical = json.dumps(
+        {"kind": kind, "version": RENDER_CACHE_VERSION, **payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _pdf_engine(format: str, engine: Optional[str]) -> Optional[str]:
+    # The engine shapes PDF output only
+    return resolve_pdf_engine(engine) if format == "pdf" else None
+
+
+def cv_render_digest(cv_request: CVRequest, format: str) -> str:
+    """
+    Digest of a CV export in one format.
+
+    Args:
+        cv_request: CV data
+        format: "docx" or "pdf"
+
+    Returns:
+        Hex digest
+    """
+    payload = cv_request.model_dump(mode="json", exclude={"format", "template", "pdf_engine"})
+    payload["format"] = format
+    payload["template"] = cv_request.template or DEFAULT_TEMPLATE
+    payload["pdf_engine"] = _pdf_engine(format, cv_request.pdf_engine)
+    return render_digest("cv", payload)
+
+
+def slides_render_digest(
+    title: str,
+    slides: List[SlideContent],
+    template: Optional[str],
+    format: str,
+    pdf_engine: Optional[str] = None,
+) -> str:
+    """
+    Digest of a presentation export (of its resolved slides, after any AI outline).
+
+    Args:
+        title: Presentation title
+        slides: Slide contents
+        template: Template style
+        format: "pptx" or "pdf"
+        pdf_engine: Requested PDF engine, if any
+
+    Returns:
+        Hex digest
+    """
+    return render_digest(
+        "slides",
+        {
+            "title": title,
+            "slides": [slide.model_dump(mode="json") for slide in slides],
+            "template": template or DEFAULT_TEMPLATE,
+            "format": format,
+            "pdf_engine": _pdf_engine(format, pdf_engine),
+        },
+    )
+
+
+def export_key(prefix: str, user_id: str, job_id: str, digest: str, filename: str) -> str:
+    """
+    S3 key of an export.
+
+    With the cache enabled, identical exports of one user share a key under
+    ``renders/<digest>``; keys are always scoped to the user, so exports are
+    never shared between users. Otherwise each job gets its own key.
+
+    Args:
+        prefix: Export prefix ("cvs" or "slides")
+        user_id: User ID
+        job_id: Job ID
+        digest: Render digest of the export
+        filename: File name
+
+    Returns:
+        S3 key
+    """
+    if RENDER_CACHE_ENABLED:
+        return f"{prefix}/{user_id}/renders/{digest}/{filename}"
+    return f"{prefix}/{user_id}/{job_id}/{filename}"
+
+
+def find_cached_export(s3_manager: S3Manager, key: str) -> bool:
+    """
+    Whether an export already exists at ``key`` and is recent enough to reuse.
+
+    A failed lookup (e.g. 403 for a missing key without ``s3:ListBucket``,
+    or a transient S3 error) counts as a miss, so the export is rendered
+    rather than failed.
+
+    Args:
+        s3_manager: S3 manager
+        key: Export key from ``export_key``
+
+    Returns:
+        True on a cache hit
+    """
+    if not RENDER_CACHE_ENABLED:
+        return False
+    try:
+        head = s3_manager.head_object(key)
+    except Exception as e:
+        # S3Manager wraps ClientError; BotoCoreError (connection, timeout) passes through
+        logger.warning("Render cache lookup failed", extra={"s3_key": key, "error_message": str(e)})
+        return False
+    if head is None:
+        return False
+    age = datetime.now(timezone.utc) - head["LastModified"]
+    return age < timedelta(days=RENDER_CACHE_MAX_AGE_DAYS)
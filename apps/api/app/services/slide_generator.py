@@ -1,14 +1,18 @@
 """Slide Generator Service - Creates PPTX and PDF presentations."""
 
+import asyncio
 import io
-from typing import List
+from typing import List, Optional
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
-from playwright.async_api import async_playwright
 
 from ..schemas.slides import SlideContent
+from ..utils.browser_pool import get_browser_pool
+from ..utils.document_pool import get_document_pool
+from .native_pdf import get_native_pdf_renderer, resolve_pdf_engine
+from .templates import get_template_registry
 
 
 class SlideGenerator:
@@ -26,7 +30,26 @@ class SlideGenerator:
         template: str = "modern"
     ) -> bytes:
         """
-        Generate presentation in PPTX format.
+        Generate presentation in PPTX format, in the document process pool.
+        
+        Args:
+            title: Presentation title
+            slides: List of slide contents
+            template: Template style
+            
+        Returns:
+            PPTX file as bytes
+        """
+        return await get_document_pool().run(build_pptx, title, slides, template)
+
+    def build_pptx(
+        self,
+        title: str,
+        slides: List[SlideContent],
+        template: str = "modern"
+    ) -> bytes:
+        """
+        Build a presentation in PPTX format (CPU-bound; see ``generate_pptx``).
         
         Args:
             title: Presentation title
@@ -132,6 +155,8 @@ class SlideGenerator:
         self,
         title: str,
         slides: List[SlideContent],
+        template: Optional[str] = "modern",
+        engine: Optional[str] = None,
     ) -> bytes:
         """
         Generate presentation in PDF format.
@@ -139,132 +164,57 @@ class SlideGenerator:
         Args:
             title: Presentation title
             slides: List of slide contents
+            template: Template name (the native engine draws the modern layout only)
+            engine: "chromium" or "native" (defaults to PDF_ENGINE)
             
         Returns:
             PDF file as bytes
         """
-        # Generate HTML presentation
-        html_content = self._generate_html_presentation(title, slides)
+        if resolve_pdf_engine(engine) == "native":
+            return await asyncio.to_thread(get_native_pdf_renderer().render_slides, title, slides)
         
-        # Convert to PDF using Playwright
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            page = await browser.new_page()
-            await page.set_content(html_content)
-            
-            # Set viewport for 16:9 aspect ratio
-            await page.set_viewport_size({"width": 1280, "height": 720})
-            
-            pdf_bytes = await page.pdf(
-                format='A4',
-                landscape=True,
-                margin={
+        # Generate HTML presentation
+        html_content = self._generate_html_presentation(title, slides, template)
+        
+        # Convert to PDF on a pooled browser (16:9 viewport)
+        pdf_bytes = await get_browser_pool().render_pdf(
+            html_content,
+            pdf_options={
+                'format': 'A4',
+                'landscape': True,
+                'margin': {
                     'top': '0.5in',
                     'right': '0.5in',
                     'bottom': '0.5in',
                     'left': '0.5in',
                 },
-                print_background=True,
-            )
-            await browser.close()
+                'print_background': True,
+            },
+            viewport={"width": 1280, "height": 720},
+        )
         
         return pdf_bytes
 
-    def _generate_html_presentation(self, title: str, slides: List[SlideContent]) -> str:
-        """Generate HTML for PDF conversion."""
-        html = """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <style>
-        @page {
-            size: A4 landscape;
-            margin: 0;
-        }
-        body {
-            font-family: 'Calibri', 'Arial', sans-serif;
-            margin: 0;
-            padding: 0;
-        }
-        .slide {
-            width: 100%;
-            height: 100vh;
-            padding: 40px 60px;
-            box-sizing: border-box;
-            page-break-after: always;
-            display: flex;
-            flex-direction: column;
-        }
-        .slide:last-child {
-            page-break-after: auto;
-        }
-        .title-slide {
-            justify-content: center;
-            align-items: center;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }
-        .title-slide h1 {
-            font-size: 48pt;
-            margin: 0;
-            text-align: center;
-        }
-        .content-slide h2 {
-            color: #1f4e79;
-            font-size: 32pt;
-            margin: 0 0 30px 0;
-            border-bottom: 3px solid #1f4e79;
-            padding-bottom: 10px;
-        }
-        .content-slide ul {
-            list-style: none;
-            padding: 0;
-            margin: 0;
-        }
-        .content-slide li {
-            font-size: 18pt;
-            color: #333;
-            margin-bottom: 20px;
-            padding-left: 30px;
-            position: relative;
-        }
-        .content-slide li:before {
-            content: "●";
-            color: #1f4e79;
-            font-size: 14pt;
-            position: absolute;
-            left: 0;
-        }
-    </style>
-</head>
-<body>
-"""
-        
-        # Title slide
-        html += f"""
-    <div class="slide title-slide">
-        <h1>{title}</h1>
-    </div>
-"""
-        
-        # Content slides
-        for slide_content in slides:
-            html += f"""
-    <div class="slide content-slide">
-        <h2>{slide_content.title}</h2>
-        <ul>
-"""
-            for bullet in slide_content.content:
-                html += f"            <li>{bullet}</li>\n"
-            
-            html += """        </ul>
-    </div>
-"""
-        
-        html += """
-</body>
-</html>
-"""
-        return html
+    def _generate_html_presentation(
+        self,
+        title: str,
+        slides: List[SlideContent],
+        template: Optional[str] = "modern",
+    ) -> str:
+        """Generate HTML for PDF conversion, in the named template."""
+        return get_template_registry().render("slides", template, title=title, slides=slides)
+
+
+def build_pptx(title: str, slides: List[SlideContent], template: str = "modern") -> bytes:
+    """
+    Build a presentation in PPTX format; runs in a document pool process.
+
+    Args:
+        title: Presentation title
+        slides: List of slide contents
+        template: Template style
 
+    Returns:
+        PPTX file as bytes
+    """
+    return SlideGenerator().build_pptx(title, slides, template)
@@ -0,0 +1,130 @@
+"""Template Registry - Compiled Jinja2 templates for CV and slide HTML."""
+
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined, Template
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+
+# Compiled template bytecode, shared by processes (and restarts) on one host
+TEMPLATE_CACHE_DIR = os.getenv(
+    "TEMPLATE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "pulse-template-cache")
+)
+
+# Document kinds, each a directory of templates named after their style
+TEMPLATE_KINDS = ("cv", "slides")
+DEFAULT_TEMPLATE = "modern"
+
+# Shared layout of a kind's templates (not selectable itself)
+BASE_TEMPLATE = "base"
+
+TEMPLATE_SUFFIX = ".html.j2"
+
+
+class UnknownTemplate(ValueError):
+    """Raised for a template name that is not registered."""
+
+
+class TemplateRegistry:
+    """
+    Named HTML templates for each document kind, compiled once.
+
+    Templates live in ``app/templates/<kind>/<name>.html.j2`` and extend
+    the kind's ``base.html.j2``. All output is HTML-escaped. Templates
+    are compiled when the registry is loaded (at startup) and their
+    bytecode is cached on disk, so new processes skip the compile step.
+    """
+
+    def __init__(self, template_dir: str = TEMPLATE_DIR, cache_dir: Optional[str] = TEMPLATE_CACHE_DIR):
+        """
+        Initialize registry.
+
+        Args:
+            template_dir: Directory of per-kind template directories
+            cache_dir: Bytecode cache directory (None disables the cache)
+        """
+        bytecode_cache = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+        self.environment = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=True,
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+            undefined=StrictUndefined,
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        self._templates: Dict[str, Dict[str, Template]] = {}
+
+    def load(self) -> None:
+        """Compile every template."""
+        templates: Dict[str, Dict[str, Template]] = {kind: {} for kind in TEMPLATE_KINDS}
+        for path in self.environment.list_templates(filter_func=lambda name: name.endswith(TEMPLATE_SUFFIX)):
+            kind, _, filename = path.partition("/")
+            name = filename[: -len(TEMPLATE_SUFFIX)]
+            if kind in templates and name != BASE_TEMPLATE:
+                templates[kind][name] = self.environment.get_template(path)
+        self._templates = templates
+
+    def names(self, kind: str) -> List[str]:
+        """
+        Template names available for a document kind.
+
+        Args:
+            kind: "cv" or "slides"
+
+        Returns:
+            Sorted template names
+        """
+        if not self._templates:
+            self.load()
+        return sorted(self._templates.get(kind, {}))
+
+    def render(self, kind: str, name: Optional[str], **context: Any) -> str:
+        """
+        Render a template.
+
+        Args:
+            kind: "cv" or "slides"
+            name: Template name (defaults to "modern")
+            **context: Template variables
+
+        Returns:
+            HTML document
+
+        Raises:
+            UnknownTemplate: If the kind has no template of that name
+        """
+        if not self._templates:
+            self.load()
+        name = name or DEFAULT_TEMPLATE
+        try:
+            template = self._templates[kind][name]
+        except KeyError:
+            raise UnknownTemplate(
+                f"Unknown {kind} template '{name}' (available: {', '.join(self.names(kind))})"
+            ) from None
+        return template.render(**context)
+
+
+# Singleton instance
+_template_registry: Optional[TemplateRegistry] = None
+
+
+def get_template_registry() -> TemplateRegistry:
+    """
+    Get or create TemplateRegistry singleton instance.
+
+    Returns:
+        TemplateRegistry instance
+    """
+    global _template_registry
+    if _template_registry is None:
+        _template_registry = TemplateRegistry()
+        _template_registry.load()
+    return _template_registry
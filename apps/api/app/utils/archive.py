@@ -0,0 +1,290 @@
+"""Archival of expired partitions to object storage, with read-through."""
+
+import os
+import gzip
+import json
+import zlib
+import asyncio
+import tempfile
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import text
+
+from .export import to_jsonable
+from .logging import logger
+from .partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    ensure_partitions,
+    list_detached_partitions,
+    list_partitions,
+    month_start,
+    partition_bounds,
+    partition_name,
+)
+from .s3 import S3Manager, get_s3_manager
+
+# Key prefix of archived partitions in the artifact bucket
+ARCHIVE_PREFIX = os.getenv("ARCHIVE_PREFIX", "archive")
+
+# Months kept in the database; older partitions are archived and dropped (0 keeps all)
+RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", "12"))
+
+# Arbitrary key so only one process runs maintenance at a time
+MAINTENANCE_LOCK_KEY = 7_310_031
+
+# Compressed bytes read per S3 request when streaming an archive back
+READ_CHUNK_SIZE = 256 * 1024
+
+
+def archive_key(table: str, month: datetime) -> str:
+    """
+    S3 key of an archived partition.
+
+    Args:
+        table: Parent table name
+        month: Month start
+
+    Returns:
+        Key, e.g. ``archive/jobs/2025-09.jsonl.gz``
+    """
+    return f"{ARCHIVE_PREFIX}/{table}/{month:%Y-%m}.jsonl.gz"
+
+
+async def _export_partition(engine, table: str, name: str, key: str, s3: S3Manager) -> int:
+    """
+    Stream a partition into a gzipped JSONL object.
+
+    Rows are read through a server-side cursor and compressed into a
+    temporary file, so memory use does not depend on partition size.
+
+    Returns:
+        Number of rows exported
+    """
+    columns = PARTITIONED_TABLES[table].c
+    query = text(
+        f"SELECT {', '.join(column.name for column in columns)} FROM {name}"
+    ).columns(*columns)
+
+    rows = 0
+    with tempfile.TemporaryFile() as buffer:
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as archive:
+            async with engine.connect() as conn:
+                result = await conn.stream(query)
+                async for row in result.mappings():
+                    archive.write(json.dumps(dict(row), default=to_jsonable).encode() + b"\n")
+                    rows += 1
+
+        buffer.seek(0)
+        await asyncio.to_thread(
+            s3.upload_fileobj,
+            buffer,
+            key,
+            "application/gzip",
+            {"table": table, "partition": name, "rows": str(rows)},
+        )
+    return rows
+
+
+async def archive_partition(
+    engine,
+    table: str,
+    month: datetime,
+    s3: Optional[S3Manager] = None,
+    attached: bool = True,
+) -> int:
+    """
+    Export one monthly partition to S3, then drop it.
+
+    The partition is detached first so no write can land in it while it is
+    exported; if the export fails it is attached again and nothing is lost.
+
+    Args:
+        engine: Async engine
+        table: Parent table name
+        month: Month start of the partition
+        s3: S3 manager (defaults to the singleton)
+        attached: False to resume a partition left detached by an
+            interrupted run
+
+    Returns:
+        Number of rows archived
+    """
+    s3 = s3 or get_s3_manager()
+    name = partition_name(table, month)
+    key = archive_key(table, month)
+
+    if attached:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+
+    try:
+        rows = await _export_partition(engine, table, name, key, s3)
+    except Exception:
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {partition_bounds(month)}"
+            ))
+        raise
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE {name}"))
+
+    logger.info("Partition archived", extra={"partition": name, "key": key, "rows": rows})
+    return rows
+
+
+def list_archived_months(table: str, s3: Optional[S3Manager] = None) -> List[str]:
+    """
+    List the archived months of a table.
+
+    Args:
+        table: Parent table name
+        s3: S3 manager (defaults to the singleton)
+
+    Returns:
+        Months as ``YYYY-MM``, oldest first
+    """
+    s3 = s3 or get_s3_manager()
+    prefix = f"{ARCHIVE_PREFIX}/{table}/"
+    return sorted(
+        key[len(prefix):-len(".jsonl.gz")]
+        for key in s3.list_keys(prefix)
+        if key.endswith(".jsonl.gz")
+    )
+
+
+def _row_matches(line: bytes, user_id: Optional[str]) -> bool:
+    """Whether an archived JSONL line passes the read-through filters."""
+    if not line:
+        return False
+    if user_id is None:
+        return True
+    return json.loads(line).get("user_id") == user_id
+
+
+async def iter_archived_rows(
+    table: str,
+    month: datetime,
+    user_id: Optional[str] = None,
+    s3: Optional[S3Manager] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream rows of an archived month back as JSONL lines.
+
+    The object is read and decompressed in chunks, so large months are
+    never held in memory.
+
+    Args:
+        table: Parent table name
+        month: Month start
+        user_id: Only yield rows of this user
+        s3: S3 manager (defaults to the singleton)
+
+    Yields:
+        JSONL lines (newline-terminated)
+
+    Raises:
+        FileNotFoundError: If the month has not been archived
+    """
+    s3 = s3 or get_s3_manager()
+    body = await asyncio.to_thread(s3.open_object, archive_key(table, month))
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pending = b""
+    try:
+        while True:
+            chunk = await asyncio.to_thread(body.read, READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            pending += decompressor.decompress(chunk)
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if _row_matches(line, user_id):
+                    yield line + b"\n"
+
+        pending += decompressor.flush()
+        for line in pending.split(b"\n"):
+            if _row_matches(line, user_id):
+                yield line + b"\n"
+    finally:
+        body.close()
+
+
+class PartitionMaintainer:
+    """Periodically create upcoming partitions and archive expired ones."""
+
+    def __init__(
+        self,
+        engine,
+        retention_months: int = RETENTION_MONTHS,
+        interval: float = 3600.0,
+    ):
+        """
+        Initialize maintainer.
+
+        Args:
+            engine: Async engine
+            retention_months: Months kept in the database (0 disables archival)
+            interval: Seconds between maintenance runs
+        """
+        self.engine = engine
+        self.retention_months = retention_months
+        self.interval = interval
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        Create upcoming partitions, then archive partitions past retention.
+
+        Guarded by an advisory lock so concurrent API processes do not race.
+
+        Args:
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            Number of partitions archived
+        """
+        now = now or datetime.utcnow()
+        archived = 0
+        async with self.engine.connect() as lock_conn:
+            result = await lock_conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+            )
+            if not result.scalar():
+                return 0
+            try:
+                async with self.engine.begin() as conn:
+                    await ensure_partitions(conn, now)
+
+                if self.retention_months <= 0:
+                    return 0
+
+                cutoff = add_months(month_start(now), -self.retention_months)
+                for table in PARTITIONED_TABLES:
+                    async with self.engine.connect() as conn:
+                        detached = await list_detached_partitions(conn, table)
+                        months = await list_partitions(conn, table)
+                    for month in detached:
+                        await archive_partition(self.engine, table, month, attached=False)
+                        archived += 1
+                    for month in months:
+                        if month < cutoff:
+                            await archive_partition(self.engine, table, month)
+                            archived += 1
+            finally:
+                await lock_conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+                )
+        return archived
+
+    async def run(self) -> None:
+        """Maintain partitions forever until cancelled."""
+        while True:
+            try:
+                archived = await self.run_once()
+                if archived:
+                    logger.info("Partitions archived", extra={"partitions": archived})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Partition maintenance failed", extra={"error_message": str(e)})
+            await asyncio.sleep(self.interval)
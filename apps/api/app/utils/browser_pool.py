@@ -0,0 +1,262 @@
+"""Warm Chromium processes shared by all HTML-to-PDF renders."""
+
+import os
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .logging import logger
+
+# Chromium processes kept running
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+
+# Renders a browser serves before it is replaced (bounds leaked memory)
+BROWSER_MAX_RENDERS = int(os.getenv("BROWSER_MAX_RENDERS", "200"))
+
+# Renders allowed to wait for a browser before new ones are turned away
+BROWSER_MAX_WAITING = int(os.getenv("BROWSER_MAX_WAITING", "32"))
+
+# Seconds a render may wait for a browser
+BROWSER_ACQUIRE_TIMEOUT = float(os.getenv("BROWSER_ACQUIRE_TIMEOUT", "30"))
+
+# Seconds a single render may take
+BROWSER_RENDER_TIMEOUT = float(os.getenv("BROWSER_RENDER_TIMEOUT", "60"))
+
+
+class BrowserPoolBusy(Exception):
+    """Raised when too many renders are already waiting for a browser."""
+
+
+class _Slot:
+    """One browser process with the page it renders on."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.renders = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    A fixed set of warm Chromium processes for rendering PDFs.
+
+    Each browser keeps one context and page, reused across renders
+    (``set_content`` replaces the document; JavaScript is disabled so a
+    document cannot leave state behind for the next one). A browser is
+    replaced after ``max_renders`` renders, when it crashes, or when a
+    render on it times out.
+
+    Renders beyond the pool size wait in FIFO order; once ``max_waiting``
+    are waiting, further renders fail fast with ``BrowserPoolBusy``
+    instead of piling up.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_renders: int = BROWSER_MAX_RENDERS,
+        max_waiting: int = BROWSER_MAX_WAITING,
+        acquire_timeout: float = BROWSER_ACQUIRE_TIMEOUT,
+        render_timeout: float = BROWSER_RENDER_TIMEOUT,
+        launcher=None,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            size: Browser processes kept running
+            max_renders: Renders per browser before it is replaced
+            max_waiting: Renders allowed to wait for a browser
+            acquire_timeout: Seconds a render may wait for a browser
+            render_timeout: Seconds a single render may take
+            launcher: Browser type to launch with (defaults to Playwright's Chromium)
+        """
+        self.size = size
+        self.max_renders = max_renders
+        self.max_waiting = max_waiting
+        self.acquire_timeout = acquire_timeout
+        self.render_timeout = render_timeout
+        self.launcher = launcher
+        self._playwright = None
+        self._idle: Deque[_Slot] = deque(_Slot(i) for i in range(size))
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._closed = False
+        self._start_lock = asyncio.Lock()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Browsers busy and renders waiting."""
+        return {
+            "size": self.size,
+            "busy": self.size - len(self._idle),
+            "waiting": len(self._waiters),
+        }
+
+    async def _ensure_launcher(self) -> None:
+        if self.launcher is not None:
+            return
+        async with self._start_lock:
+            if self.launcher is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+                self.launcher = self._playwright.chromium
+
+    async def start(self) -> None:
+        """Launch all browsers up front so the first renders are warm."""
+        await self._ensure_launcher()
+        slots = list(self._idle)
+        results = await asyncio.gather(*(self._launch(slot) for slot in slots), return_exceptions=True)
+        for slot, result in zip(slots, results, strict=True):
+            if isinstance(result, Exception):
+                # Retried on the slot's first render
+                logger.warning(
+                    "Failed to launch browser",
+                    extra={"browser": slot.index, "error_message": str(result)},
+                )
+
+    async def _launch(self, slot: _Slot) -> None:
+        slot.browser = await self.launcher.launch()
+        slot.context = await slot.browser.new_context(java_script_enabled=False)
+        slot.page = await slot.context.new_page()
+        slot.renders = 0
+
+    async def _retire(self, slot: _Slot) -> None:
+        browser, slot.browser, slot.context, slot.page = slot.browser, None, None, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning(
+                    "Failed to close browser",
+                    extra={"browser": slot.index, "error_message": str(e)},
+                )
+
+    async def _acquire(self) -> _Slot:
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        if self._idle and not self._waiters:
+            return self._idle.popleft()
+        if len(self._waiters) >= self.max_waiting:
+            raise BrowserPoolBusy(f"{len(self._waiters)} renders already waiting for a browser")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter), timeout=self.acquire_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a browser just as we gave up: pass it on
+                self._release(waiter.result())
+            else:
+                waiter.cancel()
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.TimeoutError):
+                raise BrowserPoolBusy(
+                    f"No browser free within {self.acquire_timeout:g}s"
+                ) from None
+            raise
+
+    def _release(self, slot: _Slot) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(slot)
+                return
+        self._idle.append(slot)
+
+    async def render_pdf(
+        self,
+        html: str,
+        pdf_options: Dict[str, Any],
+        viewport: Optional[Dict[str, int]] = None,
+    ) -> bytes:
+        """
+        Render an HTML document to PDF on a pooled browser.
+
+        Args:
+            html: Self-contained HTML document
+            pdf_options: Keyword arguments for Playwright's ``page.pdf``
+            viewport: Viewport size (``{"width": ..., "height": ...}``)
+
+        Returns:
+            PDF file as bytes
+
+        Raises:
+            BrowserPoolBusy: If the render could not get a browser in time
+        """
+        await self._ensure_launcher()
+        slot = await self._acquire()
+        try:
+            if not slot.alive or slot.renders >= self.max_renders:
+                if slot.browser is not None:
+                    logger.info(
+                        "Recycling browser",
+                        extra={"browser": slot.index, "renders": slot.renders},
+                    )
+                await self._retire(slot)
+                await self._launch(slot)
+
+            slot.renders += 1
+            try:
+                async with asyncio.timeout(self.render_timeout):
+                    if viewport:
+                        await slot.page.set_viewport_size(viewport)
+                    await slot.page.set_content(html)
+                    return await slot.page.pdf(**pdf_options)
+            except BaseException:
+                # The page may have crashed or still be busy with an abandoned
+                # render: replace the browser before its next render
+                slot.renders = self.max_renders
+                raise
+        finally:
+            if self._closed:
+                await self._retire(slot)
+            else:
+                self._release(slot)
+
+    async def close(self) -> None:
+        """Close all browsers and stop Playwright."""
+        self._closed = True
+        for waiter in self._waiters:
+            waiter.cancel()
+        self._waiters.clear()
+        slots: List[_Slot] = list(self._idle)
+        self._idle.clear()
+        await asyncio.gather(*(self._retire(slot) for slot in slots))
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+# Singleton instance
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Get or create BrowserPool singleton instance.
+
+    Returns:
+        BrowserPool instance
+    """
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool()
+    return _browser_pool
+
+
+async def close_browser_pool() -> None:
+    """Close the shared browser pool, if one was created."""
+    global _browser_pool
+    if _browser_pool is not None:
+        await _browser_pool.close()
+        _browser_pool = None
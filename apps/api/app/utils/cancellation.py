@@ -0,0 +1,166 @@
+"""Cooperative job cancellation: in-process cancel scopes and worker checkpoints."""
+
+import asyncio
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.job import Job, JobStatus
+from .job_events import RESYNC, get_job_event_hub
+
+
+class JobCancelled(Exception):
+    """Raised in work whose job was cancelled."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        super().__init__(f"Job {job_id} was cancelled")
+
+
+async def check_cancelled(db: AsyncSession, job_id: str) -> None:
+    """
+    Checkpoint: stop if the job was cancelled.
+
+    Catches cancellations whose event this process missed (e.g. while
+    the job event listener was reconnecting).
+
+    Args:
+        db: Database session
+        job_id: Job ID
+
+    Raises:
+        JobCancelled: If the job was cancelled
+    """
+    job_status = await db.scalar(select(Job.status).where(Job.id == job_id))
+    if job_status == JobStatus.CANCELLED:
+        raise JobCancelled(job_id)
+
+
+# Scopes of the jobs running in this process
+_scopes: Dict[str, Set["CancelScope"]] = defaultdict(set)
+
+
+class CancelScope:
+    """
+    Stop in-process work when its job is cancelled.
+
+    A cancel request arrives through the job event hub (from whichever
+    API process handled ``POST /jobs/{id}/cancel``) or directly through
+    ``cancel_running_job`` in this process.
+
+    With ``interrupt`` (the default) the task running the scope is
+    cancelled at whatever it is awaiting, like ``asyncio.timeout``, and
+    the block exits with ``JobCancelled``. Async generators, whose task
+    also runs code outside the block, pass ``interrupt=False`` and call
+    ``check()`` between items instead. Requests made once the scope is
+    exiting are ignored, and one the block finished before receiving is
+    taken back on exit rather than left to hit the caller.
+    """
+
+    def __init__(self, job_id: str, interrupt: bool = True):
+        """
+        Initialize scope.
+
+        Args:
+            job_id: Job ID
+            interrupt: Cancel the running task on request
+        """
+        self.job_id = job_id
+        self.interrupt = interrupt
+        self._requested = False
+        self._active = False
+        self._task: Optional[asyncio.Task] = None
+        self._cancelling = 0
+        self._watch = None
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the job was cancelled while the scope was active."""
+        return self._requested
+
+    def check(self) -> None:
+        """
+        Raise if the job was cancelled.
+
+        Raises:
+            JobCancelled: If the job was cancelled
+        """
+        if self._requested:
+            raise JobCancelled(self.job_id)
+
+    def cancel(self) -> None:
+        """Request cancellation of the scope's work."""
+        if not self._active or self._requested:
+            return
+        self._requested = True
+        if self.interrupt:
+            self._task.cancel()
+
+    async def _listen(self, events: asyncio.Queue) -> None:
+        while True:
+            event = await events.get()
+            if event is not RESYNC and event.get("status") == JobStatus.CANCELLED.value:
+                self.cancel()
+                return
+
+    async def __aenter__(self) -> "CancelScope":
+        self._task = asyncio.current_task()
+        self._cancelling = self._task.cancelling()
+        self._watch = get_job_event_hub().watch(self.job_id)
+        events = await self._watch.__aenter__()
+        self._listener = asyncio.create_task(self._listen(events))
+        _scopes[self.job_id].add(self)
+        self._active = True
+        return self
+
+    async def _drop_pending_interrupt(self) -> None:
+        """Take delivery of an interrupt the block finished (or swallowed it) before receiving."""
+        try:
+            await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            # Also cancelled from outside: let that through
+            if self._task.cancelling() > self._cancelling + 1:
+                raise
+
+    async def __aexit__(self, exc_type, exc, tb) -> Optional[bool]:
+        # Late requests (e.g. the listener's) are ignored from here on
+        self._active = False
+        self._listener.cancel()
+        # Task.uncancel() does not clear a cancel still waiting to be
+        # delivered, so receive it here, inside the scope
+        if self._requested and self.interrupt and exc_type is not asyncio.CancelledError:
+            await self._drop_pending_interrupt()
+        await self._watch.__aexit__(None, None, None)
+        scopes = _scopes.get(self.job_id)
+        if scopes is not None:
+            scopes.discard(self)
+            if not scopes:
+                del _scopes[self.job_id]
+
+        if (
+            self._requested
+            and self.interrupt
+            and self._task.uncancel() <= self._cancelling
+            and exc_type is asyncio.CancelledError
+        ):
+            raise JobCancelled(self.job_id) from exc
+        return None
+
+
+def cancel_running_job(job_id: str) -> bool:
+    """
+    Cancel a job's work if it runs in this process.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        True if any running work was cancelled
+    """
+    scopes = list(_scopes.get(job_id, ()))
+    for scope in scopes:
+        scope.cancel()
+    return bool(scopes)
@@ -0,0 +1,191 @@
+"""Process pool for CPU-bound document building (python-docx, python-pptx)."""
+
+import os
+import signal
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from .logging import logger
+
+T = TypeVar("T")
+
+# Processes building documents
+DOCUMENT_POOL_WORKERS = int(os.getenv("DOCUMENT_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Documents a process builds before it is replaced (bounds leaked memory)
+DOCUMENT_POOL_MAX_TASKS_PER_CHILD = int(os.getenv("DOCUMENT_POOL_MAX_TASKS_PER_CHILD", "100"))
+
+# Documents submitted at once; further builds wait their turn
+DOCUMENT_POOL_MAX_PENDING = int(os.getenv("DOCUMENT_POOL_MAX_PENDING", str(DOCUMENT_POOL_WORKERS * 4)))
+
+# Seconds a single document may take to build
+DOCUMENT_BUILD_TIMEOUT = float(os.getenv("DOCUMENT_BUILD_TIMEOUT", "60"))
+
+# Extra seconds after the timeout before a stuck process is killed
+KILL_GRACE = 5.0
+
+
+class DocumentBuildTimeout(Exception):
+    """Raised when a document takes longer than the build timeout."""
+
+
+def _on_alarm(signum, frame):
+    raise DocumentBuildTimeout()
+
+
+def _run_with_timeout(timeout: float, fn: Callable[..., T], *args: Any) -> T:
+    """Run ``fn`` in a pool process, interrupted with a timer signal after ``timeout`` seconds."""
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args)
+    except DocumentBuildTimeout:
+        raise DocumentBuildTimeout(f"{fn.__name__} took longer than {timeout:g}s") from None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+class DocumentPool:
+    """
+    Build documents in a bounded pool of processes, off the event loop.
+
+    Functions run in spawned processes, so they must be importable
+    module-level functions; arguments (pydantic payloads) and results
+    (bytes) are pickled across. The processes are replaced after
+    ``max_tasks_per_child`` builds each: the executor is retired (it
+    finishes the builds it has) and new builds go to a fresh one. The
+    executor's own ``max_tasks_per_child`` is not used, as on Python 3.11
+    it deadlocks once a process exits with builds still queued.
+
+    A build running past ``timeout`` is interrupted inside its process and
+    fails with ``DocumentBuildTimeout``. If the process does not respond
+    (stuck in native code) or dies, the pool is rebuilt; builds that were
+    running on it fail and can be retried.
+    """
+
+    def __init__(
+        self,
+        workers: int = DOCUMENT_POOL_WORKERS,
+        max_tasks_per_child: int = DOCUMENT_POOL_MAX_TASKS_PER_CHILD,
+        max_pending: int = DOCUMENT_POOL_MAX_PENDING,
+        timeout: float = DOCUMENT_BUILD_TIMEOUT,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            workers: Processes building documents
+            max_tasks_per_child: Builds per process before it is replaced
+            max_pending: Builds submitted at once
+            timeout: Seconds a single build may take
+        """
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.timeout = timeout
+        self._pending = asyncio.Semaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._builds = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._builds = 0
+        return self._executor
+
+    def _count_build(self, executor: ProcessPoolExecutor) -> None:
+        """Retire the executor once its processes have done their share of builds."""
+        self._builds += 1
+        if self._executor is executor and self._builds >= self.workers * self.max_tasks_per_child:
+            self._executor = None
+            executor.shutdown(wait=False)
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a broken or stuck executor's processes; the next build starts a new one."""
+        if self._executor is not executor:
+            return
+        self._executor = None
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self) -> None:
+        """Start the worker processes so the first builds don't pay for spawning them."""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm_up) for _ in range(self.workers)))
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Build a document in the pool.
+
+        Args:
+            fn: Module-level function building the document
+            *args: Picklable arguments
+
+        Returns:
+            The function's result
+
+        Raises:
+            DocumentBuildTimeout: If the build took longer than the timeout
+        """
+        async with self._pending:
+            executor = self._get_executor()
+            future = asyncio.get_running_loop().run_in_executor(
+                executor, _run_with_timeout, self.timeout, fn, *args
+            )
+            self._count_build(executor)
+            try:
+                return await asyncio.wait_for(future, timeout=self.timeout + KILL_GRACE)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Document build did not stop at its timeout, restarting pool",
+                    extra={"function": fn.__name__},
+                )
+                self._restart(executor)
+                raise DocumentBuildTimeout(f"{fn.__name__} took longer than {self.timeout:g}s") from None
+            except BrokenProcessPool:
+                logger.warning("Document pool process died, restarting pool", extra={"function": fn.__name__})
+                self._restart(executor)
+                raise
+
+    async def close(self) -> None:
+        """Stop the worker processes."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+# Singleton instance
+_document_pool: Optional[DocumentPool] = None
+
+
+def get_document_pool() -> DocumentPool:
+    """
+    Get or create DocumentPool singleton instance.
+
+    Returns:
+        DocumentPool instance
+    """
+    global _document_pool
+    if _document_pool is None:
+        _document_pool = DocumentPool()
+    return _document_pool
+
+
+async def close_document_pool() -> None:
+    """Stop the shared document pool, if one was created."""
+    global _document_pool
+    if _document_pool is not None:
+        await _document_pool.close()
+        _document_pool = None
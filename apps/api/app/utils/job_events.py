@@ -0,0 +1,220 @@
+"""Job status events: Postgres NOTIFY in, per-process fan-out to watchers."""
+
+import json
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import DATABASE_URL
+from .logging import logger
+
+JOB_EVENTS_CHANNEL = "job_events"
+
+# NOTIFY payloads are capped at 8000 bytes; error messages are truncated
+MAX_ERROR_LENGTH = 1000
+
+# Delivered to every watcher when events may have been missed (listener
+# reconnected); watchers re-read the job from the database
+RESYNC: Dict[str, Any] = {"type": "resync"}
+
+
+def job_event(
+    job_id: str,
+    user_id: str,
+    status: str,
+    progress: Optional[int] = None,
+    result_url: Optional[str] = None,
+    error_message: Optional[str] = None,
+    updated_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Build a job event payload.
+
+    Args:
+        job_id: Job ID
+        user_id: Owner of the job
+        status: Job status value (e.g. "processing")
+        progress: Progress percentage reported by the worker
+        result_url: Result URL once completed
+        error_message: Error message once failed
+        updated_at: Time of the change
+
+    Returns:
+        Event dict
+    """
+    return {
+        "job_id": job_id,
+        "user_id": user_id,
+        "status": status,
+        "progress": progress,
+        "result_url": result_url,
+        "error_message": error_message[:MAX_ERROR_LENGTH] if error_message else None,
+        "updated_at": (updated_at or datetime.utcnow()).isoformat(),
+    }
+
+
+async def publish_job_event(db: AsyncSession, event: Dict[str, Any]) -> None:
+    """
+    Publish a job event in the caller's transaction.
+
+    Postgres delivers the notification when the transaction commits (and
+    drops it on rollback), so watchers never see a change that did not
+    persist.
+
+    Args:
+        db: Database session
+        event: Event built with ``job_event``
+    """
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": JOB_EVENTS_CHANNEL, "payload": json.dumps(event)},
+    )
+
+
+class JobEventHub:
+    """
+    One LISTEN connection per process, fanning job events out to watchers.
+
+    SSE streams and long-polls register interest in job IDs with
+    ``watch``; each notification is pushed to the queues watching its job,
+    so no watcher has to poll the database.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        queue_size: int = 100,
+        heartbeat_interval: float = 30.0,
+        reconnect_delay: float = 1.0,
+    ):
+        """
+        Initialize hub.
+
+        Args:
+            dsn: PostgreSQL DSN (plain ``postgresql://`` form)
+            queue_size: Events buffered per watcher before the oldest is dropped
+            heartbeat_interval: Seconds between listener liveness checks
+            reconnect_delay: Initial delay before reconnecting (doubles up to 30s)
+        """
+        self.dsn = dsn
+        self.queue_size = queue_size
+        self.heartbeat_interval = heartbeat_interval
+        self.reconnect_delay = reconnect_delay
+        self._watchers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._conn: Optional[asyncpg.Connection] = None
+
+    @property
+    def connected(self) -> bool:
+        """Whether notifications are currently being received."""
+        return self._conn is not None and not self._conn.is_closed()
+
+    @asynccontextmanager
+    async def watch(self, *job_ids: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Receive events for one or more jobs.
+
+        Register before reading the job's current state, so a change made
+        in between is not missed.
+
+        Args:
+            job_ids: Job IDs to watch
+
+        Yields:
+            Queue of event dicts (or ``RESYNC``)
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        for job_id in job_ids:
+            self._watchers[job_id].add(queue)
+        try:
+            yield queue
+        finally:
+            for job_id in job_ids:
+                watchers = self._watchers.get(job_id)
+                if watchers is not None:
+                    watchers.discard(queue)
+                    if not watchers:
+                        del self._watchers[job_id]
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        """Enqueue without blocking; a slow watcher loses its oldest events."""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def dispatch(self, payload: str) -> int:
+        """
+        Deliver a raw notification payload to the job's watchers.
+
+        Args:
+            payload: JSON event
+
+        Returns:
+            Number of watchers notified
+        """
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Malformed job event", extra={"payload": payload[:200]})
+            return 0
+
+        watchers = self._watchers.get(event.get("job_id"), ())
+        for queue in watchers:
+            self._offer(queue, event)
+        return len(watchers)
+
+    def _resync_all(self) -> None:
+        for queue in {queue for watchers in self._watchers.values() for queue in watchers}:
+            self._offer(queue, RESYNC)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.dispatch(payload)
+
+    async def run(self) -> None:
+        """Listen forever (reconnecting as needed) until cancelled."""
+        delay = self.reconnect_delay
+        while True:
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                try:
+                    await conn.add_listener(JOB_EVENTS_CHANNEL, self._on_notify)
+                    self._conn = conn
+                    # Anything published while we were not listening is lost
+                    self._resync_all()
+                    delay = self.reconnect_delay
+                    while True:
+                        await asyncio.sleep(self.heartbeat_interval)
+                        await asyncio.wait_for(conn.fetchval("SELECT 1"), timeout=10)
+                finally:
+                    self._conn = None
+                    if not conn.is_closed():
+                        conn.terminate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Job event listener disconnected", extra={"error_message": str(e)})
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+# Singleton instance
+_hub: Optional[JobEventHub] = None
+
+
+def get_job_event_hub() -> JobEventHub:
+    """
+    Get or create JobEventHub singleton instance.
+
+    Returns:
+        JobEventHub instance
+    """
+    global _hub
+    if _hub is None:
+        _hub = JobEventHub(DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1))
+    return _hub
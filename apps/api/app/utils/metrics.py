@@ -0,0 +1,48 @@
+"""Prometheus metrics exported at /api/v1/metrics."""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "pulse_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+
+DB_POOL_IN_USE = Gauge(
+    "pulse_db_pool_connections_in_use",
+    "Database connections currently checked out of the pool",
+    ["engine"],
+)
+
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "pulse_db_pool_checkout_duration_seconds",
+    "How long database connections stay checked out",
+    ["engine"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+
+DB_POOL_LONG_HELD = Counter(
+    "pulse_db_pool_long_held_total",
+    "Checkouts held longer than DB_POOL_HOLD_WARN_SECONDS",
+    ["engine"],
+)
+
+# Exported by the API process currently holding the scheduler lock
+JOB_LANE_DEPTH = Gauge(
+    "pulse_job_lane_depth",
+    "Queued jobs waiting to be dispatched to workers",
+    ["lane"],
+)
+
+JOB_LANE_OLDEST_AGE = Gauge(
+    "pulse_job_lane_oldest_age_seconds",
+    "Age of the oldest job waiting to be dispatched",
+    ["lane"],
+)
+
+JOB_LANE_IN_FLIGHT = Gauge(
+    "pulse_job_lane_in_flight",
+    "Jobs dispatched to workers and not yet finished",
+    ["lane"],
+)
@@ -0,0 +1,42 @@
+"""Keyset (cursor) pagination helpers."""
+
+import json
+import base64
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """
+    Encode a ``(created_at, id)`` position as an opaque cursor.
+
+    Args:
+        created_at: Creation time of the last row on the page
+        row_id: ID of the last row on the page
+
+    Returns:
+        URL-safe cursor token
+    """
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        token: Cursor token
+
+    Returns:
+        Tuple of (created_at, id)
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except Exception as e:
+        raise ValueError("Invalid pagination cursor") from e
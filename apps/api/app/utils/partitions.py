@@ -0,0 +1,173 @@
+"""Monthly range partitions for append-heavy tables."""
+
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from ..models.job import Job
+from ..models.usage import UsageEvent
+
+# Tables partitioned by RANGE (created_at), one partition per calendar month
+PARTITIONED_TABLES: Dict[str, Table] = {
+    "jobs": Job.__table__,
+    "usage_events": UsageEvent.__table__,
+}
+
+# Partitions created ahead of the current month
+MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+
+
+def month_start(at: datetime) -> datetime:
+    """
+    Truncate a timestamp to the first instant of its month.
+
+    Args:
+        at: Timestamp
+
+    Returns:
+        Month start
+    """
+    return at.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """
+    Shift a month start by a number of months.
+
+    Args:
+        month: Month start
+        months: Months to add (may be negative)
+
+    Returns:
+        Shifted month start
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """
+    Name of the partition holding a month.
+
+    Args:
+        table: Parent table name
+        month: Month start
+
+    Returns:
+        Partition table name, e.g. ``jobs_p2026_10``
+    """
+    return f"{table}_p{month:%Y_%m}"
+
+
+def parse_partition_month(table: str, name: str) -> Optional[datetime]:
+    """
+    Parse the month out of a partition name.
+
+    Args:
+        table: Parent table name
+        name: Partition table name
+
+    Returns:
+        Month start, or None if ``name`` is not a monthly partition
+        (e.g. the default partition)
+    """
+    match = re.fullmatch(rf"{re.escape(table)}_p(\d{{4}})_(\d{{2}})", name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partition_bounds(month: datetime) -> str:
+    """
+    ``FOR VALUES`` clause of a monthly partition.
+
+    Args:
+        month: Month start
+
+    Returns:
+        Bound specification
+    """
+    return (
+        f"FROM ('{month:%Y-%m-%d %H:%M:%S}') "
+        f"TO ('{add_months(month, 1):%Y-%m-%d %H:%M:%S}')"
+    )
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    now: Optional[datetime] = None,
+    months_ahead: int = MONTHS_AHEAD,
+) -> None:
+    """
+    Create this month's and upcoming partitions, plus a default partition.
+
+    The default partition only catches rows outside every monthly range
+    (it should stay empty); creating a month whose rows already sit in
+    the default partition fails, which is why months are created ahead.
+
+    Args:
+        conn: Database connection
+        now: Current time (defaults to utcnow)
+        months_ahead: Number of future months to create
+    """
+    current = month_start(now or datetime.utcnow())
+    for table in PARTITIONED_TABLES:
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            await conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+                f"PARTITION OF {table} FOR VALUES {partition_bounds(month)}"
+            ))
+        await conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+        ))
+
+
+async def list_partitions(conn: AsyncConnection, table: str) -> List[datetime]:
+    """
+    List the months currently attached to a partitioned table.
+
+    Args:
+        conn: Database connection
+        table: Parent table name
+
+    Returns:
+        Month starts, oldest first
+    """
+    result = await conn.execute(
+        text("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table AS regclass)
+        """),
+        {"table": table},
+    )
+    months = [parse_partition_month(table, name) for name in result.scalars()]
+    return sorted(month for month in months if month is not None)
+
+
+
+async def list_detached_partitions(conn: AsyncConnection, table: str) -> List[datetime]:
+    """
+    List monthly partitions left detached (e.g. by an interrupted archival).
+
+    Args:
+        conn: Database connection
+        table: Parent table name
+
+    Returns:
+        Month starts, oldest first
+    """
+    result = await conn.execute(
+        text("""
+            SELECT relname FROM pg_class
+            WHERE relkind = 'r' AND NOT relispartition AND relname LIKE :pattern
+        """),
+        {"pattern": f"{table}_p%"},
+    )
+    # LIKE treats "_" as a wildcard; the exact name check happens here
+    months = [parse_partition_month(table, name) for name in result.scalars()]
+    return sorted(month for month in months if month is not None)
@@ -0,0 +1,178 @@
+"""Database connection pool settings, instrumentation and leak detection."""
+
+import os
+import time
+import asyncio
+import traceback
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+from .logging import logger
+from .metrics import (
+    DB_POOL_CHECKOUT_DURATION,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_IN_USE,
+    DB_POOL_LONG_HELD,
+)
+
+# Pool settings (shared by the primary and replica engines)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# Debug mode: capture the checkout stack and log connections held too long
+POOL_DEBUG = os.getenv("DB_POOL_DEBUG", "false").lower() == "true"
+HOLD_WARN_SECONDS = float(os.getenv("DB_POOL_HOLD_WARN_SECONDS", "10"))
+
+# Connections currently checked out: id(entry) -> (engine name, entry)
+_checked_out: Dict[int, Tuple[str, ConnectionPoolEntry]] = {}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    engine_name = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.engine_name).observe(time.perf_counter() - start)
+
+
+def pool_options(engine_name: str) -> dict:
+    """
+    ``create_async_engine`` pool arguments from the DB_POOL_* settings.
+
+    Args:
+        engine_name: Metrics label of the engine ("primary", "replica")
+
+    Returns:
+        Keyword arguments for ``create_async_engine``
+    """
+    # A subclass per engine, since the pool is re-created on dispose()
+    poolclass = type(
+        f"{engine_name.title()}QueuePool",
+        (InstrumentedQueuePool,),
+        {"engine_name": engine_name},
+    )
+    return {
+        "poolclass": poolclass,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+
+def _capture_stack() -> str:
+    """
+    Stack of the code checking out a connection.
+
+    Under asyncio the synchronous stack stops at SQLAlchemy's greenlet
+    bridge, so the awaiting coroutine chain of the current task is
+    walked instead.
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is None:
+        return "".join(traceback.format_stack(limit=30))
+
+    frames = []
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is not None:
+            frames.append((frame, frame.f_lineno))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return "".join(traceback.StackSummary.extract(frames[-30:]).format())
+
+
+def instrument_engine(engine: AsyncEngine, engine_name: str) -> None:
+    """
+    Track checkouts of an engine's pool in metrics (and debug logs).
+
+    Args:
+        engine: Async engine
+        engine_name: Metrics label of the engine
+    """
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, entry: ConnectionPoolEntry, proxy) -> None:
+        entry.info["checked_out_at"] = time.perf_counter()
+        entry.info["checkout_stack"] = _capture_stack() if POOL_DEBUG else None
+        entry.info["long_held_reported"] = False
+        _checked_out[id(entry)] = (engine_name, entry)
+        DB_POOL_IN_USE.labels(engine_name).inc()
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection, entry: ConnectionPoolEntry) -> None:
+        started = entry.info.pop("checked_out_at", None)
+        if started is None:
+            return
+        _checked_out.pop(id(entry), None)
+        held = time.perf_counter() - started
+        DB_POOL_IN_USE.labels(engine_name).dec()
+        DB_POOL_CHECKOUT_DURATION.labels(engine_name).observe(held)
+
+        if held > HOLD_WARN_SECONDS and not entry.info.get("long_held_reported"):
+            DB_POOL_LONG_HELD.labels(engine_name).inc()
+            if POOL_DEBUG:
+                logger.warning(
+                    "Long-held database connection released",
+                    extra={
+                        "engine": engine_name,
+                        "held_seconds": round(held, 2),
+                        "checkout_stack": entry.info.get("checkout_stack"),
+                    },
+                )
+
+
+def report_long_held(threshold: float = HOLD_WARN_SECONDS, now: Optional[float] = None) -> int:
+    """
+    Log connections that are still checked out past the threshold.
+
+    Each checkout is reported once, with the stack that acquired it, so a
+    leaked session is visible while it is still holding the connection.
+
+    Args:
+        threshold: Seconds a checkout may be held
+        now: Current ``time.perf_counter()`` value
+
+    Returns:
+        Number of newly reported checkouts
+    """
+    now = now or time.perf_counter()
+    reported = 0
+    for engine_name, entry in list(_checked_out.values()):
+        started = entry.info.get("checked_out_at")
+        if started is None or entry.info.get("long_held_reported"):
+            continue
+        if now - started > threshold:
+            entry.info["long_held_reported"] = True
+            DB_POOL_LONG_HELD.labels(engine_name).inc()
+            logger.warning(
+                "Database connection held too long",
+                extra={
+                    "engine": engine_name,
+                    "held_seconds": round(now - started, 2),
+                    "checkout_stack": entry.info.get("checkout_stack"),
+                },
+            )
+            reported += 1
+    return reported
+
+
+async def run_leak_detector(interval: float = 5.0) -> None:
+    """Report long-held connections forever until cancelled."""
+    while True:
+        report_long_held()
+        await asyncio.sleep(interval)
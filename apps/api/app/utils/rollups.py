@@ -0,0 +1,77 @@
+"""Incremental maintenance of usage rollup tables."""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.rollup import UsageRollupHourly, UsageRollupDaily
+
+GRANULARITIES = {
+    "hour": UsageRollupHourly,
+    "day": UsageRollupDaily,
+}
+
+
+def bucket_start(at: datetime, granularity: str) -> datetime:
+    """
+    Truncate a timestamp to the start of its bucket.
+
+    Args:
+        at: Timestamp
+        granularity: "hour" or "day"
+
+    Returns:
+        Bucket start
+    """
+    if granularity == "day":
+        return at.replace(hour=0, minute=0, second=0, microsecond=0)
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+async def bump_rollups(
+    db: AsyncSession,
+    at: datetime,
+    event_type: str,
+    model: Optional[str] = None,
+    plan: Optional[str] = None,
+    job_status: Optional[str] = None,
+    tokens: int = 0,
+    quantity: int = 0,
+) -> None:
+    """
+    Add one event to the hourly and daily rollups.
+
+    Runs in the caller's transaction, so the rollups commit (or roll back)
+    together with the row they summarize.
+
+    Args:
+        db: Database session
+        at: Event time
+        event_type: Usage event type, or ``job:<type>`` for job outcomes
+        model: Model name
+        plan: Subscription plan of the user
+        job_status: Terminal job status (job outcomes only)
+        tokens: Tokens consumed
+        quantity: Units consumed (images, exports, tokens for chat)
+    """
+    for granularity, table in GRANULARITIES.items():
+        stmt = insert(table).values(
+            bucket_start=bucket_start(at, granularity),
+            event_type=event_type,
+            model=model or "",
+            plan=plan or "",
+            job_status=job_status or "",
+            event_count=1,
+            tokens=tokens,
+            quantity=quantity,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["bucket_start", "event_type", "model", "plan", "job_status"],
+            set_={
+                "event_count": table.event_count + 1,
+                "tokens": table.tokens + stmt.excluded.tokens,
+                "quantity": table.quantity + stmt.excluded.quantity,
+            },
+        )
+        await db.execute(stmt)
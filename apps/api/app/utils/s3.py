@@ -2,8 +2,9 @@
 
 import os
 import uuid
-from typing import Optional
+from typing import BinaryIO, List, Optional
 import boto3
+from boto3.exceptions import S3UploadFailedError
 from botocore.exceptions import ClientError
 
 
@@ -76,6 +77,114 @@ class S3Manager:
         except ClientError as e:
             raise Exception(f"Failed to upload to S3: {str(e)}")
 
+    def upload_fileobj(
+        self,
+        fileobj: BinaryIO,
+        key: str,
+        content_type: str = "application/octet-stream",
+        metadata: Optional[dict] = None,
+    ) -> str:
+        """
+        Upload a file-like object to S3 (multipart for large files).
+
+        Args:
+            fileobj: Readable binary file object
+            key: S3 object key (path)
+            content_type: MIME type of the file
+            metadata: Optional metadata dict
+
+        Returns:
+            S3 key of uploaded file
+
+        Raises:
+            Exception: If upload fails
+        """
+        try:
+            extra_args = {
+                "ContentType": content_type,
+            }
+
+            if metadata:
+                extra_args["Metadata"] = metadata
+
+            self.s3_client.upload_fileobj(
+                fileobj,
+                self.bucket_name,
+                key,
+                ExtraArgs=extra_args,
+            )
+
+            return key
+        except (ClientError, S3UploadFailedError) as e:
+            raise Exception(f"Failed to upload to S3: {str(e)}")
+
+    def open_object(self, key: str):
+        """
+        Open an S3 object for streaming reads.
+
+        Args:
+            key: S3 object key
+
+        Returns:
+            Streaming body (call ``read(n)`` and ``close()``)
+
+        Raises:
+            FileNotFoundError: If the object does not exist
+            Exception: If the request fails
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=key,
+            )
+            return response["Body"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                raise FileNotFoundError(key)
+            raise Exception(f"Failed to read from S3: {str(e)}")
+
+    def head_object(self, key: str) -> Optional[dict]:
+        """
+        Fetch an S3 object's metadata without its body.
+
+        Args:
+            key: S3 object key
+
+        Returns:
+            Object metadata (ContentLength, LastModified, Metadata, ...), or None if it does not exist
+
+        Raises:
+            Exception: If the request fails
+        """
+        try:
+            return self.s3_client.head_object(
+                Bucket=self.bucket_name,
+                Key=key,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise Exception(f"Failed to read from S3: {str(e)}")
+
+    def list_keys(self, prefix: str) -> List[str]:
+        """
+        List object keys under a prefix.
+
+        Args:
+            prefix: Key prefix
+
+        Returns:
+            Object keys
+        """
+        try:
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            keys = []
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+                keys.extend(item["Key"] for item in page.get("Contents", []))
+            return keys
+        except ClientError as e:
+            raise Exception(f"Failed to list S3 objects: {str(e)}")
+
     def generate_presigned_url(
         self,
         key: str,
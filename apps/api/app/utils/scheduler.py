@@ -0,0 +1,428 @@
+"""Plan-aware, per-user fair dispatch of queued jobs to SQS."""
+
+import os
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.job import Job, JobStatus, JobType
+from ..models.subscription import PlanType, Subscription
+from .logging import logger
+from .metrics import JOB_LANE_DEPTH, JOB_LANE_IN_FLIGHT, JOB_LANE_OLDEST_AGE
+from .sqs import build_video_job_message
+from .sqs_producer import SQSBatchProducer, get_sqs_producer
+from .usage_writer import apply_job_record
+
+# Jobs running at once across all workers (what the worker fleet can take)
+MAX_IN_FLIGHT = int(os.getenv("SCHEDULER_MAX_IN_FLIGHT", "20"))
+
+# Jobs one user may have running at once
+USER_MAX_IN_FLIGHT = int(os.getenv("SCHEDULER_USER_MAX_IN_FLIGHT", "2"))
+
+SCHEDULER_INTERVAL = float(os.getenv("SCHEDULER_INTERVAL", "2"))
+
+# A dispatched job no worker has started by then is dispatched again (lost message)
+DISPATCH_TIMEOUT = int(os.getenv("SCHEDULER_DISPATCH_TIMEOUT", "900"))
+
+# A processing job without updates for this long has lost its worker and is failed
+PROCESSING_TIMEOUT = int(os.getenv("SCHEDULER_PROCESSING_TIMEOUT", "1800"))
+
+STALLED_JOB_ERROR = "Job stopped responding and was abandoned"
+
+SCHEDULER_LOCK_KEY = 7_310_040
+
+# Lanes in priority order, with their share of free worker slots per round
+LANE_WEIGHTS: Dict[PlanType, int] = {
+    PlanType.PRO: 4,
+    PlanType.PLUS: 2,
+    PlanType.STARTER: 1,
+}
+
+# Job types queued through the scheduler (consumed by the Node.js workers)
+SCHEDULED_JOB_TYPES = [JobType.VIDEO]
+
+
+def lane_of(plan: Optional[PlanType]) -> PlanType:
+    """Lane of a user's jobs; users without a subscription share the lowest lane."""
+    return plan or PlanType.STARTER
+
+
+def pick_jobs(
+    candidates: Dict[PlanType, List[Any]],
+    free_slots: int,
+    weights: Dict[PlanType, int] = LANE_WEIGHTS,
+) -> List[Any]:
+    """
+    Choose which waiting jobs fill the free worker slots.
+
+    Lanes take turns in priority order, each taking up to its weight in
+    jobs per round, so higher plans get more of the capacity without
+    starving lower ones; a lane with nothing waiting passes its share on.
+    Each lane's candidates are expected in per-user round-robin order
+    (every user's oldest job, then every user's second oldest, ...).
+
+    Args:
+        candidates: Dispatchable jobs per lane, in order
+        free_slots: Jobs that may be dispatched
+        weights: Jobs per round for each lane
+
+    Returns:
+        Jobs to dispatch, in dispatch order
+    """
+    queues = {lane: deque(candidates.get(lane, ())) for lane in weights}
+    picked: List[Any] = []
+    while len(picked) < free_slots and any(queues.values()):
+        for lane, weight in weights.items():
+            for _ in range(weight):
+                if not queues[lane] or len(picked) >= free_slots:
+                    break
+                picked.append(queues[lane].popleft())
+    return picked
+
+
+class JobScheduler:
+    """
+    Dispatch queued jobs to SQS in priority lanes with per-user fairness.
+
+    Jobs are created as pending and wait in the database until the
+    scheduler hands them to the queue. It keeps at most ``max_in_flight``
+    jobs dispatched-but-unfinished overall and ``user_max_in_flight`` per
+    user, so one user's burst cannot monopolize the workers and higher
+    plans are served first without starving lower ones.
+
+    A dispatched job holds its slot on a lease: until ``dispatch_timeout``
+    passes without a worker starting it, then while the worker keeps
+    updating it within ``processing_timeout``. Jobs whose lease ran out
+    are released at the start of each round (see ``release_stale``), so
+    a lost message or a crashed worker cannot hold a slot for good.
+    """
+
+    def __init__(
+        self,
+        engine,
+        producer: Optional[SQSBatchProducer] = None,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        user_max_in_flight: int = USER_MAX_IN_FLIGHT,
+        interval: float = SCHEDULER_INTERVAL,
+        dispatch_timeout: int = DISPATCH_TIMEOUT,
+        processing_timeout: int = PROCESSING_TIMEOUT,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            engine: Async engine
+            producer: Queue to dispatch to (defaults to the video job producer)
+            max_in_flight: Jobs running at once across all users
+            user_max_in_flight: Jobs running at once per user
+            interval: Seconds between dispatch rounds when not woken
+            dispatch_timeout: Seconds a dispatched job may wait for a worker
+            processing_timeout: Seconds a processing job may go without updates
+        """
+        self.engine = engine
+        self.producer = producer
+        self.max_in_flight = max_in_flight
+        self.user_max_in_flight = user_max_in_flight
+        self.interval = interval
+        self.dispatch_timeout = dispatch_timeout
+        self.processing_timeout = processing_timeout
+        self._wake = asyncio.Event()
+
+    def wake(self) -> None:
+        """Run a dispatch round now (e.g. after a job was submitted)."""
+        self._wake.set()
+
+    def _awaiting_dispatch(self):
+        return (
+            Job.type.in_(SCHEDULED_JOB_TYPES),
+            Job.status == JobStatus.PENDING,
+            Job.dispatched_at.is_(None),
+        )
+
+    def _dispatch_cutoff(self, now: datetime) -> datetime:
+        return now - timedelta(seconds=self.dispatch_timeout)
+
+    def _processing_cutoff(self, now: datetime) -> datetime:
+        return now - timedelta(seconds=self.processing_timeout)
+
+    def _in_flight(self, now: datetime):
+        return (
+            Job.type.in_(SCHEDULED_JOB_TYPES),
+            Job.dispatched_at.is_not(None),
+            or_(
+                and_(Job.status == JobStatus.PENDING, Job.dispatched_at >= self._dispatch_cutoff(now)),
+                and_(Job.status == JobStatus.PROCESSING, Job.updated_at >= self._processing_cutoff(now)),
+            ),
+        )
+
+    def _dispatch_expired(self, now: datetime):
+        return (
+            Job.type.in_(SCHEDULED_JOB_TYPES),
+            Job.status == JobStatus.PENDING,
+            Job.dispatched_at < self._dispatch_cutoff(now),
+        )
+
+    def _stalled(self, now: datetime):
+        return (
+            Job.type.in_(SCHEDULED_JOB_TYPES),
+            Job.status == JobStatus.PROCESSING,
+            Job.dispatched_at.is_not(None),
+            Job.updated_at < self._processing_cutoff(now),
+        )
+
+    async def release_stale(self, now: Optional[datetime] = None) -> Tuple[int, int]:
+        """
+        Free the slots of dispatched jobs whose lease ran out.
+
+        A job still pending after ``dispatch_timeout`` never reached a
+        worker and is dispatched again; the workers skip a duplicate
+        message for a job that has started or finished. A processing job
+        without updates for ``processing_timeout`` lost its worker and is
+        failed rather than rerun, which could pay the provider twice.
+
+        Args:
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            Number of jobs requeued and number failed
+        """
+        now = now or datetime.utcnow()
+        async with AsyncSession(self.engine) as db:
+            result = await db.execute(
+                update(Job).
+                where(*self._dispatch_expired(now)).
+                values(dispatched_at=None).
+                returning(Job.id)
+            )
+            requeued = result.scalars().all()
+
+            # Locked so a worker finishing the job meanwhile is not overwritten
+            result = await db.execute(
+                select(Job.id).where(*self._stalled(now)).with_for_update(skip_locked=True)
+            )
+            stalled = result.scalars().all()
+            for job_id in stalled:
+                await apply_job_record(db, {
+                    "job_id": job_id,
+                    "fields": {
+                        "status": JobStatus.FAILED,
+                        "error_message": STALLED_JOB_ERROR,
+                        "completed_at": now,
+                    },
+                })
+            await db.commit()
+
+        if requeued or stalled:
+            logger.warning(
+                "Released stale dispatched jobs",
+                extra={"requeued": len(requeued), "failed": len(stalled)},
+            )
+        return len(requeued), len(stalled)
+
+    async def lane_stats(self, conn, now: datetime) -> Dict[PlanType, Dict[str, Any]]:
+        """
+        Waiting and in-flight jobs per lane.
+
+        Args:
+            conn: Database connection
+            now: Current time, for the in-flight leases
+
+        Returns:
+            Per lane: ``waiting``, ``oldest_created_at`` and ``in_flight``
+        """
+        stats = {
+            lane: {"waiting": 0, "oldest_created_at": None, "in_flight": 0}
+            for lane in LANE_WEIGHTS
+        }
+
+        result = await conn.execute(
+            select(Subscription.plan, func.count(), func.min(Job.created_at)).
+            select_from(Job).
+            outerjoin(Subscription, Subscription.user_id == Job.user_id).
+            where(*self._awaiting_dispatch()).
+            group_by(Subscription.plan)
+        )
+        for plan, waiting, oldest in result:
+            lane = stats[lane_of(plan)]
+            lane["waiting"] += waiting
+            if oldest and (lane["oldest_created_at"] is None or oldest < lane["oldest_created_at"]):
+                lane["oldest_created_at"] = oldest
+
+        result = await conn.execute(
+            select(Subscription.plan, func.count()).
+            select_from(Job).
+            outerjoin(Subscription, Subscription.user_id == Job.user_id).
+            where(*self._in_flight(now)).
+            group_by(Subscription.plan)
+        )
+        for plan, in_flight in result:
+            stats[lane_of(plan)]["in_flight"] += in_flight
+
+        return stats
+
+    async def _candidates(self, conn, lane: PlanType, limit: int, now: datetime) -> List[Any]:
+        """Jobs of a lane that may run now, in per-user round-robin order."""
+        running = (
+            select(Job.user_id, func.count().label("running")).
+            where(*self._in_flight(now)).
+            group_by(Job.user_id).
+            subquery()
+        )
+
+        lane_filter = Subscription.plan == lane
+        if lane == PlanType.STARTER:
+            lane_filter = or_(lane_filter, Subscription.plan.is_(None))
+
+        waiting = (
+            select(
+                Job.id,
+                Job.user_id,
+                Job.type,
+                Job.prompt,
+                Job.parameters,
+                Job.created_at,
+                func.row_number().over(
+                    partition_by=Job.user_id, order_by=(Job.created_at, Job.id)
+                ).label("user_rank"),
+            ).
+            outerjoin(Subscription, Subscription.user_id == Job.user_id).
+            where(*self._awaiting_dispatch(), lane_filter).
+            subquery()
+        )
+
+        result = await conn.execute(
+            select(waiting).
+            outerjoin(running, running.c.user_id == waiting.c.user_id).
+            where(waiting.c.user_rank + func.coalesce(running.c.running, 0) <= self.user_max_in_flight).
+            order_by(waiting.c.user_rank, waiting.c.created_at).
+            limit(limit)
+        )
+        return list(result)
+
+    async def _send(self, job) -> str:
+        """Send a job to SQS."""
+        producer = self.producer or get_sqs_producer()
+        parameters = job.parameters or {}
+        return await producer.send(build_video_job_message(
+            job_id=job.id,
+            user_id=job.user_id,
+            prompt=job.prompt,
+            provider=parameters.get("provider"),
+            duration=parameters.get("duration"),
+            style=parameters.get("style"),
+            parameters={"aspect_ratio": parameters.get("aspect_ratio")},
+        ))
+
+    def _export_stats(self, stats: Dict[PlanType, Dict[str, Any]], now: datetime) -> None:
+        for lane, lane_stats in stats.items():
+            oldest = lane_stats["oldest_created_at"]
+            JOB_LANE_DEPTH.labels(lane.value).set(lane_stats["waiting"])
+            JOB_LANE_IN_FLIGHT.labels(lane.value).set(lane_stats["in_flight"])
+            JOB_LANE_OLDEST_AGE.labels(lane.value).set(
+                (now - oldest).total_seconds() if oldest else 0
+            )
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        Dispatch as many waiting jobs as capacity allows.
+
+        Guarded by an advisory lock so only one API process dispatches
+        (and exports lane metrics) at a time. Jobs whose lease ran out are
+        released first, so their slots count as free.
+
+        Args:
+            now: Current time (defaults to utcnow)
+
+        Returns:
+            Number of jobs dispatched
+        """
+        now = now or datetime.utcnow()
+        async with self.engine.connect() as lock_conn:
+            result = await lock_conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": SCHEDULER_LOCK_KEY}
+            )
+            if not result.scalar():
+                for gauge in (JOB_LANE_DEPTH, JOB_LANE_IN_FLIGHT, JOB_LANE_OLDEST_AGE):
+                    gauge.clear()
+                return 0
+            try:
+                await self.release_stale(now)
+
+                async with self.engine.connect() as conn:
+                    stats = await self.lane_stats(conn, now)
+                    self._export_stats(stats, now)
+
+                    in_flight = sum(lane["in_flight"] for lane in stats.values())
+                    free_slots = self.max_in_flight - in_flight
+                    if free_slots <= 0 or not any(lane["waiting"] for lane in stats.values()):
+                        return 0
+
+                    candidates = {
+                        lane: await self._candidates(conn, lane, free_slots, now)
+                        for lane in LANE_WEIGHTS
+                        if stats[lane]["waiting"]
+                    }
+
+                # Sent together (batched by the producer), then marked: a crash
+                # in between re-sends jobs rather than stranding them
+                picked = pick_jobs(candidates, free_slots)
+                results = await asyncio.gather(
+                    *(self._send(job) for job in picked), return_exceptions=True
+                )
+                sent = []
+                for job, result in zip(picked, results, strict=True):
+                    if isinstance(result, Exception):
+                        logger.warning(
+                            "Failed to dispatch job",
+                            extra={"job_id": job.id, "error_message": str(result)},
+                        )
+                    else:
+                        sent.append(job.id)
+
+                if sent:
+                    async with self.engine.begin() as conn:
+                        await conn.execute(
+                            update(Job).where(Job.id.in_(sent)).values(dispatched_at=datetime.utcnow())
+                        )
+                return len(sent)
+            finally:
+                await lock_conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEDULER_LOCK_KEY}
+                )
+
+    async def run(self) -> None:
+        """Dispatch jobs forever until cancelled."""
+        while True:
+            try:
+                dispatched = await self.run_once()
+                if dispatched:
+                    logger.info("Dispatched queued jobs", extra={"count": dispatched})
+            except Exception as e:
+                logger.warning("Job dispatch failed", extra={"error_message": str(e)})
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+
+# Singleton instance
+_scheduler: Optional[JobScheduler] = None
+
+
+def get_job_scheduler() -> JobScheduler:
+    """
+    Get or create JobScheduler singleton instance.
+
+    Returns:
+        JobScheduler instance
+    """
+    global _scheduler
+    if _scheduler is None:
+        from ..database import engine
+        _scheduler = JobScheduler(engine)
+    return _scheduler
@@ -0,0 +1,435 @@
+"""Local write-ahead spool for writes that must survive database outages."""
+
+import os
+import json
+import time
+import uuid
+import fcntl
+import socket
+import asyncio
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from .logging import logger
+
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+LOCK_SUFFIX = ".lock"
+DEAD_LETTER_DIR = "dead-letter"
+
+
+class WriteAheadSpool:
+    """
+    Append-only, segment-based spool with batched fsync.
+
+    Records are written as JSON lines to the active segment. Concurrent
+    appends share a single fsync (group commit): each caller waits until the
+    batch holding its record is durable, which happens when either
+    ``fsync_batch`` records are pending or ``fsync_interval`` seconds pass.
+    Sealed segments are immutable and are drained by a ``SpoolReplayer``.
+
+    Each process spools to its own subdirectory of the spool root, held
+    with an exclusive ``flock`` for the life of the process, so processes
+    sharing a root never replay each other's active segment. The
+    directories of processes that have exited (their lock is free) are
+    adopted and drained by whichever process replays next.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        fsync_batch: int = 64,
+        fsync_interval: float = 0.005,
+        segment_max_bytes: int = 16 * 1024 * 1024,
+    ):
+        """
+        Initialize spool.
+
+        Args:
+            directory: Spool root shared by the host's processes (defaults to env SPOOL_DIR)
+            fsync_batch: Pending records that force an immediate fsync
+            fsync_interval: Maximum seconds a record waits for its fsync
+            segment_max_bytes: Segment size that triggers rotation
+        """
+        self.root = Path(directory or os.getenv("SPOOL_DIR", "/tmp/pulse-spool"))
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.segment_max_bytes = segment_max_bytes
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.directory = self.root / f"{socket.gethostname()}-{os.getpid()}"
+        # Lock before creating the directory, so it is never seen unowned
+        self._lock = self._try_lock(self.directory)
+        if self._lock is None:
+            raise RuntimeError(f"Spool directory {self.directory} is in use")
+        self.directory.mkdir(exist_ok=True)
+        self._next_seq = self._last_sequence() + 1
+        # Directories of exited processes being drained, with their locks
+        self._adopted: Dict[Path, Any] = {}
+
+        self._file = None
+        self._active_path: Optional[Path] = None
+        self._active_records = 0
+        self._unsynced = 0
+        self._batch_waiter: Optional[asyncio.Future] = None
+        self._sync_lock = asyncio.Lock()
+
+    @staticmethod
+    def _try_lock(directory: Path):
+        """Take a process directory's lock file, or return None if a live process holds it."""
+        lock = open(directory.with_name(directory.name + LOCK_SUFFIX), "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            return None
+        return lock
+
+    @staticmethod
+    def _release(directory: Path, lock, remove: bool) -> None:
+        """Release a process directory's lock, removing the directory if asked."""
+        if remove:
+            try:
+                directory.rmdir()
+                directory.with_name(directory.name + LOCK_SUFFIX).unlink(missing_ok=True)
+            except OSError:
+                pass  # Not empty after all; left for adoption
+        lock.close()
+
+    def _last_sequence(self) -> int:
+        """Return the highest segment sequence number on disk."""
+        sequences = [self._sequence(path) for path in self._segment_paths()]
+        return max(sequences, default=0)
+
+    @staticmethod
+    def _sequence(path: Path) -> int:
+        """Parse the sequence number out of a segment file name."""
+        return int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+    def _segment_paths(self, directory: Optional[Path] = None) -> List[Path]:
+        """List a process directory's segment files ordered by sequence number."""
+        paths = (directory or self.directory).glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+        return sorted(paths, key=self._sequence)
+
+    def _adopt_orphans(self) -> None:
+        """Lock the directories of processes that exited with segments left."""
+        for directory in self.root.iterdir():
+            if (
+                not directory.is_dir()
+                or directory.name == DEAD_LETTER_DIR
+                or directory == self.directory
+                or directory in self._adopted
+            ):
+                continue
+            lock = self._try_lock(directory)
+            if lock is None:
+                continue
+            if directory.is_dir():
+                self._adopted[directory] = lock
+            else:
+                # Removed by the process that drained it before us
+                self._release(directory, lock, remove=False)
+
+    def _open_segment(self) -> None:
+        """Open a fresh active segment."""
+        self._active_path = self.directory / f"{SEGMENT_PREFIX}{self._next_seq:012d}{SEGMENT_SUFFIX}"
+        self._next_seq += 1
+        self._file = open(self._active_path, "a", encoding="utf-8")
+        self._active_records = 0
+
+        # Make the new directory entry durable as well
+        dir_fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    @property
+    def pending_records(self) -> int:
+        """Number of records in the active (unsealed) segment."""
+        return self._active_records
+
+    async def append(self, kind: str, payload: Dict[str, Any]) -> str:
+        """
+        Durably append a record.
+
+        Args:
+            kind: Record kind used by the replayer to pick a handler
+            payload: JSON-serializable record body
+
+        Returns:
+            Record ID (the payload ``id`` if present)
+        """
+        if self._file is None:
+            self._open_segment()
+
+        record_id = str(payload.get("id") or uuid.uuid4())
+        line = json.dumps(
+            {"id": record_id, "kind": kind, "ts": time.time(), "payload": payload},
+            default=str,
+            separators=(",", ":"),
+        )
+        self._file.write(line + "\n")
+        self._active_records += 1
+        self._unsynced += 1
+
+        waiter = self._batch_waiter
+        if waiter is None:
+            loop = asyncio.get_running_loop()
+            waiter = self._batch_waiter = loop.create_future()
+            loop.call_later(self.fsync_interval, self._kick, waiter)
+
+        if self._unsynced >= self.fsync_batch:
+            self._kick(waiter)
+
+        await asyncio.shield(waiter)
+
+        if self._file is not None and self._file.tell() >= self.segment_max_bytes:
+            await self.seal()
+
+        return record_id
+
+    def _kick(self, waiter: asyncio.Future) -> None:
+        """Start the fsync for the batch owning ``waiter``."""
+        if waiter is not self._batch_waiter:
+            return  # Batch already flushed
+        self._batch_waiter = None
+        self._unsynced = 0
+        self._file.flush()
+        asyncio.ensure_future(self._sync(self._file, waiter))
+
+    async def _sync(self, file, waiter: asyncio.Future) -> None:
+        """fsync ``file`` off the event loop and resolve the batch waiter."""
+        async with self._sync_lock:
+            try:
+                # A sealed segment was fsynced before it was closed
+                if not file.closed:
+                    await asyncio.to_thread(os.fsync, file.fileno())
+                waiter.set_result(None)
+            except Exception as e:
+                waiter.set_exception(e)
+
+    async def flush(self) -> None:
+        """Wait until every appended record is durable."""
+        waiter = self._batch_waiter
+        if waiter is not None:
+            self._kick(waiter)
+            await asyncio.shield(waiter)
+
+    async def seal(self) -> Optional[Path]:
+        """
+        Close the active segment so it can be replayed.
+
+        Returns:
+            Path of the sealed segment, or None if it was empty
+        """
+        if self._file is None or self._active_records == 0:
+            return None
+
+        async with self._sync_lock:
+            file, path = self._file, self._active_path
+            self._file = None
+            self._active_path = None
+            self._active_records = 0
+
+            file.flush()
+            await asyncio.to_thread(os.fsync, file.fileno())
+            file.close()
+
+            waiter, self._batch_waiter = self._batch_waiter, None
+            self._unsynced = 0
+            if waiter is not None and not waiter.done():
+                waiter.set_result(None)
+
+        return path
+
+    def sealed_segments(self) -> List[Path]:
+        """List sealed segments (this process's and adopted ones), oldest first."""
+        self._adopt_orphans()
+        paths = [path for directory in self._adopted for path in self._segment_paths(directory)]
+        return paths + [path for path in self._segment_paths() if path != self._active_path]
+
+    @staticmethod
+    def read_segment(path: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the records of a segment.
+
+        A torn final line (crash mid-write) is skipped.
+
+        Args:
+            path: Segment path
+
+        Yields:
+            Decoded records
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def remove_segment(self, path: Path) -> None:
+        """Delete a fully replayed segment, releasing an adopted directory it empties."""
+        path.unlink(missing_ok=True)
+
+        directory = path.parent
+        if directory in self._adopted and not self._segment_paths(directory):
+            self._release(directory, self._adopted.pop(directory), remove=True)
+
+    @staticmethod
+    def rewrite_segment(path: Path, records: List[Dict[str, Any]]) -> None:
+        """
+        Atomically replace a sealed segment's records.
+
+        Args:
+            path: Segment path
+            records: Records to keep
+        """
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def dead_letter(self, path: Path, records: List[Dict[str, Any]]) -> Path:
+        """
+        Set records aside that cannot be applied.
+
+        They are appended to a file in the spool root's ``dead-letter``
+        directory named after their segment, for inspection and manual replay.
+
+        Args:
+            path: Segment the records came from
+            records: Records to set aside
+
+        Returns:
+            Dead-letter file path
+        """
+        directory = self.root / DEAD_LETTER_DIR
+        directory.mkdir(exist_ok=True)
+        dead_path = directory / f"{path.parent.name}-{path.name}"
+        with open(dead_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return dead_path
+
+    async def close(self) -> None:
+        """Flush and close the active segment, releasing the spool's directories."""
+        await self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._active_path = None
+
+        for directory, lock in self._adopted.items():
+            self._release(directory, lock, remove=False)
+        self._adopted.clear()
+        if self._lock is not None:
+            # Unreplayed segments stay behind for the next process to adopt
+            self._release(self.directory, self._lock, remove=not self._segment_paths())
+            self._lock = None
+
+
+class SpoolReplayer:
+    """Drain sealed spool segments through a record handler."""
+
+    def __init__(
+        self,
+        spool: WriteAheadSpool,
+        handler: Callable[[List[Dict[str, Any]]], Awaitable[Optional[List[Dict[str, Any]]]]],
+        interval: float = 5.0,
+        max_attempts: int = 5,
+    ):
+        """
+        Initialize replayer.
+
+        Args:
+            spool: Spool to drain
+            handler: Coroutine applying a segment's records and returning
+                those it could not apply; must be idempotent
+            interval: Seconds between drain attempts
+            max_attempts: Failed replays before a record is dead-lettered
+        """
+        self.spool = spool
+        self.handler = handler
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self._failures: Dict[str, int] = {}
+
+    async def replay_once(self) -> int:
+        """
+        Seal the active segment and replay every sealed segment.
+
+        A segment is deleted only after its handler succeeds, so a failure
+        (the database still down) leaves it in place to be retried (hence
+        the idempotency requirement). Records the handler could not apply
+        are kept in their segment for the next attempt and, after
+        ``max_attempts``, moved to the spool's dead-letter directory, so
+        one bad record never holds back the others.
+
+        Returns:
+            Number of records replayed
+        """
+        await self.spool.seal()
+
+        replayed = 0
+        for path in self.spool.sealed_segments():
+            records = list(self.spool.read_segment(path))
+            failed = (await self.handler(records) or []) if records else []
+            replayed += len(records) - len(failed)
+
+            retry, dead = [], []
+            for record in failed:
+                attempts = self._failures[record["id"]] = self._failures.get(record["id"], 0) + 1
+                (dead if attempts >= self.max_attempts else retry).append(record)
+
+            if dead:
+                dead_path = self.spool.dead_letter(path, dead)
+                for record in dead:
+                    self._failures.pop(record["id"], None)
+                logger.error(
+                    "Spooled records dead-lettered",
+                    extra={"records": len(dead), "file": str(dead_path)},
+                )
+            if retry:
+                self.spool.rewrite_segment(path, retry)
+            else:
+                self.spool.remove_segment(path)
+
+        return replayed
+
+    async def run(self) -> None:
+        """Replay forever until cancelled."""
+        while True:
+            try:
+                replayed = await self.replay_once()
+                if replayed:
+                    logger.info("Spool replayed", extra={"records": replayed})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Spool replay deferred", extra={"error_message": str(e)})
+            await asyncio.sleep(self.interval)
+
+
+# Singleton instance
+_spool: Optional[WriteAheadSpool] = None
+
+
+def get_spool() -> WriteAheadSpool:
+    """
+    Get or create WriteAheadSpool singleton instance.
+
+    Returns:
+        WriteAheadSpool instance
+    """
+    global _spool
+    if _spool is None:
+        _spool = WriteAheadSpool()
+    return _spool
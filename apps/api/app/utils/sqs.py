@@ -2,11 +2,47 @@
 
 import os
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import boto3
 from botocore.exceptions import ClientError
 
 
+def build_video_job_message(
+    job_id: str,
+    user_id: str,
+    prompt: str,
+    provider: str,
+    duration: int,
+    style: Optional[str] = None,
+    parameters: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the message the video workers consume for a job.
+    
+    Args:
+        job_id: Job ID
+        user_id: User ID
+        prompt: Video prompt
+        provider: Video provider (runway or pika)
+        duration: Video duration in seconds
+        style: Optional style/preset
+        parameters: Optional additional parameters
+        
+    Returns:
+        Message body
+    """
+    return {
+        "job_id": job_id,
+        "user_id": user_id,
+        "job_type": "video",
+        "prompt": prompt,
+        "provider": provider,
+        "duration": duration,
+        "style": style,
+        "parameters": parameters or {},
+    }
+
+
 class SQSManager:
     """Manage SQS operations for job queue."""
 
@@ -75,6 +111,31 @@ class SQSManager:
         except ClientError as e:
             raise Exception(f"Failed to send SQS message: {str(e)}")
 
+    def send_message_batch(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Send up to 10 messages in one request.
+        
+        Args:
+            entries: SendMessageBatch entries (``Id``, ``MessageBody``, optional ``DelaySeconds``)
+            
+        Returns:
+            Response with ``Successful`` and ``Failed`` entries
+            
+        Raises:
+            Exception: If the request fails as a whole
+        """
+        try:
+            response = self.sqs_client.send_message_batch(
+                QueueUrl=self.queue_url,
+                Entries=entries,
+            )
+            return {
+                "Successful": response.get("Successful", []),
+                "Failed": response.get("Failed", []),
+            }
+        except ClientError as e:
+            raise Exception(f"Failed to send SQS message batch: {str(e)}")
+
     def receive_messages(
         self,
         max_messages: int = 1,
@@ -98,6 +159,7 @@ class SQSManager:
                 MaxNumberOfMessages=max_messages,
                 WaitTimeSeconds=wait_time_seconds,
                 VisibilityTimeout=visibility_timeout,
+                AttributeNames=["ApproximateReceiveCount"],
                 MessageAttributeNames=["All"],
             )
             return response.get("Messages", [])
@@ -125,6 +187,28 @@ class SQSManager:
             print(f"Failed to delete SQS message: {str(e)}")
             return False
 
+    def change_message_visibility(self, receipt_handle: str, visibility_timeout: int) -> bool:
+        """
+        Change how long a received message stays hidden from other consumers.
+        
+        Args:
+            receipt_handle: Message receipt handle
+            visibility_timeout: Seconds from now (0 makes it visible again)
+            
+        Returns:
+            True if successful
+        """
+        try:
+            self.sqs_client.change_message_visibility(
+                QueueUrl=self.queue_url,
+                ReceiptHandle=receipt_handle,
+                VisibilityTimeout=visibility_timeout,
+            )
+            return True
+        except ClientError as e:
+            print(f"Failed to change SQS message visibility: {str(e)}")
+            return False
+
     def enqueue_video_job(
         self,
         job_id: str,
@@ -150,16 +234,9 @@ class SQSManager:
         Returns:
             Message ID
         """
-        message = {
-            "job_id": job_id,
-            "user_id": user_id,
-            "job_type": "video",
-            "prompt": prompt,
-            "provider": provider,
-            "duration": duration,
-            "style": style,
-            "parameters": parameters or {},
-        }
+        message = build_video_job_message(
+            job_id, user_id, prompt, provider, duration, style, parameters
+        )
         
         return self.send_message(message)
 
@@ -0,0 +1,190 @@
+"""Non-blocking SQS producer that batches sends with SendMessageBatch."""
+
+import os
+import json
+import asyncio
+from typing import Any, Dict, List, Optional, Protocol, Set, Tuple
+
+from .logging import logger
+from .sqs import get_sqs_manager
+
+# SendMessageBatch limits
+MAX_BATCH_MESSAGES = 10
+MAX_BATCH_BYTES = 262144
+
+# How long a message waits for others to share its batch
+SQS_BATCH_LINGER = float(os.getenv("SQS_BATCH_LINGER_MS", "5")) / 1000
+
+SQS_BATCH_MAX_ATTEMPTS = int(os.getenv("SQS_BATCH_MAX_ATTEMPTS", "3"))
+
+
+class BatchSender(Protocol):
+    """What the producer sends through: ``SQSManager`` or a local stand-in."""
+
+    def send_message_batch(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        ...
+
+
+# A buffered message: SendMessageBatch entry (without Id), its size and caller's future
+_Pending = Tuple[Dict[str, Any], int, asyncio.Future]
+
+
+class SQSBatchProducer:
+    """
+    Buffer messages for a few milliseconds and send them in batches.
+
+    Each ``send`` joins the current batch, which goes out when it is full
+    (10 messages or 256 KiB) or ``linger`` seconds after its first
+    message. The blocking boto3 call runs in a thread, so the event loop
+    is never held up by the round-trip. Entries that fail are retried
+    with backoff; sender faults (e.g. invalid message) fail at once.
+    Each caller gets its own message ID or error.
+    """
+
+    def __init__(
+        self,
+        sender: BatchSender,
+        linger: float = SQS_BATCH_LINGER,
+        max_attempts: int = SQS_BATCH_MAX_ATTEMPTS,
+        retry_delay: float = 0.1,
+    ):
+        """
+        Initialize producer.
+
+        Args:
+            sender: Queue client with ``send_message_batch``
+            linger: Seconds a batch waits for more messages
+            max_attempts: Tries per message before its send fails
+            retry_delay: Delay before the first retry (doubles per attempt)
+        """
+        self.sender = sender
+        self.linger = linger
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._pending: List[_Pending] = []
+        self._pending_bytes = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    async def send(self, message_body: Dict[str, Any], delay_seconds: int = 0) -> str:
+        """
+        Send a message as part of the next batch.
+
+        Args:
+            message_body: Message payload as dict
+            delay_seconds: Delay before message becomes visible (0-900)
+
+        Returns:
+            Message ID
+
+        Raises:
+            Exception: If the message could not be sent
+        """
+        entry: Dict[str, Any] = {"MessageBody": json.dumps(message_body)}
+        if delay_seconds > 0:
+            entry["DelaySeconds"] = delay_seconds
+        size = len(entry["MessageBody"].encode())
+        if size > MAX_BATCH_BYTES:
+            raise ValueError(f"SQS message of {size} bytes exceeds {MAX_BATCH_BYTES}")
+
+        if self._pending_bytes + size > MAX_BATCH_BYTES:
+            self.flush()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((entry, size, future))
+        self._pending_bytes += size
+
+        if len(self._pending) >= MAX_BATCH_MESSAGES:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.linger, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """Send the buffered messages now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending, self._pending_bytes = self._pending, [], 0
+        task = asyncio.create_task(self._send_batch([(entry, future) for entry, _, future in batch]))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def close(self) -> None:
+        """Send buffered messages and wait for every batch to finish."""
+        self.flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+    async def _send_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        remaining = {str(i): item for i, item in enumerate(batch)}
+
+        for attempt in range(1, self.max_attempts + 1):
+            entries = [{**entry, "Id": entry_id} for entry_id, (entry, _) in remaining.items()]
+            try:
+                response = await asyncio.to_thread(self.sender.send_message_batch, entries)
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    for _, future in remaining.values():
+                        if not future.done():
+                            future.set_exception(e)
+                    return
+                logger.warning(
+                    "SQS batch send failed, will retry",
+                    extra={"messages": len(entries), "attempt": attempt, "error_message": str(e)},
+                )
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+                continue
+
+            for result in response.get("Successful", []):
+                _, future = remaining.pop(result["Id"])
+                if not future.done():
+                    future.set_result(result["MessageId"])
+
+            for failure in response.get("Failed", []):
+                if failure.get("SenderFault") or attempt == self.max_attempts:
+                    _, future = remaining.pop(failure["Id"])
+                    if not future.done():
+                        future.set_exception(Exception(
+                            f"Failed to send SQS message: {failure.get('Code')} {failure.get('Message', '')}".strip()
+                        ))
+
+            if not remaining or attempt == self.max_attempts:
+                break
+            logger.warning(
+                "SQS batch partially failed, will retry",
+                extra={"messages": len(remaining), "attempt": attempt},
+            )
+            await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+        # Entries the response did not mention at all
+        for _, future in remaining.values():
+            if not future.done():
+                future.set_exception(Exception("Failed to send SQS message: no result in batch response"))
+
+
+# Singleton instance
+_sqs_producer: Optional[SQSBatchProducer] = None
+
+
+def get_sqs_producer() -> SQSBatchProducer:
+    """
+    Get or create the batch producer for the video job queue (SQS_QUEUE_URL).
+
+    Returns:
+        SQSBatchProducer instance
+    """
+    global _sqs_producer
+    if _sqs_producer is None:
+        _sqs_producer = SQSBatchProducer(get_sqs_manager())
+    return _sqs_producer
+
+
+async def close_sqs_producer() -> None:
+    """Flush the video job producer, if one was created."""
+    if _sqs_producer is not None:
+        await _sqs_producer.close()
@@ -0,0 +1,254 @@
+"""Queue of background jobs for the Python job worker (see ``worker/``)."""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from .sqs import SQSManager
+from .sqs_producer import SQSBatchProducer
+
+
+class TaskMessage:
+    """A task received from the queue."""
+
+    def __init__(self, message_id: str, receipt_handle: str, body: Dict[str, Any], receive_count: int):
+        """
+        Initialize message.
+
+        Args:
+            message_id: Queue message ID
+            receipt_handle: Handle for deleting or re-hiding this delivery
+            body: Task payload
+            receive_count: Times the message has been delivered (1 on first)
+        """
+        self.message_id = message_id
+        self.receipt_handle = receipt_handle
+        self.body = body
+        self.receive_count = receive_count
+
+
+class TaskQueue(ABC):
+    """Queue with SQS semantics: received messages stay hidden until deleted or re-shown."""
+
+    @abstractmethod
+    async def send(self, body: Dict[str, Any], delay_seconds: int = 0) -> str:
+        """
+        Enqueue a task.
+
+        Args:
+            body: Task payload
+            delay_seconds: Delay before the task becomes visible
+
+        Returns:
+            Message ID
+        """
+
+    @abstractmethod
+    async def receive(
+        self, max_messages: int, wait_seconds: float, visibility_timeout: int
+    ) -> List[TaskMessage]:
+        """
+        Long-poll for tasks.
+
+        Args:
+            max_messages: Maximum number of tasks (1-10)
+            wait_seconds: Longest to wait for a task
+            visibility_timeout: Seconds received tasks stay hidden
+
+        Returns:
+            Received tasks (empty when the wait ran out)
+        """
+
+    @abstractmethod
+    async def delete(self, message: TaskMessage) -> None:
+        """Remove a finished task."""
+
+    @abstractmethod
+    async def change_visibility(self, message: TaskMessage, visibility_timeout: int) -> None:
+        """Keep a task hidden for another ``visibility_timeout`` seconds (0 re-shows it)."""
+
+    @abstractmethod
+    async def dead_letter(self, message: TaskMessage, error: str) -> None:
+        """Set aside a task that failed on every attempt (it is deleted separately)."""
+
+
+class SQSTaskQueue(TaskQueue):
+    """Task queue on SQS, with an optional dead-letter queue."""
+
+    def __init__(self, queue_url: str, dead_letter_url: Optional[str] = None):
+        """
+        Initialize queue.
+
+        Args:
+            queue_url: SQS queue URL
+            dead_letter_url: SQS queue receiving tasks that failed every attempt
+        """
+        self.sqs = SQSManager(queue_url=queue_url)
+        self.producer = SQSBatchProducer(self.sqs)
+        self.dead_letter_sqs = SQSManager(queue_url=dead_letter_url) if dead_letter_url else None
+
+    async def send(self, body: Dict[str, Any], delay_seconds: int = 0) -> str:
+        return await self.producer.send(body, delay_seconds)
+
+    async def receive(
+        self, max_messages: int, wait_seconds: float, visibility_timeout: int
+    ) -> List[TaskMessage]:
+        messages = await asyncio.to_thread(
+            self.sqs.receive_messages,
+            max_messages=max_messages,
+            wait_time_seconds=int(wait_seconds),
+            visibility_timeout=visibility_timeout,
+        )
+        return [
+            TaskMessage(
+                message_id=message["MessageId"],
+                receipt_handle=message["ReceiptHandle"],
+                body=json.loads(message["Body"]),
+                receive_count=int(message.get("Attributes", {}).get("ApproximateReceiveCount", 1)),
+            )
+            for message in messages
+        ]
+
+    async def delete(self, message: TaskMessage) -> None:
+        await asyncio.to_thread(self.sqs.delete_message, message.receipt_handle)
+
+    async def change_visibility(self, message: TaskMessage, visibility_timeout: int) -> None:
+        await asyncio.to_thread(
+            self.sqs.change_message_visibility, message.receipt_handle, visibility_timeout
+        )
+
+    async def dead_letter(self, message: TaskMessage, error: str) -> None:
+        if self.dead_letter_sqs:
+            await asyncio.to_thread(
+                self.dead_letter_sqs.send_message,
+                {**message.body, "error": error, "receive_count": message.receive_count},
+            )
+
+
+class MemoryTaskQueue(TaskQueue):
+    """
+    In-process stand-in for SQS, for local development and tests.
+
+    Tasks only reach a worker running in the same process, so the API
+    starts one itself when this queue is in use.
+    """
+
+    def __init__(self):
+        """Initialize queue."""
+        # message_id -> entry dict (body, visible_at, receive_count, receipt_handle)
+        self._messages: Dict[str, Dict[str, Any]] = {}
+        self._changed = asyncio.Event()
+        self.dead_letters: List[Dict[str, Any]] = []
+
+    async def send(self, body: Dict[str, Any], delay_seconds: int = 0) -> str:
+        message_id = str(uuid.uuid4())
+        self._messages[message_id] = {
+            "body": body,
+            "visible_at": time.monotonic() + delay_seconds,
+            "receive_count": 0,
+            "receipt_handle": None,
+        }
+        self._changed.set()
+        return message_id
+
+    async def receive(
+        self, max_messages: int, wait_seconds: float, visibility_timeout: int
+    ) -> List[TaskMessage]:
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            now = time.monotonic()
+            ready = [
+                (message_id, entry) for message_id, entry in self._messages.items()
+                if entry["visible_at"] <= now
+            ][:max_messages]
+            if ready:
+                received = []
+                for message_id, entry in ready:
+                    entry["receive_count"] += 1
+                    entry["visible_at"] = now + visibility_timeout
+                    entry["receipt_handle"] = str(uuid.uuid4())
+                    received.append(TaskMessage(
+                        message_id, entry["receipt_handle"], entry["body"], entry["receive_count"]
+                    ))
+                return received
+
+            if now >= deadline:
+                return []
+            # Sleep until a send, the next task becoming visible, or the deadline
+            next_visible = min((entry["visible_at"] for entry in self._messages.values()), default=deadline)
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=max(0, min(deadline, next_visible) - now))
+            except asyncio.TimeoutError:
+                pass
+
+    def _entry(self, message: TaskMessage) -> Optional[Dict[str, Any]]:
+        entry = self._messages.get(message.message_id)
+        # A stale receipt (the task was re-delivered since) is ignored, as in SQS
+        if entry is None or entry["receipt_handle"] != message.receipt_handle:
+            return None
+        return entry
+
+    async def delete(self, message: TaskMessage) -> None:
+        if self._entry(message) is not None:
+            del self._messages[message.message_id]
+
+    async def change_visibility(self, message: TaskMessage, visibility_timeout: int) -> None:
+        entry = self._entry(message)
+        if entry is not None:
+            entry["visible_at"] = time.monotonic() + visibility_timeout
+            self._changed.set()
+
+    async def dead_letter(self, message: TaskMessage, error: str) -> None:
+        self.dead_letters.append({**message.body, "error": error, "receive_count": message.receive_count})
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+
+# Singleton instance
+_task_queue: Optional[TaskQueue] = None
+
+
+def get_task_queue() -> TaskQueue:
+    """
+    Get or create the task queue singleton.
+
+    Uses SQS when TASK_QUEUE_URL is set, otherwise an in-process queue.
+
+    Returns:
+        TaskQueue instance
+    """
+    global _task_queue
+    if _task_queue is None:
+        queue_url = os.getenv("TASK_QUEUE_URL")
+        if queue_url:
+            _task_queue = SQSTaskQueue(queue_url, os.getenv("TASK_DLQ_URL"))
+        else:
+            _task_queue = MemoryTaskQueue()
+    return _task_queue
+
+
+async def enqueue_job_task(job_type: str, job_id: str, user_id: str, payload: Dict[str, Any]) -> str:
+    """
+    Queue a job for the worker.
+
+    Args:
+        job_type: Job type value (selects the worker handler)
+        job_id: Job ID (created as pending by the caller)
+        user_id: User ID
+        payload: Request data the handler needs
+
+    Returns:
+        Message ID
+    """
+    return await get_task_queue().send({
+        "job_type": job_type,
+        "job_id": job_id,
+        "user_id": user_id,
+        "payload": payload,
+    })
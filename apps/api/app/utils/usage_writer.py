@@ -0,0 +1,364 @@
+"""Usage and job-result writes that fall back to the local spool on DB outages."""
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import exc as sa_exc, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import AsyncSessionLocal
+from ..models.job import TERMINAL_STATUSES, Job, JobStatus
+from ..models.subscription import Subscription
+from ..models.usage import UsageEvent
+from .job_events import job_event, publish_job_event
+from .logging import logger
+from .rollups import bump_rollups
+from .spool import get_spool
+from .webhooks import enqueue_job_webhooks
+
+USAGE_RECORD = "usage"
+JOB_RECORD = "job"
+
+# Metadata keys stored in typed UsageEvent columns
+USAGE_COLUMN_FIELDS = ("provider", "model", "prompt_tokens", "completion_tokens", "image_count")
+
+# Job columns that may be carried in a spooled job update
+JOB_DATETIME_FIELDS = {"started_at", "completed_at"}
+JOB_FIELDS = JOB_DATETIME_FIELDS | {
+    "status",
+    "parameters",
+    "result_url",
+    "error_message",
+    "model_name",
+    "tokens_used",
+    "progress",
+}
+
+
+def is_db_unavailable(error: BaseException) -> bool:
+    """
+    Check whether an error means the database could not be reached.
+
+    Args:
+        error: Raised exception
+
+    Returns:
+        True for connection-level failures, False for query errors
+    """
+    if isinstance(error, sa_exc.DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(
+        error,
+        (
+            sa_exc.OperationalError,
+            sa_exc.InterfaceError,
+            sa_exc.TimeoutError,
+            ConnectionError,
+            TimeoutError,
+            OSError,
+        ),
+    )
+
+
+async def _safe_rollback(db: AsyncSession) -> None:
+    """Roll back a session whose connection may already be gone."""
+    # Detach loaded objects first so the rollback does not expire them;
+    # callers keep reading e.g. ``job.id`` after a spooled write.
+    db.expunge_all()
+    try:
+        await db.rollback()
+    except Exception:
+        pass
+
+
+async def apply_usage_record(db: AsyncSession, record: Dict[str, Any]) -> bool:
+    """
+    Insert a usage event and bump its subscription counter.
+
+    Idempotent: an event whose ID already exists is skipped, so a record
+    can be replayed any number of times.
+
+    Args:
+        db: Database session
+        record: Usage record
+
+    Returns:
+        True if the event was inserted
+    """
+    if await db.get(UsageEvent, record["id"]) is not None:
+        return False
+
+    created_at = record.get("created_at") or datetime.utcnow()
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+
+    # Hot fields become typed columns; only the long tail stays in JSON
+    metadata = dict(record.get("event_metadata") or {})
+    hot = {field: metadata.pop(field) for field in USAGE_COLUMN_FIELDS if field in metadata}
+
+    db.add(
+        UsageEvent(
+            id=record["id"],
+            user_id=record["user_id"],
+            job_id=record.get("job_id"),
+            event_type=record["event_type"],
+            tokens=record.get("tokens", 0),
+            event_metadata=metadata or None,
+            created_at=created_at,
+            updated_at=created_at,
+            **hot,
+        )
+    )
+
+    counter = record.get("counter")
+    if counter and record.get("amount"):
+        column = getattr(Subscription, counter)
+        result = await db.execute(
+            update(Subscription)
+            .where(Subscription.user_id == record["user_id"])
+            .values({column: column + record["amount"]})
+            .returning(Subscription.plan)
+        )
+        plan = result.scalar_one_or_none()
+    else:
+        plan = await db.scalar(
+            select(Subscription.plan).where(Subscription.user_id == record["user_id"])
+        )
+
+    await bump_rollups(
+        db,
+        at=created_at,
+        event_type=record["event_type"],
+        model=hot.get("model"),
+        plan=plan.value if plan else None,
+        tokens=record.get("tokens", 0),
+        quantity=record.get("amount", 0),
+    )
+
+    return True
+
+
+async def apply_job_record(db: AsyncSession, record: Dict[str, Any]) -> None:
+    """
+    Apply a job update. Setting absolute values keeps it idempotent.
+
+    Status changes of a cancelled job are ignored, and a job that already
+    finished is not cancelled, nor moved back to an unfinished status or
+    earlier progress (e.g. by a stale update replayed from the spool after
+    a later write finished it). The job's row is locked while its previous
+    status is read, so of two concurrent updates into the same terminal
+    status only the first counts as the transition (rolled up and
+    announced to webhooks once).
+
+    Watchers of the job are notified when the transaction commits.
+
+    Args:
+        db: Database session
+        record: Job record with ``job_id`` and ``fields``
+    """
+    values = {}
+    for field, value in record["fields"].items():
+        if field not in JOB_FIELDS:
+            continue
+        if field in JOB_DATETIME_FIELDS and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif field == "status" and value is not None:
+            value = JobStatus(value)
+        values[field] = value
+
+    if not values:
+        return
+    new_status = values.get("status")
+    if new_status == JobStatus.COMPLETED:
+        values.setdefault("progress", 100)
+
+    # Lock the row until commit: a concurrent update waits here and then
+    # sees this one's status, rather than the status both started from
+    result = await db.execute(
+        select(Job.status, Job.type, Job.model_name, Job.user_id).
+        where(Job.id == record["job_id"]).
+        with_for_update()
+    )
+    previous = result.one_or_none()
+
+    # A cancelled job keeps its status (a worker finishing late cannot
+    # revive it); only unfinished jobs can be cancelled or given an
+    # unfinished status or progress, so a finished job is never reopened
+    reopens = new_status not in TERMINAL_STATUSES and ("status" in values or "progress" in values)
+    query = update(Job).where(Job.id == record["job_id"])
+    if reopens or new_status == JobStatus.CANCELLED:
+        query = query.where(Job.status.not_in(TERMINAL_STATUSES))
+    elif "status" in values:
+        query = query.where(Job.status != JobStatus.CANCELLED)
+
+    result = await db.execute(
+        query.
+        values(**values).
+        returning(
+            Job.user_id,
+            Job.status,
+            Job.progress,
+            Job.result_url,
+            Job.error_message,
+            Job.updated_at,
+        )
+    )
+    current = result.one_or_none()
+    if current:
+        await publish_job_event(db, job_event(
+            record["job_id"],
+            current.user_id,
+            current.status.value,
+            progress=current.progress,
+            result_url=current.result_url,
+            error_message=current.error_message,
+            updated_at=current.updated_at,
+        ))
+
+    # Roll up (and announce) terminal outcomes once, on the transition into that status
+    if previous and current and new_status in TERMINAL_STATUSES and previous.status != new_status:
+        plan = await db.scalar(
+            select(Subscription.plan).where(Subscription.user_id == previous.user_id)
+        )
+        await bump_rollups(
+            db,
+            at=values.get("completed_at") or datetime.utcnow(),
+            event_type=f"job:{previous.type.value}",
+            model=values.get("model_name") or previous.model_name,
+            plan=plan.value if plan else None,
+            job_status=new_status.value,
+            tokens=values.get("tokens_used") or 0,
+            quantity=1,
+        )
+
+        # Notify the owner's webhook endpoints with the same commit
+        await enqueue_job_webhooks(db, previous.user_id, {
+            "id": record["job_id"],
+            "type": previous.type,
+            "status": new_status,
+            "result_url": current.result_url,
+            "error_message": current.error_message,
+            "completed_at": values.get("completed_at"),
+        })
+
+
+async def record_usage_event(
+    db: AsyncSession,
+    user_id: str,
+    job_id: Optional[str],
+    event_type: str,
+    tokens: int = 0,
+    event_metadata: Optional[dict] = None,
+    counter: Optional[str] = None,
+    amount: int = 0,
+) -> None:
+    """
+    Record a usage event, spooling it locally if the database is down.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        job_id: Job ID
+        event_type: Usage event type
+        tokens: Tokens consumed
+        event_metadata: Additional event data
+        counter: Subscription counter column to increment
+        amount: Increment for ``counter``
+    """
+    record = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "job_id": job_id,
+        "event_type": event_type,
+        "tokens": tokens,
+        "event_metadata": event_metadata,
+        "counter": counter,
+        "amount": amount,
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+    try:
+        await apply_usage_record(db, record)
+        await db.commit()
+    except Exception as e:
+        if not is_db_unavailable(e):
+            raise
+        await _safe_rollback(db)
+        await get_spool().append(USAGE_RECORD, record)
+        logger.warning(
+            "Usage event spooled",
+            extra={"user_id": user_id, "job_id": job_id, "event_type": event_type},
+        )
+
+
+async def save_job_result(db: AsyncSession, job_id: str, **fields: Any) -> bool:
+    """
+    Update a job's outcome, spooling the update locally if the database is down.
+
+    A spooled update leaves the session without its loaded objects, so
+    callers must not refresh or lazy-load them afterwards.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+        **fields: Job columns to set (status, completed_at, result_url, ...)
+
+    Returns:
+        True if the update was written, False if it was spooled for replay
+    """
+    record = {
+        "job_id": job_id,
+        "fields": {
+            field: value.isoformat() if isinstance(value, datetime) else getattr(value, "value", value)
+            for field, value in fields.items()
+        },
+    }
+
+    try:
+        await apply_job_record(db, record)
+        await db.commit()
+    except Exception as e:
+        if not is_db_unavailable(e):
+            raise
+        await _safe_rollback(db)
+        await get_spool().append(JOB_RECORD, record)
+        logger.warning("Job update spooled", extra={"job_id": job_id})
+        return False
+    return True
+
+
+async def replay_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Apply a spool segment's records in one transaction, each in its own savepoint.
+
+    A record that fails to apply (bad data, a constraint violation) is
+    rolled back to its savepoint and handed back, without affecting the
+    others; losing the database connection fails the whole segment.
+
+    Args:
+        records: Spooled records, in append order
+
+    Returns:
+        Records that could not be applied
+    """
+    failed = []
+    async with AsyncSessionLocal() as db:
+        for record in records:
+            try:
+                async with db.begin_nested():
+                    if record["kind"] == USAGE_RECORD:
+                        await apply_usage_record(db, record["payload"])
+                    elif record["kind"] == JOB_RECORD:
+                        await apply_job_record(db, record["payload"])
+                    else:
+                        raise ValueError(f"Unknown spool record kind: {record['kind']}")
+            except Exception as e:
+                if is_db_unavailable(e):
+                    raise
+                logger.warning(
+                    "Spooled record not applied",
+                    extra={"record_id": record["id"], "kind": record["kind"], "error_message": str(e)},
+                )
+                failed.append(record)
+        await db.commit()
+    return failed
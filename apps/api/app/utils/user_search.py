@@ -0,0 +1,97 @@
+"""Index-backed user search for admin lookups."""
+
+from typing import Tuple
+from sqlalchemy import Select, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..models.user import User
+
+# Shortest term the pg_trgm index can serve for a substring match
+TRIGRAM_MIN_LENGTH = 3
+
+# Counts stop here; larger result sets report an approximate total
+COUNT_CAP = 10_000
+
+
+def escape_like(term: str) -> str:
+    """
+    Escape LIKE wildcards so user input matches literally.
+
+    Args:
+        term: Raw search term
+
+    Returns:
+        Escaped term (escape character is backslash)
+    """
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_user_filter(search: str) -> ColumnElement[bool]:
+    """
+    Build the WHERE clause for an admin user search.
+
+    - Terms containing ``@`` are treated as email prefixes and use the
+      ``lower(email) text_pattern_ops`` btree index, except domain terms
+      starting with ``@`` (e.g. ``@example.com``), which are substring
+      matches on email.
+    - Terms shorter than the trigram length are prefix-matched on email
+      and name (a trigram index cannot serve them).
+    - Everything else is a substring match served by the ``gin_trgm_ops``
+      indexes on email and name.
+
+    Args:
+        search: Search term
+
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    term = escape_like(search.strip().lower())
+
+    if term.startswith("@"):
+        return User.email.ilike(f"%{term}%", escape="\\")
+
+    if "@" in term:
+        return func.lower(User.email).like(f"{term}%", escape="\\")
+
+    if len(term) < TRIGRAM_MIN_LENGTH:
+        return or_(
+            func.lower(User.email).like(f"{term}%", escape="\\"),
+            func.lower(User.name).like(f"{term}%", escape="\\"),
+        )
+
+    return or_(
+        User.email.ilike(f"%{term}%", escape="\\"),
+        User.name.ilike(f"%{term}%", escape="\\"),
+    )
+
+
+async def count_users(db: AsyncSession, query: Select) -> Tuple[int, bool]:
+    """
+    Count users matching a query without scanning unbounded result sets.
+
+    Unfiltered lists use the planner's row estimate when the table is
+    large; filtered counts stop at ``COUNT_CAP``.
+
+    Args:
+        db: Database session
+        query: User query (without pagination)
+
+    Returns:
+        Tuple of (total, is_estimate)
+    """
+    if query.whereclause is None:
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+        )
+        estimate = result.scalar() or 0
+        if estimate > COUNT_CAP:
+            return estimate, True
+
+    capped = query.with_only_columns(User.id).limit(COUNT_CAP + 1).subquery()
+    result = await db.execute(select(func.count()).select_from(capped))
+    total = result.scalar()
+
+    if total > COUNT_CAP:
+        return COUNT_CAP, True
+    return total, False
@@ -0,0 +1,452 @@
+"""Signed job-event webhooks: queued with the job update, delivered by a worker loop."""
+
+import os
+import hmac
+import json
+import time
+import uuid
+import socket
+import asyncio
+import hashlib
+import secrets
+import ipaddress
+from urllib.parse import urlsplit
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.job import JobStatus
+from ..models.webhook import DeliveryStatus, WebhookDelivery, WebhookEndpoint, WebhookEvent
+from .logging import logger
+
+SIGNATURE_HEADER = "X-Pulse-Signature"
+EVENT_HEADER = "X-Pulse-Event"
+DELIVERY_HEADER = "X-Pulse-Delivery"
+
+# Job statuses that fire an event
+JOB_STATUS_EVENTS = {
+    JobStatus.COMPLETED: WebhookEvent.JOB_COMPLETED,
+    JobStatus.FAILED: WebhookEvent.JOB_FAILED,
+    JobStatus.CANCELLED: WebhookEvent.JOB_CANCELLED,
+}
+
+# Seconds an endpoint gets to answer
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "10"))
+
+# Attempts before a delivery is given up (about a day with the defaults)
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+
+# Delay before the first retry (doubles per attempt, capped)
+WEBHOOK_RETRY_DELAY = float(os.getenv("WEBHOOK_RETRY_DELAY", "30"))
+WEBHOOK_MAX_RETRY_DELAY = 6 * 3600
+
+WEBHOOK_POLL_INTERVAL = float(os.getenv("WEBHOOK_POLL_INTERVAL", "2"))
+
+# Deliveries sent at once per dispatcher
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "20"))
+
+# Plain http endpoints are only accepted in development
+WEBHOOK_ALLOW_HTTP = os.getenv("ENVIRONMENT", "development") == "development"
+
+
+class WebhookDestinationError(ValueError):
+    """A webhook URL is not one events may be sent to."""
+
+
+def generate_secret() -> str:
+    """
+    Generate a signing secret for a new endpoint.
+
+    Returns:
+        Secret string
+    """
+    return f"whsec_{secrets.token_urlsafe(32)}"
+
+
+def sign_payload(secret: str, payload: str, timestamp: Optional[int] = None) -> str:
+    """
+    Sign a webhook body.
+
+    The signature is an HMAC-SHA256 of ``"{timestamp}.{payload}"``, so a
+    captured request cannot be replayed later with a fresh timestamp.
+
+    Args:
+        secret: Endpoint secret
+        payload: Request body
+        timestamp: Unix time of the attempt (defaults to now)
+
+    Returns:
+        Header value ``t=<timestamp>,v1=<hex digest>``
+    """
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify_signature(secret: str, payload: str, header: str, tolerance: int = 300) -> bool:
+    """
+    Check a signature header the way a receiver should.
+
+    Args:
+        secret: Endpoint secret
+        payload: Raw request body
+        header: X-Pulse-Signature value
+        tolerance: Largest accepted age of the timestamp (seconds)
+
+    Returns:
+        True if the signature matches and is recent
+    """
+    try:
+        parts = dict(part.split("=", 1) for part in header.split(","))
+        timestamp = int(parts["t"])
+    except (KeyError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    expected = sign_payload(secret, payload, timestamp).split("v1=", 1)[1]
+    return hmac.compare_digest(expected, parts.get("v1", ""))
+
+
+def is_public_address(address: str) -> bool:
+    """
+    Check that an IP address is publicly routable.
+
+    Loopback, link-local, private, shared, reserved and multicast
+    addresses are not, including IPv4 addresses mapped into IPv6.
+
+    Args:
+        address: IPv4 or IPv6 address
+
+    Returns:
+        True if webhooks may be sent to the address
+    """
+    ip = ipaddress.ip_address(address)
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not (ip.is_multicast or ip.is_reserved)
+
+
+def check_webhook_url(url: str) -> None:
+    """
+    Check a webhook URL without resolving its host.
+
+    Args:
+        url: Endpoint URL
+
+    Raises:
+        WebhookDestinationError: If the URL is not https (http is accepted
+            in development) or names a local or private host
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "https" and not (WEBHOOK_ALLOW_HTTP and parts.scheme == "http"):
+        raise WebhookDestinationError("Webhook URLs must use https")
+
+    host = (parts.hostname or "").rstrip(".").lower()
+    if not host or host == "localhost" or host.endswith(".localhost"):
+        raise WebhookDestinationError("Webhook URLs must not point to a local or private address")
+    try:
+        is_public = is_public_address(host)
+    except ValueError:
+        # A host name, checked once resolved
+        return
+    if not is_public:
+        raise WebhookDestinationError("Webhook URLs must not point to a local or private address")
+
+
+async def resolve_webhook_host(host: str, port: int) -> List[str]:
+    """
+    Resolve a webhook host.
+
+    Args:
+        host: Host name or address
+        port: Port
+
+    Returns:
+        Addresses, in resolver order
+
+    Raises:
+        socket.gaierror: If the host cannot be resolved
+    """
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+async def resolve_webhook_url(url: str) -> str:
+    """
+    Check a webhook URL and resolve the address to send to.
+
+    Every address the host resolves to must be public, so a host cannot
+    pass by also resolving to an internal one.
+
+    Args:
+        url: Endpoint URL
+
+    Returns:
+        Address to connect to
+
+    Raises:
+        WebhookDestinationError: If the URL is not allowed or its host
+            cannot be resolved
+    """
+    check_webhook_url(url)
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    try:
+        addresses = await resolve_webhook_host(parts.hostname, port)
+    except (socket.gaierror, UnicodeError):
+        raise WebhookDestinationError("Webhook URL host could not be resolved")
+    if not addresses or not all(is_public_address(address.split("%")[0]) for address in addresses):
+        raise WebhookDestinationError("Webhook URLs must not point to a local or private address")
+    return addresses[0]
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    Delay before retrying a delivery.
+
+    Args:
+        attempts: Attempts made so far
+
+    Returns:
+        Seconds until the next attempt
+    """
+    return min(WEBHOOK_RETRY_DELAY * 2 ** (attempts - 1), WEBHOOK_MAX_RETRY_DELAY)
+
+
+def job_event_payload(event: WebhookEvent, job: Dict[str, Any]) -> str:
+    """
+    Build the body of a job event.
+
+    Args:
+        event: Event type
+        job: Job fields (id, type, status, result_url, error_message, completed_at)
+
+    Returns:
+        JSON body
+    """
+    completed_at = job.get("completed_at")
+    return json.dumps({
+        "id": str(uuid.uuid4()),
+        "type": event.value,
+        "created_at": datetime.utcnow().isoformat(),
+        "data": {
+            "job_id": job["id"],
+            "type": getattr(job["type"], "value", job["type"]),
+            "status": getattr(job["status"], "value", job["status"]),
+            "result_url": job.get("result_url"),
+            "error_message": job.get("error_message"),
+            "completed_at": completed_at.isoformat() if isinstance(completed_at, datetime) else completed_at,
+        },
+    })
+
+
+async def enqueue_job_webhooks(db: AsyncSession, user_id: str, job: Dict[str, Any]) -> int:
+    """
+    Queue the event for a job that just finished, in the caller's transaction.
+
+    The deliveries commit (or roll back) with the job update itself, so
+    an event is never sent for a change that did not persist, nor lost
+    for one that did.
+
+    Args:
+        db: Database session
+        user_id: Owner of the job
+        job: Job fields (see ``job_event_payload``)
+
+    Returns:
+        Number of deliveries queued
+    """
+    event = JOB_STATUS_EVENTS.get(JobStatus(job["status"]))
+    if event is None:
+        return 0
+
+    result = await db.execute(
+        select(WebhookEndpoint.id, WebhookEndpoint.events).
+        where(WebhookEndpoint.user_id == user_id, WebhookEndpoint.is_active.is_(True))
+    )
+    endpoint_ids = [endpoint_id for endpoint_id, events in result if event.value in events]
+    if not endpoint_ids:
+        return 0
+
+    payload = job_event_payload(event, job)
+    now = datetime.utcnow()
+    db.add_all([
+        WebhookDelivery(
+            id=str(uuid.uuid4()),
+            endpoint_id=endpoint_id,
+            job_id=job["id"],
+            event_type=event.value,
+            payload=payload,
+            status=DeliveryStatus.PENDING,
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now,
+        )
+        for endpoint_id in endpoint_ids
+    ])
+    await db.flush()
+    return len(endpoint_ids)
+
+
+class WebhookDispatcher:
+    """
+    Send due webhook deliveries, retrying failures with exponential backoff.
+
+    Due deliveries are claimed with ``FOR UPDATE SKIP LOCKED`` and leased
+    by pushing their next attempt past the request timeout, so several
+    worker processes can dispatch side by side without sending twice.
+    A delivery succeeds on any 2xx answer and is given up after
+    ``max_attempts``.
+
+    Each attempt resolves the endpoint's host anew and connects to the
+    address it checked, so a host re-pointed at an internal address
+    after registration (DNS rebinding) is refused, not requested.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        client: Optional[httpx.AsyncClient] = None,
+        batch_size: int = WEBHOOK_BATCH_SIZE,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        timeout: float = WEBHOOK_TIMEOUT,
+        interval: float = WEBHOOK_POLL_INTERVAL,
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            session_factory: Async session factory
+            client: HTTP client (created on first use by default)
+            batch_size: Deliveries sent at once
+            max_attempts: Attempts before a delivery is given up
+            timeout: Seconds an endpoint gets to answer
+            interval: Seconds between polls for due deliveries
+        """
+        self.session_factory = session_factory
+        self.client = client
+        self._owns_client = client is None
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.interval = interval
+
+    async def _claim(self) -> List[Dict[str, Any]]:
+        """Lease the due deliveries of active endpoints."""
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(
+                    WebhookDelivery.id,
+                    WebhookDelivery.event_type,
+                    WebhookDelivery.payload,
+                    WebhookDelivery.attempts,
+                    WebhookEndpoint.url,
+                    WebhookEndpoint.secret,
+                ).
+                join(WebhookEndpoint, WebhookEndpoint.id == WebhookDelivery.endpoint_id).
+                where(
+                    WebhookDelivery.status == DeliveryStatus.PENDING,
+                    WebhookDelivery.next_attempt_at <= now,
+                    WebhookEndpoint.is_active.is_(True),
+                ).
+                order_by(WebhookDelivery.next_attempt_at).
+                limit(self.batch_size).
+                with_for_update(of=WebhookDelivery, skip_locked=True)
+            )
+            deliveries = [dict(row._mapping) for row in result]
+            if deliveries:
+                await db.execute(
+                    update(WebhookDelivery).
+                    where(WebhookDelivery.id.in_([delivery["id"] for delivery in deliveries])).
+                    values(next_attempt_at=now + timedelta(seconds=self.timeout * 3))
+                )
+            await db.commit()
+        return deliveries
+
+    async def _send(self, delivery: Dict[str, Any]) -> Dict[str, Any]:
+        """POST one delivery; returns the columns recording the attempt."""
+        attempts = delivery["attempts"] + 1
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "Pulse-Webhooks/1.0",
+            EVENT_HEADER: delivery["event_type"],
+            DELIVERY_HEADER: delivery["id"],
+            SIGNATURE_HEADER: sign_payload(delivery["secret"], delivery["payload"]),
+        }
+        status_code = None
+        error = None
+        try:
+            url = httpx.URL(delivery["url"])
+            address = await resolve_webhook_url(delivery["url"])
+            # Send to the checked address; Host and TLS still name the endpoint's host
+            response = await self.client.post(
+                url.copy_with(host=address),
+                content=delivery["payload"],
+                headers={**headers, "Host": url.netloc.decode("ascii")},
+                extensions={"sni_hostname": url.host},
+                timeout=self.timeout,
+            )
+            status_code = response.status_code
+            if not 200 <= status_code < 300:
+                # The response body stays out of the user-visible delivery log
+                error = f"HTTP {status_code}"
+        except WebhookDestinationError as e:
+            error = str(e)
+        except httpx.HTTPError as e:
+            error = f"Request failed ({type(e).__name__})"
+
+        now = datetime.utcnow()
+        values: Dict[str, Any] = {"attempts": attempts, "last_status_code": status_code, "last_error": error}
+        if error is None:
+            values.update(status=DeliveryStatus.SUCCEEDED, delivered_at=now)
+        elif attempts >= self.max_attempts:
+            values.update(status=DeliveryStatus.FAILED)
+            logger.warning(
+                "Webhook delivery gave up",
+                extra={"delivery_id": delivery["id"], "attempts": attempts, "error_message": error},
+            )
+        else:
+            values.update(next_attempt_at=now + timedelta(seconds=retry_delay(attempts)))
+        return values
+
+    async def run_once(self) -> int:
+        """
+        Send the deliveries that are due.
+
+        Returns:
+            Number of deliveries attempted
+        """
+        deliveries = await self._claim()
+        if not deliveries:
+            return 0
+        if self.client is None:
+            self.client = httpx.AsyncClient(follow_redirects=False)
+
+        outcomes = await asyncio.gather(*(self._send(delivery) for delivery in deliveries))
+        async with self.session_factory() as db:
+            for delivery, values in zip(deliveries, outcomes, strict=True):
+                await db.execute(
+                    update(WebhookDelivery).where(WebhookDelivery.id == delivery["id"]).values(**values)
+                )
+            await db.commit()
+        return len(deliveries)
+
+    async def run(self) -> None:
+        """Dispatch forever until cancelled."""
+        try:
+            while True:
+                try:
+                    # Keep going while a backlog is being worked off
+                    if await self.run_once() >= self.batch_size:
+                        continue
+                except Exception as e:
+                    logger.warning("Webhook dispatch failed", extra={"error_message": str(e)})
+                await asyncio.sleep(self.interval)
+        finally:
+            if self._owns_client and self.client is not None:
+                await self.client.aclose()
+                self.client = None
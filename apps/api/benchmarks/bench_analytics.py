@@ -0,0 +1,87 @@
+"""
+Benchmark admin analytics latency: raw GROUP BY vs. rollup tables.
+
+Seeds ``usage_events`` at increasing sizes into a scratch schema, builds the
+daily rollup from it, and times the legacy full-table aggregation against
+the 30-day rollup read used by ``GET /admin/analytics``. The rollup query
+should stay flat while the raw query grows with row count.
+
+Requires a PostgreSQL database (DATABASE_URL); everything is created in the
+``bench_analytics`` schema, which is dropped afterwards.
+
+Usage (from apps/api):
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_analytics
+"""
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.models import Base
+
+SCHEMA = "bench_analytics"
+SIZES = (10_000, 100_000, 1_000_000)
+
+RAW_QUERY = "SELECT event_type, count(*) FROM usage_events GROUP BY event_type"
+ROLLUP_QUERY = """
+    SELECT event_type, sum(event_count) FROM usage_rollups_daily
+    WHERE bucket_start >= now() - interval '30 days' AND event_type NOT LIKE 'job:%'
+    GROUP BY event_type
+"""
+
+
+async def timed(conn, sql: str, repeat: int = 5) -> float:
+    """Return the best-of-``repeat`` latency of ``sql`` in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await conn.execute(text(sql))
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text("INSERT INTO users (id, email, is_active, is_verified, created_at, updated_at) "
+                 "VALUES ('bench', 'bench@example.com', true, true, now(), now())")
+        )
+
+        print(f"{'rows':>10} {'raw GROUP BY ms':>16} {'rollup ms':>10}")
+        seeded = 0
+        for size in SIZES:
+            # Two years of history, spread over four event types
+            await conn.execute(text(f"""
+                INSERT INTO usage_events (id, user_id, event_type, tokens, event_metadata, created_at, updated_at)
+                SELECT gen_random_uuid()::text, 'bench',
+                       (ARRAY['chat_completion','image_generation','cv_export','slides_export'])[1 + g % 4],
+                       g % 1000, json_build_object('model', 'gpt-4'),
+                       now() - (g % 730) * interval '1 day', now()
+                FROM generate_series({seeded + 1}, {size}) AS g
+            """))
+            seeded = size
+
+            await conn.execute(text("TRUNCATE usage_rollups_daily"))
+            await conn.execute(text("""
+                INSERT INTO usage_rollups_daily (bucket_start, event_type, model, plan, job_status, event_count, tokens, quantity)
+                SELECT date_trunc('day', created_at), event_type, '', '', '', count(*), sum(tokens), count(*)
+                FROM usage_events GROUP BY 1, 2
+            """))
+            await conn.execute(text("ANALYZE"))
+
+            raw_ms = await timed(conn, RAW_QUERY)
+            rollup_ms = await timed(conn, ROLLUP_QUERY)
+            print(f"{size:>10} {raw_ms:>16.1f} {rollup_ms:>10.1f}")
+
+        await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
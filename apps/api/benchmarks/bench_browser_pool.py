@@ -0,0 +1,110 @@
+"""
+Benchmark PDF render latency and throughput: pooled browsers vs. a launch per render.
+
+Renders a sample CV concurrently, first starting a fresh Chromium for every
+render (the previous behaviour), then on a warm BrowserPool of several
+sizes, and reports renders/s with p50/p95 latency. Needs Chromium
+(``playwright install chromium``).
+
+Usage (from apps/api):
+    python -m benchmarks.bench_browser_pool [--renders 40] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Tuple
+
+from playwright.async_api import async_playwright
+
+from app.schemas.cv import CVRequest
+from app.services.cv_generator import CVGenerator
+from app.utils.browser_pool import BrowserPool
+
+PDF_OPTIONS = {"format": "A4", "margin": {"top": "0.5in", "right": "0.75in", "bottom": "0.5in", "left": "0.75in"}}
+
+SAMPLE_CV = CVRequest.model_validate({
+    "personal_info": {
+        "full_name": "Ada Example",
+        "email": "ada@example.com",
+        "phone": "+1 555 0100",
+        "location": "Remote",
+    },
+    "summary": "Backend engineer focused on reliable, observable services. " * 4,
+    "experience": [
+        {
+            "job_title": "Senior Engineer",
+            "company": f"Company {n}",
+            "start_date": "2019-01",
+            "end_date": "2023-06",
+            "description": "Built and operated high-throughput APIs. " * 3,
+        }
+        for n in range(4)
+    ],
+    "education": [],
+    "skills": [{"category": "Languages", "skills": ["Python", "SQL", "TypeScript"]}],
+    "format": "pdf",
+})
+
+
+async def render_with_launch(html: str) -> None:
+    """Render the way generate_pdf used to: a new Chromium per document."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        await page.set_content(html)
+        await page.pdf(**PDF_OPTIONS)
+        await browser.close()
+
+
+async def measure(render, html: str, renders: int, concurrency: int) -> Tuple[float, List[float]]:
+    """Run ``renders`` renders ``concurrency`` at a time; return renders/s and latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await render(html)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(renders)))
+    return renders / (time.perf_counter() - start), latencies
+
+
+def report(label: str, rate: float, latencies: List[float]) -> None:
+    cuts = statistics.quantiles(latencies, n=20)
+    print(f"{label:>16} {rate:>10.1f} {cuts[9] * 1000:>10.0f} {cuts[18] * 1000:>10.0f}")
+
+
+async def run(renders: int, concurrency: int, pool_sizes: List[int]) -> None:
+    html = CVGenerator()._generate_html(SAMPLE_CV)
+
+    print(f"{'mode':>16} {'renders/s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    rate, latencies = await measure(render_with_launch, html, renders, concurrency)
+    report("launch/render", rate, latencies)
+
+    for size in pool_sizes:
+        pool = BrowserPool(size=size, max_waiting=renders)
+        await pool.start()
+        try:
+            rate, latencies = await measure(
+                lambda doc, pool=pool: pool.render_pdf(doc, PDF_OPTIONS), html, renders, concurrency
+            )
+        finally:
+            await pool.close()
+        report(f"pool size={size}", rate, latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    asyncio.run(run(args.renders, args.concurrency, args.pool_sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark bulk CV ZIP export throughput and memory by render concurrency.
+
+Streams a batch of CVs through iter_cv_zip into a discarding sink, as the
+bulk endpoint does, and reports documents per second. With --memory it
+also reports the peak Python heap while streaming, which should stay flat
+as the batch grows (tracing slows rendering, so throughput is then not
+comparable). DOCX files build in the document pool; PDFs use the native
+engine, so no browser is needed.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_bulk_cv [--cvs 200] [--format docx] [--concurrency 1 4 8] [--memory]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import List
+
+from app.schemas.cv import CVRequest
+from app.services.bulk_cv import BulkCVStats, iter_cv_zip
+from app.utils.document_pool import close_document_pool, get_document_pool
+
+
+def make_cvs(count: int, format: str) -> List[CVRequest]:
+    return [
+        CVRequest.model_validate({
+            "personal_info": {"full_name": f"Candidate {n}", "email": f"candidate{n}@example.com"},
+            "summary": "Engineer focused on reliable distributed systems. " * 4,
+            "experience": [
+                {
+                    "job_title": f"Engineer {i}",
+                    "company": f"Company {i}",
+                    "start_date": "2015",
+                    "end_date": "2020",
+                    "description": "Owned the platform roadmap. " * 4,
+                    "responsibilities": [f"Shipped project {j}" for j in range(4)],
+                }
+                for i in range(4)
+            ],
+            "skills": [{"category": "Languages", "skills": ["Python", "Go", "SQL"]}],
+            "format": format,
+            "pdf_engine": "native",
+        })
+        for n in range(count)
+    ]
+
+
+async def run(cvs: List[CVRequest], concurrency: int, memory: bool) -> None:
+    stats = BulkCVStats()
+    size = 0
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    async for chunk in iter_cv_zip(cvs, stats, concurrency=concurrency):
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+    peak = "-"
+    if memory:
+        peak = f"{tracemalloc.get_traced_memory()[1] / 1e6:.1f}"
+        tracemalloc.stop()
+    print(f"{concurrency:>12} {stats.files / elapsed:>10.1f} {size / 1e6:>10.1f} {peak:>12} {stats.failed:>7}")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    cvs = make_cvs(args.cvs, args.format)
+    await get_document_pool().start()
+    try:
+        print(f"{'concurrency':>12} {'docs/s':>10} {'zip MB':>10} {'peak heap MB':>12} {'failed':>7}")
+        for concurrency in args.concurrency:
+            await run(cvs, concurrency, args.memory)
+    finally:
+        await close_document_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cvs", type=int, default=200)
+    parser.add_argument("--format", choices=["docx", "pdf"], default="docx")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--memory", action="store_true", help="Trace the peak Python heap")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark event-loop lag during concurrent PPTX/DOCX exports, inline vs. process pool.
+
+Builds large decks concurrently while a ticker measures how late the event
+loop wakes it up (what every chat stream in the process would feel).
+"inline" builds on the event loop as generate_pptx used to; "pool" builds
+in a DocumentPool.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_document_pool [--exports 16] [--slides 60] [--workers 4]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from app.schemas.slides import SlideContent
+from app.services.slide_generator import SlideGenerator, build_pptx
+from app.utils.document_pool import DocumentPool
+
+TICK = 0.01
+
+
+async def ticker(lags: List[float], stop: asyncio.Event) -> None:
+    """Sleep TICK at a time, recording how late each wake-up is."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def run(mode: str, exports: int, slides: List[SlideContent], workers: int) -> None:
+    pool = DocumentPool(workers=workers) if mode == "pool" else None
+    if pool:
+        await pool.start()
+
+    async def export() -> bytes:
+        if pool:
+            return await pool.run(build_pptx, "Benchmark", slides)
+        await asyncio.sleep(0)
+        return SlideGenerator().build_pptx("Benchmark", slides)
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    tick_task = asyncio.create_task(ticker(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(export() for _ in range(exports)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick_task
+    if pool:
+        await pool.close()
+
+    p99 = statistics.quantiles(lags, n=100)[98] if len(lags) > 1 else lags[0]
+    print(f"{mode:>8} {exports / elapsed:>10.1f} {p99 * 1000:>12.1f} {max(lags) * 1000:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--exports", type=int, default=16)
+    parser.add_argument("--slides", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    slides = [
+        SlideContent(title=f"Section {n}", content=[f"Point {i} of section {n}" for i in range(8)])
+        for n in range(args.slides)
+    ]
+    print(f"{'mode':>8} {'exports/s':>10} {'p99 lag ms':>12} {'max lag ms':>12}")
+    for mode in ("inline", "pool"):
+        asyncio.run(run(mode, args.exports, slides, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark PDF throughput of the native renderer against pooled Chromium.
+
+Renders the sample CV and a ten-slide deck with each engine and reports
+renders/s with p50/p95 latency. The native engine runs in worker threads
+the way ``generate_pdf`` calls it. Chromium rows need
+``playwright install chromium`` and are skipped without it.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_pdf_engines [--renders 40] [--concurrency 4]
+"""
+import argparse
+import asyncio
+
+from app.schemas.slides import SlideContent
+from app.services.cv_generator import CVGenerator
+from app.services.slide_generator import SlideGenerator
+from app.utils.browser_pool import close_browser_pool
+
+from .bench_browser_pool import SAMPLE_CV, measure, report
+
+SAMPLE_SLIDES = [
+    SlideContent(
+        title=f"Section {n}",
+        content=[f"Key point {i} about section {n}, with enough words to wrap once" for i in range(4)],
+    )
+    for n in range(10)
+]
+
+
+async def run(renders: int, concurrency: int) -> None:
+    cv_generator, slide_generator = CVGenerator(), SlideGenerator()
+    documents = {
+        "cv": lambda engine: cv_generator.generate_pdf(SAMPLE_CV, engine=engine),
+        "slides": lambda engine: slide_generator.generate_pdf("Quarterly Review", SAMPLE_SLIDES, engine=engine),
+    }
+
+    print(f"{'mode':>16} {'renders/s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    for name, render in documents.items():
+        for engine in ("native", "chromium"):
+            try:
+                await render(engine)  # warm up (fonts parsed, browsers launched)
+            except Exception as e:
+                print(f"{name + ' ' + engine:>16}  skipped: {str(e).splitlines()[0]}")
+                continue
+            rate, latencies = await measure(
+                lambda _, render=render, engine=engine: render(engine), None, renders, concurrency
+            )
+            report(f"{name} {engine}", rate, latencies)
+    await close_browser_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.renders, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
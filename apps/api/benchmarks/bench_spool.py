@@ -0,0 +1,61 @@
+"""
+Benchmark degraded-mode write throughput of the local write-ahead spool.
+
+Measures how many usage records per second concurrent request handlers can
+spool while the database is down, for several fsync batch sizes.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_spool [--records 5000] [--concurrency 200]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+from app.utils.spool import WriteAheadSpool
+
+
+async def run(records: int, concurrency: int, fsync_batch: int) -> float:
+    """Spool ``records`` usage events from ``concurrency`` writers; return records/s."""
+    with tempfile.TemporaryDirectory() as directory:
+        spool = WriteAheadSpool(directory=directory, fsync_batch=fsync_batch)
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(records):
+            queue.put_nowait(i)
+
+        async def writer() -> None:
+            while not queue.empty():
+                i = queue.get_nowait()
+                await spool.append(
+                    "usage",
+                    {
+                        "user_id": f"user-{i % 100}",
+                        "event_type": "chat_completion",
+                        "tokens": 512,
+                        "counter": "tokens_used",
+                        "amount": 512,
+                    },
+                )
+
+        start = time.perf_counter()
+        await asyncio.gather(*(writer() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        await spool.close()
+
+    return records / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'fsync_batch':>12} {'records/s':>12}")
+    for fsync_batch in (1, 8, 64, 256):
+        rate = asyncio.run(run(args.records, args.concurrency, fsync_batch))
+        print(f"{fsync_batch:>12} {rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Load test: pooled DB connections held by open SSE job-status streams.
+
+Opens increasing numbers of concurrent ``GET /videos/{job_id}/stream``
+streams against the app in-process, samples how many pooled connections
+are checked out while they are open, then completes the job so every
+stream ends. Streams read the job once and then wait on the job event
+hub, so the peak stays flat (a handful of connections at most) however
+many streams are open; previously each stream pinned a connection until
+the pool ran out.
+
+Requires a PostgreSQL database with the schema applied (DATABASE_URL).
+A scratch user and job are created and deleted afterwards.
+
+Usage (from apps/api):
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_sse_connections [--streams 10 50 200]
+"""
+import argparse
+import asyncio
+import uuid
+from datetime import datetime
+
+import httpx
+from sqlalchemy import delete
+
+from app.auth.dependencies import require_auth
+from app.database import AsyncSessionLocal, engine, pool_stats
+from app.main import app
+from app.models import Job, User
+from app.models.job import JobStatus, JobType
+from app.utils.job_events import get_job_event_hub
+from app.utils.usage_writer import apply_job_record
+
+# How long streams stay open while the pool is sampled
+SAMPLE_SECONDS = 12
+
+
+async def seed() -> tuple[User, str]:
+    """Create a scratch user and a processing video job."""
+    async with AsyncSessionLocal() as db:
+        user = User(id=str(uuid.uuid4()), email=f"bench-{uuid.uuid4().hex[:8]}@example.com")
+        job = Job(
+            id=str(uuid.uuid4()),
+            user_id=user.id,
+            type=JobType.VIDEO,
+            status=JobStatus.PROCESSING,
+            started_at=datetime.utcnow(),
+        )
+        db.add_all([user, job])
+        await db.commit()
+        return user, job.id
+
+
+async def set_status(job_id: str, job_status: JobStatus) -> None:
+    async with AsyncSessionLocal() as db:
+        # Publishes the job event that ends the open streams
+        await apply_job_record(db, {"job_id": job_id, "fields": {"status": job_status.value}})
+        await db.commit()
+
+
+async def peak_checked_out(seconds: float) -> int:
+    """Sample the primary pool's checked-out count and return the peak."""
+    peak = 0
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + seconds
+    while loop.time() < deadline:
+        peak = max(peak, pool_stats()["primary"].get("checked_out", 0))
+        await asyncio.sleep(0.05)
+    return peak
+
+
+async def run(streams: int, job_id: str) -> int:
+    await set_status(job_id, JobStatus.PROCESSING)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Distinct client addresses so the per-IP rate limit does not kick in
+        requests = [
+            asyncio.create_task(client.get(
+                f"/api/v1/videos/{job_id}/stream",
+                headers={"X-Forwarded-For": f"10.0.{i // 256}.{i % 256}"},
+            ))
+            for i in range(streams)
+        ]
+        peak = await peak_checked_out(SAMPLE_SECONDS)
+        await set_status(job_id, JobStatus.COMPLETED)
+        await asyncio.gather(*requests)
+    return peak
+
+
+async def main(stream_counts: list[int]) -> None:
+    user, job_id = await seed()
+    listener = asyncio.create_task(get_job_event_hub().run())
+    app.dependency_overrides[require_auth] = lambda: user
+    try:
+        print(f"{'open streams':>12} {'peak checked-out connections':>29}")
+        for streams in stream_counts:
+            peak = await run(streams, job_id)
+            print(f"{streams:>12} {peak:>29}")
+    finally:
+        listener.cancel()
+        app.dependency_overrides.clear()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id == user.id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--streams", type=int, nargs="+", default=[10, 50, 200])
+    asyncio.run(main(parser.parse_args().streams))
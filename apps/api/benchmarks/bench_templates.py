@@ -0,0 +1,94 @@
+"""
+Benchmark CV HTML rendering for growing CVs, precompiled vs. compiled per render.
+
+"compiled" renders with the shared TemplateRegistry (templates compiled
+once at startup); "per-call" builds a fresh environment and compiles the
+templates on every render, as rendering without a shared environment does. The
+cold-start lines time loading a new registry with and without the
+bytecode cache, as a freshly spawned worker process would.
+
+Usage (from apps/api):
+    python -m benchmarks.bench_templates [--renders 200] [--sizes 1 10 50]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from app.schemas.cv import CVRequest
+from app.services.templates import TemplateRegistry
+
+
+def make_cv(experiences: int) -> CVRequest:
+    """A CV with ``experiences`` detailed positions."""
+    return CVRequest.model_validate({
+        "personal_info": {
+            "full_name": "Jordan Example",
+            "email": "jordan@example.com",
+            "phone": "+1 555 0100",
+            "linkedin": "linkedin.com/in/jordan",
+            "github": "jordan",
+        },
+        "summary": "Engineer focused on reliable distributed systems & developer tooling. " * 4,
+        "experience": [
+            {
+                "job_title": f"Senior Engineer {n}",
+                "company": f"Company <{n}>",
+                "start_date": "2015",
+                "end_date": "2020",
+                "description": "Owned the platform roadmap. " * 6,
+                "achievements": [f"Cut latency by {n + i}% on service {i}" for i in range(6)],
+            }
+            for n in range(experiences)
+        ],
+        "education": [{"degree": "BSc Computer Science", "institution": "State University", "graduation_date": "2014"}],
+        "skills": [{"category": f"Area {n}", "skills": ["Python", "Go", "SQL", "Kubernetes"]} for n in range(6)],
+    })
+
+
+def timed(fn: Callable[[], object], renders: int) -> List[float]:
+    latencies = []
+    for _ in range(renders):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(label: str, latencies: List[float]) -> None:
+    p50 = statistics.median(latencies) * 1000
+    p99 = (statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else latencies[0]) * 1000
+    print(f"{label:>22} {p50:>10.3f} {p99:>10.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    registry = TemplateRegistry(cache_dir=None)
+    registry.load()
+
+    def per_call(cv: CVRequest) -> str:
+        return TemplateRegistry(cache_dir=None).render("cv", cv.template, cv=cv)
+
+    print(f"{'render':>22} {'p50 ms':>10} {'p99 ms':>10}")
+    for size in args.sizes:
+        cv = make_cv(size)
+        report(
+            f"compiled, {size} jobs",
+            timed(lambda cv=cv: registry.render("cv", cv.template, cv=cv), args.renders),
+        )
+        report(f"per-call, {size} jobs", timed(lambda cv=cv: per_call(cv), args.renders))
+
+    cold_runs = max(1, args.renders // 10)
+    report("cold start, no cache", timed(lambda: TemplateRegistry(cache_dir=None).load(), cold_runs))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        TemplateRegistry(cache_dir=cache_dir).load()
+        report("cold start, bytecode", timed(lambda: TemplateRegistry(cache_dir=cache_dir).load(), cold_runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark admin user search at 1M users: leading-wildcard ILIKE vs. indexed search.
+
+Seeds ``users`` in a scratch schema, then times the legacy
+``ILIKE '%q%'`` + ``count(*)`` pair against ``build_user_filter`` +
+``count_users`` for a few representative search terms.
+
+Requires a PostgreSQL database with the pg_trgm extension available
+(DATABASE_URL); everything is created in the ``bench_user_search`` schema,
+which is dropped afterwards.
+
+Usage (from apps/api):
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_user_search [--users 1000000]
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine
+from app.models import Base, User
+from app.utils.user_search import build_user_filter, count_users
+
+SCHEMA = "bench_user_search"
+TERMS = ("user42", "user999999@", "ab", "example")
+
+
+async def legacy_search(db: AsyncSession, term: str) -> None:
+    """The original list_users search: ILIKE '%q%' plus an exact count."""
+    query = select(User).where(
+        or_(User.email.ilike(f"%{term}%"), User.name.ilike(f"%{term}%"))
+    )
+    await db.execute(select(func.count()).select_from(query.subquery()))
+    await db.execute(query.limit(20))
+
+
+async def indexed_search(db: AsyncSession, term: str) -> None:
+    """The indexed search path used by list_users."""
+    query = select(User).where(build_user_filter(term))
+    await count_users(db, query)
+    await db.execute(query.limit(20))
+
+
+async def timed(db: AsyncSession, search, term: str, repeat: int = 3) -> float:
+    """Return the best-of-``repeat`` latency in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await search(db, term)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def main(users: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(f"""
+            INSERT INTO users (id, email, name, is_active, is_verified, created_at, updated_at)
+            SELECT gen_random_uuid()::text, 'user' || g || '@example.com',
+                   'User ' || md5(g::text), true, true, now(), now()
+            FROM generate_series(1, {users}) AS g
+        """))
+        await conn.execute(text("ANALYZE users"))
+
+        db = AsyncSession(bind=conn)
+        print(f"{'term':>14} {'legacy ms':>10} {'indexed ms':>11}")
+        for term in TERMS:
+            legacy_ms = await timed(db, legacy_search, term)
+            indexed_ms = await timed(db, indexed_search, term)
+            print(f"{term:>14} {legacy_ms:>10.1f} {indexed_ms:>11.1f}")
+
+        await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    asyncio.run(main(parser.parse_args().users))
@@ -0,0 +1,101 @@
+"""Tests for the PDF browser pool"""
+import asyncio
+
+import pytest
+
+from app.utils.browser_pool import BrowserPool, BrowserPoolBusy
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def set_viewport_size(self, viewport):
+        pass
+
+    async def set_content(self, html):
+        await asyncio.sleep(self.browser.launcher.render_time)
+        if html == "crash":
+            self.browser.connected = False
+            raise RuntimeError("Target closed")
+        self.html = html
+
+    async def pdf(self, **options):
+        return f"{self.browser.number}:{self.html}".encode()
+
+
+class FakeBrowser:
+    def __init__(self, launcher, number):
+        self.launcher = launcher
+        self.number = number
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        return self
+
+    async def new_page(self):
+        return FakePage(self)
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeChromium:
+    """Launches in-memory browsers numbered in launch order"""
+
+    def __init__(self, render_time=0.0):
+        self.render_time = render_time
+        self.launched = 0
+
+    async def launch(self):
+        self.launched += 1
+        return FakeBrowser(self, self.launched)
+
+
+@pytest.fixture
+async def make_pool():
+    """Started pools over fake Chromium, closed after the test"""
+    pools = []
+
+    async def make(chromium, **options):
+        pools.append(BrowserPool(launcher=chromium, **options))
+        await pools[-1].start()
+        return pools[-1]
+
+    yield make
+    for pool in pools:
+        await pool.close()
+
+
+async def test_browsers_are_reused_and_recycled(make_pool):
+    """Renders reuse warm browsers; one is replaced after max_renders or a crash"""
+    chromium = FakeChromium()
+    pool = await make_pool(chromium, size=1, max_renders=2)
+
+    outputs = [await pool.render_pdf(f"doc{n}", {}) for n in range(3)]
+    with pytest.raises(RuntimeError):
+        await pool.render_pdf("crash", {})
+    outputs.append(await pool.render_pdf("after", {}))
+
+    assert outputs == [b"1:doc0", b"1:doc1", b"2:doc2", b"3:after"]
+    assert chromium.launched == 3
+
+
+async def test_renders_queue_with_backpressure(make_pool):
+    """Renders beyond the pool wait their turn; past max_waiting they are turned away"""
+    chromium = FakeChromium(render_time=0.02)
+    pool = await make_pool(chromium, size=2, max_waiting=3)
+
+    results = await asyncio.gather(
+        *(pool.render_pdf(f"doc{n}", {}) for n in range(6)), return_exceptions=True
+    )
+
+    assert [r for r in results if isinstance(r, bytes)] == [
+        b"1:doc0", b"2:doc1", b"1:doc2", b"2:doc3", b"1:doc4"
+    ]
+    assert isinstance(results[5], BrowserPoolBusy)
+    assert pool.stats == {"size": 2, "busy": 0, "waiting": 0}
+    assert chromium.launched == 2
@@ -0,0 +1,109 @@
+"""Tests for bulk CV exports"""
+import asyncio
+import io
+import json
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.cv import BulkCVRequest, CVRequest
+from app.services import bulk_cv
+from app.services.bulk_cv import BulkCVStats, iter_cv_zip
+
+
+def make_cv(name: str, **options) -> dict:
+    return {"personal_info": {"full_name": name, "email": "cv@example.com"}, "summary": "Analyst", **options}
+
+
+@pytest.fixture
+def slow_renders(monkeypatch):
+    """Renders that take a while and track how many run at once; CVs named "Broken" fail"""
+    state = SimpleNamespace(running=0, peak=0)
+
+    async def render_cv(cv_request, format):
+        state.running += 1
+        state.peak = max(state.peak, state.running)
+        await asyncio.sleep(0.01)
+        state.running -= 1
+        if cv_request.personal_info.full_name == "Broken":
+            raise RuntimeError("render failed")
+        return f"{cv_request.personal_info.full_name}.{format}".encode()
+
+    monkeypatch.setattr(bulk_cv, "render_cv", render_cv)
+    return state
+
+
+async def test_zip_streams_with_bounded_concurrency(slow_renders):
+    """Documents render a few at a time and leave as separate chunks; failures are listed, not fatal"""
+    cvs = [CVRequest.model_validate(make_cv(f"Candidate {n}")) for n in range(10)]
+    cvs.append(CVRequest.model_validate(make_cv("Broken")))
+    cvs.append(CVRequest.model_validate(make_cv("Ada Lovelace", format=["docx", "pdf"])))
+    stats, progress = BulkCVStats(), []
+
+    async def on_progress(done, total):
+        progress.append((done, total))
+
+    chunks = [chunk async for chunk in iter_cv_zip(cvs, stats, on_progress=on_progress, concurrency=3)]
+
+    assert slow_renders.peak == 3
+    assert len(chunks) >= 13
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    names = archive.namelist()
+    assert sorted(names)[:2] == ["0001-candidate-0.docx", "0002-candidate-1.docx"]
+    assert archive.read("0012-ada-lovelace.pdf") == b"Ada Lovelace.pdf"
+    assert json.loads(archive.read("errors.json")) == [{"file": "0011-broken.docx", "error": "render failed"}]
+    assert (stats.total, stats.files, stats.failed, len(stats.cvs)) == (13, 12, 1, 11)
+    assert progress == [(done, 13) for done in range(1, 14)]
+
+
+class FakeS3:
+    """In-memory stand-in for S3Manager's managed upload and presign calls"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, fileobj, key, content_type, metadata=None):
+        self.objects[key] = fileobj.read()
+        return key
+
+    def generate_presigned_url(self, key, expiration=3600):
+        return f"https://s3.test/{key}"
+
+
+@pytest.fixture
+def bulk_jobs(monkeypatch):
+    """Bulk jobs against an in-memory bucket, recording job updates and usage"""
+    store = SimpleNamespace(s3=FakeS3(), jobs=[], usage=[])
+
+    async def save_job_result(db, job_id, **fields):
+        store.jobs.append(fields)
+
+    async def record_usage_event(db, user_id, job_id, event_type, **kwargs):
+        store.usage.append(kwargs)
+
+    async def check_cancelled(db, job_id):
+        pass
+
+    monkeypatch.setattr(bulk_cv, "get_s3_manager", lambda: store.s3)
+    monkeypatch.setattr(bulk_cv, "save_job_result", save_job_result)
+    monkeypatch.setattr(bulk_cv, "record_usage_event", record_usage_event)
+    monkeypatch.setattr(bulk_cv, "check_cancelled", check_cancelled)
+    return store
+
+
+async def test_bulk_job_uploads_archive(bulk_jobs):
+    """An s3-delivered batch renders real PDFs, uploads one archive and reports progress on the job"""
+    request = BulkCVRequest.model_validate({
+        "cvs": [make_cv(f"Candidate {n}", format="pdf", pdf_engine="native") for n in range(4)],
+        "delivery": "s3",
+    })
+    response = await bulk_cv.run_bulk_cv_job(None, "j1", "u1", request)
+
+    assert response.s3_key == "cvs/u1/j1/cvs.zip" and (response.file_count, response.failed_count) == (4, 0)
+    archive = zipfile.ZipFile(io.BytesIO(bulk_jobs.s3.objects[response.s3_key]))
+    assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+    assert [fields["progress"] for fields in bulk_jobs.jobs[:-1]] == [25, 50, 75]
+    assert bulk_jobs.jobs[-1]["result_url"] == response.download_url
+    assert bulk_jobs.jobs[-1]["parameters"]["file_count"] == 4
+    assert bulk_jobs.usage[0]["amount"] == 4
@@ -0,0 +1,148 @@
+"""Tests for cooperative job cancellation"""
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.job import Job, JobStatus, JobType
+from app.routers import chat, jobs
+from app.schemas.chat import ChatCompletionRequest
+from app.utils.cancellation import CancelScope, JobCancelled, cancel_running_job
+from app.utils.job_events import get_job_event_hub, job_event
+
+
+@pytest.fixture
+async def start_work():
+    """Start tasks sleeping inside a job's cancel scope; leftovers are cancelled afterwards"""
+    tasks = []
+
+    async def start(job_id):
+        async def work():
+            async with CancelScope(job_id):
+                await asyncio.sleep(10)
+
+        tasks.append(asyncio.create_task(work()))
+        # Let the task enter its scope
+        await asyncio.sleep(0)
+        return tasks[-1]
+
+    yield start
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def test_cancel_event_interrupts_running_work(start_work):
+    """A cancelled event for the job interrupts the awaited call with JobCancelled"""
+    task = await start_work("job-1")
+    get_job_event_hub().dispatch(json.dumps(job_event("job-1", "user-1", "cancelled")))
+    with pytest.raises(JobCancelled):
+        await task
+    # The scope is gone once the work stopped
+    assert not cancel_running_job("job-1")
+
+
+async def test_non_interrupting_scope_is_checked_between_items(start_work):
+    """Generators stop at their next check; outside cancellations still propagate"""
+    seen = []
+    async with CancelScope("job-2", interrupt=False) as scope:
+        for item in range(5):
+            if item == 2:
+                assert cancel_running_job("job-2")
+            if scope.cancelled:
+                break
+            seen.append(item)
+    assert seen == [0, 1]
+
+    task = await start_work("job-3")
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+async def test_cancel_as_scope_exits_does_not_leak():
+    """A cancel that lands as the block finishes is dropped with the scope, not raised in the caller"""
+    async with CancelScope("job-5") as scope:
+        # Requested while nothing in the block is awaiting, so not delivered before it exits
+        assert cancel_running_job("job-5")
+    await asyncio.sleep(0)
+
+    assert scope.cancelled
+    assert not cancel_running_job("job-5")
+    assert asyncio.current_task().cancelling() == 0
+
+
+class FakeSession:
+    """Session that finds one job and, like a session after a spooled write, cannot refresh it"""
+
+    def __init__(self, job):
+        self.job = job
+
+    async def execute(self, query):
+        return SimpleNamespace(scalar_one_or_none=lambda: self.job)
+
+    async def refresh(self, instance):
+        raise AssertionError("the job was detached by the spooled write")
+
+
+async def test_cancel_during_outage_returns_spooled_values(monkeypatch):
+    """A cancellation spooled while the database is down still answers with the cancelled job"""
+    now = datetime.utcnow()
+    job = Job(
+        id="job-3", user_id="user-1", type=JobType.VIDEO, status=JobStatus.PROCESSING,
+        created_at=now, updated_at=now,
+    )
+    saved = []
+
+    async def save_job_result(db, job_id, **fields):
+        saved.append(fields)
+        return False
+
+    monkeypatch.setattr(jobs, "save_job_result", save_job_result)
+
+    response = await jobs.cancel_job("job-3", current_user=SimpleNamespace(id="user-1"), db=FakeSession(job))
+
+    assert response.status == JobStatus.CANCELLED
+    assert response.completed_at == saved[0]["completed_at"]
+
+
+async def test_cancelled_chat_completion_records_prompt_usage(monkeypatch):
+    """A non-streaming chat cancelled mid-request still records the prompt it sent"""
+    added, usage = [], []
+
+    class SlowProvider:
+        async def chat_completion(self, chat_request):
+            await asyncio.sleep(10)
+
+        def count_tokens(self, text, model=None):
+            return len(text.split())
+
+    async def record_usage(**fields):
+        usage.append(fields)
+
+    async def noop(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(chat, "check_quota", noop)
+    monkeypatch.setattr(chat, "get_provider", lambda provider_type: SlowProvider())
+    monkeypatch.setattr(chat, "record_usage", record_usage)
+    request = ChatCompletionRequest.model_validate({
+        "messages": [{"role": "user", "content": "three word prompt"}],
+        "provider": "openai",
+        "model": "gpt-4",
+    })
+    db = SimpleNamespace(add=added.append, commit=noop)
+
+    task = asyncio.create_task(chat.chat_complete(request, current_user=SimpleNamespace(id="user-1"), db=db))
+    while not added or not cancel_running_job(added[0].id):
+        await asyncio.sleep(0)
+    with pytest.raises(HTTPException) as raised:
+        await task
+
+    assert raised.value.status_code == 409
+    assert [(fields["prompt_tokens"], fields["completion_tokens"], fields["cancelled"]) for fields in usage] == [
+        (3, 0, True)
+    ]
@@ -0,0 +1,63 @@
+"""Tests for the document process pool"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.schemas.slides import SlideContent
+from app.services.slide_generator import build_pptx
+from app.utils.document_pool import DocumentBuildTimeout, DocumentPool
+
+
+def worker_pid() -> int:
+    return os.getpid()
+
+
+def spin(seconds: float) -> str:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+    return "done"
+
+
+@pytest.fixture
+async def make_pool():
+    """Single-process document pools, closed after the test"""
+    pools = []
+
+    def make(**options):
+        pools.append(DocumentPool(workers=1, **options))
+        return pools[-1]
+
+    yield make
+    for pool in pools:
+        await pool.close()
+
+
+async def test_builds_run_in_recycled_processes(make_pool):
+    """Documents are built out of process; each process is replaced after max_tasks_per_child builds"""
+    slides = [SlideContent(title="Agenda", content=["Results", "Roadmap"])]
+    pool = make_pool(max_tasks_per_child=2, timeout=30)
+
+    pptx = await pool.run(build_pptx, "Quarterly Review", slides)
+    pids = [await pool.run(worker_pid) for _ in range(3)]
+    # Builds queued while processes are replaced still complete
+    queued = await asyncio.wait_for(asyncio.gather(*(pool.run(worker_pid) for _ in range(5))), 60)
+
+    assert pptx[:2] == b"PK"  # a zip package
+    assert os.getpid() not in pids
+    # The first process built the deck and one more document, then was replaced
+    assert pids[0] != pids[1] == pids[2]
+    assert len(set(queued)) >= 3
+
+
+async def test_build_timeout_leaves_pool_usable(make_pool):
+    """A build past the timeout fails without blocking the next ones"""
+    pool = make_pool(timeout=0.5)
+    start = time.monotonic()
+
+    with pytest.raises(DocumentBuildTimeout):
+        await pool.run(spin, 10)
+    assert await pool.run(spin, 0) == "done"
+    assert time.monotonic() - start < 8
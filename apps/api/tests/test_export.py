@@ -0,0 +1,55 @@
+"""Tests for streaming admin exports"""
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.job import JobStatus
+from app.utils.export import build_export_query, encode_csv, encode_ndjson
+
+
+def test_export_query_filters():
+    """Filters become WHERE clauses; rows come out in created_at order"""
+    query = build_export_query(
+        "usage",
+        start=datetime(2025, 1, 1),
+        end=datetime(2026, 1, 1),
+        user_id="u1",
+        event_type="chat_completion",
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "usage_events.created_at >= " in sql
+    assert "usage_events.created_at < " in sql
+    assert "usage_events.user_id = " in sql
+    assert "usage_events.event_type = " in sql
+    assert sql.endswith("ORDER BY usage_events.created_at")
+
+
+def test_export_query_rejects_unknown_job_type():
+    """Job exports filter on job type, so unknown types are an error"""
+    with pytest.raises(ValueError):
+        build_export_query("jobs", event_type="chat_completion")
+
+
+def test_encoders_render_values():
+    """CSV and NDJSON render enums, timestamps, JSON and NULLs"""
+    row = ("j1", JobStatus.COMPLETED, datetime(2026, 1, 2, 3, 4, 5), {"model": "gpt-4"}, None)
+    columns = ["id", "status", "created_at", "parameters", "error_message"]
+
+    body = encode_csv([row], header=columns).decode()
+    assert list(csv.reader(io.StringIO(body))) == [
+        columns,
+        ["j1", "completed", "2026-01-02T03:04:05", '{"model": "gpt-4"}', ""],
+    ]
+
+    assert json.loads(encode_ndjson([row], columns)) == {
+        "id": "j1",
+        "status": "completed",
+        "created_at": "2026-01-02T03:04:05",
+        "parameters": {"model": "gpt-4"},
+        "error_message": None,
+    }
+
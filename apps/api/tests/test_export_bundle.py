@@ -0,0 +1,66 @@
+"""Tests for multi-format exports"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.slides import SlideGenerationRequest
+from app.services import generation
+
+from .test_render_cache import FakeS3
+
+
+@pytest.fixture
+def slide_exports(monkeypatch):
+    """Slide exports against an in-memory bucket, with slow renders whose concurrency is tracked"""
+    store = SimpleNamespace(s3=FakeS3(), jobs={}, outlines=[], running=0, peak=0)
+
+    async def render(label):
+        store.running += 1
+        store.peak = max(store.peak, store.running)
+        await asyncio.sleep(0.05)
+        store.running -= 1
+        return label.encode()
+
+    async def generate_pptx(self, title, slides, template="modern"):
+        return await render("pptx")
+
+    async def generate_pdf(self, title, slides, template="modern", engine=None):
+        return await render("pdf")
+
+    async def resolve_slides(slide_request):
+        store.outlines.append(slide_request)
+        return slide_request.topic, slide_request.outline
+
+    async def save_job_result(db, job_id, **fields):
+        store.jobs[job_id] = fields
+
+    async def noop(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(generation.SlideGenerator, "generate_pptx", generate_pptx)
+    monkeypatch.setattr(generation.SlideGenerator, "generate_pdf", generate_pdf)
+    monkeypatch.setattr(generation, "resolve_slides", resolve_slides)
+    monkeypatch.setattr(generation, "get_s3_manager", lambda: store.s3)
+    monkeypatch.setattr(generation, "save_job_result", save_job_result)
+    monkeypatch.setattr(generation, "record_usage_event", noop)
+    monkeypatch.setattr(generation, "check_cancelled", noop)
+    return store
+
+
+async def test_formats_render_concurrently_under_one_job(slide_exports):
+    """A format list renders each format once, concurrently, and returns a URL per format"""
+    request = SlideGenerationRequest.model_validate({
+        "topic": "Review",
+        "outline": [{"title": "Agenda", "content": ["Results"]}],
+        "format": ["pdf", "pptx", "pdf"],
+    })
+    response = await generation.run_slides_job(None, "j1", "u1", request)
+
+    objects, job = slide_exports.s3.objects, slide_exports.jobs["j1"]
+    assert [file.format for file in response.files] == ["pdf", "pptx"]
+    assert response.s3_key == response.files[0].s3_key and response.s3_key.endswith("presentation.pdf")
+    assert {objects[file.s3_key]["Body"] for file in response.files} == {b"pdf", b"pptx"}
+    assert slide_exports.peak == 2 and len(slide_exports.outlines) == 1
+    assert job["result_url"] == response.download_url
+    assert [file["s3_key"] for file in job["parameters"]["files"]] == [f.s3_key for f in response.files]
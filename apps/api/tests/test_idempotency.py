@@ -0,0 +1,129 @@
+"""Tests for Idempotency-Key handling"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.middleware import idempotency
+from app.middleware.idempotency import REPLAYED_HEADER, IdempotentRoute, request_fingerprint
+
+router = APIRouter(route_class=IdempotentRoute)
+calls = []
+
+
+@router.post("/generate")
+async def generate(payload: dict):
+    calls.append(payload)
+    if payload.get("fail"):
+        raise HTTPException(status_code=503, detail="Provider unavailable")
+    return {"ok": True}
+
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+class FakeKeys:
+    """In-memory stand-in for the idempotency_keys table"""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def claim_key(self, user_id, key, request_hash):
+        if (user_id, key) in self.rows:
+            return False
+        self.rows[user_id, key] = SimpleNamespace(
+            request_hash=request_hash, status_code=None, content_type=None, response_body=None
+        )
+        return True
+
+    async def get_key(self, user_id, key):
+        return self.rows.get((user_id, key))
+
+    async def store_response(self, user_id, key, response):
+        row = self.rows[user_id, key]
+        row.status_code = response.status_code
+        row.content_type = response.headers.get("content-type")
+        row.response_body = response.body.decode()
+
+    async def release_key(self, user_id, key):
+        if self.rows[user_id, key].status_code is None:
+            del self.rows[user_id, key]
+
+
+@pytest.fixture
+def keys(monkeypatch):
+    """Keys scoped to one signed-in user, kept in memory; duplicates do not wait"""
+    fake = FakeKeys()
+    for name in ("claim_key", "get_key", "store_response", "release_key"):
+        monkeypatch.setattr(idempotency, name, getattr(fake, name))
+    monkeypatch.setattr(idempotency, "user_id_from_request", lambda request: "user-1")
+    monkeypatch.setattr(idempotency, "IDEMPOTENCY_WAIT_TIMEOUT", 0)
+    calls.clear()
+    return fake
+
+
+def post(body: bytes, key: str = "key-1", query: str = ""):
+    return client.post(
+        f"/generate{query}",
+        content=body,
+        headers={"Content-Type": "application/json", "Idempotency-Key": key},
+    )
+
+
+def test_requests_without_a_usable_key_pass_through():
+    """No key (or no valid token to scope it) runs the endpoint as before"""
+    calls.clear()
+    assert client.post("/generate", json={"n": 1}).json() == {"ok": True}
+    assert client.post("/generate", json={"n": 1}, headers={"Idempotency-Key": "abc"}).status_code == 200
+    assert len(calls) == 2
+
+    response = client.post("/generate", json={"n": 1}, headers={"Idempotency-Key": "x" * 256})
+    assert response.status_code == 400
+
+
+def test_fingerprint_covers_path_query_and_body():
+    """The same key cannot be replayed for a different request"""
+    base = request_fingerprint("POST", "/api/v1/images/generate", b'{"prompt": "a"}')
+    assert base == request_fingerprint("POST", "/api/v1/images/generate", b'{"prompt": "a"}')
+    assert base != request_fingerprint("POST", "/api/v1/images/generate", b'{"prompt": "b"}')
+    assert base != request_fingerprint("POST", "/api/v1/videos/generate", b'{"prompt": "a"}')
+
+    queued = request_fingerprint("POST", "/api/v1/cv/generate", b"{}", "async=true&x=1")
+    assert queued != request_fingerprint("POST", "/api/v1/cv/generate", b"{}")
+    assert queued == request_fingerprint("POST", "/api/v1/cv/generate", b"{}", "x=1&async=true")
+
+
+def test_duplicate_gets_stored_response(keys):
+    """A repeated request is answered from the stored response without running again"""
+    first = post(b'{"n": 1}')
+    repeat = post(b'{"n": 1}')
+
+    assert first.json() == repeat.json() == {"ok": True}
+    assert repeat.headers[REPLAYED_HEADER] == "true" and REPLAYED_HEADER not in first.headers
+    assert len(calls) == 1
+
+    # A different query string is a different request
+    assert post(b'{"n": 1}', query="?async=true").status_code == 422
+
+
+def test_key_in_flight_or_reused_is_rejected(keys):
+    """A duplicate of a running request times out with 409; a different body gets 422"""
+    keys.rows["user-1", "key-1"] = SimpleNamespace(
+        request_hash=request_fingerprint("POST", "/generate", b'{"n": 1}'),
+        status_code=None, content_type=None, response_body=None,
+    )
+    assert post(b'{"n": 1}').status_code == 409
+    assert post(b'{"n": 2}').status_code == 422
+    assert not calls
+
+
+def test_failure_releases_key(keys):
+    """A failed request frees its key, so a retry runs the endpoint again"""
+    assert post(b'{"fail": true}').status_code == 503
+    assert not keys.rows
+
+    assert post(b'{"fail": true}').status_code == 503
+    assert len(calls) == 2
@@ -0,0 +1,37 @@
+"""Tests for the job event hub"""
+import json
+
+import pytest
+
+from app.utils.job_events import RESYNC, JobEventHub, job_event
+
+
+@pytest.fixture
+def hub():
+    """Hub fed by hand through dispatch, with room for two events per watcher"""
+    return JobEventHub("postgresql://unused", queue_size=2)
+
+
+async def test_events_fan_out_to_watchers_of_the_job(hub):
+    """Every watcher of a job gets its events; other jobs' watchers do not"""
+    payload = json.dumps(job_event("job-1", "user-1", "processing", progress=40))
+    async with hub.watch("job-1") as first, hub.watch("job-1") as second, hub.watch("job-2") as other:
+        assert hub.dispatch(payload) == 2
+        assert (await first.get())["progress"] == 40
+        assert (await second.get())["status"] == "processing"
+        assert other.empty()
+
+    # Watchers are removed on exit
+    assert hub.dispatch(payload) == 0
+
+
+async def test_slow_watcher_keeps_latest_events(hub):
+    """A full queue drops its oldest event instead of blocking the listener"""
+    async with hub.watch("job-1") as events:
+        for progress in (10, 20, 30):
+            hub.dispatch(json.dumps(job_event("job-1", "user-1", "processing", progress=progress)))
+        hub._resync_all()
+        latest, marker = events.get_nowait(), events.get_nowait()
+
+    assert latest["progress"] == 30
+    assert marker is RESYNC
@@ -0,0 +1,62 @@
+"""Tests for the batch job status endpoint helpers and job updates"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.job import Job, JobStatus, JobType
+from app.routers import jobs
+from app.routers.jobs import MAX_STATUS_BATCH, parse_job_ids, should_wait_for_change
+from app.schemas.job import JobStatusSummary, JobUpdate
+
+from .test_cancellation import FakeSession
+
+
+def summary(job_id, job_status, updated_at):
+    return JobStatusSummary(id=job_id, status=job_status, updated_at=updated_at)
+
+
+def test_parse_job_ids():
+    """IDs are trimmed and de-duplicated; empty and oversized lists are rejected"""
+    assert parse_job_ids("a, b,,a ") == ["a", "b"]
+    with pytest.raises(ValueError):
+        parse_job_ids(" , ")
+    with pytest.raises(ValueError):
+        parse_job_ids(",".join(str(i) for i in range(MAX_STATUS_BATCH + 1)))
+
+
+def test_long_poll_waits_only_for_unchanged_active_jobs():
+    """Waiting stops once a job changed after the cursor or all jobs are finished"""
+    since = datetime(2026, 10, 19, 12, 0)
+    before = datetime(2026, 10, 19, 11, 0)
+    after = datetime(2026, 10, 19, 12, 1)
+
+    assert should_wait_for_change([summary("a", JobStatus.PROCESSING, before)], since)
+    assert not should_wait_for_change(
+        [summary("a", JobStatus.PROCESSING, before), summary("b", JobStatus.PENDING, after)], since
+    )
+    assert not should_wait_for_change([summary("a", JobStatus.COMPLETED, before)], since)
+    assert not should_wait_for_change([], since)
+
+
+async def test_update_during_outage_returns_spooled_values(monkeypatch):
+    """A job update spooled while the database is down still answers with the new values"""
+    now = datetime.utcnow()
+    job = Job(
+        id="job-1", user_id="user-1", type=JobType.IMAGE, status=JobStatus.PROCESSING,
+        created_at=now, updated_at=now,
+    )
+
+    async def save_job_result(db, job_id, **fields):
+        return False
+
+    monkeypatch.setattr(jobs, "save_job_result", save_job_result)
+
+    response = await jobs.update_job(
+        "job-1",
+        JobUpdate(status=JobStatus.COMPLETED, result_url="https://cdn.test/image.png"),
+        current_user=SimpleNamespace(id="user-1"),
+        db=FakeSession(job),
+    )
+
+    assert (response.status, response.result_url) == (JobStatus.COMPLETED, "https://cdn.test/image.png")
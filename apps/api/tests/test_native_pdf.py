@@ -0,0 +1,100 @@
+"""Tests for the native (browser-free) PDF renderer"""
+import pytest
+
+from app.schemas.cv import CVRequest
+from app.schemas.slides import SlideContent
+from app.services.cv_generator import CVGenerator
+from app.services.native_pdf import NativePDFRenderer, find_font_set
+from app.services.slide_generator import SlideGenerator
+from app.utils.browser_pool import close_browser_pool
+
+pdfium = pytest.importorskip("pypdfium2")
+from PIL import Image, ImageChops, ImageOps  # noqa: E402
+
+CV = CVRequest.model_validate({
+    "personal_info": {"full_name": "Ada Example", "email": "ada@example.com", "location": "Remote"},
+    "summary": "Backend engineer focused on reliable, observable services. " * 3,
+    "experience": [
+        {
+            "job_title": "Senior Engineer",
+            "company": "Example Corp",
+            "start_date": "2019",
+            "end_date": "Present",
+            "description": "Built and operated high-throughput APIs.",
+            "responsibilities": ["Led the billing rewrite", "Ran the on-call rotation"],
+        }
+    ],
+    "education": [{"degree": "BSc Computer Science", "institution": "Example University"}],
+    "skills": [{"category": "Languages", "skills": ["Python", "SQL"]}],
+    "format": "pdf",
+})
+
+SLIDES = [
+    SlideContent(title="Agenda", content=["Results", "Roadmap", "Questions"]),
+    SlideContent(title="Results", content=["Revenue up 12% quarter over quarter"]),
+]
+
+
+def rasterize(pdf: bytes, scale: float = 0.5):
+    document = pdfium.PdfDocument(pdf)
+    return [document[i].render(scale=scale).to_pil().convert("L") for i in range(len(document))]
+
+
+def layout_difference(a, b, factor: int = 8) -> float:
+    """Ink that differs between two pages after blurring away glyph-level detail (0 = same, 1 = disjoint)"""
+    size = (a.width // factor, a.height // factor)
+    a = ImageOps.invert(a.resize(size, Image.BOX))
+    b = ImageOps.invert(b.resize(size, Image.BOX))
+    ink = sum(a.getdata()) + sum(b.getdata())
+    return sum(ImageChops.difference(a, b).getdata()) / ink if ink else 0.0
+
+
+def test_native_renders_text_with_subset_fonts():
+    """CV and slide PDFs carry their text, one page per slide, with fonts embedded as subsets"""
+    if find_font_set() is None:
+        pytest.skip("No TrueType fonts installed")
+    renderer = NativePDFRenderer()
+
+    cv_pdf = renderer.render_cv(CV)
+    slides_pdf = renderer.render_slides("Quarterly Review", SLIDES)
+
+    cv = pdfium.PdfDocument(cv_pdf)
+    text = cv[0].get_textpage().get_text_range()
+    for expected in ("Ada Example", "Professional Summary", "Led the billing rewrite", "Languages: Python, SQL"):
+        assert expected in text
+    assert len(pdfium.PdfDocument(slides_pdf)) == 1 + len(SLIDES)
+    # Subset fonts are tagged "ABCDEF+Name"
+    assert b"/FontFile2" in cv_pdf
+    assert b"+" + find_font_set().family.encode() in cv_pdf
+
+
+@pytest.fixture
+async def render_both():
+    """Render the CV and the slides with a given engine; the browser pool is closed afterwards"""
+    cv_generator, slide_generator = CVGenerator(), SlideGenerator()
+
+    async def render(engine):
+        return [
+            await cv_generator.generate_pdf(CV, engine=engine),
+            await slide_generator.generate_pdf("Quarterly Review", SLIDES, engine=engine),
+        ]
+
+    yield render
+    await close_browser_pool()
+
+
+async def test_native_matches_chromium_layout(render_both):
+    """Native pages line up with the Chromium render of the same documents"""
+    try:
+        chromium = await render_both("chromium")
+    except Exception as e:
+        pytest.skip(f"Chromium unavailable: {str(e).splitlines()[0]}")
+    native = await render_both("native")
+
+    for chromium_pdf, native_pdf in zip(chromium, native, strict=True):
+        chromium_pages, native_pages = rasterize(chromium_pdf), rasterize(native_pdf)
+        assert len(native_pages) == len(chromium_pages)
+        for chromium_page, native_page in zip(chromium_pages, native_pages, strict=True):
+            assert native_page.size == chromium_page.size
+            # About a third of the ink moves when a page shifts ~6pt
+            assert layout_difference(chromium_page, native_page) < 0.3
@@ -0,0 +1,20 @@
+"""Tests for keyset pagination cursors"""
+from datetime import datetime
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    """A cursor decodes to the position it was built from"""
+    created_at = datetime(2026, 10, 19, 9, 30, 15, 123456)
+    token = encode_cursor(created_at, "6f1c2d9e-0000-4000-8000-000000000000")
+    assert "=" not in token
+    assert decode_cursor(token) == (created_at, "6f1c2d9e-0000-4000-8000-000000000000")
+
+
+def test_malformed_cursor_rejected():
+    """Garbage tokens raise ValueError"""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
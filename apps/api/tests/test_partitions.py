@@ -0,0 +1,70 @@
+"""Tests for monthly partition helpers and archive read-through"""
+import gzip
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from app.utils.archive import archive_key, iter_archived_rows
+from app.utils.partitions import (
+    add_months,
+    month_start,
+    parse_partition_month,
+    partition_bounds,
+    partition_name,
+)
+
+
+def test_month_arithmetic_crosses_years():
+    """Months roll over year boundaries in both directions"""
+    month = month_start(datetime(2026, 12, 31, 23, 59, 59))
+    assert month == datetime(2026, 12, 1)
+    assert add_months(month, 1) == datetime(2027, 1, 1)
+    assert add_months(month, -12) == datetime(2025, 12, 1)
+    assert partition_bounds(month) == "FROM ('2026-12-01 00:00:00') TO ('2027-01-01 00:00:00')"
+
+
+def test_partition_names_round_trip():
+    """Only monthly partitions of the given table parse back to a month"""
+    name = partition_name("usage_events", datetime(2026, 3, 1))
+    assert name == "usage_events_p2026_03"
+    assert parse_partition_month("usage_events", name) == datetime(2026, 3, 1)
+    assert parse_partition_month("usage_events", "usage_events_default") is None
+    assert parse_partition_month("jobs", name) is None
+
+
+class FakeS3:
+    """In-memory stand-in for S3Manager.open_object"""
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    def open_object(self, key):
+        if key not in self.objects:
+            raise FileNotFoundError(key)
+        return io.BytesIO(self.objects[key])
+
+
+@pytest.fixture
+def archived_rows():
+    """A month of job rows archived to a fake bucket"""
+    rows = [{"id": str(i), "user_id": "a" if i % 2 else "b"} for i in range(1000)]
+    payload = gzip.compress(b"".join(json.dumps(row).encode() + b"\n" for row in rows))
+    return rows, FakeS3({archive_key("jobs", datetime(2025, 9, 1)): payload})
+
+
+async def collect(month, s3, **kwargs):
+    return [json.loads(line) async for line in iter_archived_rows("jobs", month, s3=s3, **kwargs)]
+
+
+async def test_read_through_filters_by_user(archived_rows):
+    """Archived rows stream back decompressed, optionally for one user"""
+    rows, s3 = archived_rows
+    month = datetime(2025, 9, 1)
+
+    assert await collect(month, s3) == rows
+    assert await collect(month, s3, user_id="a") == [row for row in rows if row["user_id"] == "a"]
+
+    with pytest.raises(FileNotFoundError):
+        await collect(datetime(2020, 1, 1), s3)
@@ -0,0 +1,55 @@
+"""Tests for connection pool instrumentation"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.auth import dependencies
+from app.auth.dependencies import require_metrics_access
+from app.utils.pool import instrument_engine, report_long_held
+
+
+def sample(name, engine_name):
+    return REGISTRY.get_sample_value(name, {"engine": engine_name}) or 0
+
+
+def test_checkouts_are_tracked_and_long_holds_reported():
+    """In-use gauge follows checkouts; long holds are reported once"""
+    sync_engine = create_engine("sqlite://")
+    instrument_engine(SimpleNamespace(sync_engine=sync_engine), "test")
+
+    with sync_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert sample("pulse_db_pool_connections_in_use", "test") == 1
+        assert report_long_held(threshold=0) == 1
+        assert report_long_held(threshold=0) == 0
+
+    assert sample("pulse_db_pool_connections_in_use", "test") == 0
+    assert sample("pulse_db_pool_checkout_duration_seconds_count", "test") == 1
+    assert sample("pulse_db_pool_long_held_total", "test") == 1
+
+
+async def test_metrics_require_scrape_token_or_admin(monkeypatch):
+    """The scrape token is accepted; anything else must be an admin's token"""
+    monkeypatch.setenv("METRICS_TOKEN", "scrape-secret")
+    users = {"admin-token": SimpleNamespace(is_admin=True), "user-token": SimpleNamespace(is_admin=False)}
+
+    async def get_current_user(credentials, db):
+        if credentials is None or credentials.credentials not in users:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        return users[credentials.credentials]
+
+    monkeypatch.setattr(dependencies, "get_current_user", get_current_user)
+
+    def bearer(token):
+        return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    await require_metrics_access(bearer("scrape-secret"), None)
+    await require_metrics_access(bearer("admin-token"), None)
+    for credentials, status_code in ((None, 401), (bearer("wrong"), 401), (bearer("user-token"), 403)):
+        with pytest.raises(HTTPException) as error:
+            await require_metrics_access(credentials, None)
+        assert error.value.status_code == status_code
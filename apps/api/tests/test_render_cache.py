@@ -0,0 +1,113 @@
+"""Tests for the export render cache"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.cv import CVRequest
+from app.schemas.slides import SlideContent
+from app.services import generation
+from app.services.render_cache import cv_render_digest, find_cached_export, slides_render_digest
+
+CV = {
+    "personal_info": {"full_name": "Ada Lovelace", "email": "ada@example.com"},
+    "summary": "Analyst",
+    "skills": [{"category": "Maths", "skills": ["Analysis"]}],
+    "format": "docx",
+}
+
+
+def test_digest_is_canonical():
+    """Equal content hashes equally; template, format and PDF engine change the digest"""
+    digest = cv_render_digest(CVRequest.model_validate(CV), "docx")
+
+    reordered = dict(reversed(list(CV.items())))
+    assert cv_render_digest(CVRequest.model_validate(reordered), "docx") == digest
+    # "modern" is the default template; the PDF engine only matters for PDFs
+    variant = {**CV, "template": None, "pdf_engine": "native", "format": ["pdf", "docx"]}
+    assert cv_render_digest(CVRequest.model_validate(variant), "docx") == digest
+    assert cv_render_digest(CVRequest.model_validate({**CV, "template": "classic"}), "docx") != digest
+    assert cv_render_digest(CVRequest.model_validate(CV), "pdf") != digest
+    assert cv_render_digest(CVRequest.model_validate({**CV, "summary": "Analyst."}), "docx") != digest
+
+    slides = [SlideContent(title="Agenda", content=["Results"])]
+    pdf = slides_render_digest("Review", slides, "modern", "pdf", "chromium")
+    assert pdf == slides_render_digest("Review", slides, None, "pdf", "chromium")
+    assert pdf != slides_render_digest("Review", slides, "modern", "pdf", "native")
+
+
+class FakeS3:
+    """In-memory stand-in for S3Manager's upload, head and presign calls"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_file(self, file_bytes, key, content_type, metadata=None):
+        self.objects[key] = {"Body": file_bytes, "LastModified": datetime.now(timezone.utc)}
+        return key
+
+    def head_object(self, key):
+        return self.objects.get(key)
+
+    def generate_presigned_url(self, key, expiration=3600):
+        return f"https://s3.test/{key}?expires={expiration}"
+
+
+@pytest.fixture
+def exports(monkeypatch):
+    """Run export jobs against an in-memory bucket, recording job results and usage metadata"""
+    store = SimpleNamespace(s3=FakeS3(), jobs={}, usage=[])
+
+    async def save_job_result(db, job_id, **fields):
+        store.jobs[job_id] = fields
+
+    async def record_usage_event(db, user_id, job_id, event_type, **kwargs):
+        store.usage.append(kwargs["event_metadata"])
+
+    async def check_cancelled(db, job_id):
+        pass
+
+    monkeypatch.setattr(generation, "get_s3_manager", lambda: store.s3)
+    monkeypatch.setattr(generation, "save_job_result", save_job_result)
+    monkeypatch.setattr(generation, "record_usage_event", record_usage_event)
+    monkeypatch.setattr(generation, "check_cancelled", check_cancelled)
+    return store
+
+
+async def test_repeat_export_reuses_object(exports, monkeypatch):
+    """A repeat export of the same CV skips rendering and upload but completes its own job"""
+    renders = []
+
+    async def generate_docx(self, cv_request):
+        renders.append(cv_request)
+        return b"docx"
+
+    monkeypatch.setattr(generation.CVGenerator, "generate_docx", generate_docx)
+    cv_request = CVRequest.model_validate(CV)
+
+    first, repeat, other_user = [
+        await generation.run_cv_job(None, job_id, user_id, cv_request)
+        for job_id, user_id in (("j1", "u1"), ("j2", "u1"), ("j3", "u2"))
+    ]
+
+    assert repeat.s3_key == first.s3_key and repeat.job_id == "j2"
+    assert exports.jobs["j2"]["result_url"] == repeat.download_url
+    # Another user's identical CV is rendered and stored separately
+    assert other_user.s3_key != first.s3_key and "/u2/" in other_user.s3_key
+    assert len(renders) == 2 and len(exports.s3.objects) == 2
+    assert [event["cached"] for event in exports.usage] == [False, True, False]
+
+    # Exports too close to bucket expiry are rendered again
+    exports.s3.objects[first.s3_key]["LastModified"] -= timedelta(days=85)
+    await generation.run_cv_job(None, "j4", "u1", cv_request)
+    assert len(renders) == 3
+
+
+def test_failed_lookup_is_a_miss():
+    """A lookup S3 refuses (403 without ListBucket, or an outage) renders instead of failing"""
+
+    class DeniedS3:
+        def head_object(self, key):
+            raise Exception("Failed to read from S3: An error occurred (403) when calling the HeadObject operation")
+
+    assert find_cached_export(DeniedS3(), "cvs/u1/renders/abc/cv.docx") is False
@@ -0,0 +1,33 @@
+"""Tests for read-replica routing"""
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import ReplicaMonitor
+
+
+@pytest.fixture
+async def replica():
+    """Engine for a replica nothing listens on"""
+    engine = create_async_engine("postgresql+asyncpg://pulse@127.0.0.1:1/pulse")
+    yield engine
+    await engine.dispose()
+
+
+async def test_unreachable_replica_is_not_used(replica):
+    """Reads fall back to the primary when the replica cannot be reached"""
+    monitor = ReplicaMonitor(replica, max_lag=5, check_interval=1)
+    assert await monitor.is_usable() is False
+    assert monitor.lag is None
+
+
+async def test_lag_threshold(replica):
+    """A fresh lag measurement is compared against max_lag"""
+    monitor = ReplicaMonitor(replica, max_lag=5, check_interval=60)
+    monitor.checked_at = time.monotonic()
+
+    monitor.lag = 0.5
+    assert await monitor.is_usable() is True
+    monitor.lag = 30.0
+    assert await monitor.is_usable() is False
@@ -0,0 +1,83 @@
+"""Tests for plan-lane job scheduling"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.job import JobStatus
+from app.models.subscription import PlanType
+from app.utils import scheduler
+from app.utils.scheduler import STALLED_JOB_ERROR, JobScheduler, lane_of, pick_jobs
+
+
+def test_lanes_share_slots_by_weight():
+    """Each round gives PRO four slots, PLUS two and STARTER one"""
+    candidates = {
+        PlanType.PRO: [f"pro-{i}" for i in range(10)],
+        PlanType.PLUS: [f"plus-{i}" for i in range(10)],
+        PlanType.STARTER: [f"starter-{i}" for i in range(10)],
+    }
+
+    picked = pick_jobs(candidates, free_slots=14)
+
+    assert picked[:7] == ["pro-0", "pro-1", "pro-2", "pro-3", "plus-0", "plus-1", "starter-0"]
+    assert sum(job.startswith("starter") for job in picked) == 2
+
+
+def test_idle_lanes_pass_their_share_on():
+    """A lane with nothing waiting does not hold back the others"""
+    candidates = {PlanType.STARTER: ["a", "b", "c"], PlanType.PRO: ["p"]}
+
+    assert pick_jobs(candidates, free_slots=10) == ["p", "a", "b", "c"]
+    assert pick_jobs(candidates, free_slots=0) == []
+    assert lane_of(None) == PlanType.STARTER
+
+
+class FakeSession:
+    """Session answering the stale-job queries with fixed job IDs"""
+
+    def __init__(self, *job_ids):
+        self.job_ids = list(job_ids)
+        self.queries = []
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def execute(self, query):
+        self.queries.append(query.compile(dialect=postgresql.dialect()))
+        ids = self.job_ids.pop(0)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: ids))
+
+    async def commit(self):
+        self.committed = True
+
+
+async def test_stale_dispatched_jobs_are_released(monkeypatch):
+    """A lost dispatch is put back in line and a job whose worker went quiet is failed"""
+    session = FakeSession(["lost"], ["stalled"])
+    applied = []
+
+    async def apply_job_record(db, record):
+        applied.append(record)
+
+    monkeypatch.setattr(scheduler, "AsyncSession", lambda engine: session)
+    monkeypatch.setattr(scheduler, "apply_job_record", apply_job_record)
+    now = datetime(2026, 10, 19, 12, 0)
+
+    released = await JobScheduler(None, dispatch_timeout=600, processing_timeout=1200).release_stale(now)
+
+    requeue, stalled = session.queries
+    assert released == (1, 1)
+    assert requeue.params["dispatched_at"] is None
+    assert now - timedelta(seconds=600) in requeue.params.values()
+    assert now - timedelta(seconds=1200) in stalled.params.values()
+    assert "FOR UPDATE SKIP LOCKED" in stalled.string
+    assert applied == [{
+        "job_id": "stalled",
+        "fields": {"status": JobStatus.FAILED, "error_message": STALLED_JOB_ERROR, "completed_at": now},
+    }]
+    assert session.committed
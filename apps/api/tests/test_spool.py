@@ -0,0 +1,155 @@
+"""Tests for the local write-ahead spool"""
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.job import TERMINAL_STATUSES, JobStatus, JobType
+from app.utils import spool as spool_module
+from app.utils import usage_writer
+from app.utils.spool import SpoolReplayer, WriteAheadSpool
+
+
+async def test_append_is_durable_and_replayed_once(tmp_path):
+    """Records survive a restart and are removed once replayed"""
+    spool = WriteAheadSpool(directory=str(tmp_path), fsync_batch=4)
+    await asyncio.gather(*(spool.append("usage", {"id": f"e{i}"}) for i in range(10)))
+    await spool.close()
+
+    # A new process sees the previous segment as sealed
+    restarted = WriteAheadSpool(directory=str(tmp_path))
+    applied = []
+
+    async def handler(records):
+        applied.extend(record["id"] for record in records)
+
+    replayer = SpoolReplayer(restarted, handler)
+    assert await replayer.replay_once() == 10
+    assert applied == [f"e{i}" for i in range(10)]
+    assert await replayer.replay_once() == 0
+
+
+async def test_failed_replay_keeps_segment(tmp_path):
+    """A handler failure leaves the segment for the next attempt"""
+    spool = WriteAheadSpool(directory=str(tmp_path))
+    await spool.append("job", {"job_id": "j1", "fields": {"status": "completed"}})
+
+    async def failing(records):
+        raise ConnectionError("database down")
+
+    replayer = SpoolReplayer(spool, failing)
+    try:
+        await replayer.replay_once()
+    except ConnectionError:
+        pass
+    assert len(spool.sealed_segments()) == 1
+
+    applied = []
+
+    async def handler(records):
+        applied.extend(records)
+
+    replayer.handler = handler
+    assert await replayer.replay_once() == 1
+    assert applied[0]["payload"]["job_id"] == "j1"
+
+
+def test_torn_tail_is_skipped(tmp_path):
+    """A partially written last line does not break replay"""
+    segment = tmp_path / "segment-000000000001.log"
+    segment.write_text('{"id":"a","kind":"usage","payload":{}}\n{"id":"b","ki')
+    records = list(WriteAheadSpool.read_segment(segment))
+    assert [record["id"] for record in records] == ["a"]
+
+
+async def test_process_directories_are_isolated(tmp_path, monkeypatch):
+    """A live process's segments are left alone; an exited one's are adopted and cleaned up"""
+    monkeypatch.setattr(spool_module.socket, "gethostname", lambda: "api-1")
+    first = WriteAheadSpool(directory=str(tmp_path))
+    monkeypatch.setattr(spool_module.socket, "gethostname", lambda: "api-2")
+    second = WriteAheadSpool(directory=str(tmp_path))
+
+    await first.append("usage", {"id": "e1"})
+    await first.seal()
+    await first.append("usage", {"id": "e2"})
+    assert second.sealed_segments() == []
+
+    await first.close()
+    applied = []
+
+    async def handler(records):
+        applied.extend(record["id"] for record in records)
+
+    assert await SpoolReplayer(second, handler).replay_once() == 2
+    assert sorted(applied) == ["e1", "e2"]
+    assert not first.directory.exists()
+    await second.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_failing_records_are_dead_lettered(tmp_path):
+    """A record that keeps failing is retried alone, then set aside"""
+    spool = WriteAheadSpool(directory=str(tmp_path))
+    for record_id in ("e1", "bad", "e2"):
+        await spool.append("usage", {"id": record_id})
+    attempts = []
+
+    async def handler(records):
+        attempts.append([record["id"] for record in records])
+        return [record for record in records if record["id"] == "bad"]
+
+    replayer = SpoolReplayer(spool, handler, max_attempts=2)
+    assert await replayer.replay_once() == 2
+    assert await replayer.replay_once() == 0
+    assert attempts == [["e1", "bad", "e2"], ["bad"]]
+    assert spool.sealed_segments() == []
+
+    dead_letters = list((tmp_path / "dead-letter").iterdir())
+    assert [record["id"] for record in WriteAheadSpool.read_segment(dead_letters[0])] == ["bad"]
+
+
+class FakeJobTable:
+    """Session over one job row that honours only the status guard of job updates"""
+
+    def __init__(self, job_status):
+        self.job = SimpleNamespace(
+            user_id="user-1", status=job_status, type=JobType.VIDEO, model_name=None,
+            progress=100, result_url="https://s3.test/video.mp4", error_message=None, updated_at=None,
+        )
+        self.updates = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def begin_nested(self):
+        return self
+
+    async def execute(self, query, params=None):
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        row = self.job
+        if sql.startswith("UPDATE"):
+            if "jobs.status NOT IN" in sql and self.job.status in TERMINAL_STATUSES:
+                row = None
+            else:
+                self.updates.append(query.compile().params)
+        return SimpleNamespace(one_or_none=lambda: row)
+
+    async def commit(self):
+        pass
+
+
+async def test_stale_replay_does_not_reopen_finished_job(monkeypatch):
+    """Updates spooled while a job ran are not applied once it has completed"""
+    table = FakeJobTable(JobStatus.COMPLETED)
+    monkeypatch.setattr(usage_writer, "AsyncSessionLocal", lambda: table)
+    records = [
+        {"id": "r1", "kind": "job", "payload": {"job_id": "j1", "fields": {"status": "processing"}}},
+        {"id": "r2", "kind": "job", "payload": {"job_id": "j1", "fields": {"progress": 40}}},
+        {"id": "r3", "kind": "job", "payload": {"job_id": "j1", "fields": {"tokens_used": 12}}},
+    ]
+
+    assert await usage_writer.replay_records(records) == []
+    assert [params["tokens_used"] for params in table.updates] == [12]
@@ -0,0 +1,70 @@
+"""Tests for the batching SQS producer"""
+import asyncio
+import json
+
+import pytest
+
+from app.utils.sqs_producer import SQSBatchProducer
+
+
+class LocalSQS:
+    """SendMessageBatch stand-in that can fail chosen messages once"""
+
+    def __init__(self, fail_once=(), sender_fault=()):
+        self.calls = []
+        self.messages = []
+        self.fail_once = set(fail_once)
+        self.sender_fault = set(sender_fault)
+
+    def send_message_batch(self, entries):
+        self.calls.append(len(entries))
+        successful, failed = [], []
+        for entry in entries:
+            body = json.loads(entry["MessageBody"])
+            if body["n"] in self.sender_fault:
+                failed.append({"Id": entry["Id"], "SenderFault": True, "Code": "InvalidMessageContents"})
+            elif body["n"] in self.fail_once:
+                self.fail_once.discard(body["n"])
+                failed.append({"Id": entry["Id"], "SenderFault": False, "Code": "InternalError"})
+            else:
+                self.messages.append(body)
+                successful.append({"Id": entry["Id"], "MessageId": f"msg-{body['n']}"})
+        return {"Successful": successful, "Failed": failed}
+
+
+@pytest.fixture
+async def make_producer():
+    """Producers over a LocalSQS, closed after the test"""
+    producers = []
+
+    def make(sqs, **options):
+        producers.append(SQSBatchProducer(sqs, linger=0.01, retry_delay=0, **options))
+        return producers[-1]
+
+    yield make
+    for producer in producers:
+        await producer.close()
+
+
+async def test_concurrent_sends_share_batches(make_producer):
+    """25 concurrent sends go out in batches of at most 10, each caller getting its own ID"""
+    sqs = LocalSQS()
+    producer = make_producer(sqs)
+
+    message_ids = await asyncio.gather(*(producer.send({"n": n}) for n in range(25)))
+
+    assert message_ids == [f"msg-{n}" for n in range(25)]
+    assert sqs.calls == [10, 10, 5]
+
+
+async def test_partial_failures_are_retried(make_producer):
+    """Failed entries are resent; sender faults fail their caller only"""
+    sqs = LocalSQS(fail_once={1, 3}, sender_fault={4})
+    producer = make_producer(sqs)
+
+    results = await asyncio.gather(*(producer.send({"n": n}) for n in range(5)), return_exceptions=True)
+
+    assert results[:4] == ["msg-0", "msg-1", "msg-2", "msg-3"]
+    assert "InvalidMessageContents" in str(results[4])
+    assert sqs.calls == [5, 2]
+    assert sorted(body["n"] for body in sqs.messages) == [0, 1, 2, 3]
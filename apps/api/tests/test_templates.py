@@ -0,0 +1,46 @@
+"""Tests for the CV and slide template registry"""
+import os
+
+import pytest
+
+from app.schemas.cv import CVRequest
+from app.schemas.slides import SlideContent
+from app.services.templates import TemplateRegistry, UnknownTemplate
+
+CV = CVRequest.model_validate({
+    "personal_info": {"full_name": "Ada <Admin>", "email": "ada@example.com", "github": "ada"},
+    "summary": "<script>alert(1)</script>",
+    "experience": [{"job_title": "Engineer", "company": "R&D", "start_date": "2019", "end_date": "2023"}],
+    "skills": [{"category": "Languages", "skills": ["Python", "SQL"]}],
+})
+
+
+def test_cv_output_is_escaped(tmp_path):
+    """User text is HTML-escaped; compiled templates land in the bytecode cache"""
+    registry = TemplateRegistry(cache_dir=str(tmp_path))
+
+    html = registry.render("cv", None, cv=CV)
+
+    assert "<h1>Ada &lt;Admin&gt;</h1>" in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert "<span class='company'>R&amp;D</span> | <span class='date'>2019 - 2023</span>" in html
+    assert "<div class='links'>GitHub: ada</div>" in html
+    assert "<strong>Languages:</strong> Python, SQL" in html
+    assert os.listdir(tmp_path)
+
+
+def test_named_slide_templates():
+    """Each registered slide template renders its own styling; unknown names are rejected"""
+    registry = TemplateRegistry(cache_dir=None)
+    slides = [SlideContent(title="Agenda", content=["Results"])]
+
+    assert registry.names("slides") == ["classic", "minimal", "modern"]
+    rendered = {name: registry.render("slides", name, title="Review", slides=slides) for name in registry.names("slides")}
+    assert "linear-gradient(135deg, #667eea 0%, #764ba2 100%)" in rendered["modern"]
+    assert "Georgia" in rendered["classic"] and "linear-gradient" not in rendered["classic"]
+    assert len(set(rendered.values())) == 3
+    for html in rendered.values():
+        assert "<h2>Agenda</h2>" in html and "<li>Results</li>" in html
+
+    with pytest.raises(UnknownTemplate):
+        registry.render("slides", "base", title="Review", slides=slides)
@@ -0,0 +1,42 @@
+"""Tests for admin user search query building"""
+from sqlalchemy.dialects import postgresql
+
+from app.utils.user_search import build_user_filter, escape_like
+
+
+def compile_sql(expression) -> str:
+    return str(expression.compile(dialect=postgresql.dialect()))
+
+
+def test_email_terms_use_prefix_match():
+    """Terms with '@' only hit the lower(email) prefix index"""
+    sql = compile_sql(build_user_filter("Bob@Example"))
+    assert "lower(users.email) LIKE" in sql
+    assert "ILIKE" not in sql
+
+
+def test_domain_terms_use_substring_match():
+    """Terms starting with '@' find every address at that domain"""
+    sql = compile_sql(build_user_filter("@Example.com"))
+    assert "users.email ILIKE" in sql
+    assert "users.name" not in sql
+    assert build_user_filter("@Example.com").right.value == "%@example.com%"
+
+
+def test_short_terms_use_prefix_match():
+    """Terms too short for trigrams fall back to prefix matches"""
+    sql = compile_sql(build_user_filter("ab"))
+    assert "ILIKE" not in sql
+    assert "lower(users.name) LIKE" in sql
+
+
+def test_long_terms_use_trigram_match():
+    """Longer terms use substring matches served by trigram indexes"""
+    sql = compile_sql(build_user_filter("smith"))
+    assert "users.email ILIKE" in sql
+    assert "users.name ILIKE" in sql
+
+
+def test_wildcards_are_escaped():
+    """User input cannot inject LIKE wildcards"""
+    assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
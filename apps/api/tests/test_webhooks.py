@@ -0,0 +1,124 @@
+"""Tests for job-event webhooks"""
+import json
+
+import httpx
+import pytest
+
+from app.models.job import JobStatus, JobType
+from app.models.webhook import DeliveryStatus, WebhookEvent
+from app.schemas.webhook import WebhookEndpointCreate
+from app.utils import webhooks
+from app.utils.webhooks import (
+    SIGNATURE_HEADER,
+    WEBHOOK_MAX_RETRY_DELAY,
+    WebhookDispatcher,
+    check_webhook_url,
+    job_event_payload,
+    retry_delay,
+    sign_payload,
+    verify_signature,
+)
+
+
+def test_signature_round_trip():
+    """Receivers can verify a signature; a changed body or old timestamp fails"""
+    body = job_event_payload(WebhookEvent.JOB_COMPLETED, {
+        "id": "job-1", "type": JobType.VIDEO, "status": JobStatus.COMPLETED, "result_url": "https://x/v.mp4",
+    })
+    header = sign_payload("whsec_test", body)
+
+    assert verify_signature("whsec_test", body, header)
+    assert not verify_signature("whsec_other", body, header)
+    assert not verify_signature("whsec_test", body.replace("job-1", "job-2"), header)
+    assert not verify_signature("whsec_test", body, sign_payload("whsec_test", body, timestamp=1))
+    assert json.loads(body)["data"] == {
+        "job_id": "job-1",
+        "type": "video",
+        "status": "completed",
+        "result_url": "https://x/v.mp4",
+        "error_message": None,
+        "completed_at": None,
+    }
+
+
+@pytest.fixture
+def received():
+    """Requests that reached the endpoint"""
+    return []
+
+
+@pytest.fixture
+async def dispatcher(received):
+    """Dispatcher whose endpoint records each request and answers 503"""
+
+    def endpoint(request):
+        received.append(request)
+        return httpx.Response(503, text="busy")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(endpoint)) as client:
+        yield WebhookDispatcher(None, client=client, max_attempts=3)
+
+
+@pytest.fixture
+def resolve_to(monkeypatch):
+    """Make every webhook host resolve to the given addresses"""
+
+    def resolve(*addresses):
+        async def resolve_webhook_host(host, port):
+            return list(addresses)
+
+        monkeypatch.setattr(webhooks, "resolve_webhook_host", resolve_webhook_host)
+
+    return resolve
+
+
+def delivery(**fields):
+    return {
+        "id": "delivery-1",
+        "event_type": "job.failed",
+        "payload": "{}",
+        "url": "https://example.com/hook",
+        "secret": "whsec_test",
+        "attempts": 0,
+        **fields,
+    }
+
+
+async def test_failed_attempts_back_off_then_give_up(dispatcher, received, resolve_to):
+    """Non-2xx answers are retried with growing delays until max_attempts"""
+    resolve_to("93.184.216.34")
+
+    retry = await dispatcher._send(delivery())
+    final = await dispatcher._send(delivery(attempts=2))
+
+    assert retry["attempts"] == 1 and "status" not in retry
+    # The endpoint's answer is not echoed into the delivery log
+    assert retry["last_status_code"] == 503 and retry["last_error"] == "HTTP 503"
+    assert final["status"] == DeliveryStatus.FAILED
+    assert verify_signature("whsec_test", "{}", received[0].headers[SIGNATURE_HEADER])
+    # Sent to the resolved address, still addressed to the endpoint's host
+    assert received[0].url.host == "93.184.216.34" and received[0].headers["Host"] == "example.com"
+    assert retry_delay(1) < retry_delay(2) <= retry_delay(20) == WEBHOOK_MAX_RETRY_DELAY
+
+
+async def test_internal_destinations_are_refused(dispatcher, received, resolve_to, monkeypatch):
+    """Private and local URLs are rejected on registration; hosts re-pointed at them are never requested"""
+    for url in (
+        "https://127.0.0.1/hook",
+        "https://169.254.169.254/latest",
+        "https://[::ffff:10.0.0.1]/",
+        "https://localhost:8000",
+    ):
+        with pytest.raises(ValueError):
+            WebhookEndpointCreate(url=url)
+    check_webhook_url("https://hooks.example.com/pulse")
+
+    monkeypatch.setattr(webhooks, "WEBHOOK_ALLOW_HTTP", False)
+    with pytest.raises(ValueError, match="https"):
+        check_webhook_url("http://hooks.example.com/pulse")
+
+    resolve_to("93.184.216.34", "10.0.0.5")
+    outcome = await dispatcher._send(delivery(url="https://rebound.example.com/hook"))
+
+    assert not received
+    assert outcome["last_status_code"] is None and "private" in outcome["last_error"]
@@ -0,0 +1,85 @@
+"""Tests for the job worker"""
+import asyncio
+
+import pytest
+
+from app.utils.task_queue import MemoryTaskQueue
+from worker.runner import PermanentTaskError, Worker
+
+
+@pytest.fixture
+def queue():
+    return MemoryTaskQueue()
+
+
+async def run_until(worker, condition, timeout=5):
+    task = asyncio.create_task(worker.run())
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition() and loop.time() < deadline:
+        await asyncio.sleep(0.01)
+    worker.stop()
+    await task
+
+
+async def test_failed_task_is_retried_then_deleted(queue):
+    """A task that fails once succeeds on redelivery and leaves the queue"""
+    attempts = []
+
+    async def flaky(body):
+        attempts.append(body["job_id"])
+        if len(attempts) == 1:
+            raise RuntimeError("provider timeout")
+
+    await queue.send({"job_type": "cv", "job_id": "job-1"})
+    worker = Worker(queue, {"cv": flaky}, poll_wait=0.05, retry_delay=0)
+    await run_until(worker, lambda: len(queue) == 0)
+
+    assert attempts == ["job-1", "job-1"]
+    assert queue.dead_letters == []
+
+
+async def test_task_failing_every_attempt_is_dead_lettered(queue):
+    """After max_attempts the task is set aside and its job failed"""
+    failed = []
+
+    async def broken(body):
+        raise RuntimeError("bad template")
+
+    async def on_dead_letter(body, error):
+        failed.append((body["job_id"], error))
+
+    await queue.send({"job_type": "slides", "job_id": "job-2"})
+    await queue.send({"job_type": "unknown", "job_id": "job-3"})
+    worker = Worker(
+        queue, {"slides": broken}, on_dead_letter=on_dead_letter,
+        max_attempts=2, poll_wait=0.05, retry_delay=0,
+    )
+    await run_until(worker, lambda: len(queue) == 0)
+
+    assert sorted(job_id for job_id, _ in failed) == ["job-2", "job-3"]
+    assert ("job-2", "bad template") in failed
+    assert {letter["job_id"]: letter["receive_count"] for letter in queue.dead_letters} == {
+        "job-2": 2,
+        "job-3": 1,
+    }
+
+
+async def test_permanent_failure_is_not_retried(queue):
+    """A task that can never succeed is dead-lettered on its first attempt"""
+    failed = []
+
+    async def unconfigured(body):
+        raise PermanentTaskError("Google Vertex AI not configured")
+
+    async def on_dead_letter(body, error):
+        failed.append((body["job_id"], error))
+
+    await queue.send({"job_type": "image", "job_id": "job-4"})
+    worker = Worker(
+        queue, {"image": unconfigured}, on_dead_letter=on_dead_letter, poll_wait=0.05, retry_delay=0,
+    )
+    await run_until(worker, lambda: len(queue) == 0)
+
+    assert failed == [("job-4", "Google Vertex AI not configured")]
+    assert [letter["receive_count"] for letter in queue.dead_letters] == [1]
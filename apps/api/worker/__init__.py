@@ -0,0 +1,11 @@
+"""
+Background job worker.
+
+Runs CV, slide and image generation taken off the request path by the
+API's async mode. Start it with ``python -m worker``.
+"""
+
+from .runner import Worker
+from .tasks import create_worker
+
+__all__ = ["Worker", "create_worker"]
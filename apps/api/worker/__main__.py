@@ -0,0 +1,70 @@
+"""Run the job worker as its own process: ``python -m worker``."""
+
+import os
+import asyncio
+import signal
+import sys
+
+from app.database import AsyncSessionLocal, close_db
+from app.services.templates import get_template_registry
+from app.utils.browser_pool import close_browser_pool, get_browser_pool
+from app.utils.document_pool import close_document_pool, get_document_pool
+from app.utils.job_events import get_job_event_hub
+from app.utils.logging import logger
+from app.utils.secrets import load_secrets_to_env
+from app.utils.spool import SpoolReplayer, get_spool
+from app.utils.task_queue import MemoryTaskQueue, get_task_queue
+from app.utils.usage_writer import replay_records
+from app.utils.webhooks import WebhookDispatcher
+
+from .tasks import create_worker
+
+
+async def main() -> None:
+    queue = get_task_queue()
+    if isinstance(queue, MemoryTaskQueue):
+        # Without SQS, tasks stay in the API process (which runs its own worker)
+        logger.error("TASK_QUEUE_URL must be set to run the worker as its own process")
+        sys.exit(1)
+
+    # Compile the CV and slide HTML templates before taking jobs
+    get_template_registry()
+
+    worker = create_worker(queue)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    # Drain job/usage writes spooled while the database was unreachable
+    spool = get_spool()
+    replayer = SpoolReplayer(
+        spool,
+        replay_records,
+        interval=float(os.getenv("SPOOL_REPLAY_INTERVAL", "5")),
+    )
+    replay_task = asyncio.create_task(replayer.run())
+    # Cancel requests for running jobs arrive as job events
+    event_task = asyncio.create_task(get_job_event_hub().run())
+    # Deliver queued webhook events
+    webhook_task = asyncio.create_task(WebhookDispatcher(AsyncSessionLocal).run())
+    # Warm the browsers that render PDF jobs
+    browser_task = asyncio.create_task(get_browser_pool().start())
+    # Start the processes that build DOCX/PPTX jobs
+    document_task = asyncio.create_task(get_document_pool().start())
+    try:
+        await worker.run()
+    finally:
+        document_task.cancel()
+        browser_task.cancel()
+        webhook_task.cancel()
+        event_task.cancel()
+        replay_task.cancel()
+        await close_browser_pool()
+        await close_document_pool()
+        await spool.close()
+        await close_db()
+
+
+if __name__ == "__main__":
+    load_secrets_to_env()
+    asyncio.run(main())
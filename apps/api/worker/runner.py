@@ -0,0 +1,177 @@
+"""Task queue consumer with bounded concurrency, retries and graceful shutdown."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.utils.logging import logger
+from app.utils.task_queue import TaskMessage, TaskQueue
+
+# Longest SQS accepts for a message's visibility (and so a retry delay)
+MAX_VISIBILITY_TIMEOUT = 43200
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+DeadLetterHandler = Callable[[Dict[str, Any], str], Awaitable[None]]
+
+
+class PermanentTaskError(Exception):
+    """A task failure retrying cannot fix; the task is dead-lettered at once."""
+
+
+class Worker:
+    """
+    Consume a task queue, running up to ``concurrency`` tasks at once.
+
+    A running task's message is kept hidden from other consumers by
+    extending its visibility every half timeout. A failed task is retried
+    with exponential backoff by re-showing its message later; after
+    ``max_attempts`` deliveries (or on a ``PermanentTaskError``) it is
+    dead-lettered and ``on_dead_letter`` runs. ``stop()`` stops receiving and lets running tasks finish.
+    """
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        handlers: Dict[str, Handler],
+        on_dead_letter: Optional[DeadLetterHandler] = None,
+        concurrency: int = 4,
+        visibility_timeout: int = 120,
+        max_attempts: int = 3,
+        poll_wait: float = 20,
+        retry_delay: float = 10,
+        drain_timeout: float = 60,
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            queue: Task queue to consume
+            handlers: Coroutine per ``job_type``, called with the message body
+            on_dead_letter: Called with the body and error of a task that
+                failed on every attempt
+            concurrency: Tasks run at once
+            visibility_timeout: Seconds a received task stays hidden per extension
+            max_attempts: Deliveries before a failing task is dead-lettered
+            poll_wait: Long-poll wait per receive
+            retry_delay: Delay before the first retry (doubles per attempt)
+            drain_timeout: Seconds running tasks get to finish on shutdown
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.on_dead_letter = on_dead_letter
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.poll_wait = poll_wait
+        self.retry_delay = retry_delay
+        self.drain_timeout = drain_timeout
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop receiving tasks; ``run`` returns once running tasks finish."""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Receive and run tasks until stopped."""
+        in_flight: Set[asyncio.Task] = set()
+        logger.info("Job worker started", extra={"concurrency": self.concurrency})
+
+        while not self._stopping.is_set():
+            free = self.concurrency - len(in_flight)
+            if free <= 0:
+                await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            try:
+                messages = await self.queue.receive(
+                    min(free, 10), self.poll_wait, self.visibility_timeout
+                )
+            except Exception as e:
+                logger.warning("Task queue receive failed", extra={"error_message": str(e)})
+                await asyncio.sleep(1)
+                continue
+
+            for message in messages:
+                if self._stopping.is_set():
+                    # Received while shutting down: hand it straight back
+                    await self.queue.change_visibility(message, 0)
+                    continue
+                task = asyncio.create_task(self.process(message))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            logger.info("Job worker draining", extra={"tasks": len(in_flight)})
+            _, pending = await asyncio.wait(in_flight, timeout=self.drain_timeout)
+            # Unfinished tasks are redelivered once their visibility runs out
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info("Job worker stopped")
+
+    async def process(self, message: TaskMessage) -> None:
+        """
+        Run one task and settle its message.
+
+        Args:
+            message: Received task
+        """
+        handler = self.handlers.get(message.body.get("job_type"))
+        error: Optional[Exception] = None
+
+        keep_hidden = asyncio.create_task(self._keep_hidden(message))
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job type {message.body.get('job_type')!r}")
+            await handler(message.body)
+        except Exception as e:
+            error = e
+        finally:
+            keep_hidden.cancel()
+
+        try:
+            if error is None:
+                await self.queue.delete(message)
+            elif (
+                handler is None
+                or isinstance(error, PermanentTaskError)
+                or message.receive_count >= self.max_attempts
+            ):
+                await self._dead_letter(message, error)
+            else:
+                delay = min(self.retry_delay * 2 ** (message.receive_count - 1), MAX_VISIBILITY_TIMEOUT)
+                logger.warning(
+                    "Task failed, will retry",
+                    extra={
+                        "job_id": message.body.get("job_id"),
+                        "attempt": message.receive_count,
+                        "retry_in": delay,
+                        "error_message": str(error),
+                    },
+                )
+                await self.queue.change_visibility(message, int(delay))
+        except Exception as e:
+            # The message is redelivered after its visibility timeout
+            logger.warning("Failed to settle task", extra={"error_message": str(e)})
+
+    async def _dead_letter(self, message: TaskMessage, error: Exception) -> None:
+        logger.error(
+            "Task failed on every attempt",
+            extra={
+                "job_id": message.body.get("job_id"),
+                "attempts": message.receive_count,
+                "error_message": str(error),
+            },
+        )
+        await self.queue.dead_letter(message, str(error))
+        if self.on_dead_letter:
+            await self.on_dead_letter(message.body, str(error))
+        await self.queue.delete(message)
+
+    async def _keep_hidden(self, message: TaskMessage) -> None:
+        """Extend the message's visibility while its task runs."""
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 2)
+            try:
+                await self.queue.change_visibility(message, self.visibility_timeout)
+            except Exception as e:
+                logger.warning("Failed to extend task visibility", extra={"error_message": str(e)})
@@ -0,0 +1,130 @@
+"""Job handlers run by the worker."""
+
+import os
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models.job import TERMINAL_STATUSES, Job, JobStatus, JobType
+from app.schemas.cv import BulkCVRequest, CVRequest
+from app.schemas.image import ImageGenerationRequest
+from app.schemas.slides import SlideGenerationRequest
+from app.services.bulk_cv import BULK_CV_TASK, run_bulk_cv_job
+from app.services.generation import run_cv_job, run_image_job, run_slides_job
+from app.utils.cancellation import JobCancelled
+from app.utils.logging import logger
+from app.utils.task_queue import TaskQueue
+from app.utils.usage_writer import save_job_result
+
+from .runner import PermanentTaskError, Worker
+
+
+async def start_job(db, job_id: str) -> bool:
+    """
+    Mark a job as processing, unless it has already finished.
+
+    A redelivered message for a job that completed (or was cancelled)
+    is skipped, so the work and its usage are never recorded twice.
+
+    Args:
+        db: Database session
+        job_id: Job ID
+
+    Returns:
+        True if the job should run
+    """
+    job_status = await db.scalar(select(Job.status).where(Job.id == job_id))
+    if job_status is None or job_status in TERMINAL_STATUSES:
+        logger.info("Skipping task for finished job", extra={"job_id": job_id})
+        return False
+
+    await save_job_result(db, job_id, status=JobStatus.PROCESSING, started_at=datetime.utcnow())
+    return True
+
+
+async def run_job(body: Dict[str, Any], runner: Callable[..., Awaitable[Any]], request: Any) -> None:
+    """
+    Run a job unless it already finished; a cancel mid-way ends it quietly.
+
+    Args:
+        body: Task message body
+        runner: Generation runner (``run_cv_job``, ...)
+        request: Validated generation request
+    """
+    async with AsyncSessionLocal() as db:
+        if not await start_job(db, body["job_id"]):
+            return
+        try:
+            await runner(db, body["job_id"], body["user_id"], request)
+        except JobCancelled:
+            logger.info("Job cancelled while running", extra={"job_id": body["job_id"]})
+
+
+async def handle_cv(body: Dict[str, Any]) -> None:
+    """Render and upload a CV."""
+    await run_job(body, run_cv_job, CVRequest.model_validate(body["payload"]))
+
+
+async def handle_cv_bulk(body: Dict[str, Any]) -> None:
+    """Render a batch of CVs into a ZIP archive and upload it."""
+    await run_job(body, run_bulk_cv_job, BulkCVRequest.model_validate(body["payload"]))
+
+
+async def handle_slides(body: Dict[str, Any]) -> None:
+    """Render and upload a presentation."""
+    await run_job(body, run_slides_job, SlideGenerationRequest.model_validate(body["payload"]))
+
+
+async def handle_images(body: Dict[str, Any]) -> None:
+    """Generate and upload images; an unknown or unconfigured provider fails the job at once."""
+    try:
+        await run_job(body, run_image_job, ImageGenerationRequest.model_validate(body["payload"]))
+    except HTTPException as e:
+        # Raised by get_image_provider (400 unsupported, 503 not configured)
+        raise PermanentTaskError(e.detail) from e
+
+
+async def fail_job(body: Dict[str, Any], error: str) -> None:
+    """Mark the job of a dead-lettered task as failed."""
+    async with AsyncSessionLocal() as db:
+        await save_job_result(
+            db,
+            body["job_id"],
+            status=JobStatus.FAILED,
+            error_message=error,
+            completed_at=datetime.utcnow(),
+        )
+
+
+HANDLERS = {
+    JobType.CV.value: handle_cv,
+    BULK_CV_TASK: handle_cv_bulk,
+    JobType.SLIDES.value: handle_slides,
+    JobType.IMAGE.value: handle_images,
+}
+
+
+def create_worker(queue: TaskQueue, **options: Any) -> Worker:
+    """
+    Create a worker for the job handlers, configured from WORKER_* settings.
+
+    Args:
+        queue: Task queue to consume
+        **options: Overrides of the ``Worker`` settings
+
+    Returns:
+        Worker instance
+    """
+    settings = {
+        "concurrency": int(os.getenv("WORKER_CONCURRENCY", "4")),
+        "visibility_timeout": int(os.getenv("WORKER_VISIBILITY_TIMEOUT", "120")),
+        "max_attempts": int(os.getenv("WORKER_MAX_ATTEMPTS", "3")),
+        "poll_wait": float(os.getenv("WORKER_POLL_WAIT", "20")),
+        "retry_delay": float(os.getenv("WORKER_RETRY_DELAY", "10")),
+        "drain_timeout": float(os.getenv("WORKER_DRAIN_TIMEOUT", "60")),
+    }
+    settings.update(options)
+    return Worker(queue, HANDLERS, on_dead_letter=fail_job, **settings)
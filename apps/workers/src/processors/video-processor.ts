@@ -7,6 +7,21 @@ import AWS from 'aws-sdk';
 import { DatabaseService } from '../services/database';
 import { JobMessage } from '../services/sqs-worker';
 
+// Progress milestones (percent); generation itself spans STARTED..GENERATED
+const PROGRESS_STARTED = 5;
+const PROGRESS_GENERATED = 85;
+const PROGRESS_UPLOADING = 90;
+
+/**
+ * Thrown at a checkpoint once the job was cancelled (POST /jobs/{id}/cancel).
+ */
+export class JobCancelledError extends Error {
+  constructor(jobId: string) {
+    super(`Job ${jobId} was cancelled`);
+    this.name = 'JobCancelledError';
+  }
+}
+
 export class VideoProcessor {
   private database: DatabaseService;
   private s3: AWS.S3;
@@ -31,8 +46,13 @@ export class VideoProcessor {
     console.log(`🎬 Processing video job ${job.job_id}`);
     
     try {
-      // Update job status to processing
-      await this.database.updateJobStatus(job.job_id, 'processing');
+      // Update job status to processing (skipping jobs cancelled while queued,
+      // or already finished when a message is delivered twice)
+      if (!(await this.database.updateJobStatus(job.job_id, 'processing'))) {
+        console.log(`⏭️  Video job ${job.job_id} was cancelled or already finished, skipping`);
+        return;
+      }
+      await this.reportProgress(job.job_id, PROGRESS_STARTED);
       
       // Generate video based on provider
       let videoUrl: string;
@@ -45,10 +65,10 @@ export class VideoProcessor {
         throw new Error(`Unsupported provider: ${job.provider}`);
       }
       
-      // Update job status to completed
-      await this.database.updateJobStatus(job.job_id, 'completed', videoUrl);
+      // Update job status to completed (unless cancelled in the meantime)
+      const completed = await this.database.updateJobStatus(job.job_id, 'completed', videoUrl);
       
-      // Record usage
+      // Record usage; the video was generated either way
       await this.database.recordUsage(
         job.user_id,
         job.job_id,
@@ -57,6 +77,7 @@ export class VideoProcessor {
           provider: job.provider,
           duration: job.duration,
           style: job.style,
+          ...(!completed && { cancelled: true }),
         }
       );
       
@@ -65,6 +86,12 @@ export class VideoProcessor {
       
       console.log(`✅ Video job ${job.job_id} completed successfully`);
     } catch (error: any) {
+      if (error instanceof JobCancelledError) {
+        // Stopped at a checkpoint before delivery: no usage is recorded
+        console.log(`🛑 Video job ${job.job_id} cancelled`);
+        return;
+      }
+      
       console.error(`❌ Video job ${job.job_id} failed:`, error);
       
       // Update job status to failed
@@ -107,7 +134,7 @@ export class VideoProcessor {
       );
       
       // Poll for completion
-      const videoUrl = await this.pollRunwayJob(response.data.id, apiKey);
+      const videoUrl = await this.pollRunwayJob(response.data.id, apiKey, job.job_id);
       
       // Upload to S3
       return await this.uploadVideoToS3(videoUrl, job.job_id, job.user_id);
@@ -146,7 +173,7 @@ export class VideoProcessor {
       );
       
       // Poll for completion
-      const videoUrl = await this.pollPikaJob(response.data.id, apiKey);
+      const videoUrl = await this.pollPikaJob(response.data.id, apiKey, job.job_id);
       
       // Upload to S3
       return await this.uploadVideoToS3(videoUrl, job.job_id, job.user_id);
@@ -159,9 +186,17 @@ export class VideoProcessor {
   private async mockVideoGeneration(job: JobMessage, provider: string): Promise<string> {
     console.log(`🎭 Using mock video generation (${provider}) for development`);
     
-    // Simulate processing time (2-5 seconds per duration second)
+    // Simulate processing time (2-5 seconds per duration second), in steps
     const processingTime = job.duration * 2000 + Math.random() * job.duration * 3000;
-    await new Promise(resolve => setTimeout(resolve, processingTime));
+    const steps = 10;
+    for (let step = 1; step <= steps; step++) {
+      await new Promise(resolve => setTimeout(resolve, processingTime / steps));
+      await this.checkpoint(job.job_id);
+      await this.reportProgress(
+        job.job_id,
+        PROGRESS_STARTED + ((PROGRESS_GENERATED - PROGRESS_STARTED) * step) / steps
+      );
+    }
     
     // Create a mock video URL (in real scenario, this would be actual video from provider)
     // For now, we'll use a placeholder or generate a simple video
@@ -179,7 +214,7 @@ export class VideoProcessor {
     return presignedUrl;
   }
   
-  private async pollRunwayJob(jobId: string, apiKey: string): Promise<string> {
+  private async pollRunwayJob(jobId: string, apiKey: string, pulseJobId: string): Promise<string> {
     // Placeholder for Runway job polling
     // In real implementation, poll until job is complete
     const maxAttempts = 60;
@@ -198,9 +233,15 @@ export class VideoProcessor {
           return response.data.video_url;
         }
         
+        await this.reportProviderProgress(pulseJobId, response.data.progress);
+        
         await new Promise(resolve => setTimeout(resolve, 5000));
+        await this.checkpoint(pulseJobId);
         attempt++;
       } catch (error) {
+        if (error instanceof JobCancelledError) {
+          throw error;
+        }
         console.error('Error polling Runway job:', error);
         throw error;
       }
@@ -209,7 +250,7 @@ export class VideoProcessor {
     throw new Error('Runway job timed out');
   }
   
-  private async pollPikaJob(jobId: string, apiKey: string): Promise<string> {
+  private async pollPikaJob(jobId: string, apiKey: string, pulseJobId: string): Promise<string> {
     // Placeholder for Pika job polling
     // Similar structure to Runway polling
     const maxAttempts = 60;
@@ -228,9 +269,15 @@ export class VideoProcessor {
           return response.data.video_url;
         }
         
+        await this.reportProviderProgress(pulseJobId, response.data.progress);
+        
         await new Promise(resolve => setTimeout(resolve, 5000));
+        await this.checkpoint(pulseJobId);
         attempt++;
       } catch (error) {
+        if (error instanceof JobCancelledError) {
+          throw error;
+        }
         console.error('Error polling Pika job:', error);
         throw error;
       }
@@ -239,11 +286,48 @@ export class VideoProcessor {
     throw new Error('Pika job timed out');
   }
   
+  /**
+   * Stop here if the job was cancelled since the last checkpoint.
+   */
+  private async checkpoint(jobId: string): Promise<void> {
+    if (await this.database.isJobCancelled(jobId)) {
+      throw new JobCancelledError(jobId);
+    }
+  }
+  
+  /**
+   * Publish progress to watchers; a failed report never fails the job.
+   */
+  private async reportProgress(jobId: string, progress: number): Promise<void> {
+    try {
+      await this.database.updateJobProgress(jobId, progress);
+    } catch (error) {
+      console.error(`Failed to report progress for job ${jobId}:`, error);
+    }
+  }
+  
+  /**
+   * Map a provider's progress (0-1 or 0-100) onto the generation span.
+   */
+  private async reportProviderProgress(jobId: string, providerProgress: unknown): Promise<void> {
+    if (typeof providerProgress !== 'number') {
+      return;
+    }
+    const fraction = providerProgress > 1 ? providerProgress / 100 : providerProgress;
+    await this.reportProgress(
+      jobId,
+      PROGRESS_STARTED + (PROGRESS_GENERATED - PROGRESS_STARTED) * fraction
+    );
+  }
+  
   private async uploadVideoToS3(
     videoUrl: string,
     jobId: string,
     userId: string
   ): Promise<string> {
+    await this.checkpoint(jobId);
+    await this.reportProgress(jobId, PROGRESS_UPLOADING);
+    
     try {
       // Download video from provider
       const response = await axios.get(videoUrl, { responseType: 'arraybuffer' });
@@ -4,6 +4,33 @@
 
 import { Pool, PoolClient } from 'pg';
 
+const TERMINAL_STATUSES = ['completed', 'failed', 'cancelled'];
+
+const ROLLUP_TABLES: [string, string][] = [
+  ['usage_rollups_hourly', 'hour'],
+  ['usage_rollups_daily', 'day'],
+];
+
+/**
+ * Publishes the updated job row on the job_events channel (mirrors
+ * app/utils/job_events.py in the API). Wrap an UPDATE ... RETURNING in a
+ * CTE named `updated`; the notification is delivered on commit.
+ */
+const NOTIFY_JOB_EVENT = `
+  SELECT pg_notify('job_events', json_build_object(
+    'job_id', id,
+    'user_id', user_id,
+    'status', LOWER(status::text),
+    'progress', progress,
+    'result_url', result_url,
+    'error_message', LEFT(error_message, 1000),
+    'updated_at', updated_at
+  )::text)
+  FROM updated
+`;
+
+const JOB_EVENT_COLUMNS = 'id, user_id, status, progress, result_url, error_message, updated_at';
+
 export class DatabaseService {
   private pool: Pool;
   
@@ -38,12 +65,23 @@ export class DatabaseService {
     return await this.pool.connect();
   }
   
+  /**
+   * Set a job's status. A cancelled job keeps its status, so a worker
+   * finishing late cannot revive it, and a finished job is not moved back
+   * to an unfinished status (e.g. by a duplicate message); returns false
+   * when the update was skipped.
+   *
+   * The job's row is locked while its previous status is read, and the
+   * rollups and webhooks of a terminal transition commit with the update,
+   * so of two concurrent updates into the same status only the first
+   * counts as the transition (mirrors apply_job_record in the API).
+   */
   async updateJobStatus(
     jobId: string,
     status: string,
     resultUrl?: string,
     errorMessage?: string
-  ): Promise<void> {
+  ): Promise<boolean> {
     const updateFields: string[] = ['status = $2', 'updated_at = NOW()'];
     const params: any[] = [jobId, status];
     let paramIndex = 3;
@@ -54,6 +92,10 @@ export class DatabaseService {
       updateFields.push(`completed_at = NOW()`);
     }
     
+    if (status === 'completed') {
+      updateFields.push('progress = 100');
+    }
+    
     if (resultUrl) {
       updateFields.push(`result_url = $${paramIndex}`);
       params.push(resultUrl);
@@ -66,13 +108,119 @@ export class DatabaseService {
       paramIndex++;
     }
     
+    let condition = `LOWER(status::text) <> 'cancelled'`;
+    if (!TERMINAL_STATUSES.includes(status)) {
+      condition = `LOWER(status::text) <> ALL($${paramIndex}::text[])`;
+      params.push(TERMINAL_STATUSES);
+      paramIndex++;
+    }
+    
+    const query = `
+      WITH updated AS (
+        UPDATE jobs
+        SET ${updateFields.join(', ')}
+        WHERE id = $1 AND ${condition}
+        RETURNING ${JOB_EVENT_COLUMNS}
+      )
+      ${NOTIFY_JOB_EVENT}
+    `;
+    
+    const client = await this.getClient();
+    try {
+      await client.query('BEGIN');
+      
+      // Lock the row until commit: a concurrent update waits here and then
+      // sees this one's status, rather than the status both started from
+      const previous = await client.query(
+        'SELECT status, type, user_id, model_name FROM jobs WHERE id = $1 FOR UPDATE',
+        [jobId]
+      );
+      
+      const result = await client.query(query, params);
+      const updated = (result.rowCount ?? 0) > 0;
+      
+      // Roll up terminal outcomes once, on the transition into that status
+      const job = previous.rows[0];
+      if (updated && job && TERMINAL_STATUSES.includes(status) && job.status.toLowerCase() !== status) {
+        await this.bumpRollups(job.user_id, `job:${job.type.toLowerCase()}`, job.model_name, status, 0, 1, client);
+        await this.enqueueJobWebhooks(jobId, `job.${status}`, client);
+      }
+      
+      await client.query('COMMIT');
+      return updated;
+    } catch (error) {
+      await client.query('ROLLBACK').catch(() => undefined);
+      console.error('❌ Job status update failed:', error);
+      throw error;
+    } finally {
+      client.release();
+    }
+  }
+  
+  /**
+   * Queue the event of a finished job for the owner's webhook endpoints
+   * (mirrors enqueue_job_webhooks in app/utils/webhooks.py); the API's
+   * job worker delivers them. Pass the client of an open transaction to
+   * queue them with it.
+   */
+  async enqueueJobWebhooks(jobId: string, eventType: string, client?: PoolClient): Promise<void> {
+    const query = `
+      WITH event AS (
+        SELECT user_id, json_build_object(
+          'id', gen_random_uuid(),
+          'type', $2::text,
+          'created_at', to_char(NOW() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US'),
+          'data', json_build_object(
+            'job_id', id,
+            'type', LOWER(type::text),
+            'status', LOWER(status::text),
+            'result_url', result_url,
+            'error_message', error_message,
+            'completed_at', to_char(completed_at, 'YYYY-MM-DD"T"HH24:MI:SS.US')
+          )
+        )::text AS payload
+        FROM jobs
+        WHERE id = $1
+      )
+      INSERT INTO webhook_deliveries
+        (id, endpoint_id, job_id, event_type, payload, status, attempts, next_attempt_at, created_at)
+      SELECT gen_random_uuid()::text, e.id, $1, $2, event.payload, 'PENDING', 0,
+             NOW() AT TIME ZONE 'UTC', NOW() AT TIME ZONE 'UTC'
+      FROM event
+      JOIN webhook_endpoints e ON e.user_id = event.user_id
+      WHERE e.is_active AND e.events::jsonb ? $2
+    `;
+    
+    await (client ?? this).query(query, [jobId, eventType]);
+  }
+  
+  /**
+   * Whether the job was cancelled (checked at the worker's checkpoints).
+   */
+  async isJobCancelled(jobId: string): Promise<boolean> {
+    const result = await this.query(
+      'SELECT LOWER(status::text) AS status FROM jobs WHERE id = $1',
+      [jobId]
+    );
+    return result.rows[0]?.status === 'cancelled';
+  }
+  
+  /**
+   * Record real progress (0-100) and push it to watchers of the job.
+   * Progress only moves forward, so late or repeated reports are no-ops.
+   */
+  async updateJobProgress(jobId: string, progress: number): Promise<void> {
     const query = `
-      UPDATE jobs
-      SET ${updateFields.join(', ')}
-      WHERE id = $1
+      WITH updated AS (
+        UPDATE jobs
+        SET progress = $2, updated_at = NOW()
+        WHERE id = $1 AND (progress IS NULL OR progress < $2)
+        RETURNING ${JOB_EVENT_COLUMNS}
+      )
+      ${NOTIFY_JOB_EVENT}
     `;
     
-    await this.query(query, params);
+    await this.query(query, [jobId, Math.max(0, Math.min(100, Math.round(progress)))]);
   }
   
   async recordUsage(
@@ -81,12 +229,47 @@ export class DatabaseService {
     eventType: string,
     metadata: Record<string, any>
   ): Promise<void> {
+    // Provider and model have typed columns; the rest stays in event_metadata
+    const { provider, model, ...extra } = metadata;
     const query = `
-      INSERT INTO usage_events (id, user_id, job_id, event_type, tokens, event_metadata, created_at, updated_at)
-      VALUES (gen_random_uuid(), $1, $2, $3, 0, $4, NOW(), NOW())
+      INSERT INTO usage_events (id, user_id, job_id, event_type, tokens, provider, model, event_metadata, created_at, updated_at)
+      VALUES (gen_random_uuid(), $1, $2, $3, 0, $4, $5, $6, NOW(), NOW())
     `;
     
-    await this.query(query, [userId, jobId, eventType, JSON.stringify(metadata)]);
+    await this.query(query, [userId, jobId, eventType, provider, model, JSON.stringify(extra)]);
+    await this.bumpRollups(userId, eventType, model, '', 0, metadata.duration || 1);
+  }
+  
+  /**
+   * Add one event to the hourly and daily analytics rollups
+   * (mirrors app/utils/rollups.py in the API), optionally in the
+   * transaction of `client`.
+   */
+  async bumpRollups(
+    userId: string,
+    eventType: string,
+    model: string | undefined,
+    jobStatus: string,
+    tokens: number,
+    quantity: number,
+    client?: PoolClient
+  ): Promise<void> {
+    for (const [table, unit] of ROLLUP_TABLES) {
+      const query = `
+        INSERT INTO ${table} (bucket_start, event_type, model, plan, job_status, event_count, tokens, quantity)
+        VALUES (
+          date_trunc('${unit}', NOW() AT TIME ZONE 'UTC'), $2, $3,
+          COALESCE((SELECT LOWER(plan::text) FROM subscriptions WHERE user_id = $1), ''),
+          $4, 1, $5, $6
+        )
+        ON CONFLICT (bucket_start, event_type, model, plan, job_status) DO UPDATE
+        SET event_count = ${table}.event_count + 1,
+            tokens = ${table}.tokens + EXCLUDED.tokens,
+            quantity = ${table}.quantity + EXCLUDED.quantity
+      `;
+      
+      await (client ?? this).query(query, [userId, eventType, model || '', jobStatus, tokens, quantity]);
+    }
   }
   
   async updateSubscriptionVideoUsage(userId: string, videoSeconds: number): Promise<void> {